@@ -1,15 +1,42 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-import re
+from plotly.subplots import make_subplots
 import os
+import json
+import hashlib
 import datetime
 import requests
 import time
 import streamlit.components.v1 as components
-from pathlib import Path
+
+# Analitik murni (tanpa Streamlit) ada di package bandarmology/ -> bisa dipakai juga dari CLI / notebook.
+from bandarmology.analytics import (
+    calculate_broker_action_meter, compute_trade_stats, get_detailed_broker_summary, prepare_trade_book_data,
+)
+from bandarmology.bigprint import BIG_PRINT_DEFAULTS, big_print_from_index, build_big_print_index
+from bandarmology.brokers import BROKER_FILE, BROKER_REGISTRY, COLOR_MAP, get_broker_info, style_broker_code
+from bandarmology.cleaning import clean_running_trade, format_time_sec, time_sec_to_time
+from bandarmology.consistency import CONSISTENCY_WINDOWS, broker_consistency, broker_consistency_rolling
+from bandarmology.flow import build_flow_matrix, flow_group_matrix, sankey_from_flow
+from bandarmology.formatting import format_freq_label, format_lot_label, format_number_label
+from bandarmology.insights import (
+    make_bigprint_insight, make_broker_summary_insight, make_consistency_insight, make_fd_insight,
+    make_sankey_distribution_insight, make_tradebook_insight,
+)
+from bandarmology.instrument import stage, start_trace, stop_trace, trace_frame, traced, write_trace_jsonl
+from bandarmology.loader import (
+    CACHE_ROOT, DB_ROOT, _file_signature, catalog_files_in_range, catalog_latest_date,
+    get_database_catalog, resolve_database_files_range,
+)
+from bandarmology.market import MARKET_TTL, OHLC_RANGE_OFFSETS, market_data, market_status_text, slice_ohlc
+from bandarmology.ohlcv import OHLCV_BASE_INTERVAL, build_ohlcv, load_ohlcv_bars, resample_ohlcv
+from bandarmology.rollup import INTRADAY_MAX_DAYS, build_daily_rollup, load_range_for_analysis
+from bandarmology.score import (
+    BANDAR_SCORE_COMPONENTS, SCORE_CONS_DAYS, bandar_score_history, compute_bandar_score, overall_conclusion,
+)
+from bandarmology.screener import run_screener
 
 # =========================================================
 # 1. KONFIGURASI HALAMAN (dark mode only)
@@ -21,153 +48,15 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# =========================================================
-# 2. KONFIGURASI BROKER (NAMA + KELOMPOK)
-# =========================================================
-# --- NAMA BROKER (LENGKAP) ---
-BROKER_NAMES = {
-    "CC": "Mandiri Sekuritas",
-    "AK": "UBS Sekuritas Indonesia",
-    "ZP": "Maybank Sekuritas Indonesia",
-    "XL": "Stockbit Sekuritas Digital",
-    "YP": "Mirae Asset Sekuritas Indonesia",
-    "YU": "CGS International Sekuritas Indonesia",
-    "BK": "J.P. Morgan Sekuritas Indonesia",
-    "PD": "Indo Premier Sekuritas",
-    "MG": "Semesta Indovest Sekuritas",
-    "CP": "KB Valbury Sekuritas",
-    "XC": "Ajaib Sekuritas Asia",
-    "LG": "Trimegah Sekuritas Indonesia Tbk.",
-    "SQ": "BCA Sekuritas",
-    "KZ": "CLSA Sekuritas Indonesia",
-    "NI": "BNI Sekuritas",
-    "RX": "Macquarie Sekuritas Indonesia",
-    "DH": "Sinarmas Sekuritas",
-    "AZ": "Sucor Sekuritas",
-    "OD": "BRI Danareksa Sekuritas",
-    "BB": "Verdhana Sekuritas Indonesia",
-    "KK": "Phillip Sekuritas Indonesia",
-    "IF": "Samuel Sekuritas Indonesia",
-    "GR": "Panin Sekuritas Tbk.",
-    "EP": "MNC Sekuritas",
-    "KI": "Ciptadana Sekuritas Asia",
-    "DR": "RHB Sekuritas Indonesia",
-    "TP": "OCBC Sekuritas Indonesia",
-    "BQ": "Korea Investment and Sekuritas Indonesia",
-    "YB": "Yakin Bertumbuh Sekuritas",
-    "XA": "NH Korindo Sekuritas Indonesia",
-    "AP": "Pacific Sekuritas Indonesia",
-    "HP": "Henan Putihrai Sekuritas",
-    "AI": "UOB Kay Hian Sekuritas",
-    "HD": "KGI Sekuritas Indonesia",
-    "DX": "Bahana Sekuritas",
-    "YJ": "Lotus Andalan Sekuritas",
-    "AG": "Kiwoom Sekuritas Indonesia",
-    "SS": "Supra Sekuritas Indonesia",
-    "DP": "DBS Vickers Sekuritas Indonesia",
-    "AO": "Erdikha Elit Sekuritas",
-    "RF": "Buana Capital Sekuritas",
-    "RB": "Ina Sekuritas Indonesia",
-    "BR": "Trust Sekuritas",
-    "AT": "Phintraco Sekuritas",
-    "CD": "Mega Capital Sekuritas",
-    "IN": "Investindo Nusantara Sekuritas",
-    "PO": "Pilarmas Investindo Sekuritas",
-    "FS": "Yuanta Sekuritas Indonesia",
-    "SH": "Artha Sekuritas Indonesia",
-    "IH": "Indo Harvest Sekuritas",
-    "TS": "Dwidana Sakti Sekuritas",
-    "LS": "Reliance Sekuritas Indonesia Tbk.",
-    "MI": "Victoria Sekuritas Indonesia",
-    "FZ": "Waterfront Sekuritas Indonesia",
-    "IU": "Indo Capital Sekuritas",
-    "PC": "FAC Sekuritas Indonesia",
-    "PP": "Aldiracita Sekuritas Indonesia",
-    "MU": "Minna Padi Investama Sekuritas",
-    "II": "Danatama Makmur Sekuritas",
-    "RO": "Pluang Maju Sekuritas",
-    "SA": "Elit Sukses Sekuritas",
-    "ID": "Anugerah Sekuritas Indonesia",
-    "EL": "Evergreen Sekuritas Indonesia",
-    "GA": "BNC Sekuritas Indonesia",
-    "ES": "Ekokapital Sekuritas",
-    "AR": "Binaartha Sekuritas",
-    "PG": "Panca Global Sekuritas",
-    "AN": "Wanteg Sekuritas",
-    "DU": "KAF Sekuritas Indonesia",
-    "AH": "Shinhan Sekuritas Indonesia",
-    "RG": "Profindo Sekuritas Indonesia",
-    "ZR": "Bumiputera Sekuritas",
-    "YO": "Amantara Sekuritas Indonesia",
-    "SF": "Surya Fajar Sekuritas",
-    "RS": "Yulie Sekuritas Indonesia Tbk.",
-    "AF": "Harita Kencana Sekuritas",
-    "PF": "Danasakti Sekuritas Indonesia",
-    "PI": "Magenta Kapital Sekuritas Indonesia",
-    "BS": "Equity Sekuritas Indonesia",
-    "PS": "Paramitra Alfa Sekuritas",
-    "JB": "Bjb Sekuritas",
-    "OK": "Net Sekuritas",
-    "GW": "HSBC Sekuritas Indonesia",
-    "BF": "Inti Fikasa Sekuritas",
-    "TF": "Universal Broker Indonesia Sekuritas",
-    "QA": "Tuntun Sekuritas Indonesia",
-    "GI": "Webull Sekuritas Indonesia",
-    "IT": "Inti Teladan Sekuritas",
-    "AD": "OSO Sekuritas Indonesia",
-    "DD": "Makindo Sekuritas",
-    "IC": "Integrity Capital Sekuritas",
-    "FO": "Forte Global Sekuritas",
-    "IP": "Yugen Bertumbuh Sekuritas",
-    "SC": "IMG Sekuritas",
-    "DM": "Masindo Artha Sekuritas",
-    "CG": "Citigroup Sekuritas Indonesia",
-    "CS": "Credit Suisse Sekuritas Indonesia",
-    "DK": "KAF Sekuritas Indonesia",
-}
-
-# --- KELOMPOK BROKER: Asing / BUMN / Lokal ---
-FOREIGN_BROKERS = {
-    "AG", "AH", "AI", "AK", "BK", "BQ", "CG", "CP", "CS",
-    "DR", "FS", "GI", "GW", "HD", "KI", "KK", "KZ", "RX",
-    "TP", "XA", "YP", "YU", "ZP",
-}
-
-BUMN_BROKERS = {"CC", "DX", "NI", "OD"}
+# Fragment: bagian dashboard yang widget-nya cukup me-rerun bagian itu sendiri (bukan seluruh halaman).
+# Streamlit lama: fallback ke experimental_fragment, atau fungsi biasa (rerun penuh seperti dulu).
+ui_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda fn: fn)
 
 
-def get_broker_group(code: str) -> str:
-    """Kembalikan kelompok broker: Asing / BUMN / Lokal."""
-    c = str(code).upper().strip()
-    if c in BUMN_BROKERS:
-        return "BUMN"
-    if c in FOREIGN_BROKERS:
-        return "Asing"
-    return "Lokal"
-
-
-def get_broker_info(code: str):
-    """Return (code, name, group)."""
-    c = str(code).upper().strip()
-    name = BROKER_NAMES.get(c, "Sekuritas Lain")
-    group = get_broker_group(c)
-    return c, name, group
-
-
-# Warna untuk group broker (dipakai di tabel + sankey + label)
-COLOR_MAP = {
-    "Asing": "#ff4b4b",   # merah
-    "BUMN": "#22c55e",    # hijau
-    "Lokal": "#3b82f6",   # biru
-    "Unknown": "#6b7280",  # abu
-}
-
-
-def style_broker_code(val):
-    """Dipakai untuk mewarnai kolom 'Code' di tabel."""
-    group = get_broker_group(val)
-    color = COLOR_MAP.get(group, COLOR_MAP["Unknown"])
-    return f"color:{color}; font-weight:700;"
+def ui_fragment_every(seconds: float):
+    """Fragment yang juga rerun sendiri tiap `seconds` detik (Streamlit tanpa st.fragment: fragment biasa)."""
+    frag = getattr(st, "fragment", None)
+    return frag(run_every=seconds) if frag is not None else ui_fragment
 
 
 # =========================================================
@@ -177,6 +66,12 @@ if "authenticated" not in st.session_state:
     st.session_state["authenticated"] = False
 if "df_raw" not in st.session_state:
     st.session_state["df_raw"] = None
+if "df_clean" not in st.session_state:
+    st.session_state["df_clean"] = None
+if "data_fp" not in st.session_state:
+    st.session_state["data_fp"] = None
+if "rollup" not in st.session_state:
+    st.session_state["rollup"] = None
 if "current_stock" not in st.session_state:
     st.session_state["current_stock"] = "UNKNOWN"
 
@@ -376,73 +271,8 @@ def render_footer():
     )
 
 # =========================================================
-# 5. TOOLS LAIN (YAHOO TICKER, FORMAT, DLL)
-# =========================================================
-def format_number_label(value):
-    """Format angka untuk IDR: K/M/B/T (K=ribu, M=juta, B=miliar, T=triliun)."""
-    try:
-        value = float(value)
-    except Exception:
-        return str(value)
-    if pd.isna(value):
-        return "0"
-    abs_val = abs(value)
-    if abs_val >= 1e12:
-        return f"{value/1e12:.2f}T"
-    if abs_val >= 1e9:
-        return f"{value/1e9:.2f}B"
-    if abs_val >= 1e6:
-        return f"{value/1e6:.2f}M"
-    if abs_val >= 1e3:
-        return f"{value/1e3:.2f}K"
-    return f"{value:,.0f}"
-
-
-def format_lot_label(value):
-    try:
-        value = float(value)
-    except Exception:
-        return str(value)
-    abs_val = abs(value)
-    if abs_val >= 1e6:
-        return f"{value/1e6:.2f}M"
-    if abs_val >= 1e3:
-        return f"{value/1e3:.2f}K"
-    return f"{value:,.0f}"
-
-def format_freq_label(value):
-    try:
-        value = float(value)
-    except Exception:
-        return str(value)
-    abs_val = abs(value)
-    if abs_val >= 1e6:
-        return f"{value/1e6:.2f}M"
-    if abs_val >= 1e3:
-        return f"{value/1e3:.2f}K"
-    return f"{value:,.0f}"
-    abs_val = abs(value)
-    if abs_val >= 1e12:
-        return f"{value/1e12:.2f}T"
-    if abs_val >= 1e9:
-        return f"{value/1e9:.2f}B"
-    if abs_val >= 1e6:
-        return f"{value/1e6:.2f}M"
-    if abs_val >= 1e3:
-        return f"{value/1e3:.2f}K"
-    return f"{value:,.0f}"
-
-
-# =========================================================
-# 5A. INSIGHT ENGINE (Gaya Bandar) - NEW
+# 0. PANEL TOP: SINYAL HARI INI + SKOR BANDAR + RED FLAGS
 # =========================================================
-def _fmt_id(x) -> str:
-    """Format angka Indonesia untuk tampilan ringkas."""
-    try:
-        return f"{int(round(float(x))):,}".replace(",", ".")
-    except Exception:
-        return str(x)
-
 def _badge(label: str, color: str = "#22c55e") -> str:
     return f"<span style='display:inline-block;padding:3px 10px;border-radius:999px;background:{color};color:#0b1020;font-weight:800;font-size:11px;'>{label}</span>"
 
@@ -468,294 +298,13 @@ def render_bandarmology_insight(title: str, bullets: list[str], conclusion: str
         unsafe_allow_html=True
     )
 
-def make_fd_insight(fd_stats: dict, mode_key: str = "value") -> tuple[list[str], str, str]:
-    m = fd_stats.get(mode_key, {}) if fd_stats else {}
-    net = float(m.get("Net_Foreign", 0))
-    fp = float(m.get("Foreign_Pct", 0))
-    label = "Asing Akumulasi" if net > 0 else ("Asing Distribusi" if net < 0 else "Asing Netral")
-    tone = "good" if net > 0 else ("bad" if net < 0 else "neutral")
-
-    bullets = [
-        f"Dominasi asing (2 sisi): <b>{fp:.2f}%</b> | domestik: <b>{float(m.get('Domestic_Pct',0)):.2f}%</b>.",
-        f"Net asing: <b>{format_number_label(net) if mode_key=='value' else _fmt_id(net)}</b> ({label}).",
-        "Kalau asing net buy saat harga tidak liar (naik bertahap), biasanya itu ciri akumulasi yang rapi.",
-        "Kalau asing net sell saat harga naik (ritel FOMO), seringnya itu distribusi."
-    ]
-    conclusion = f"{label} → fokus validasi dengan struktur harga (HH/HL) + volume."
-    return bullets, conclusion, tone
-
-def make_broker_summary_insight(summ: pd.DataFrame, net_mode: bool = True) -> tuple[list[str], str, str]:
-    if summ is None or summ.empty:
-        return [], "Data broker summary kosong.", "neutral"
-    # Top net buy/sell
-    top_acc = summ.sort_values("Net_Val", ascending=False).head(3)
-    top_dist = summ.sort_values("Net_Val", ascending=True).head(3)
-    acc_txt = ", ".join([f"<b>{r['Code']}</b> (Net Rp {format_number_label(r['Net_Val'])})" for _, r in top_acc.iterrows()])
-    dist_txt = ", ".join([f"<b>{r['Code']}</b> (Net Rp {format_number_label(r['Net_Val'])})" for _, r in top_dist.iterrows()])
-
-    # Konsentrasi top 5
-    top5 = summ.reindex(summ["Net_Val"].abs().sort_values(ascending=False).index).head(5)
-    conc = (top5["Net_Val"].abs().sum() / summ["Net_Val"].abs().sum() * 100) if summ["Net_Val"].abs().sum() else 0
-
-    bullets = [
-        f"Top akumulasi (net buy): {acc_txt}.",
-        f"Top distribusi (net sell): {dist_txt}.",
-        f"Konsentrasi 5 broker paling dominan: <b>{conc:.1f}%</b> (semakin tinggi = pergerakan lebih 'dikunci' tangan besar).",
-        "Baca cepat: net buy besar + muncul berulang beberapa hari = kandidat bandar akumulasi.",
-    ]
-    net_total = float(summ["Net_Val"].sum())
-    tone = "good" if net_total > 0 else ("bad" if net_total < 0 else "neutral")
-    conclusion = "Akumulasi lebih kuat" if net_total > 0 else ("Distribusi lebih kuat" if net_total < 0 else "Kekuatan seimbang")
-    return bullets, conclusion, tone
-
-def make_consistency_insight(cons: pd.DataFrame) -> tuple[list[str], str, str]:
-    if cons is None or cons.empty:
-        return [], "Belum cukup data multi-day.", "neutral"
-    # Score: Net_Val + Consistency_Score
-    work = cons.copy()
-    # Top akumulasi konsisten
-    topA = work[work["Net_Lot"] > 0].head(5)
-    topD = work[work["Net_Lot"] < 0].sort_values("Net_Lot").head(5)
-
-    def _fmt_row(r):
-        return f"<b>{r['Code']}</b> (days {int(r['Days_Active'])}, net lot {_fmt_id(r['Net_Lot'])}, score {int(r['Consistency_Score'])})"
-
-    bullets = [
-        "<b>Cara baca tabel:</b> cari kombinasi <b>Days_Active tinggi</b> + <b>Net_Lot besar</b> + <b>Consistency_Score tinggi</b> → broker kerja multi-hari (akumulasi).",
-        "Days_Active = seberapa sering broker aktif di periode; Consistency_Score mendekati 100 = lebih sering net buy, mendekati 0 = lebih sering net sell.",
-        "Top akumulasi konsisten: " + (", ".join([_fmt_row(r) for _, r in topA.iterrows()]) if not topA.empty else "—"),
-        "Top distribusi konsisten: " + (", ".join([_fmt_row(r) for _, r in topD.iterrows()]) if not topD.empty else "—"),
-    ]
-    tone = "good" if not topA.empty and (topA["Net_Lot"].sum() > abs(topD["Net_Lot"].sum()) if not topD.empty else True) else "neutral"
-    conclusion = "Ada indikasi akumulasi multi-hari" if tone == "good" else "Belum ada dominasi akumulasi multi-hari yang jelas"
-    return bullets, conclusion, tone
-
-# Mapping label Big Print (English -> Indonesia)
-BIG_PRINT_LABEL_ID = {
-    "Absorption (Buy, price flat)": "Serap (Beli, harga ditahan)",
-    "Impulse Up (Buy)": "Dorong Naik (Beli)",
-    "Failed Buy / Supply": "Beli Gagal / Ada Supply",
-    "Big Buy": "Big Buy (Beli besar)",
-    "Absorption (Sell absorbed)": "Serap (Jual diserap)",
-    "Distribution (Sell)": "Distribusi (Jual besar)",
-    "Squeeze / Trap Sell": "Squeeze / Trap Sell",
-    "Big Sell": "Big Sell (Jual besar)",
-    "Big Print": "Big Print",
-}
-
-def make_bigprint_insight(bp: pd.DataFrame) -> tuple[list[str], str, str]:
-    if bp is None or bp.empty:
-        return ["Turunkan percentile atau kurangi minimal lot agar Big Print muncul."], "Tidak ada big print terdeteksi.", "neutral"
-    total_lot = float(bp["Lot"].sum()) if "Lot" in bp.columns else 0
-    thr = int(bp["Threshold_Lot"].iloc[0]) if "Threshold_Lot" in bp.columns and len(bp) else 0
-    counts = bp["Label"].value_counts() if "Label" in bp.columns else pd.Series(dtype=int)
-
-    # dominasi serap vs distribusi
-    serap = counts[counts.index.astype(str).str.lower().str.contains("serap")].sum() if not counts.empty else 0
-    dist = counts[counts.index.astype(str).str.lower().str.contains("distribusi")].sum() if not counts.empty else 0
-    tone = "good" if serap > dist else ("bad" if dist > serap else "neutral")
-    concl = "Serap/akumulasi lebih dominan" if serap > dist else ("Distribusi lebih dominan" if dist > serap else "Sinyal campur / netral")
-
-    bullets = [
-        f"Threshold Big Print (filter): sekitar <b>{_fmt_id(thr)}</b> lot (atau minimal lot).",
-        f"Total lot Big Print terdeteksi: <b>{_fmt_id(total_lot)}</b> lot.",
-        "Dominasi label: " + (", ".join([f"<b>{k}</b> ({int(v)})" for k, v in counts.head(5).items()]) if not counts.empty else "—"),
-        "Baca cepat: <b>Serap</b> = transaksi besar tapi harga tidak jatuh (ada yang nampung). <b>Distribusi</b> = transaksi besar diikuti pelemahan (barang dilepas)."
-    ]
-    return bullets, concl, tone
-
-def make_tradebook_insight(df: pd.DataFrame) -> tuple[list[str], str, str]:
-    if df is None or df.empty:
-        return [], "Trade book kosong.", "neutral"
-    buy_lot = float(df.loc[df["Action"]=="Buy", "Lot"].sum()) if "Action" in df.columns else 0
-    sell_lot = float(df.loc[df["Action"]=="Sell", "Lot"].sum()) if "Action" in df.columns else 0
-    total = buy_lot + sell_lot
-    buy_pct = (buy_lot/total*100) if total else 0
-    tone = "good" if buy_lot > sell_lot else ("bad" if sell_lot > buy_lot else "neutral")
-    concl = "Tekanan beli lebih dominan" if buy_lot > sell_lot else ("Tekanan jual lebih dominan" if sell_lot > buy_lot else "Seimbang")
-    bullets = [
-        f"Total lot agresif: Buy <b>{_fmt_id(buy_lot)}</b> vs Sell <b>{_fmt_id(sell_lot)}</b> (Buy {buy_pct:.1f}%).",
-        "Kalau Buy dominan tapi harga tidak naik → bisa jadi ada supply besar (ditahan). Kalau Buy dominan dan harga naik bertahap → akumulasi rapi.",
-        "Kalau Sell dominan saat harga naik → rawan distribusi (ritel FOMO).",
-    ]
-    return bullets, concl, tone
-
-def make_sankey_distribution_insight(df: pd.DataFrame, metric_col: str = "Value") -> tuple[list[str], str, str]:
-    if df is None or df.empty:
-        return [], "Data broker distribution kosong.", "neutral"
-    # Net per broker (gunakan summari kasar dari buyer/seller)
-    buy = df.groupby("Buyer_Code")[metric_col].sum()
-    sell = df.groupby("Seller_Code")[metric_col].sum()
-    net = buy.subtract(sell, fill_value=0).sort_values(ascending=False)
-
-    top_acc = net.head(5)
-    top_dist = net.tail(5).sort_values()
-
-    bullets = [
-        "Top akumulasi (net buy): " + ", ".join([f"<b>{k}</b> ({format_number_label(v) if metric_col=='Value' else _fmt_id(v)})" for k,v in top_acc.items()]),
-        "Top distribusi (net sell): " + ", ".join([f"<b>{k}</b> ({format_number_label(v) if metric_col=='Value' else _fmt_id(v)})" for k,v in top_dist.items()]),
-    ]
-    # konsentrasi
-    abs_total = float(net.abs().sum())
-    conc = float(top_acc.abs().sum() / abs_total * 100) if abs_total else 0
-    bullets.append(f"Konsentrasi 5 netteratas: <b>{conc:.1f}%</b> (tinggi = lebih 'dikunci' bandar).")
-
-    tone = "good" if top_acc.sum() > abs(top_dist.sum()) else ("bad" if abs(top_dist.sum()) > top_acc.sum() else "neutral")
-    concl = "Net buy lebih dominan" if tone=="good" else ("Net sell lebih dominan" if tone=="bad" else "Netral / campur")
-    return bullets, concl, tone
-
 
-
-# =========================================================
-# 0. PANEL TOP: SINYAL HARI INI + SKOR BANDAR + RED FLAGS
-# =========================================================
-def compute_bandar_score(fd_stats: dict, summ: pd.DataFrame, cons: pd.DataFrame | None, bp: pd.DataFrame | None, df: pd.DataFrame):
-    """
-    Skor 0-100 (heuristik) untuk memudahkan ritel memahami 'bias bandar' intraday.
-    Ini BUKAN rekomendasi investasi.
-    Return:
-      score (int), bias_label (str), components(list[tuple[name, pts, note]]), red_flags(list[str]), reasons(list[str])
-    """
-    # --- 1) Foreign component (0-30) ---
-    netf = float(fd_stats.get("value", {}).get("Net_Foreign", 0)) if fd_stats else 0.0
-    f_buy = float(fd_stats.get("value", {}).get("F_Buy", 0)) if fd_stats else 0.0
-    f_sell = float(fd_stats.get("value", {}).get("F_Sell", 0)) if fd_stats else 0.0
-    f_turn = max(f_buy + f_sell, 1.0)
-    f_ratio = max(-1.0, min(1.0, netf / f_turn))
-    score_foreign = int(round(15 * (f_ratio + 1)))  # 0..30
-
-    # --- 2) Broker net component (0-25) ---
-    score_broker = 12
-    broker_ratio = 0.0
-    net_total = 0.0
-    if summ is not None and not summ.empty:
-        net_total = float(summ.get("Net_Val", pd.Series([0])).sum())
-        turn = float(summ.get("Buy_Val", pd.Series([0])).sum() + summ.get("Sell_Val", pd.Series([0])).sum())
-        turn = max(turn, 1.0)
-        broker_ratio = max(-1.0, min(1.0, net_total / turn))
-        score_broker = int(round(12.5 * (broker_ratio + 1)))  # 0..25
-
-    # --- 3) Multi-day consistency component (0-25) ---
-    score_cons = 12
-    cons_bias = 0.0
-    if cons is not None and not cons.empty and "Net_Lot" in cons.columns:
-        top = cons.copy()
-        # fokus 10 broker paling aktif (abs net lot besar)
-        top = top.reindex(top["Net_Lot"].abs().sort_values(ascending=False).head(10).index)
-        denom = float(top["Net_Lot"].abs().sum()) or 1.0
-        cons_bias = float(top["Net_Lot"].sum()) / denom  # -1..1
-        cons_bias = max(-1.0, min(1.0, cons_bias))
-        # reliability factor dari Days_Active (biar nggak overreact 1 hari)
-        if "Days_Active" in top.columns and top["Days_Active"].notna().any():
-            rel = float(top["Days_Active"].mean())
-            rel_factor = max(0.4, min(1.0, rel / 3.0))
-        else:
-            rel_factor = 0.7
-        score_cons = int(round(12.5 * (cons_bias + 1) * rel_factor))  # 0..25 (aproks)
-
-    # --- 4) Big Print component (0-15) ---
-    score_bp = 7
-    bp_bias = 0.0
-    if bp is not None and not bp.empty and "Label" in bp.columns:
-        counts = bp["Label"].astype(str).str.lower().value_counts()
-        serap = int(counts[counts.index.str.contains("serap")].sum()) if not counts.empty else 0
-        dist = int(counts[counts.index.str.contains("distribusi")].sum()) if not counts.empty else 0
-        denom = max(serap + dist, 1)
-        bp_bias = (serap - dist) / denom  # -1..1
-        bp_bias = max(-1.0, min(1.0, bp_bias))
-        score_bp = int(round(7.5 * (bp_bias + 1)))  # 0..15
-
-    # --- 5) Trade book pressure component (0-5) ---
-    score_tb = 2
-    tb_bias = 0.0
-    if df is not None and not df.empty and "Action" in df.columns and "Lot" in df.columns:
-        xx = df[df["Action"].isin(["Buy", "Sell"])].copy()
-        if not xx.empty:
-            buy_l = float(xx.loc[xx["Action"] == "Buy", "Lot"].sum())
-            sell_l = float(xx.loc[xx["Action"] == "Sell", "Lot"].sum())
-            denom = max(buy_l + sell_l, 1.0)
-            tb_bias = (buy_l - sell_l) / denom
-            tb_bias = max(-1.0, min(1.0, tb_bias))
-            score_tb = int(round(2.5 * (tb_bias + 1)))  # 0..5
-
-    # Total score
-    score = int(np.clip(score_foreign + score_broker + score_cons + score_bp + score_tb, 0, 100))
-
-    # Bias label
-    if score >= 65:
-        bias = "AKUMULASI (bullish bandar)"
-    elif score <= 35:
-        bias = "DISTRIBUSI (waspada bandar)"
-    else:
-        bias = "NETRAL / CAMPUR"
-
-    # Transparansi komponen
-    components = [
-        ("Asing (Net)", score_foreign, f"Net/turnover asing ≈ {f_ratio:+.2f}"),
-        ("Broker Summary (Net)", score_broker, f"Net/turnover broker ≈ {broker_ratio:+.2f}"),
-        ("Konsistensi Multi-day", score_cons, f"Bias net lot ≈ {cons_bias:+.2f}"),
-        ("Big Print (Serap vs Distribusi)", score_bp, f"Bias label ≈ {bp_bias:+.2f}"),
-        ("Trade Book (Buy vs Sell)", score_tb, f"Tekanan lot ≈ {tb_bias:+.2f}"),
-    ]
-
-    # Red Flags (aturan sederhana)
-    red_flags = []
-    # VWAP & last price untuk konteks
-    vwap = 0.0
-    last_price = None
-    if df is not None and not df.empty and "Value" in df.columns and "Lot" in df.columns:
-        tv = float(df["Value"].sum())
-        tl = float(df["Lot"].sum())
-        vwap = (tv / (tl * 100)) if tl else 0.0
-    if df is not None and not df.empty and "DateTime" in df.columns and df["DateTime"].notna().any():
-        last_row = df.sort_values("DateTime").dropna(subset=["DateTime"]).iloc[-1]
-        last_price = float(last_row.get("Price", np.nan)) if "Price" in last_row else None
-
-    # 1) Asing jual tapi harga di atas VWAP (rawan distribusi)
-    if netf < 0 and vwap > 0 and last_price is not None and last_price > vwap:
-        red_flags.append("Asing **net sell** tapi harga di atas **VWAP** → rawan distribusi di atas (harga 'diangkat' saat barang dilepas).")
-
-    # 2) Big print distribusi dominan tapi trade book buy dominan (rawan trap)
-    if bp_bias < -0.25 and tb_bias > 0.20:
-        red_flags.append("Big Print dominan **distribusi** tapi tekanan **buy** tinggi → potensi **trap / FOMO** (ritel nyerap barang bandar).")
-
-    # 3) Broker net distribusi saat skor total masih tinggi (sinyal campur)
-    if net_total < 0 and score >= 65:
-        red_flags.append("Skor tinggi tapi broker total net **distribusi** → sinyal campur, butuh konfirmasi struktur harga.")
-
-    # 4) Konsistensi lemah: net besar tapi skor konsistensi rendah
-    if cons is not None and not cons.empty and "Consistency_Score" in cons.columns and "Net_Val" in cons.columns:
-        leader = cons.iloc[0]
-        if float(leader.get("Net_Val", 0)) > 0 and float(leader.get("Consistency_Score", 50)) < 55:
-            red_flags.append("Broker leader net buy tapi **tidak konsisten** (Consistency < 55) → bisa one-off / bukan kerja multi-hari.")
-
-    # Reasons (highlight)
-    reasons = []
-    if netf > 0:
-        reasons.append("Asing cenderung **akumulasi** (net buy).")
-    elif netf < 0:
-        reasons.append("Asing cenderung **distribusi** (net sell).")
-
-    if net_total > 0:
-        reasons.append("Agregat broker menunjukkan **akumulasi** (net buy).")
-    elif net_total < 0:
-        reasons.append("Agregat broker menunjukkan **distribusi** (net sell).")
-
-    if bp_bias > 0.25:
-        reasons.append("Big Print lebih banyak **serap/akumulasi**.")
-    elif bp_bias < -0.25:
-        reasons.append("Big Print lebih banyak **distribusi**.")
-
-    if cons_bias > 0.20:
-        reasons.append("Broker yang konsisten condong **net buy multi-day**.")
-    elif cons_bias < -0.20:
-        reasons.append("Broker konsisten condong **net sell multi-day**.")
-
-    return score, bias, components, red_flags, reasons
-
-
-def render_signal_panel(fd_stats: dict, summ: pd.DataFrame, cons: pd.DataFrame | None, bp: pd.DataFrame | None, df: pd.DataFrame):
-    score, bias, components, red_flags, reasons = compute_bandar_score(fd_stats, summ, cons, bp, df)
+@traced("render: sinyal + skor bandar")
+def render_signal_panel(fd_stats: dict, summ: pd.DataFrame, cons: pd.DataFrame | None, bp: pd.DataFrame | None, df: pd.DataFrame,
+                        stats=None, score=None):
+    if score is None:
+        score = compute_bandar_score(fd_stats, summ, cons, bp, df, stats=stats)
+    score, bias, components, red_flags, reasons = score
 
     st.markdown("### 🧠 Sinyal Hari Ini (Ringkas)")
     c1, c2, c3 = st.columns([1.2, 1, 1])
@@ -785,44 +334,9 @@ def render_signal_panel(fd_stats: dict, summ: pd.DataFrame, cons: pd.DataFrame |
         st.success("Tidak ada red flag utama yang terdeteksi dari aturan sederhana (tetap waspada kondisi pasar).")
 
 
-def overall_conclusion(fd_stats: dict, summ: pd.DataFrame, cons: pd.DataFrame | None, bp: pd.DataFrame | None, df: pd.DataFrame) -> tuple[list[str], str, str]:
-    bullets = []
-    tone = "neutral"
-    # Foreign net
-    netf = float(fd_stats.get("value", {}).get("Net_Foreign", 0)) if fd_stats else 0
-    bullets.append(f"Asing: <b>{'Net Buy' if netf>0 else ('Net Sell' if netf<0 else 'Netral')}</b> (Rp {format_number_label(netf)}).")
-
-    # Broker net
-    net_total = float(summ["Net_Val"].sum()) if summ is not None and not summ.empty else 0
-    bullets.append(f"Broker summary (total net): <b>{'Akumulasi' if net_total>0 else ('Distribusi' if net_total<0 else 'Seimbang')}</b>.")
-
-    # Consistency
-    if cons is not None and not cons.empty:
-        topA = cons[cons["Net_Lot"]>0].head(3)
-        bullets.append("Multi-day top akumulasi: " + (", ".join([f"<b>{r['Code']}</b>" for _, r in topA.iterrows()]) if not topA.empty else "—"))
-
-    # Big print
-    if bp is not None and not bp.empty and "Label" in bp.columns:
-        counts = bp["Label"].value_counts()
-        serap = counts[counts.index.astype(str).str.lower().str.contains("serap")].sum()
-        dist = counts[counts.index.astype(str).str.lower().str.contains("distribusi")].sum()
-        bullets.append(f"Big Print: Serap {int(serap)} vs Distribusi {int(dist)}.")
-    else:
-        bullets.append("Big Print: belum cukup sinyal (atau filter terlalu ketat).")
-
-    # Trade book
-    if df is not None and not df.empty and "Action" in df.columns:
-        buy_lot = float(df.loc[df["Action"]=="Buy", "Lot"].sum())
-        sell_lot = float(df.loc[df["Action"]=="Sell", "Lot"].sum())
-        bullets.append(f"Trade Book: Buy lot {_fmt_id(buy_lot)} vs Sell lot {_fmt_id(sell_lot)}.")
-
-    # Tone + conclusion
-    score = (1 if netf>0 else (-1 if netf<0 else 0)) + (1 if net_total>0 else (-1 if net_total<0 else 0))
-    tone = "good" if score >= 2 else ("bad" if score <= -2 else "neutral")
-    concl = "Bias naik (akumulasi) lebih kuat" if tone=="good" else ("Waspada distribusi / koreksi" if tone=="bad" else "Tunggu konfirmasi (campur/sideways)")
-    return bullets, concl, tone
-
-
+# =========================================================
+# 5. TOOLS LAIN (YAHOO TICKER)
+# =========================================================
 def get_yahoo_session():
     session = requests.Session()
     session.headers.update(
@@ -880,514 +394,10 @@ def get_stock_ticker():
     except Exception:
         return "<div class='ticker-wrap'>Connection Limited</div>"
 
-# =========================================================
-# 5B. DATABASE DATE RESOLVER (Tanggal -> Path File)
-# =========================================================
-MONTH_ID = {
-    1: 'Januari', 2: 'Februari', 3: 'Maret', 4: 'April', 5: 'Mei', 6: 'Juni',
-    7: 'Juli', 8: 'Agustus', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'Desember',
-}
-
-def _norm_token(s: str) -> str:
-    return re.sub(r'[^a-z0-9]+', '', str(s).lower())
-
-def _resolve_year_folder(p_stock: str, year: int) -> str | None:
-    if not os.path.exists(p_stock):
-        return None
-    target = str(year)
-    p = os.path.join(p_stock, target)
-    if os.path.isdir(p):
-        return target
-    # fallback: cari folder yg cocok (case-insensitive / ada tambahan)
-    for d in os.listdir(p_stock):
-        if os.path.isdir(os.path.join(p_stock, d)) and _norm_token(d) == _norm_token(target):
-            return d
-    return None
-
-def _resolve_month_folder(p_year: str, month: int) -> str | None:
-    if not os.path.exists(p_year):
-        return None
-    id_name = MONTH_ID.get(month, str(month))
-    # kandidat umum
-    candidates = [
-        id_name, id_name.lower(), id_name.upper(),
-        id_name[:3], id_name[:3].lower(),
-        str(month), f'{month:02d}',
-        f'{month}-{id_name}', f'{month:02d}-{id_name}',
-        f'{id_name}-{month}', f'{id_name}-{month:02d}',
-    ]
-    dirs = [d for d in os.listdir(p_year) if os.path.isdir(os.path.join(p_year, d))]
-    norm_map = { _norm_token(d): d for d in dirs }
-    for c in candidates:
-        nc = _norm_token(c)
-        if nc in norm_map:
-            return norm_map[nc]
-    # fallback: coba match mengandung nama bulan / angka bulan
-    for d in dirs:
-        nd = _norm_token(d)
-        if _norm_token(id_name) in nd or _norm_token(f'{month:02d}') in nd:
-            return d
-    return None
-
-
-def _resolve_daily_files(p_month: str, dt_date) -> list[str]:
-    """Cari *semua* file harian yang match (bukan hanya 1 file).
-
-    Perbaikan penting:
-    - Hindari fallback 'dd in filename' yang terlalu longgar (bisa kebaca SEMUA file dalam 1 bulan, terutama kalau dd==mm seperti 12/12).
-    - Match hanya jika:
-        (1) nama file (tanpa ekstensi) diawali day (09.csv / 9_part1.csv / 09-xxx.csv), atau
-        (2) nama file mengandung tanggal lengkap (YYYY-MM-DD / DD-MM-YYYY / YYYYMMDD / DDMMYYYY) dengan separator apa pun.
-
-    Ini mencegah nilai transaksi membengkak (mis. jadi triliunan) karena salah load banyak hari sekaligus.
-    """
-    if not os.path.exists(p_month):
-        return []
-
-    day = int(dt_date.day)
-    month = int(dt_date.month)
-    year = int(dt_date.year)
-
-    files = [f for f in os.listdir(p_month) if f.lower().endswith(('.csv', '.xlsx'))]
-    if not files:
-        return []
-
-    dd, mm, yyyy = f"{day:02d}", f"{month:02d}", str(year)
-
-    def stem_lower(fn: str) -> str:
-        return os.path.splitext(fn)[0].strip().lower()
-
-    # (1) kandidat utama: diawali hari
-    start_day = re.compile(rf"^0?{day}([^0-9]|$)")
-    cand = [f for f in files if start_day.search(stem_lower(f))]
-
-    # (2) kandidat tanggal lengkap (lebih aman)
-    if not cand:
-        s_ddmm = f"{dd}{mm}"
-        s_mmdd = f"{mm}{dd}"
-        s_yyyymmdd = f"{yyyy}{mm}{dd}"
-        s_ddmmyyyy = f"{dd}{mm}{yyyy}"
-
-        # allow separators: -, _, ., space
-        sep = r"[-_\.\s]"
-        full_patterns = [
-            re.compile(rf"{yyyy}{sep}{mm}{sep}{dd}"),
-            re.compile(rf"{dd}{sep}{mm}{sep}{yyyy}"),
-            re.compile(rf"{yyyy}{sep}{dd}{sep}{mm}"),  # jarang, tapi biarin
-            re.compile(rf"{dd}{sep}{yyyy}{sep}{mm}"),  # jarang, tapi biarin
-            re.compile(rf"{s_yyyymmdd}"),
-            re.compile(rf"{s_ddmmyyyy}"),
-        ]
-
-        for f in files:
-            s = f.lower()
-            if any(p.search(s) for p in full_patterns):
-                cand.append(f)
-
-    # de-dup (tetap jaga urutan)
-    seen = set()
-    cand = [x for x in cand if not (x.lower() in seen or seen.add(x.lower()))]
-
-    # urutan: prefer .csv dulu, lalu alfabet (stabil)
-    cand_sorted = sorted(cand, key=lambda x: (0 if x.lower().endswith('.csv') else 1, x.lower()))
-    return [os.path.join(p_month, fn) for fn in cand_sorted]
-
-def _resolve_daily_file(p_month: str, dt_date) -> str | None:
-    """Backward-compat: ambil file pertama yang match."""
-    files = _resolve_daily_files(p_month, dt_date)
-    return files[0] if files else None
-
-def resolve_database_file(db_root: str, stock: str, dt_date) -> str | None:
-    """Resolve path file database berdasarkan (stock, tanggal)."""
-    p_stock = os.path.join(db_root, stock)
-    year_folder = _resolve_year_folder(p_stock, int(dt_date.year))
-    if not year_folder:
-        return None
-    p_year = os.path.join(p_stock, year_folder)
-    month_folder = _resolve_month_folder(p_year, int(dt_date.month))
-    if not month_folder:
-        return None
-    p_month = os.path.join(p_year, month_folder)
-    return _resolve_daily_file(p_month, dt_date)
-
-
-def resolve_database_files(db_root: str, stock: str, dt_date) -> list[str]:
-    """Resolve *semua* file database berdasarkan (stock, tanggal)."""
-    p_stock = os.path.join(db_root, stock)
-    year_folder = _resolve_year_folder(p_stock, int(dt_date.year))
-    if not year_folder:
-        return []
-    p_year = os.path.join(p_stock, year_folder)
-    month_folder = _resolve_month_folder(p_year, int(dt_date.month))
-    if not month_folder:
-        return []
-    p_month = os.path.join(p_year, month_folder)
-    return _resolve_daily_files(p_month, dt_date)
-
-def load_database_files(filepaths: list[str]) -> pd.DataFrame:
-    """Load dan gabung banyak file (.csv/.xlsx) jadi 1 DataFrame."""
-    frames = []
-    for fp in filepaths:
-        try:
-            if fp.lower().endswith(".csv"):
-                dfp = pd.read_csv(fp)
-            else:
-                dfp = pd.read_excel(fp)
-            dfp["__source_file"] = os.path.basename(fp)
-            frames.append(dfp)
-        except Exception:
-            continue
-    if not frames:
-        return pd.DataFrame()
-    return pd.concat(frames, ignore_index=True)
-
-# =========================================================
-# 6. DATA PROCESSING (DIPERBAIKI UNTUK MENGHINDARI ERROR FORMAT)
-# =========================================================
-
-def clean_running_trade(df_input: pd.DataFrame, trade_date: datetime.date | None = None, volume_mode: str = "AUTO"):
-    """
-    Bersihin & standarisasi data running trade agar:
-    - tidak ada baris hilang gara-gara parsing time/lot/price
-    - bisa di-sort & di-filter berdasarkan waktu dengan rapi
-    - Value dihitung konsisten: Shares * Price (Shares diturunkan dari Lot atau sebaliknya)
-
-    trade_date dipakai untuk membentuk kolom DateTime intraday (default: hari ini).
-    """
-    if df_input is None or df_input.empty:
-        return pd.DataFrame()
-
-    df = df_input.copy()
-
-    # --- 1) Normalisasi nama kolom ---
-    df.columns = [str(c).strip() for c in df.columns]
-    col_lut = {str(c).strip().lower(): str(c).strip() for c in df.columns}
-
-    # mapping fleksibel (lowercase)
-    rename_map = {
-        "time": "Time", "waktu": "Time", "jam": "Time", "timestamp": "Time", "datetime": "Time",
-        "price": "Price", "harga": "Price", "last": "Price",
-        "lot": "Lot", "vol": "Lot", "volume": "Lot", "qty": "Lot", "quantity": "Lot", "shares": "Lot",
-        "buyer": "Buyer", "b": "Buyer", "buyer broker": "Buyer", "broker beli": "Buyer", "bcode": "Buyer",
-        "seller": "Seller", "s": "Seller", "seller broker": "Seller", "broker jual": "Seller", "scode": "Seller",
-        "action": "Action", "type": "Action", "side": "Action", "bs": "Action",
-        "buyer_code": "Buyer_Code", "seller_code": "Seller_Code",
-    }
-
-    for low, old in col_lut.items():
-        if low in rename_map:
-            df.rename(columns={old: rename_map[low]}, inplace=True)
-
-    # --- 2) Pastikan kolom minimal ada ---
-    required = {"Price", "Lot", "Buyer", "Seller"}
-    if not required.issubset(set(df.columns)):
-        raise ValueError(
-            "Kolom wajib tidak lengkap. Minimal harus ada: Price, Lot, Buyer, Seller. "
-            f"Kolom ditemukan: {list(df.columns)}"
-        )
-
-    # --- 3) Helper parsing ---
-    def _clean_code(x) -> str:
-        s = str(x).upper().strip()
-        # ambil kode broker 2 huruf pertama yang valid
-        m = re.search(r"\b([A-Z]{2})\b", s)
-        if m:
-            return m.group(1)
-        # fallback: ambil token pertama
-        return s.split()[0] if s else ""
-
-    def _to_int_series(s: pd.Series) -> pd.Series:
-        # generic int cleaner (dipakai untuk kolom yang memang murni angka)
-        out = pd.to_numeric(s.astype(str).str.replace(r"[^\d-]", "", regex=True), errors="coerce")
-        return out.fillna(0).astype(int)
-
-    def _parse_first_number_series(s: pd.Series) -> pd.Series:
-        """Ambil angka pertama dari string.
-        Penting untuk Price seperti '1,190 (+2.15%)' atau '1.190 (+2,15%)'.
-        """
-        def _one(x):
-            if pd.isna(x):
-                return float("nan")
-            t = str(x)
-            m = re.search(r"([0-9][0-9,\.]+)", t)
-            if not m:
-                return float("nan")
-            num = m.group(1)
-
-            # Normalisasi pemisah ribuan/desimal
-            if "," in num and "." in num:
-                # Aman untuk price: buang keduanya (umumnya pemisah ribuan)
-                num_clean = num.replace(".", "").replace(",", "")
-            elif "," in num:
-                # Umumnya pemisah ribuan
-                num_clean = num.replace(",", "")
-            elif "." in num:
-                parts = num.split(".")
-                # Kalau 3 digit di belakang, biasanya pemisah ribuan (1.190)
-                if len(parts[-1]) == 3:
-                    num_clean = "".join(parts)
-                else:
-                    num_clean = num  # decimal
-            else:
-                num_clean = num
-
-            try:
-                return float(num_clean)
-            except Exception:
-                return float("nan")
-
-        out = s.apply(_one)
-        return pd.to_numeric(out, errors="coerce")
-
-
-    def _parse_lot_series(s: pd.Series) -> pd.Series:
-        """Lot bisa integer, bisa juga desimal kecil (mis. 0.06)."""
-        def _one(x):
-            if pd.isna(x):
-                return float('nan')
-            t = str(x).strip().replace(",", "")
-            try:
-                return float(t)
-            except Exception:
-                m = re.search(r"([0-9][0-9,\.]+)", t)
-                if not m:
-                    return float('nan')
-                num = m.group(1).replace(",", "")
-                if num.endswith("."):
-                    num = num[:-1]
-                try:
-                    return float(num)
-                except Exception:
-                    return float('nan')
-        out = s.apply(_one)
-        return pd.to_numeric(out, errors="coerce")
-
-    def _parse_time_to_dt(val, base_date: datetime.date) -> pd.Timestamp:
-        if pd.isna(val):
-            return pd.NaT
-        if isinstance(val, datetime.datetime):
-            return pd.Timestamp(val)
-        if isinstance(val, datetime.time):
-            return pd.Timestamp(datetime.datetime.combine(base_date, val))
-
-        s = str(val).strip()
-        if not s:
-            return pd.NaT
-
-        # Variasi yang sering muncul:
-        # - "8:58.00"  -> "8:58:00"
-        # - "08:58"    -> "08:58:00"
-        # - "08:58:00.123" -> "08:58:00"
-        s = s.replace(",", ":")
-        if re.match(r"^\d{1,2}:\d{2}\.\d{1,2}$", s):
-            s = s.replace(".", ":", 1)
-        s = re.sub(r"\.\d+$", "", s)  # buang fractional seconds
-        if re.match(r"^\d{1,2}:\d{2}$", s):
-            s = s + ":00"
-
-        t = pd.to_datetime(s, errors="coerce")
-        if pd.isna(t):
-            return pd.NaT
-        return pd.Timestamp(datetime.datetime.combine(base_date, t.time()))
-
-    # --- 4) Clean numerik ---
-    df["Price"] = _parse_first_number_series(df["Price"]).round(0).astype("int64")
-    df["Lot"] = _parse_lot_series(df["Lot"])
-    # --- 7b) Satuan Volume (Lot vs Shares) ---
-    # Banyak data sekuritas menampilkan volume dalam "Shares (lembar)", sementara file lain sudah dalam "Lot".
-    # Kalau salah asumsi, nilai transaksi bisa melonjak (mis. jadi triliunan) atau mengecil.
-    mode = (volume_mode or "AUTO").strip().upper()
-    if mode.startswith("LOT"):
-        mode = "LOT"
-    elif mode.startswith("SHARE"):
-        mode = "SHARES"
-    elif mode.startswith("AUTO"):
-        mode = "AUTO"
-    if mode == "AUTO":
-        s = df["Lot"].dropna()
-        if len(s) == 0:
-            mode = "LOT"
-        else:
-            # Heuristik: kalau mayoritas kelipatan 100 dan median cukup besar, kemungkinan ini Shares.
-            div100 = ((s.astype("int64") % 100) == 0).mean()
-            med = float(s.median())
-            mode = "SHARES" if (div100 > 0.90 and med >= 100) else "LOT"
-
-    if mode == "SHARES":
-        df["Shares"] = df["Lot"].round(0).astype("int64")
-        df["Lot"] = (df["Shares"] // 100).astype("int64")
-    else:
-        df["Lot"] = df["Lot"].astype("int64")
-        df["Lot"] = df["Lot"].round(0).astype("int64")
-        df["Shares"] = (df["Lot"] * 100).astype("int64")
-
-
-    # --- 5) Clean broker ---
-    df["Buyer_Code"] = df["Buyer"].apply(_clean_code)
-    df["Seller_Code"] = df["Seller"].apply(_clean_code)
-
-    # --- 6) Action (opsional) ---
-    if "Action" in df.columns:
-        def _norm_action(x):
-            s = str(x).strip().lower()
-            if "buy" in s or s.startswith("b"):
-                return "Buy"
-            if "sell" in s or s.startswith("s"):
-                return "Sell"
-            return "Unknown"
-        df["Action"] = df["Action"].apply(_norm_action)
-    else:
-        df["Action"] = "Unknown"
-
-    # --- 7) Time parsing ---
-    base_date = trade_date or datetime.date.today()
-    df["Time_Str"] = df["Time"].astype(str).str.strip()
-    df["DateTime"] = df["Time"].apply(lambda x: _parse_time_to_dt(x, base_date))
-    df["Time_Obj"] = pd.to_datetime(df["DateTime"], errors="coerce").dt.time
-
-    # --- 8) Value ---
-    df["Value"] = df["Shares"] * df["Price"]
-
-    # --- 9) Filter baris tidak valid (jangan terlalu agresif) ---
-    df = df[(df["Price"] > 0) & (df["Lot"] > 0)]
-    # kalau time gagal diparse, tetap tampilkan, tapi DateTime = NaT (di-sort belakangan)
-    return df
-
-
-def get_detailed_broker_summary(df):
-    """
-    Menghitung Broker Summary lengkap dengan Net Val & Avg Price
-    """
-    buy = df.groupby("Buyer_Code").agg(
-        Buy_Val=("Value", "sum"),
-        Buy_Lot=("Lot", "sum")
-    )
-    sell = df.groupby("Seller_Code").agg(
-        Sell_Val=("Value", "sum"),
-        Sell_Lot=("Lot", "sum")
-    )
-
-    summ = pd.merge(buy, sell, left_index=True, right_index=True, how="outer").fillna(0)
-    summ["Net_Val"] = summ["Buy_Val"] - summ["Sell_Val"]
-    summ["Net_Lot"] = summ["Buy_Lot"] - summ["Sell_Lot"]
-    summ["Total_Val"] = summ["Buy_Val"] + summ["Sell_Val"]
-    
-    # Hitung Avg Price (Hindari pembagian dengan nol)
-    summ["Buy_Avg"] = 0
-    mask_b = summ["Buy_Lot"] > 0
-    summ.loc[mask_b, "Buy_Avg"] = summ.loc[mask_b, "Buy_Val"] / (summ.loc[mask_b, "Buy_Lot"] * 100)
-    
-    summ["Sell_Avg"] = 0
-    mask_s = summ["Sell_Lot"] > 0
-    summ.loc[mask_s, "Sell_Avg"] = summ.loc[mask_s, "Sell_Val"] / (summ.loc[mask_s, "Sell_Lot"] * 100)
-    
-    # Convert ke Int
-    summ["Buy_Avg"] = summ["Buy_Avg"].astype(int)
-    summ["Sell_Avg"] = summ["Sell_Avg"].astype(int)
-
-    summ.index.name = "Code"
-    summ = summ.reset_index()
-    summ["Name"] = summ["Code"].apply(lambda x: get_broker_info(x)[1])
-    summ["Group"] = summ["Code"].apply(lambda x: get_broker_info(x)[2])
-
-    return summ.sort_values("Net_Val", ascending=False)
-
-
-def calculate_broker_action_meter(summ):
-    """
-    Menghitung skala akumulasi (0-100)
-    """
-    top_buyers = summ.nlargest(5, "Net_Val")["Net_Val"].sum()
-    top_sellers = summ.nsmallest(5, "Net_Val")["Net_Val"].sum() # Value is negative
-    
-    abs_sell = abs(top_sellers)
-    total_power = top_buyers + abs_sell
-    
-    if total_power == 0:
-        return 50 # Neutral
-        
-    # Rasio kekuatan buyer
-    ratio = top_buyers / total_power
-    return int(ratio * 100)
-
-
-
-def prepare_trade_book_data(df: pd.DataFrame):
-    """
-    Menyiapkan data untuk Trade Book Chart & Price Table.
-    - Price table: agregasi Buy/Sell per price
-    - Chart: cumulative Buy/Sell per menit (intraday)
-
-    Catatan:
-    Action "Unknown" tidak dimasukkan ke chart kumulatif (biar chart tidak misleading).
-    """
-    # 1) Price table
-    price_grp = df.groupby(["Price", "Action"]).agg(
-        Lot=("Lot", "sum"),
-        Freq=("Lot", "count")
-    ).reset_index()
-
-    pivot = price_grp.pivot(index="Price", columns="Action", values=["Lot", "Freq"]).fillna(0)
-    pivot.columns = [f"{c[1]}_{c[0]}" for c in pivot.columns]  # e.g. Buy_Lot, Sell_Lot
-    pivot = pivot.reset_index()
-
-    for c in ["Buy_Lot", "Sell_Lot", "Buy_Freq", "Sell_Freq"]:
-        if c not in pivot.columns:
-            pivot[c] = 0
-
-    pivot["Total_Lot"] = pivot["Buy_Lot"] + pivot["Sell_Lot"]
-    pivot = pivot.sort_values("Price", ascending=False)
-
-    # 2) Chart data
-    chart_data = pd.DataFrame()
-    if "DateTime" in df.columns:
-        ts = df.dropna(subset=["DateTime"]).copy()
-        ts = ts[ts["Action"].isin(["Buy", "Sell"])]
-        if not ts.empty:
-            ts = ts.set_index("DateTime").sort_index()
-            res = ts.groupby([pd.Grouper(freq="1min"), "Action"])["Lot"].sum().unstack(fill_value=0)
-            res["Buy_Cum"] = res.get("Buy", 0).cumsum()
-            res["Sell_Cum"] = res.get("Sell", 0).cumsum()
-            chart_data = res.reset_index()
-
-    return pivot, chart_data
-
-
-def build_sankey(df, top_n=15, metric="Value"):
-    flow = df.groupby(["Buyer_Code", "Seller_Code"])[metric].sum().reset_index()
-    flow = flow.sort_values(metric, ascending=False).head(top_n)
-
-    flow["Source"] = flow["Buyer_Code"] + " (Buyer)"
-    flow["Target"] = flow["Seller_Code"] + " (Seller)"
-    
-    all_nodes = list(set(flow["Source"]).union(set(flow["Target"])))
-    node_map = {k: v for v, k in enumerate(all_nodes)}
-
-    labels = all_nodes
-    colors = []
-    for node in all_nodes:
-        code = node.split()[0]
-        group = get_broker_group(code)
-        colors.append(COLOR_MAP.get(group, "#888"))
-
-    src = [node_map[x] for x in flow["Source"]]
-    tgt = [node_map[x] for x in flow["Target"]]
-    vals = flow[metric].tolist()
-
-    link_colors = []
-    for s_idx in src:
-        c_hex = colors[s_idx].lstrip("#")
-        try:
-            rgb = tuple(int(c_hex[i: i + 2], 16) for i in (0, 2, 4))
-            link_colors.append(f"rgba({rgb[0]},{rgb[1]},{rgb[2]},0.4)")
-        except:
-            link_colors.append("rgba(100,100,100,0.4)")
-
-    return labels, colors, src, tgt, vals, link_colors
-
 # =========================================================
 # 7. UI COMPONENTS (VISUAL)
 # =========================================================
+@traced("render: broker action meter")
 def render_broker_action_meter(summ):
     val = calculate_broker_action_meter(summ)
     
@@ -1409,6 +419,7 @@ def render_broker_action_meter(summ):
     </div>
     """, unsafe_allow_html=True)
 
+@traced("render: broker summary (Styler)")
 def render_broker_summary_split(summ, net_mode=False):
     st.subheader("Broker Summary")
 
@@ -1457,12 +468,13 @@ def render_broker_summary_split(summ, net_mode=False):
     render_bandarmology_insight("Kesimpulan Broker Summary", bullets, concl, tone)
 
 
-def render_trade_book(df):
+@traced("render: trade book")
+def render_trade_book(df, stats=None):
     st.subheader("Trade Book")
 
     with st.expander("📖 Cara baca cepat (Trade Book)", expanded=False):
         st.markdown('\n- Lihat price table: area harga dengan **Buy_Lot tinggi** bisa jadi support (serapan).  \n- Kalau **Sell_Lot** besar muncul di area atas, itu sering jadi resistance / distribusi.  \n- Chart kumulatif: buy naik stabil tanpa drop tajam → tape sehat; spike buy lalu cepat dibalas sell → rawan trap.\n        ')
-    price_df, chart_df = prepare_trade_book_data(df)
+    price_df, chart_df = analysis_node("trade_book", df)
     
     tab1, tab2 = st.tabs(["Chart", "Price Table"])
     
@@ -1490,74 +502,19 @@ def render_trade_book(df):
             use_container_width=True, hide_index=True, height=400
         )
 
-    bullets, concl, tone = make_tradebook_insight(df)
+    bullets, concl, tone = analysis_node("trade_book_insight", df)
     render_bandarmology_insight("Kesimpulan Trade Book", bullets, concl, tone)
 
 
-
-
-def compute_foreign_domestic_activity(df: pd.DataFrame):
-    """
-    Hitung aktivitas Foreign vs Domestic.
-    Definisi:
-      - F Buy  : trade dimana Buyer broker group = Asing
-      - F Sell : trade dimana Seller broker group = Asing
-      - D Buy/Sell: selain Asing (BUMN + Lokal)
-    """
-    dfx = df.copy()
-    dfx["Buyer_Group"] = dfx["Buyer_Code"].apply(get_broker_group)
-    dfx["Seller_Group"] = dfx["Seller_Code"].apply(get_broker_group)
-
-    def _sum_where(mask, col):
-        return float(dfx.loc[mask, col].sum()) if col in dfx.columns else 0.0
-
-    def _cnt_where(mask):
-        return int(mask.sum())
-
-    is_f_buy = dfx["Buyer_Group"] == "Asing"
-    is_f_sell = dfx["Seller_Group"] == "Asing"
-    is_d_buy = ~is_f_buy
-    is_d_sell = ~is_f_sell
-
-    out = {
-        "value": {
-            "F_Buy": _sum_where(is_f_buy, "Value"),
-            "F_Sell": _sum_where(is_f_sell, "Value"),
-            "D_Buy": _sum_where(is_d_buy, "Value"),
-            "D_Sell": _sum_where(is_d_sell, "Value"),
-        },
-        "volume": {
-            "F_Buy": _sum_where(is_f_buy, "Lot"),
-            "F_Sell": _sum_where(is_f_sell, "Lot"),
-            "D_Buy": _sum_where(is_d_buy, "Lot"),
-            "D_Sell": _sum_where(is_d_sell, "Lot"),
-        },
-        "freq": {
-            "F_Buy": _cnt_where(is_f_buy),
-            "F_Sell": _cnt_where(is_f_sell),
-            "D_Buy": _cnt_where(is_d_buy),
-            "D_Sell": _cnt_where(is_d_sell),
-        }
-    }
-
-    # persentase Foreign vs Domestic (berdasarkan total dua sisi)
-    for k in ["value", "volume", "freq"]:
-        total_f = out[k]["F_Buy"] + out[k]["F_Sell"]
-        total_d = out[k]["D_Buy"] + out[k]["D_Sell"]
-        grand = total_f + total_d
-        out[k]["Foreign_Pct"] = (total_f / grand * 100) if grand else 0.0
-        out[k]["Domestic_Pct"] = (total_d / grand * 100) if grand else 0.0
-        out[k]["Net_Foreign"] = out[k]["F_Buy"] - out[k]["F_Sell"]
-    return out
-
-
-def render_foreign_domestic_activity(df: pd.DataFrame):
+@traced("render: asing vs domestik")
+def render_foreign_domestic_activity(df: pd.DataFrame, stats: dict | None = None):
     st.subheader("Foreign–Domestic Activity")
 
     with st.expander("📖 Cara baca cepat (Foreign–Domestic)", expanded=False):
         st.markdown('\n- **Net Foreign** positif → asing akumulasi; negatif → asing distribusi.  \n- Lihat juga porsi **Foreign %**: makin besar artinya asing makin dominan menggerakkan tape.  \n- Konfirmasi: kalau asing net buy tapi harga nggak naik, berarti ada supply besar yang nahan (perlu waspada).\n        ')
 
-    stats = compute_foreign_domestic_activity(df)
+    if stats is None:
+        stats = analysis_node("fd", df)
 
     tab_val, tab_vol, tab_freq = st.tabs(["Value (IDR)", "Volume (Lot)", "Frequency (x)"])
 
@@ -1642,25 +599,19 @@ def render_foreign_domestic_activity(df: pd.DataFrame):
     return stats
 
 
-def render_insight_box(df: pd.DataFrame, summ: pd.DataFrame, fd_stats: dict):
+def render_insight_box(df: pd.DataFrame, summ: pd.DataFrame, fd_stats: dict, stats=None):
     """
     Kesimpulan / insight / saran ringan (bukan rekomendasi investasi).
     """
     if df.empty or summ.empty:
         return
+    if stats is None:
+        stats = compute_trade_stats(df)
 
     # VWAP (aproksimasi) & last price (berdasarkan waktu terbaru)
-    total_val = float(df["Value"].sum())
-    total_lot = float(df["Lot"].sum())
-    vwap = (total_val / (total_lot * 100)) if total_lot else 0
-
-    last_price = None
-    if "DateTime" in df.columns and df["DateTime"].notna().any():
-        last_row = df.sort_values("DateTime").dropna(subset=["DateTime"]).iloc[-1]
-        last_price = int(last_row["Price"])
-        last_time = str(last_row.get("Time_Str", ""))
-    else:
-        last_time = ""
+    vwap = stats.vwap
+    last_price = int(stats.last_price) if stats.last_price is not None else None
+    last_time = stats.last_time
 
     top_acc = summ.sort_values("Net_Val", ascending=False).head(1).iloc[0]
     top_dist = summ.sort_values("Net_Val", ascending=True).head(1).iloc[0]
@@ -1711,6 +662,8 @@ def render_insight_box(df: pd.DataFrame, summ: pd.DataFrame, fd_stats: dict):
     )
 
 
+@ui_fragment
+@traced("render: running trade")
 def render_running_trade_raw(df: pd.DataFrame):
     st.subheader("Running Trade")
 
@@ -1723,12 +676,13 @@ def render_running_trade_raw(df: pd.DataFrame):
     with c2:
         sort_order = st.selectbox("Urutan", ["Terbaru dulu", "Terlama dulu"], index=0)
 
-    # Range waktu (pakai Time_Obj)
+    # Range waktu (pakai Time_Sec, -1 = jam tidak terbaca)
     min_t = None
     max_t = None
-    if "Time_Obj" in df.columns and df["Time_Obj"].notna().any():
-        min_t = df["Time_Obj"].dropna().min()
-        max_t = df["Time_Obj"].dropna().max()
+    if "Time_Sec" in df.columns and (df["Time_Sec"] >= 0).any():
+        valid_sec = df.loc[df["Time_Sec"] >= 0, "Time_Sec"]
+        min_t = time_sec_to_time(valid_sec.min())
+        max_t = time_sec_to_time(valid_sec.max())
 
     with c3:
         if min_t and max_t:
@@ -1746,28 +700,36 @@ def render_running_trade_raw(df: pd.DataFrame):
     with c4:
         max_rows = st.number_input("Max rows", min_value=50, max_value=5000, value=500, step=50)
 
-    df_show = df.copy()
+    df_show = df
 
     if act_filter != "All":
         df_show = df_show[df_show["Action"] == act_filter]
 
-    if t_from and t_to and "Time_Obj" in df_show.columns:
-        df_show = df_show[df_show["Time_Obj"].between(t_from, t_to)]
+    if t_from and t_to and "Time_Sec" in df_show.columns:
+        sec_from = t_from.hour * 3600 + t_from.minute * 60 + t_from.second
+        sec_to = t_to.hour * 3600 + t_to.minute * 60 + t_to.second
+        df_show = df_show[df_show["Time_Sec"].between(sec_from, sec_to)]
 
     asc = True if sort_order == "Terlama dulu" else False
-    # sort utama pakai DateTime, fallback Time_Str
+    # sort utama pakai DateTime, fallback Time_Sec
     if "DateTime" in df_show.columns and df_show["DateTime"].notna().any():
         df_show = df_show.sort_values("DateTime", ascending=asc, na_position="last")
     else:
-        df_show = df_show.sort_values("Time_Str", ascending=asc)
+        df_show = df_show.sort_values("Time_Sec", ascending=asc)
 
     st.caption(f"Menampilkan {min(len(df_show), int(max_rows)):,} dari {len(df_show):,} transaksi")
 
+    df_show = df_show.head(int(max_rows)).copy()
+    df_show["Time_Str"] = format_time_sec(df_show["Time_Sec"]).to_numpy()
+    for c in ["Action", "Buyer_Code", "Seller_Code"]:
+        if c in df_show.columns:
+            df_show[c] = df_show[c].astype(str)
+
     cols = ["Time_Str", "Price", "Action", "Lot", "Buyer_Code", "Seller_Code"]
     cols = [c for c in cols if c in df_show.columns]
 
     st.dataframe(
-        df_show[cols].head(int(max_rows)).style.format({
+        df_show[cols].style.format({
             "Price": "{:,.0f}",
             "Lot": "{:,.0f}",
         })
@@ -1833,7 +795,7 @@ def login_page():
         if submitted:
             if pin == "241130":
                 st.session_state["authenticated"] = True
-                st.session_state["df_raw"] = None
+                reset_session_data()
                 st.session_state["current_stock"] = "UNKNOWN"
                 show_sidebar()
                 st.rerun()
@@ -1855,386 +817,54 @@ TOP10_IHSG_TICKERS = [
     "BBCA","BBRI","BMRI","TLKM","ASII","UNVR","ICBP","TPIA","ADRO","MDKA"
 ]
 
-MONTH_NAME_TO_NUM = {
-    "januari": 1, "jan": 1, "january": 1,
-    "februari": 2, "feb": 2, "february": 2,
-    "maret": 3, "mar": 3, "march": 3,
-    "april": 4, "apr": 4,
-    "mei": 5, "may": 5,
-    "juni": 6, "jun": 6, "june": 6,
-    "juli": 7, "jul": 7, "july": 7,
-    "agustus": 8, "agu": 8, "aug": 8, "august": 8,
-    "september": 9, "sep": 9,
-    "oktober": 10, "okt": 10, "oct": 10, "october": 10,
-    "november": 11, "nov": 11,
-    "desember": 12, "des": 12, "dec": 12, "december": 12,
-}
-
-def _extract_trade_date_from_filepath(fp: str) -> datetime.date | None:
-    """Ambil tanggal dari path database/{SAHAM}/{YYYY}/{BULAN}/{DD}.csv atau DD_*.csv"""
-    try:
-        p = Path(fp)
-        parts = [x for x in p.parts]
-        # cari tahun 4 digit
-        year = None
-        for x in parts:
-            if re.fullmatch(r"\d{4}", x):
-                year = int(x); break
-        if year is None:
-            return None
-        # cari nama bulan (folder setelah tahun biasanya bulan)
-        month = None
-        if str(year) in parts:
-            idx = parts.index(str(year))
-            if idx+1 < len(parts):
-                mname = parts[idx+1].strip().lower()
-                month = MONTH_NAME_TO_NUM.get(mname)
-        if month is None:
-            # fallback: cari token bulan di path
-            for x in parts:
-                m = MONTH_NAME_TO_NUM.get(str(x).strip().lower())
-                if m:
-                    month = m; break
-        if month is None:
-            return None
-        # ambil day dari nama file (leading number)
-        stem = p.stem
-        mday = re.match(r"^\s*(\d{1,2})", stem)
-        if not mday:
-            return None
-        day = int(mday.group(1))
-        return datetime.date(year, month, day)
-    except Exception:
-        return None
-
-def resolve_database_files_range(db_root: str, stock: str, start_date: datetime.date, end_date: datetime.date) -> list[str]:
-    """Kumpulkan semua file yang tersedia untuk rentang tanggal (inklusif)."""
-    fps: list[str] = []
-    d = start_date
-    while d <= end_date:
-        fps.extend(resolve_database_files(db_root, stock, d))
-        d += datetime.timedelta(days=1)
-    # de-dup
-    seen = set()
-    out = []
-    for fp in fps:
-        k = str(fp)
-        if k not in seen:
-            out.append(fp); seen.add(k)
-    return out
-
-def load_database_files(filepaths: list[str]) -> pd.DataFrame:
-    """Override: load multi file + inject TradeDate dari path untuk multi-day analysis."""
-    frames = []
-    for fp in filepaths:
-        try:
-            if fp.lower().endswith(".csv"):
-                dfp = pd.read_csv(fp)
-            else:
-                dfp = pd.read_excel(fp)
-            dfp["__source_file"] = os.path.basename(fp)
-            td = _extract_trade_date_from_filepath(fp)
-            if td is not None:
-                dfp["TradeDate"] = td
-            frames.append(dfp)
-        except Exception:
-            continue
-    if not frames:
-        return pd.DataFrame()
-    return pd.concat(frames, ignore_index=True)
-
-def clean_running_trade(df_input: pd.DataFrame, trade_date: datetime.date | None = None, volume_mode: str = "LOT"):
-    """Override:
-    - Price ambil angka pertama (fix '1,190 (+2.15%)')
-    - Lot selalu dianggap LOT (1 lot = 100 saham)
-    - Kalau ada kolom TradeDate per baris, DateTime dibentuk per baris (multi-day)
-    """
-    if df_input is None or df_input.empty:
-        return pd.DataFrame()
-
-    df = df_input.copy()
-    df.columns = [str(c).strip() for c in df.columns]
-    col_lut = {str(c).strip().lower(): str(c).strip() for c in df.columns}
-
-    rename_map = {
-        "time": "Time", "waktu": "Time", "jam": "Time", "timestamp": "Time", "datetime": "Time",
-        "price": "Price", "harga": "Price", "last": "Price",
-        "lot": "Lot", "vol": "Lot", "volume": "Lot", "qty": "Lot", "quantity": "Lot",
-        "buyer": "Buyer", "b": "Buyer", "buyer broker": "Buyer", "broker beli": "Buyer",
-        "seller": "Seller", "s": "Seller", "seller broker": "Seller", "broker jual": "Seller",
-        "action": "Action", "type": "Action", "side": "Action", "bs": "Action",
-        "market": "Market",
-        "tradedate": "TradeDate", "date": "TradeDate", "__tradedate": "TradeDate",
-    }
-    for low, old in col_lut.items():
-        if low in rename_map:
-            df.rename(columns={old: rename_map[low]}, inplace=True)
-
-    required = {"Price", "Lot", "Buyer", "Seller"}
-    if not required.issubset(set(df.columns)):
-        raise ValueError("Kolom wajib tidak lengkap. Minimal harus ada: Price, Lot, Buyer, Seller.")
-
-    def _clean_code(x) -> str:
-        s = str(x).upper().strip()
-        m = re.search(r"\b([A-Z]{2})\b", s)
-        return m.group(1) if m else (s.split()[0] if s else "")
-
-    def _extract_origin(x) -> str | None:
-        # sumber file kamu punya tag [F] / [D]
-        m = re.search(r"\[\s*([FD])\s*\]", str(x).upper())
-        return m.group(1) if m else None
-
-    def _parse_first_number(x) -> float:
-        if pd.isna(x):
-            return float("nan")
-        t = str(x)
-        m = re.search(r"([0-9][0-9,\.]+)", t)
-        if not m:
-            return float("nan")
-        num = m.group(1)
-        if "," in num and "." in num:
-            num = num.replace(".", "").replace(",", "")
-        elif "," in num:
-            num = num.replace(",", "")
-        else:
-            parts = num.split(".")
-            if len(parts) > 1 and len(parts[-1]) == 3:
-                num = "".join(parts)
-        try:
-            return float(num)
-        except Exception:
-            return float("nan")
-
-
-    def _parse_time_to_dt(val, base_date: datetime.date) -> pd.Timestamp:
-        """Parse kolom Time yang sering variatif: '08:58', '8:58.00', '08:58:00', '08:58:00.123', dst.
-        Mengembalikan Timestamp dengan tanggal = base_date.
-        """
-        if pd.isna(val):
-            return pd.NaT
-
-        # Sudah timestamp/datetime
-        if isinstance(val, (pd.Timestamp, datetime.datetime)):
-            ts = pd.Timestamp(val)
-            # kalau tanggal dummy, ganti ke base_date
-            if ts.date() in (datetime.date(1900, 1, 1), datetime.date(1970, 1, 1)):
-                return pd.Timestamp(datetime.datetime.combine(base_date, ts.time()))
-            return ts
-
-        if isinstance(val, datetime.time):
-            return pd.Timestamp(datetime.datetime.combine(base_date, val))
-
-        s = str(val).strip()
-        if not s:
-            return pd.NaT
-
-        # Ambil token waktu pertama saja (menghindari '1,190 (+2.15%)' dsb bila salah kolom)
-        m = re.search(r"(\d{1,2}:\d{2}(?:[:\.]\d{2})?)", s)
-        if m:
-            s = m.group(1)
-
-        # 8:58.00 -> 8:58:00
-        if re.match(r"^\d{1,2}:\d{2}\.\d{2}$", s):
-            s = s.replace(".", ":")
-
-        # 8:58 -> 8:58:00
-        if re.match(r"^\d{1,2}:\d{2}$", s):
-            s = s + ":00"
-
-        t = pd.to_datetime(s, errors="coerce")
-        if pd.isna(t):
-            return pd.NaT
-
-        return pd.Timestamp(datetime.datetime.combine(base_date, t.time()))
-
-
-    def _parse_time_to_dt_local(t, base_date: datetime.date):
-        # pakai parser lama (yang sudah toleran)
-        return _parse_time_to_dt(t, base_date)
-
-    # Price
-    df["Price"] = df["Price"].apply(_parse_first_number)
-    df["Price"] = pd.to_numeric(df["Price"], errors="coerce").fillna(0).astype(int)
-
-    # Lot
-    df["Lot"] = pd.to_numeric(df["Lot"].astype(str).str.replace(r"[^0-9\.]", "", regex=True), errors="coerce").fillna(0)
-    df["Lot"] = df["Lot"].round(0).astype("int64")
-    df["Shares"] = (df["Lot"] * 100).astype("int64")
-
-    # Broker code + origin
-    df["Buyer_Code"] = df["Buyer"].apply(_clean_code)
-    df["Seller_Code"] = df["Seller"].apply(_clean_code)
-    df["Buyer_Origin"] = df["Buyer"].apply(_extract_origin)
-    df["Seller_Origin"] = df["Seller"].apply(_extract_origin)
-
-    # Action
-    if "Action" in df.columns:
-        def _norm_action(x):
-            s = str(x).strip().lower()
-            if "buy" in s or s.startswith("b"):
-                return "Buy"
-            if "sell" in s or s.startswith("s"):
-                return "Sell"
-            return "Unknown"
-        df["Action"] = df["Action"].apply(_norm_action)
-    else:
-        df["Action"] = "Unknown"
-
-    # TradeDate
-    if "TradeDate" in df.columns:
-        df["TradeDate"] = pd.to_datetime(df["TradeDate"], errors="coerce").dt.date
-    else:
-        base_date = trade_date or datetime.date.today()
-        df["TradeDate"] = base_date
-
-    # DateTime per row
-    df["Time_Str"] = df["Time"].astype(str).str.strip()
-    df["DateTime"] = df.apply(lambda r: _parse_time_to_dt_local(r["Time"], r["TradeDate"]), axis=1)
-    df["Time_Obj"] = pd.to_datetime(df["DateTime"], errors="coerce").dt.time
 
-    # Value
-    df["Value"] = df["Shares"] * df["Price"]
-
-    # basic validity
-    df = df[(df["Price"] > 0) & (df["Lot"] > 0)].copy()
-    return df
-
-def compute_foreign_domestic_activity(df: pd.DataFrame):
-    """Override: pakai tag [F]/[D] dari file jika ada (lebih mirip sekuritas).
-    F Buy  : Buyer_Origin == 'F' (fallback: broker group Asing)
-    F Sell : Seller_Origin == 'F' (fallback: broker group Asing)
-    """
-    dfx = df.copy()
-
-    def _is_foreign_buy(row):
-        if row.get("Buyer_Origin") in ("F", "D"):
-            return row.get("Buyer_Origin") == "F"
-        return get_broker_group(row.get("Buyer_Code")) == "Asing"
-
-    def _is_foreign_sell(row):
-        if row.get("Seller_Origin") in ("F", "D"):
-            return row.get("Seller_Origin") == "F"
-        return get_broker_group(row.get("Seller_Code")) == "Asing"
-
-    is_f_buy = dfx.apply(_is_foreign_buy, axis=1)
-    is_f_sell = dfx.apply(_is_foreign_sell, axis=1)
-    is_d_buy = ~is_f_buy
-    is_d_sell = ~is_f_sell
-
-    def _sum_where(mask, col):
-        return float(dfx.loc[mask, col].sum()) if col in dfx.columns else 0.0
-
-    def _cnt_where(mask):
-        return int(mask.sum())
-
-    out = {
-        "value": {"F_Buy": _sum_where(is_f_buy, "Value"), "F_Sell": _sum_where(is_f_sell, "Value"),
-                  "D_Buy": _sum_where(is_d_buy, "Value"), "D_Sell": _sum_where(is_d_sell, "Value")},
-        "volume": {"F_Buy": _sum_where(is_f_buy, "Lot"), "F_Sell": _sum_where(is_f_sell, "Lot"),
-                   "D_Buy": _sum_where(is_d_buy, "Lot"), "D_Sell": _sum_where(is_d_sell, "Lot")},
-        "freq": {"F_Buy": _cnt_where(is_f_buy), "F_Sell": _cnt_where(is_f_sell),
-                 "D_Buy": _cnt_where(is_d_buy), "D_Sell": _cnt_where(is_d_sell)},
-    }
-    for k in ["value", "volume", "freq"]:
-        total_f = out[k]["F_Buy"] + out[k]["F_Sell"]
-        total_d = out[k]["D_Buy"] + out[k]["D_Sell"]
-        grand = total_f + total_d
-        out[k]["Foreign_Pct"] = (total_f / grand * 100) if grand else 0.0
-        out[k]["Domestic_Pct"] = (total_d / grand * 100) if grand else 0.0
-        out[k]["Net_Foreign"] = out[k]["F_Buy"] - out[k]["F_Sell"]
-    return out
+def rollup_for_session(df: pd.DataFrame) -> pd.DataFrame:
+    """Rollup dataset aktif: rollup rentang penuh dari Load Data kalau ada, kalau tidak dibangun dari df."""
+    roll = st.session_state.get("rollup")
+    return roll if roll is not None else build_daily_rollup(df)
 
 
 # ---------------------------
-# Yahoo Finance (robust fetch)
+# Data sesi aktif (fingerprint data)
 # ---------------------------
-_YAHOO_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/124.0.0.0 Safari/537.36"
-    ),
-    "Accept": "application/json,text/plain,*/*",
-    "Accept-Language": "en-US,en;q=0.9,id;q=0.8",
-    "Connection": "keep-alive",
-}
+# Setiap rerun Streamlit (toggle, slider, filter) menjalankan ulang seluruh halaman. Hasil cleaning +
+# agregasi disimpan di cache ANALYSIS_GRAPH (lihat run_analysis), dikunci fingerprint data yang sedang
+# di-load, supaya interaksi widget hanya membayar rendering yang memang berubah.
 
-_YAHOO_SESSION = requests.Session()
-_YAHOO_SESSION.headers.update(_YAHOO_HEADERS)
 
-def _yahoo_get(url: str, timeout: int = 15, retries: int = 3) -> requests.Response:
-    """HTTP GET ke Yahoo dengan retry ringan (untuk 429/5xx)."""
-    last_exc = None
-    for i in range(retries):
-        try:
-            r = _YAHOO_SESSION.get(url, timeout=timeout)
-            # rate limit / transient
-            if r.status_code in (429, 500, 502, 503, 504):
-                time.sleep(0.6 * (i + 1))
-                continue
-            r.raise_for_status()
-            return r
-        except Exception as e:
-            last_exc = e
-            time.sleep(0.6 * (i + 1))
-    # lempar exception terakhir biar kelihatan di debug kalau perlu
-    raise last_exc if last_exc else RuntimeError("Yahoo request failed")
-
-@st.cache_data(ttl=60)
-def yahoo_quotes(symbols: list[str]) -> dict:
-    """Batch quote: 1 request untuk banyak simbol."""
-    if not symbols:
-        return {}
-    syms = ",".join(symbols)
-    url = f"https://query1.finance.yahoo.com/v7/finance/quote?symbols={syms}"
-    try:
-        r = _yahoo_get(url, timeout=12, retries=3)
-        j = r.json()
-        res = (j.get("quoteResponse", {}) or {}).get("result", []) or []
-        return {item.get("symbol"): item for item in res if item.get("symbol")}
-    except Exception:
-        return {}
-
-@st.cache_data(ttl=60)
-def yahoo_quote(symbol: str) -> dict | None:
-    q = yahoo_quotes([symbol])
-    return q.get(symbol)
-
-@st.cache_data(ttl=3600)
-def yahoo_ohlc(symbol: str, rng: str = "3mo", interval: str = "1d") -> pd.DataFrame:
-    """Ambil OHLC dari Yahoo chart API."""
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range={rng}&interval={interval}"
-    try:
-        r = _yahoo_get(url, timeout=15, retries=3)
-        j = r.json()
-    except Exception:
-        return pd.DataFrame()
+def data_fingerprint(*parts) -> str:
+    """Fingerprint murah untuk data yang di-load (signature file database / hash konten upload)."""
+    h = hashlib.sha1()
+    for p in parts:
+        if isinstance(p, (bytes, bytearray)):
+            h.update(p)
+        else:
+            h.update(json.dumps(p, default=str).encode("utf-8"))
+    return h.hexdigest()
 
-    result = (j.get("chart", {}) or {}).get("result", []) or []
-    if not result:
-        return pd.DataFrame()
 
-    res = result[0]
-    ts = res.get("timestamp", []) or []
-    ind = (res.get("indicators", {}) or {}).get("quote", []) or []
-    if not ts or not ind:
-        return pd.DataFrame()
+def reset_session_data(df_raw: pd.DataFrame | None = None, df_clean: pd.DataFrame | None = None,
+                       fp: str | None = None, rollup: pd.DataFrame | None = None,
+                       intraday_from: datetime.date | None = None):
+    """Ganti data aktif di session (df_raw / df_clean + rollup harian + fingerprint) dan buang cache graph lama.
 
-    q = ind[0]
-    df = pd.DataFrame({
-        "Date": pd.to_datetime(ts, unit="s"),
-        "Open": q.get("open", []),
-        "High": q.get("high", []),
-        "Low": q.get("low", []),
-        "Close": q.get("close", []),
-        "Volume": q.get("volume", []),
-    }).dropna(subset=["Open", "High", "Low", "Close"])
-    return df
+    intraday_from: kalau rentang dipotong untuk section intraday, tanggal awal data trade mentah.
+    """
+    st.session_state["df_raw"] = df_raw
+    st.session_state["df_clean"] = df_clean
+    st.session_state["rollup"] = rollup
+    st.session_state["intraday_from"] = intraday_from
+    st.session_state["data_fp"] = fp
+    st.session_state.pop(_GRAPH_KEY, None)
 
 
+@ui_fragment_every(MARKET_TTL["quotes"])
+@traced("yahoo: marquee top 10")
 def render_top10_marquee():
-    symbols = [f"{t}.JK" for t in TOP10_IHSG_TICKERS]
-    quotes = yahoo_quotes(symbols)
+    # data dari refresher background (bandarmology.market): render tidak pernah menunggu Yahoo
+    symbols = tuple(f"{t}.JK" for t in TOP10_IHSG_TICKERS)
+    snap = market_data("quotes", symbols)
+    quotes = snap["value"] or {}
 
     items = []
     for t in TOP10_IHSG_TICKERS:
@@ -2250,6 +880,8 @@ def render_top10_marquee():
         items.append((t, price, sign, chg_pct))
 
     if not items:
+        if snap["error"] or snap["breaker"]["open"]:
+            st.caption("⚠️ " + market_status_text(snap))
         return
 
     spans = []
@@ -2272,87 +904,168 @@ def render_top10_marquee():
     </div>
     """
     components.html(html, height=52)
+    if snap["stale"]:
+        st.caption("⚠️ " + market_status_text(snap))
+
+CANDLE_SOURCES = ["Yahoo Finance", "Lokal (running trade)"]
+CANDLE_RANGES = list(OHLC_RANGE_OFFSETS)
+CANDLE_INTERVALS = ["1d", "15m", "5m", "1m"]
+
 
-def render_candlestick(stock_code: str):
-    st.subheader("📈 Candlestick (Yahoo Finance)")
-    sym = f"{stock_code}.JK"
-    rng = st.selectbox("Timeframe", ["1mo","3mo","6mo","1y","2y","5y"], index=1, key="y_rng")
+def local_ohlcv(stock_code: str, df: pd.DataFrame, end_date: datetime.date, rng: str, interval: str) -> pd.DataFrame:
+    """Bar OHLCV dari running trade: saham database lewat store .cache/ohlcv (rng mundur dari end_date,
+    intraday maks INTRADAY_MAX_DAYS hari); data upload / di luar katalog dari trade di session."""
+    if stock_code not in ("UNKNOWN", "UPLOADED"):
+        try:
+            _, cat_index = get_database_catalog(DB_ROOT)
+            start_date = (pd.Timestamp(end_date) - OHLC_RANGE_OFFSETS[rng]).date()
+            if interval != "1d":
+                start_date = max(start_date, end_date - datetime.timedelta(days=INTRADAY_MAX_DAYS - 1))
+            fps = catalog_files_in_range(cat_index, stock_code, start_date, end_date)
+            if fps:
+                return load_ohlcv_bars(stock_code, fps, interval)
+        except Exception:
+            pass
+    bars = analysis_node("ohlcv", df)
+    return slice_ohlc(bars if interval == OHLCV_BASE_INTERVAL else resample_ohlcv(bars, interval), rng)
+
+
+def candlestick_figure(ohlc: pd.DataFrame, name: str, intraday: bool = False) -> go.Figure:
+    """Candlestick; kalau ada split Buy/Sell (OHLC lokal) ditambah panel volume Buy vs Sell di bawahnya."""
+    candle = go.Candlestick(x=ohlc["Date"], open=ohlc["Open"], high=ohlc["High"], low=ohlc["Low"],
+                            close=ohlc["Close"], name=name)
+    if "Buy_Volume" in ohlc.columns:
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.75, 0.25], vertical_spacing=0.03)
+        fig.add_trace(candle, row=1, col=1)
+        fig.add_trace(go.Bar(x=ohlc["Date"], y=ohlc["Buy_Volume"], name="Buy (lot)", marker_color="#22c55e"), row=2, col=1)
+        fig.add_trace(go.Bar(x=ohlc["Date"], y=ohlc["Sell_Volume"], name="Sell (lot)", marker_color="#ef4444"), row=2, col=1)
+        fig.update_layout(barmode="stack", showlegend=False)
+    else:
+        fig = go.Figure(data=[candle])
+    breaks = [dict(bounds=["sat", "mon"])]
+    if intraday:
+        breaks.append(dict(bounds=[16.5, 9], pattern="hour"))
+    fig.update_xaxes(rangebreaks=breaks)
+    fig.update_layout(
+        height=420 if "Buy_Volume" not in ohlc.columns else 520,
+        margin=dict(l=10,r=10,t=40,b=10),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#f9fafb"),
+        xaxis_rangeslider_visible=False,
+    )
+    return fig
+
+
+@ui_fragment
+@traced("render: candlestick")
+def render_candlestick(stock_code: str, df: pd.DataFrame, end_date: datetime.date):
+    """Candlestick Yahoo (saham database) dengan fallback OHLC lokal dari running trade kalau Yahoo belum /
+    tidak punya data; data upload selalu memakai OHLC lokal."""
+    st.subheader("📈 Candlestick")
+    has_yahoo = stock_code not in ("UNKNOWN", "UPLOADED")
+    c1, c2, c3 = st.columns([2, 1, 1])
+    src = c1.radio("Sumber", CANDLE_SOURCES, horizontal=True, key="candle_src") if has_yahoo else CANDLE_SOURCES[1]
+    rng = c2.selectbox("Timeframe", CANDLE_RANGES, index=1, key="y_rng")
+
+    fallback = None
+    if src == CANDLE_SOURCES[0]:
+        sym = f"{stock_code}.JK"
+        try:
+            snap = market_data("ohlc", sym, "1d")
+            ohlc = slice_ohlc(snap["value"], rng)
+            if not ohlc.empty:
+                st.plotly_chart(candlestick_figure(ohlc, sym), use_container_width=True)
+                st.caption(("⚠️ " if snap["stale"] else "") + market_status_text(snap))
+                return
+            if snap["value"] is None:
+                fallback = market_status_text(snap)
+                st.button("🔄 Cek lagi", key="y_refresh")
+            else:
+                fallback = "Yahoo tidak punya data untuk kode ini."
+        except Exception:
+            fallback = "Gagal mengambil data dari Yahoo Finance (cek koneksi / rate limit)."
+
+    interval = c3.selectbox("Interval", CANDLE_INTERVALS, index=0, key="candle_interval")
     try:
-        ohlc = yahoo_ohlc(sym, rng=rng, interval="1d")
-        if ohlc.empty:
-            st.info("Data candlestick belum tersedia di Yahoo untuk kode ini.")
-            return
-        fig = go.Figure(data=[go.Candlestick(
-            x=ohlc["Date"],
-            open=ohlc["Open"],
-            high=ohlc["High"],
-            low=ohlc["Low"],
-            close=ohlc["Close"],
-            name=sym
+        ohlc = local_ohlcv(stock_code, df, end_date, rng, interval)
+    except Exception:
+        ohlc = pd.DataFrame()
+    if ohlc.empty:
+        st.info("Belum ada trade dengan jam valid untuk membentuk candlestick lokal.")
+        return
+    if fallback:
+        st.caption(f"⚠️ {fallback} Menampilkan OHLC lokal dari running trade.")
+    st.plotly_chart(candlestick_figure(ohlc, stock_code, intraday=interval != "1d"), use_container_width=True)
+    note = f"OHLC lokal dari running trade: {len(ohlc):,} bar {interval}, volume dalam lot (hijau = Buy, merah = Sell)."
+    if interval != "1d" and has_yahoo:
+        note += f" Interval intraday maks {INTRADAY_MAX_DAYS} hari terakhir."
+    st.caption(note)
+
+
+@ui_fragment
+@traced("render: sankey")
+def render_sankey_section(df: pd.DataFrame):
+    st.subheader("🕸️ Broker Distribution (Sankey)")
+
+    with st.expander("📖 Cara baca cepat (Broker Distribution)", expanded=False):
+        st.markdown("""
+- Diagram ini menunjukkan **siapa mendistribusikan ke siapa** (node = broker, link = aliran lot/value).
+- Link tebal/besar = transaksi yang dominan.
+- Jika aliran netterkonsentrasi di sedikit broker → seringnya ada **tangan besar** yang kerja terstruktur.
+- Kalau aliran menyebar ke banyak broker ritel → rawan **distribution ke publik**.
+        """)
+
+    left, right = st.columns([2, 1])
+    with left:
+        metric_choice = st.radio("Metrik", ["Value (Dana)", "Lot (Volume)"], horizontal=True)
+    with right:
+        top_n = st.slider("Jumlah interaksi", 5, 50, 15)
+
+    metric_col = "Value" if "Value" in metric_choice else "Lot"
+    try:
+        flow = analysis_node("flow", df)
+        labels, node_colors, src, tgt, vals, link_colors = sankey_from_flow(flow, top_n=top_n, metric=metric_col)
+        fig = go.Figure(data=[go.Sankey(
+            node=dict(pad=20, thickness=18, line=dict(color="black", width=0.3),
+                      label=labels, color=node_colors),
+            link=dict(source=src, target=tgt, value=vals, color=link_colors)
         )])
         fig.update_layout(
-            height=420,
-            margin=dict(l=10,r=10,t=40,b=10),
+            height=600,
+            margin=dict(l=10, r=10, t=10, b=10),
+            font=dict(size=12, color="#e5e7eb"),
             paper_bgcolor="rgba(0,0,0,0)",
             plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="#f9fafb"),
-            xaxis_rangeslider_visible=False,
         )
         st.plotly_chart(fig, use_container_width=True)
+        with st.expander("Aliran antar kelompok broker (Asing / BUMN / Lokal)", expanded=False):
+            gm = flow_group_matrix(flow, metric_col)
+            st.caption("Baris = kelompok pembeli, kolom = kelompok penjual.")
+            st.dataframe(gm.style.format("{:,.0f}"), use_container_width=True)
+        bullets, concl, tone = make_sankey_distribution_insight(df, metric_col=metric_col, flow=flow)
+        render_bandarmology_insight("Kesimpulan Broker Distribution", bullets, concl, tone)
     except Exception:
-        st.warning("Gagal mengambil data dari Yahoo Finance (cek koneksi / rate limit).")
+        st.info("Sankey tidak bisa dibuat untuk data ini (mungkin data terlalu sedikit).")
+
+@ui_fragment
+def render_consistency_trend(df: pd.DataFrame, codes: list[str]):
+    """Tren Net Lot rolling (5/10/20 hari bursa) untuk beberapa broker akumulasi teratas."""
+    roll = analysis_node("cons_rolling", df)
+    if roll.empty or roll["Date"].nunique() < 2 or not codes:
+        return
+    with st.expander("📈 Tren akumulasi rolling (top akumulasi)", expanded=False):
+        w = st.radio("Window (hari bursa)", list(CONSISTENCY_WINDOWS), horizontal=True, key="cons_roll_w")
+        sub = roll[(roll["Window"] == w) & (roll["Code"].isin(codes))]
+        fig = px.line(sub, x="Date", y="Net_Lot", color="Code", markers=True,
+                      hover_data=["Score", "Days_Active"], title=f"Net Lot rolling {w} hari")
+        fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font=dict(color="#f9fafb"),
+                          height=380, legend=dict(orientation="h", y=1.1))
+        st.plotly_chart(fig, use_container_width=True)
 
-def big_print_detector(df: pd.DataFrame, q: float = 0.99, min_lot: int = 0, lookahead_trades: int = 15) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame()
-    dfx = df.dropna(subset=["DateTime"]).sort_values("DateTime").copy()
-    if dfx.empty:
-        return pd.DataFrame()
-    thr = max(int(dfx["Lot"].quantile(q)), int(min_lot))
-    bp = dfx[dfx["Lot"] >= thr].copy()
-    if bp.empty:
-        return bp
-    # future price change (next N trades)
-    prices = dfx["Price"].to_numpy()
-    idx_map = {i: pos for pos, i in enumerate(dfx.index)}
-    labels = []
-    for i, row in bp.iterrows():
-        pos = idx_map.get(i)
-        if pos is None:
-            labels.append("Big Print")
-            continue
-        end = min(pos + lookahead_trades, len(dfx)-1)
-        future = prices[end]
-        cur = row["Price"]
-        pct = (future - cur) / cur * 100 if cur else 0.0
-        # heuristic label
-        if row["Action"] == "Buy":
-            if abs(pct) <= 0.10:
-                lab = "Absorption (Buy, price flat)"
-            elif pct > 0.25:
-                lab = "Dorong Naik (Beli agresif)"
-            elif pct < -0.25:
-                lab = "Buy Gagal / Supply Kuat"
-            else:
-                lab = "Big Buy (Beli besar)"
-        elif row["Action"] == "Sell":
-            if abs(pct) <= 0.10:
-                lab = "Serap (Jual diserap)"
-            elif pct < -0.25:
-                lab = "Distribusi (Jual besar)"
-            elif pct > 0.25:
-                lab = "Squeeze / Trap Sell"
-            else:
-                lab = "Big Sell (Jual besar)"
-        else:
-            lab = "Big Print"
-        labels.append(lab)
-    bp["Label"] = labels
-    # Label -> Bahasa Indonesia
-    bp["Label"] = bp["Label"].map(BIG_PRINT_LABEL_ID).fillna(bp["Label"])
-    bp["Threshold_Lot"] = thr
-    return bp.sort_values("DateTime")
 
+@ui_fragment
+@traced("render: big print")
 def render_big_print_section(df: pd.DataFrame):
     st.subheader("🧱 Big Print + Absorption/Distribution")
     with st.expander("📌 Fungsi slider & filter (wajib paham dulu)", expanded=False):
@@ -2366,24 +1079,37 @@ def render_big_print_section(df: pd.DataFrame):
             - Filter tambahan. Kalau diisi, Big Print harus >= minimal lot.  
             - Berguna kalau sahamnya “rame kecil-kecil” tapi kamu cuma mau nangkep transaksi besar.
 
-            **Lookahead (jumlah trade)**  
+            **Lookahead (jumlah trade / detik)**  
             - Berapa transaksi setelah Big Print yang dipakai untuk menilai: setelah big print harga **ditahan/diangkat (serap/akumulasi)** atau malah **dijatuhin (distribusi)**.  
+            - Mode **Detik**: harga pembanding = transaksi terakhir dalam N detik setelah Big Print (tidak tergantung ramai/sepinya tape).  
             - Lookahead kecil ⇒ lebih sensitif (cepet berubah). Lookahead besar ⇒ lebih stabil tapi “lambat”.
             '''
         )
     if df.empty:
         st.info("Data kosong.")
         return
-    c1, c2, c3 = st.columns([1,1,1])
+    c1, c2, c3, c4 = st.columns([1,1,0.8,1])
     with c1:
-        q = st.slider("Ambang percentile (Lot)", 0.90, 0.995, 0.99, step=0.005)
+        st.slider("Ambang percentile (Lot)", 0.90, 0.995, 0.99, step=0.005, key="bp_q")
     with c2:
-        min_lot = st.number_input("Minimal Lot (opsional)", min_value=0, value=0, step=10)
+        st.number_input("Minimal Lot (opsional)", min_value=0, value=0, step=10, key="bp_min_lot")
     with c3:
-        lookahead = st.slider("Lookahead (jumlah trade)", 5, 50, 15, step=5)
-
-    bp = big_print_detector(df, q=q, min_lot=int(min_lot), lookahead_trades=int(lookahead))
-    if bp.empty:
+        la_mode = st.radio("Lookahead berdasarkan", ["Jumlah trade", "Detik"], horizontal=True, key="bp_la_mode")
+    with c4:
+        if la_mode == "Detik":
+            st.slider("Lookahead (detik)", 10, 600, 60, step=10, key="bp_la_sec")
+        else:
+            st.slider("Lookahead (jumlah trade)", 5, 50, 15, step=5, key="bp_la_trades")
+
+    # node "bp" yang sama dipakai Skor Bandar + Kesimpulan Keseluruhan. Slider di fragment ini hanya rerun
+    # fragment; kalau parameternya beda dengan yang dipakai panel-panel itu, rerun seluruh halaman supaya
+    # bp -> score -> conclusion ikut dihitung ulang (node lain tetap dari cache graph).
+    bp_params = big_print_params_from_state()
+    applied = st.session_state.get(_BP_APPLIED_KEY)
+    if applied is not None and applied != bp_params:
+        st.rerun(scope="app")
+    bp = analysis_node("bp", df, **bp_params)
+    if bp is None or bp.empty:
         st.info("Tidak ada Big Print di ambang ini.")
         return
 
@@ -2402,58 +1128,7 @@ def render_big_print_section(df: pd.DataFrame):
     bullets, concl, tone = make_bigprint_insight(bp)
     render_bandarmology_insight("Kesimpulan Big Print + Serap/Distribusi", bullets, concl, tone)
 
-def broker_consistency(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame()
-
-    dfx = df.copy()
-    dfx["Date"] = pd.to_datetime(dfx["TradeDate"]).dt.date
-
-    # daily buy/sell per broker
-    buy = dfx.groupby(["Date","Buyer_Code"]).agg(Buy_Lot=("Lot","sum"), Buy_Val=("Value","sum"))
-    sell = dfx.groupby(["Date","Seller_Code"]).agg(Sell_Lot=("Lot","sum"), Sell_Val=("Value","sum"))
-    buy.index.names = ["Date","Code"]
-    sell.index.names = ["Date","Code"]
-    daily = buy.join(sell, how="outer").fillna(0)
-    daily["Net_Lot_D"] = daily["Buy_Lot"] - daily["Sell_Lot"]
-    daily["Net_Val_D"] = daily["Buy_Val"] - daily["Sell_Val"]
-    daily = daily.reset_index()
-
-    # aggregate
-    agg = daily.groupby("Code").agg(
-        Days_Active=("Date","nunique"),
-        Net_Buy_Days=("Net_Lot_D", lambda x: int((x>0).sum())),
-        Net_Sell_Days=("Net_Lot_D", lambda x: int((x<0).sum())),
-        Net_Lot=("Net_Lot_D","sum"),
-        Net_Val=("Net_Val_D","sum"),
-        Buy_Lot=("Buy_Lot","sum"),
-        Sell_Lot=("Sell_Lot","sum"),
-        Buy_Val=("Buy_Val","sum"),
-        Sell_Val=("Sell_Val","sum"),
-    ).reset_index()
-
-    # avg prices
-    agg["Buy_Avg"] = 0
-    m = agg["Buy_Lot"] > 0
-    agg.loc[m, "Buy_Avg"] = (agg.loc[m, "Buy_Val"] / (agg.loc[m, "Buy_Lot"]*100)).round(0).astype(int)
-
-    agg["Sell_Avg"] = 0
-    m2 = agg["Sell_Lot"] > 0
-    agg.loc[m2, "Sell_Avg"] = (agg.loc[m2, "Sell_Val"] / (agg.loc[m2, "Sell_Lot"]*100)).round(0).astype(int)
-
-    # consistency score: dominan net-buy vs net-sell sepanjang hari aktif (0-100)
-    def _score(row):
-        da = row["Days_Active"] or 1
-        return int(50 + 50*((row["Net_Buy_Days"] - row["Net_Sell_Days"]) / da))
-    agg["Consistency_Score"] = agg.apply(_score, axis=1)
-
-    agg["Name"] = agg["Code"].apply(lambda x: get_broker_info(x)[1])
-    agg["Group"] = agg["Code"].apply(lambda x: get_broker_info(x)[2])
-
-    # urut: net val besar + skor konsisten
-    agg = agg.sort_values(["Net_Val","Consistency_Score"], ascending=[False, False])
-    return agg
-
+@traced("render: broker consistency")
 def render_broker_consistency_section(df: pd.DataFrame, start_date: datetime.date, end_date: datetime.date):
     st.subheader("🏦 Broker Consistency + Top Accumulation (Multi-day)")
 
@@ -2462,8 +1137,8 @@ def render_broker_consistency_section(df: pd.DataFrame, start_date: datetime.dat
     if df.empty:
         st.info("Data kosong.")
         return
-    cons = broker_consistency(df)
-    if cons.empty:
+    cons = analysis_node("cons", df)
+    if cons is None or cons.empty:
         st.info("Tidak cukup data untuk menghitung konsistensi.")
         return
 
@@ -2483,16 +1158,272 @@ def render_broker_consistency_section(df: pd.DataFrame, start_date: datetime.dat
 
     st.markdown("**Semua Broker (urut Net Val)**")
     st.dataframe(cons.reset_index(drop=True), use_container_width=True, height=520)
+    st.caption("Score_5D/10D/20D & Net_Lot_5D/10D/20D = konsistensi di 5/10/20 hari bursa terakhir. "
+               "Score window pendek > Consistency_Score ⇒ akumulasi makin cepat; lebih kecil ⇒ mulai memudar.")
+
+    render_consistency_trend(df, cons[cons["Net_Lot"] > 0]["Code"].head(5).tolist())
 
     bullets, concl, tone = make_consistency_insight(cons)
     render_bandarmology_insight("Kesimpulan Broker Consistency (Multi-day)", bullets, concl, tone)
 
+# ---------------------------
+# Analysis graph (DAG + cache per node)
+# ---------------------------
+# Tiap node mendeklarasikan input (node lain / "df") dan parameter yang dipakai. Fingerprint node =
+# nama + fingerprint input + nilai parameter, jadi ganti 1 parameter (mis. lookahead Big Print) hanya
+# menghitung ulang node hilirnya (bp -> score -> conclusion); node lain diambil dari cache session.
+# "optional": error di node itu jadi None (pola try/except lama di halaman).
+# "clean" adalah satu-satunya node yang input "df"-nya trade mentah (upload); hasilnya jadi "df" untuk
+# node lain (data database sudah cleaned lewat cache harian, jadi node ini tidak dipakai di sana).
+ANALYSIS_PARAMS = {**BIG_PRINT_DEFAULTS, "trade_date": None}
+
+ANALYSIS_GRAPH = {
+    "clean": {
+        "inputs": ("df",),
+        "params": ("trade_date",),
+        "fn": lambda df, trade_date: clean_running_trade(df, trade_date=trade_date, volume_mode="LOT"),
+    },
+    "stats": {"inputs": ("df",), "fn": lambda df: compute_trade_stats(df)},
+    "summ": {"inputs": ("df", "stats"), "fn": lambda df, stats: get_detailed_broker_summary(df, stats=stats)},
+    "fd": {"inputs": ("stats",), "fn": lambda stats: stats.foreign},
+    "rollup": {"inputs": ("df",), "fn": lambda df: rollup_for_session(df)},
+    "cons": {"inputs": ("rollup",), "fn": lambda roll: broker_consistency(roll), "optional": True},
+    "cons_rolling": {"inputs": ("rollup",), "fn": lambda roll: broker_consistency_rolling(roll)},
+    "bp_index": {"inputs": ("df",), "fn": lambda df: build_big_print_index(df)},
+    "bp": {
+        "inputs": ("bp_index",),
+        "params": ("bp_q", "bp_min_lot", "bp_lookahead_trades", "bp_lookahead_seconds"),
+        "fn": lambda idx, bp_q, bp_min_lot, bp_lookahead_trades, bp_lookahead_seconds: big_print_from_index(
+            idx, q=bp_q, min_lot=bp_min_lot, lookahead_trades=bp_lookahead_trades,
+            lookahead_seconds=bp_lookahead_seconds),
+        "optional": True,
+    },
+    "trade_book": {"inputs": ("df",), "fn": lambda df: prepare_trade_book_data(df)},
+    "trade_book_insight": {"inputs": ("df", "stats"), "fn": lambda df, stats: make_tradebook_insight(df, stats=stats)},
+    "flow": {"inputs": ("df",), "fn": lambda df: build_flow_matrix(df)},
+    "ohlcv": {"inputs": ("df",), "fn": lambda df: build_ohlcv(df)},
+    "score": {
+        "inputs": ("fd", "summ", "cons", "bp", "df", "stats"),
+        "fn": lambda fd, summ, cons, bp, df, stats: compute_bandar_score(fd, summ, cons, bp, df, stats=stats),
+    },
+    "conclusion": {
+        "inputs": ("fd", "summ", "cons", "bp", "df", "stats"),
+        "fn": lambda fd, summ, cons, bp, df, stats: overall_conclusion(fd, summ, cons, bp, df, stats=stats),
+    },
+}
+
+_GRAPH_KEY = "_analysis_graph"
+_GRAPH_LOG_KEY = "_analysis_log"
+_GRAPH_VARIANTS = 4  # hasil per node yang disimpan (mis. bolak-balik slider Big Print)
+
+
+def _graph_store() -> dict | None:
+    fp = st.session_state.get("data_fp")
+    if fp is None:
+        return None
+    store = st.session_state.get(_GRAPH_KEY)
+    if store is None or store.get("__fp") != fp:
+        store = {"__fp": fp}
+        st.session_state[_GRAPH_KEY] = store
+    return store
+
+
+def _graph_log(node: str, status: str, seconds: float, fp: str):
+    st.session_state.setdefault(_GRAPH_LOG_KEY, []).append(
+        {"node": node, "status": status, "ms": round(seconds * 1000, 1), "fingerprint": fp[:10]}
+    )
+
+
+def reset_analysis_log():
+    st.session_state[_GRAPH_LOG_KEY] = []
+
+
+def run_analysis(df: pd.DataFrame, targets, params: dict | None = None) -> dict:
+    """Hitung node targets (+ semua input-nya) dari ANALYSIS_GRAPH; return {node: hasil}.
+
+    Hasil di-cache per fingerprint node di session (dibuang saat data berganti). Tanpa data_fp
+    (data belum punya fingerprint) semua node dihitung langsung tanpa cache.
+    """
+    prm = {**ANALYSIS_PARAMS, **(params or {})}
+    store = _graph_store()
+    base = data_fingerprint(st.session_state.get("data_fp"), len(df))
+    results = {"df": df}
+    fps = {"df": base}
+
+    def _resolve(name: str):
+        if name in results:
+            return
+        node = ANALYSIS_GRAPH[name]
+        for dep in node["inputs"]:
+            _resolve(dep)
+        p_vals = [prm[k] for k in node.get("params", ())]
+        fp = data_fingerprint(name, [fps[d] for d in node["inputs"]], p_vals)
+        fps[name] = fp
+
+        cache = store.setdefault(name, {}) if store is not None else {}
+        if fp in cache:
+            results[name] = cache[fp]
+            _graph_log(name, "cache", 0.0, fp)
+            return
+
+        t0 = time.perf_counter()
+        with stage(f"graph: {name}", df) as stg:
+            try:
+                out = stg.out(node["fn"](*[results[d] for d in node["inputs"]], *p_vals))
+            except Exception:
+                if not node.get("optional"):
+                    raise
+                out = None
+        _graph_log(name, "run", time.perf_counter() - t0, fp)
+        cache[fp] = out
+        while len(cache) > _GRAPH_VARIANTS:
+            cache.pop(next(iter(cache)))
+        results[name] = out
+
+    for t in ([targets] if isinstance(targets, str) else targets):
+        _resolve(t)
+    return results
+
+
+def analysis_node(name: str, df: pd.DataFrame, **params):
+    """Hasil 1 node ANALYSIS_GRAPH (lihat run_analysis)."""
+    return run_analysis(df, [name], params)[name]
+
+
+_BP_APPLIED_KEY = "_bp_params_applied"
+
+
+def big_print_params_from_state() -> dict:
+    """Parameter Big Print dari widget section Big Print (default = ANALYSIS_PARAMS kalau belum ada)."""
+    ss = st.session_state
+    by_seconds = ss.get("bp_la_mode") == "Detik"
+    return {
+        "bp_q": float(ss.get("bp_q", ANALYSIS_PARAMS["bp_q"])),
+        "bp_min_lot": int(ss.get("bp_min_lot", ANALYSIS_PARAMS["bp_min_lot"])),
+        "bp_lookahead_trades": 15 if by_seconds else int(ss.get("bp_la_trades", ANALYSIS_PARAMS["bp_lookahead_trades"])),
+        "bp_lookahead_seconds": int(ss.get("bp_la_sec", 60)) if by_seconds else None,
+    }
+
+
+def render_analysis_log():
+    log = st.session_state.get(_GRAPH_LOG_KEY) or []
+    if not log:
+        return
+    runs = [r for r in log if r["status"] == "run"]
+    with st.expander(f"🧮 Log analisis ({len(runs)} node dihitung ulang, {len(log) - len(runs)} dari cache)",
+                     expanded=False):
+        st.dataframe(pd.DataFrame(log), use_container_width=True, hide_index=True)
+
+
+# ---------------------------
+# Diagnostics (instrumentasi opsional per tahap)
+# ---------------------------
+# Toggle di sidebar: 1 run halaman dicatat per tahap (load, cleaning, node graph, Yahoo, render section)
+# lewat bandarmology.instrument: waktu, baris in/out, delta RSS. Kalau toggle mati, tahap-tahap itu cuma
+# memanggil fungsi aslinya. Fragment yang rerun sendiri (slider di dalam section) tidak ikut tercatat.
+DIAG_DEFAULT = os.environ.get("BANDAR_DIAG", "") == "1"
+DIAG_JSONL_PATH = os.environ.get("BANDAR_DIAG_JSONL") or os.path.join(CACHE_ROOT, "diag", "trace.jsonl")
+
+
+def run_with_diagnostics(page_fn):
+    """Jalankan halaman; kalau diagnostics aktif, catat tahapnya lalu tampilkan panel di bawah halaman."""
+    if not st.session_state.get("diag_on"):
+        page_fn()
+        return
+    token = start_trace()
+    try:
+        with stage(f"page: {page_fn.__name__}"):
+            page_fn()
+    finally:
+        render_diagnostics(stop_trace(token))
+
+
+def render_diagnostics(records: list[dict]):
+    if not records:
+        return
+    tbl = trace_frame(records)
+    total = float(tbl.loc[tbl["depth"] == 0, "seconds"].sum())
+    leaf = tbl[tbl["depth"] >= tbl["depth"].shift(-1, fill_value=0)]  # tahap tanpa anak
+    slow = leaf.nlargest(3, "seconds")
+    with st.expander(f"🩺 Diagnostics: {len(tbl)} tahap, {total:.2f} detik", expanded=False):
+        st.caption("Paling lama: " + ", ".join(f"**{r.stage.strip()}** {r.seconds:.2f}s" for r in slow.itertuples()))
+        st.dataframe(
+            tbl.style.format({"seconds": "{:.3f}", "mem_delta_mb": "{:+.1f}", "rows_in": "{:,.0f}", "rows_out": "{:,.0f}"},
+                             na_rep="-"),
+            use_container_width=True,
+            hide_index=True,
+        )
+        if st.checkbox(f"Simpan tiap run ke JSONL (`{DIAG_JSONL_PATH}`)", key="diag_jsonl"):
+            try:
+                write_trace_jsonl(DIAG_JSONL_PATH, records, run=data_fingerprint(time.time_ns()),
+                                  stock=st.session_state.get("current_stock"))
+                st.caption(f"{len(records)} baris ditulis.")
+            except Exception as e:
+                st.warning(f"Gagal menulis JSONL: {e}")
+
+
+SCORE_HISTORY_RANGES = {"1 Bulan": 31, "3 Bulan": 92, "6 Bulan": 183, "1 Tahun": 366}
+
+
+@ui_fragment
+@traced("render: riwayat skor")
+def render_score_history(stock: str, end_date: datetime.date):
+    """Chart riwayat skor bandar harian (stacked komponen + garis skor) untuk saham dari database.
+
+    Render awal hanya membaca skor tersimpan; hari yang belum punya skor dihitung kalau tombol "Hitung"
+    diklik (rerun fragment saja), karena tiap hari butuh load + clean + rollup running trade.
+    """
+    st.subheader("📈 Riwayat Skor Bandar (harian)")
+    rng = st.radio("Rentang", list(SCORE_HISTORY_RANGES), index=1, horizontal=True, key="score_hist_range")
+    start_date = end_date - datetime.timedelta(days=SCORE_HISTORY_RANGES[rng] - 1)
+    try:
+        _, cat_index = get_database_catalog(DB_ROOT)
+    except Exception:
+        st.info("Katalog database tidak tersedia.")
+        return
+
+    bar = None
+
+    def _progress(done, total):
+        nonlocal bar
+        if bar is None:
+            bar = st.progress(0.0)
+        bar.progress(done / total, text=f"Menghitung skor {done}/{total} hari baru")
+
+    pending: list[str] = []
+    hist = bandar_score_history(stock, cat_index, start_date, end_date, compute_missing=False, pending=pending)
+    if pending:
+        c1, c2 = st.columns([3, 1])
+        c1.caption(f"{len(pending)} hari bursa di rentang ini belum punya skor tersimpan "
+                   f"(dihitung dari running trade hari itu, bisa agak lama untuk rentang panjang).")
+        if c2.button(f"Hitung {len(pending)} hari", key="score_hist_fill", use_container_width=True):
+            hist = bandar_score_history(stock, cat_index, start_date, end_date, progress=_progress)
+            if bar is not None:
+                bar.empty()
+    if hist.empty:
+        st.info("Belum ada skor tersimpan di rentang ini." if pending
+                else "Belum ada hari bursa dengan data di rentang ini.")
+        return
+
+    fig = go.Figure()
+    for key, (label, _) in BANDAR_SCORE_COMPONENTS.items():
+        fig.add_trace(go.Bar(x=hist["Date"], y=hist[key], name=label))
+    fig.add_trace(go.Scatter(x=hist["Date"], y=hist["score"], name="Skor", mode="lines+markers",
+                             line=dict(color="#f9fafb", width=2)))
+    fig.add_hline(y=65, line_dash="dot", line_color="#22c55e")
+    fig.add_hline(y=35, line_dash="dot", line_color="#ef4444")
+    fig.update_layout(barmode="stack", height=420, yaxis=dict(range=[0, 100], title="Poin"),
+                      paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font=dict(color="#f9fafb"),
+                      legend=dict(orientation="h", y=1.1), margin=dict(l=10, r=10, t=30, b=10))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(hist)} hari bursa. Garis hijau 65 = zona akumulasi, merah 35 = zona distribusi. "
+               f"Konsistensi harian = {SCORE_CONS_DAYS} hari bursa terakhir; Big Print setting default.")
+
+
 # =========================================================
 # 11. BANDARMOLOGY PAGE (UPDATED)
 # =========================================================
 def bandarmology_page():
-    DB_ROOT = "database"
-
     df_raw = st.session_state.get("df_raw")
     current_stock = st.session_state.get("current_stock", "UNKNOWN")
 
@@ -2515,8 +1446,14 @@ def bandarmology_page():
                 if not sel_stock:
                     st.info("Tidak ada folder saham di database.")
                 else:
-                    # date range
-                    default_start = st.session_state.get("selected_start_date") or datetime.date.today()
+                    # date range (default: hari terakhir yang ada datanya di katalog)
+                    latest_date = None
+                    try:
+                        _, cat_index = get_database_catalog(DB_ROOT)
+                        latest_date = catalog_latest_date(cat_index, sel_stock)
+                    except Exception:
+                        pass
+                    default_start = st.session_state.get("selected_start_date") or latest_date or datetime.date.today()
                     default_end = st.session_state.get("selected_end_date") or default_start
                     try:
                         start_date = st.date_input("Mulai Tanggal", value=default_start, format="DD/MM/YYYY", key="db_start")
@@ -2535,42 +1472,80 @@ def bandarmology_page():
                         if not fps:
                             st.warning("Data tidak tersedia untuk rentang tanggal tersebut.")
                         else:
-                            df_raw_new = load_database_files(fps)
-                            if df_raw_new.empty:
+                            load_report: list[dict] = []
+                            rollup_new = intraday_from = None
+                            try:
+                                df_clean_new, rollup_new, intraday_from = load_range_for_analysis(
+                                    sel_stock, fps, start_date, end_date, report=load_report
+                                )
+                            except ValueError as e:
+                                df_clean_new = pd.DataFrame()
+                                st.error(str(e))
+                            failed = [r for r in load_report if not r["ok"]]
+                            if failed:
+                                st.warning(
+                                    f"{len(failed)} file gagal dibaca: "
+                                    + "; ".join(f"{os.path.basename(r['file'])} ({r['error']})" for r in failed[:5])
+                                )
+                            if df_clean_new.empty:
                                 st.error("File ditemukan, tapi gagal dibaca. Cek format CSV/XLSX.")
                             else:
-                                st.session_state["df_raw"] = df_raw_new
+                                reset_session_data(
+                                    df_clean=df_clean_new,
+                                    fp=data_fingerprint("db", sel_stock, [_file_signature(p) for p in fps]),
+                                    rollup=rollup_new,
+                                    intraday_from=intraday_from,
+                                )
                                 st.session_state["current_stock"] = sel_stock
                                 st.toast(f"Data {sel_stock} dimuat ({len(fps)} file).", icon="✅")
                                 with st.expander("Detail file yang ter-load", expanded=False):
                                     st.write("Jumlah file:", len(fps))
                                     st.write("Rentang:", f"{start_date} s/d {end_date}")
                                     st.write("Daftar file:")
+                                    cat_files = get_database_catalog(DB_ROOT)[0]["files"]
                                     for p in fps[:80]:
-                                        st.code(p)
+                                        ent = cat_files.get(p) or {}
+                                        if ent.get("rows") is not None:
+                                            st.code(f"{p}  ({ent['rows']:,} baris, {ent.get('time_min') or '-'} s/d {ent.get('time_max') or '-'})")
+                                        else:
+                                            st.code(p)
                                     if len(fps) > 80:
                                         st.caption(f"... {len(fps)-80} file lain")
-                                    st.write("Jumlah baris (raw):", len(df_raw_new))
+                                    st.write("Jumlah baris (cleaned):", len(df_clean_new))
+                                    st.write("Jumlah baris rollup harian (broker x hari):", len(rollup_new))
+                                    if load_report:
+                                        st.write("Waktu baca per file:")
+                                        st.dataframe(
+                                            pd.DataFrame(load_report).reindex(
+                                                columns=["file", "ok", "cached", "rows", "seconds", "error"]
+                                            ),
+                                            use_container_width=True,
+                                            hide_index=True,
+                                        )
             else:
                 st.warning(f"Folder database '{DB_ROOT}' belum dibuat.")
         else:
             uploaded = st.file_uploader("Upload File Running Trade", type=["csv", "xlsx"], key="upload_file")
             if uploaded:
-                try:
-                    if uploaded.name.endswith("csv"):
-                        df_raw = pd.read_csv(uploaded)
-                    else:
-                        df_raw = pd.read_excel(uploaded)
-                    st.session_state["df_raw"] = df_raw
-                    st.session_state["current_stock"] = "UPLOADED"
-                except Exception:
-                    st.error("File tidak dapat dibaca, cek formatnya.")
+                # file yang sama tidak dibaca ulang di setiap rerun
+                upload_fp = data_fingerprint("upload", uploaded.name, uploaded.getvalue())
+                if upload_fp != st.session_state.get("data_fp") or st.session_state.get("df_raw") is None:
+                    try:
+                        if uploaded.name.endswith("csv"):
+                            df_raw = pd.read_csv(uploaded)
+                        else:
+                            df_raw = pd.read_excel(uploaded)
+                        reset_session_data(df_raw=df_raw, fp=upload_fp)
+                        st.session_state["current_stock"] = "UPLOADED"
+                    except Exception:
+                        st.error("File tidak dapat dibaca, cek formatnya.")
 
     df_raw = st.session_state.get("df_raw")
+    df_clean = st.session_state.get("df_clean")
     current_stock = st.session_state.get("current_stock", "UNKNOWN")
 
     # --------- MAIN CONTENT ---------
-    if df_raw is None:
+    if df_raw is None and df_clean is None:
         st.markdown("<br><br>", unsafe_allow_html=True)
         st.markdown(
             """
@@ -2590,13 +1565,21 @@ def bandarmology_page():
         start_date = st.session_state.get("selected_start_date") or st.session_state.get("selected_date") or datetime.date.today()
         end_date = st.session_state.get("selected_end_date") or start_date
 
-        # cleaning
-        df = clean_running_trade(df_raw, trade_date=start_date, volume_mode="LOT")
+        # cleaning (data database sudah cleaned lewat cache harian)
+        if df_clean is not None:
+            df = df_clean
+        else:
+            df = analysis_node("clean", df_raw, trade_date=start_date)
         if df.empty:
             st.warning("Data kosong setelah dibersihkan.")
             return
 
-        summ = get_detailed_broker_summary(df)
+        # graph analisis: node di-cache per fingerprint, log node yang dihitung ulang di bawah halaman
+        reset_analysis_log()
+        bp_params = big_print_params_from_state()
+        st.session_state[_BP_APPLIED_KEY] = bp_params
+        res = run_analysis(df, ["stats", "summ", "fd", "cons", "bp"], bp_params)
+        stats, summ = res["stats"], res["summ"]
 
         # Top marquee
         render_top10_marquee()
@@ -2605,41 +1588,38 @@ def bandarmology_page():
 
         # Metrics Top
         col1, col2, col3, col4 = st.columns(4)
-        tot_val = float(df["Value"].sum())
-        col1.metric("Total Transaksi", f"Rp {format_number_label(tot_val)}")
-        col2.metric("Total Volume", f"{format_lot_label(df['Lot'].sum())} Lot")
-        col3.metric("Frequency", f"{format_freq_label(len(df))} x")
+        col1.metric("Total Transaksi", f"Rp {format_number_label(stats.total_value)}")
+        col2.metric("Total Volume", f"{format_lot_label(stats.total_lot)} Lot")
+        col3.metric("Frequency", f"{format_freq_label(stats.rows)} x")
 
-        fd_stats = compute_foreign_domestic_activity(df)
+        fd_stats = res["fd"]
         foreign_net_val = float(fd_stats["value"]["Net_Foreign"])
         col4.metric("Net Foreign", f"Rp {format_number_label(foreign_net_val)}",
                     delta="Net Buy" if foreign_net_val>0 else ("Net Sell" if foreign_net_val<0 else "Flat"))
+        intraday_from = st.session_state.get("intraday_from")
+        if intraday_from:
+            st.caption(f"Rentang panjang: section intraday memakai trade **{intraday_from.strftime('%d/%m/%Y')}** "
+                       f"s/d **{end_date.strftime('%d/%m/%Y')}**; konsistensi multi-hari memakai rollup harian "
+                       f"seluruh rentang.")
 
         
         # Panel ringkas: Sinyal Hari Ini + Skor Bandar + Red Flags
-        cons_panel = None
-        bp_panel = None
-        try:
-            cons_panel = broker_consistency(df)
-        except Exception:
-            cons_panel = None
-        try:
-            bp_panel = big_print_detector(df, q=0.99, min_lot=0, lookahead_trades=15)
-        except Exception:
-            bp_panel = None
+        render_signal_panel(fd_stats, summ, res["cons"], res["bp"], df, stats=stats,
+                            score=analysis_node("score", df, **bp_params))
 
-        render_signal_panel(fd_stats, summ, cons_panel, bp_panel, df)
+        if current_stock not in ("UNKNOWN", "UPLOADED"):
+            st.markdown("---")
+            render_score_history(current_stock, end_date)
 
         st.markdown("---")
 
-        # Candlestick (Yahoo)
-        if current_stock not in ("UNKNOWN","UPLOADED"):
-            render_candlestick(current_stock)
+        # Candlestick (Yahoo, fallback OHLC lokal dari running trade)
+        render_candlestick(current_stock, df, end_date)
 
         st.markdown("---")
 
         # Foreign–Domestic Activity (mirip sekuritas)
-        fd_stats = render_foreign_domestic_activity(df)
+        fd_stats = render_foreign_domestic_activity(df, stats=fd_stats)
 
         st.markdown("---")
 
@@ -2664,7 +1644,7 @@ def bandarmology_page():
         st.markdown("---")
 
         # Trade Book
-        render_trade_book(df)
+        render_trade_book(df, stats=stats)
 
         st.markdown("---")
 
@@ -2673,61 +1653,16 @@ def bandarmology_page():
 
         st.markdown("---")
 
-        st.subheader("🕸️ Broker Distribution (Sankey)")
-
-        with st.expander("📖 Cara baca cepat (Broker Distribution)", expanded=False):
-            st.markdown("""
-- Diagram ini menunjukkan **siapa mendistribusikan ke siapa** (node = broker, link = aliran lot/value).
-- Link tebal/besar = transaksi yang dominan.
-- Jika aliran netterkonsentrasi di sedikit broker → seringnya ada **tangan besar** yang kerja terstruktur.
-- Kalau aliran menyebar ke banyak broker ritel → rawan **distribution ke publik**.
-            """)
-
-        left, right = st.columns([2, 1])
-        with left:
-            metric_choice = st.radio("Metrik", ["Value (Dana)", "Lot (Volume)"], horizontal=True)
-        with right:
-            top_n = st.slider("Jumlah interaksi", 5, 50, 15)
-
-        metric_col = "Value" if "Value" in metric_choice else "Lot"
-        try:
-            labels, node_colors, src, tgt, vals, link_colors = build_sankey(df, top_n=top_n, metric=metric_col)
-            fig = go.Figure(data=[go.Sankey(
-                node=dict(pad=20, thickness=18, line=dict(color="black", width=0.3),
-                          label=labels, color=node_colors),
-                link=dict(source=src, target=tgt, value=vals, color=link_colors)
-            )])
-            fig.update_layout(
-                height=600,
-                margin=dict(l=10, r=10, t=10, b=10),
-                font=dict(size=12, color="#e5e7eb"),
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            bullets, concl, tone = make_sankey_distribution_insight(df, metric_col=metric_col)
-            render_bandarmology_insight("Kesimpulan Broker Distribution", bullets, concl, tone)
-        except Exception:
-            st.info("Sankey tidak bisa dibuat untuk data ini (mungkin data terlalu sedikit).")
+        render_sankey_section(df)
 
         # Kesimpulan keseluruhan (sesuai semua visual)
         st.markdown("---")
-        # Recompute konsistensi & big print untuk rangkuman (ringan)
-        cons_all = None
-        try:
-            cons_all = cons_panel if 'cons_panel' in locals() else broker_consistency(df)
-        except Exception:
-            cons_all = None
-        bp_all = None
-        try:
-            # pakai setting default yang sama seperti UI (99% / min 0 / lookahead 15)
-            bp_all = bp_panel if 'bp_panel' in locals() else big_print_detector(df, q=0.99, min_lot=0, lookahead_trades=15)
-        except Exception:
-            bp_all = None
-
-        bullets, concl, tone = overall_conclusion(fd_stats, summ, cons_all, bp_all, df)
+        # konsistensi & big print sama dengan panel atas (node cons / bp di graph)
+        bullets, concl, tone = analysis_node("conclusion", df, **bp_params)
         render_bandarmology_insight("Kesimpulan Keseluruhan", bullets, concl, tone)
 
+        render_analysis_log()
+
     except Exception as e:
         st.error("Terjadi error saat memproses data. Cek format file kamu.")
         st.exception(e)
@@ -2735,11 +1670,15 @@ def bandarmology_page():
 def daftar_broker_page():
     st.title("📚 Daftar Broker / Sekuritas")
 
-    rows = []
-    for code, name in BROKER_NAMES.items():
-        group = get_broker_group(code)
-        rows.append({"Code": code, "Sekuritas": name, "Kategori": group})
-    df = pd.DataFrame(rows)
+    reg = BROKER_REGISTRY
+    df = pd.DataFrame({
+        "Code": reg["codes"][1:],
+        "Sekuritas": reg["name"][1:],
+        "Kategori": reg["group"][1:],
+    })
+    st.caption(f"Sumber: `{BROKER_FILE}` ({len(df)} broker). Tambah / ubah broker cukup lewat file ini.")
+    if reg["source"] is None:
+        st.warning(f"`{BROKER_FILE}` tidak terbaca, yang tampil adalah daftar broker bawaan.")
 
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -3003,6 +1942,84 @@ def edukasi_page():
             else:
                 st.caption(row["Link"])
 
+
+# =========================================================
+# 15. PAGE BARU: SCREENER BANDARMOLOGY (SEMUA SAHAM)
+# =========================================================
+# Tabel ranking dari bandarmology.screener (1 worker process per saham, data dari cache cleaned + rollup).
+def screener_page():
+    st.title("🔎 Screener Bandarmology")
+    st.caption("Ranking semua saham di database berdasarkan Skor Bandar (heuristik, bukan rekomendasi investasi). "
+               "Klik judul kolom untuk mengurutkan.")
+
+    if not os.path.exists(DB_ROOT):
+        st.warning(f"Folder database '{DB_ROOT}' belum dibuat.")
+        return
+    _, cat_index = get_database_catalog(DB_ROOT)
+    stocks = sorted(cat_index)
+    if not stocks:
+        st.info("Tidak ada folder saham di database.")
+        return
+
+    latest = max((d for d in (catalog_latest_date(cat_index, s) for s in stocks) if d), default=datetime.date.today())
+    c1, c2 = st.columns(2)
+    with c1:
+        start_date = st.date_input("Mulai Tanggal", value=latest, key="scr_start")
+    with c2:
+        end_date = st.date_input("Sampai Tanggal", value=latest, key="scr_end")
+    sel = st.multiselect("Saham", stocks, default=stocks, key="scr_stocks")
+
+    if st.button("Jalankan Screener", use_container_width=True, key="scr_run"):
+        if end_date < start_date:
+            st.warning("Sampai Tanggal harus >= Mulai Tanggal.")
+        else:
+            jobs = [(s, catalog_files_in_range(cat_index, s, start_date, end_date), start_date, end_date) for s in sel]
+            missing = [j[0] for j in jobs if not j[1]]
+            jobs = [j for j in jobs if j[1]]
+            bar = st.progress(0.0, text="Menghitung skor...")
+            t0 = time.perf_counter()
+            table = run_screener(jobs, progress=lambda done, total: bar.progress(done / total, text=f"{done}/{total} saham"))
+            bar.empty()
+            st.session_state["screener_result"] = {
+                "start": start_date, "end": end_date, "table": table, "missing": missing,
+                "seconds": time.perf_counter() - t0,
+            }
+
+    res = st.session_state.get("screener_result")
+    if not res:
+        st.info("Pilih tanggal / saham lalu klik **Jalankan Screener**.")
+        return
+
+    table = res["table"]
+    st.caption(f"Periode **{res['start'].strftime('%d/%m/%Y')}** s/d **{res['end'].strftime('%d/%m/%Y')}** — "
+               f"{len(table)} saham, {res['seconds']:.1f} detik.")
+    if res["missing"]:
+        st.caption("Tidak ada data di periode ini: " + ", ".join(res["missing"]))
+    if table.empty:
+        st.info("Tidak ada saham yang punya data di periode ini.")
+        return
+
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        height=min(42 + 35 * len(table), 720),
+        column_config={
+            "Skor": st.column_config.ProgressColumn("Skor", min_value=0, max_value=100, format="%d"),
+            "Net_Foreign": st.column_config.NumberColumn("Net Foreign (Rp)", format="%,.0f"),
+            "Foreign_Pct": st.column_config.NumberColumn("Foreign %", format="%.1f%%"),
+            "Top_Akum_Net": st.column_config.NumberColumn("Net Top Akum (Rp)", format="%,.0f"),
+            "Total_Value": st.column_config.NumberColumn("Total Value (Rp)", format="%,.0f"),
+            "Frequency": st.column_config.NumberColumn("Freq", format="%,d"),
+            "Detik": st.column_config.NumberColumn("Detik", format="%.2f"),
+        },
+    )
+    errors = table[table["Error"].notna()]
+    if not errors.empty:
+        with st.expander(f"⚠️ {len(errors)} saham gagal diproses", expanded=False):
+            st.dataframe(errors[["Saham", "Error"]], use_container_width=True, hide_index=True)
+
+
 # =========================================================
 # 12. MAIN ROUTER
 # =========================================================
@@ -3020,19 +2037,22 @@ def main():
         st.markdown("---")
         page = st.radio(
             "Menu",
-            ["Technical & Valuation Snapshot", "Kamus", "Edukasi", "Daftar Broker", "Daftar Saham"],
+            ["Technical & Valuation Snapshot", "Screener", "Kamus", "Edukasi", "Daftar Broker", "Daftar Saham"],
             index=0,
             key="main_menu",
         )
         st.markdown("---")
+        st.toggle("🩺 Diagnostics (waktu per tahap)", value=DIAG_DEFAULT, key="diag_on")
         if st.button("Logout", use_container_width=True, key="logout_btn"):
             st.session_state["authenticated"] = False
-            st.session_state["df_raw"] = None
+            reset_session_data()
             st.session_state["current_stock"] = "UNKNOWN"
             st.rerun()
 
     if page == "Technical & Valuation Snapshot":
-        bandarmology_page()
+        run_with_diagnostics(bandarmology_page)
+    elif page == "Screener":
+        screener_page()
     elif page == "Kamus":
         kamus_page()
     elif page == "Edukasi":
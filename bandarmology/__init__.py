@@ -0,0 +1,43 @@
+"""Analitik bandarmology tanpa Streamlit.
+
+Semua perhitungan murni (cleaning running trade, broker summary, aktivitas asing vs domestik, Big Print,
+broker consistency, flow Sankey, skor bandar, bar OHLCV dari running trade) ada di package ini, jadi bisa
+dipakai dari app.py, notebook, script batch, atau CLI (``python -m bandarmology report ...``) tanpa
+meng-import Streamlit.
+"""
+from .analytics import (
+    TradeStats,
+    calculate_broker_action_meter,
+    compute_foreign_domestic_activity,
+    compute_trade_stats,
+    get_detailed_broker_summary,
+    prepare_trade_book_data,
+)
+from .bigprint import BIG_PRINT_DEFAULTS, big_print_detector, big_print_from_index, build_big_print_index
+from .brokers import (
+    BROKER_NAMES,
+    BUMN_BROKERS,
+    FOREIGN_BROKERS,
+    broker_colors,
+    broker_groups,
+    broker_ids,
+    broker_names,
+    get_broker_group,
+    get_broker_info,
+    load_broker_registry,
+)
+from .cleaning import clean_running_trade, compact_trade_frame, concat_trade_frames
+from .consistency import CONSISTENCY_WINDOWS, broker_consistency, broker_consistency_rolling
+from .flow import build_flow_matrix, build_sankey, flow_broker_totals, flow_group_matrix, flow_top_links, sankey_from_flow
+from .loader import (
+    catalog_files_in_range,
+    catalog_latest_date,
+    get_database_catalog,
+    load_cleaned_database_files,
+    read_database_files,
+    resolve_database_files_range,
+)
+from .ohlcv import OHLCV_INTERVALS, build_ohlcv, load_ohlcv_bars, resample_ohlcv
+from .rollup import build_daily_rollup, concat_rollups, load_daily_rollups, load_range_for_analysis
+from .score import BANDAR_SCORE_COMPONENTS, bandar_score_history, compute_bandar_score, overall_conclusion
+from .screener import SCREENER_COLUMNS, map_stock_jobs, run_screener, screen_stock
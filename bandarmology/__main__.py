@@ -0,0 +1,6 @@
+"""python -m bandarmology report ..."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
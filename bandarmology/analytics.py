@@ -0,0 +1,315 @@
+"""Agregasi dasar per dataset: broker summary, action meter, trade book, asing vs domestik, TradeStats."""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .brokers import BROKER_REGISTRY, broker_ids
+from .cleaning import _NAT_NS, format_time_sec
+from .instrument import traced
+
+
+@traced()
+def get_detailed_broker_summary(df, stats=None):
+    """
+    Menghitung Broker Summary lengkap dengan Net Val & Avg Price
+    (jumlah per broker diambil dari TradeStats kalau sudah ada)
+    """
+    if stats is None:
+        stats = compute_trade_stats(df)
+    summ = stats.brokers.set_index("Code")[["Buy_Val", "Buy_Lot", "Sell_Val", "Sell_Lot"]].copy()
+    summ["Net_Val"] = summ["Buy_Val"] - summ["Sell_Val"]
+    summ["Net_Lot"] = summ["Buy_Lot"] - summ["Sell_Lot"]
+    summ["Total_Val"] = summ["Buy_Val"] + summ["Sell_Val"]
+    
+    # Hitung Avg Price (Hindari pembagian dengan nol)
+    summ["Buy_Avg"] = 0.0
+    mask_b = summ["Buy_Lot"] > 0
+    summ.loc[mask_b, "Buy_Avg"] = summ.loc[mask_b, "Buy_Val"] / (summ.loc[mask_b, "Buy_Lot"] * 100)
+    
+    summ["Sell_Avg"] = 0.0
+    mask_s = summ["Sell_Lot"] > 0
+    summ.loc[mask_s, "Sell_Avg"] = summ.loc[mask_s, "Sell_Val"] / (summ.loc[mask_s, "Sell_Lot"] * 100)
+    
+    # Convert ke Int
+    summ["Buy_Avg"] = summ["Buy_Avg"].astype(int)
+    summ["Sell_Avg"] = summ["Sell_Avg"].astype(int)
+
+    summ.index = summ.index.astype(str)
+    summ.index.name = "Code"
+    summ = summ.reset_index()
+    ids = broker_ids(summ["Code"])
+    summ["Name"] = BROKER_REGISTRY["name"].take(ids)
+    summ["Group"] = BROKER_REGISTRY["group"].take(ids)
+
+    return summ.sort_values("Net_Val", ascending=False)
+
+
+def calculate_broker_action_meter(summ):
+    """
+    Menghitung skala akumulasi (0-100)
+    """
+    top_buyers = summ.nlargest(5, "Net_Val")["Net_Val"].sum()
+    top_sellers = summ.nsmallest(5, "Net_Val")["Net_Val"].sum() # Value is negative
+    
+    abs_sell = abs(top_sellers)
+    total_power = top_buyers + abs_sell
+    
+    if total_power == 0:
+        return 50 # Neutral
+        
+    # Rasio kekuatan buyer
+    ratio = top_buyers / total_power
+    return int(ratio * 100)
+
+
+
+@traced()
+def prepare_trade_book_data(df: pd.DataFrame):
+    """
+    Menyiapkan data untuk Trade Book Chart & Price Table.
+    - Price table: agregasi Buy/Sell per price
+    - Chart: cumulative Buy/Sell per menit (intraday)
+
+    Catatan:
+    Action "Unknown" tidak dimasukkan ke chart kumulatif (biar chart tidak misleading).
+    """
+    # 1) Price table
+    price_grp = df.groupby(["Price", "Action"], observed=True).agg(
+        Lot=("Lot", "sum"),
+        Freq=("Lot", "count")
+    ).reset_index()
+
+    price_grp["Action"] = price_grp["Action"].astype(str)
+    pivot = price_grp.pivot(index="Price", columns="Action", values=["Lot", "Freq"]).fillna(0)
+    pivot.columns = [f"{c[1]}_{c[0]}" for c in pivot.columns]  # e.g. Buy_Lot, Sell_Lot
+    pivot = pivot.reset_index()
+
+    for c in ["Buy_Lot", "Sell_Lot", "Buy_Freq", "Sell_Freq"]:
+        if c not in pivot.columns:
+            pivot[c] = 0
+
+    pivot["Total_Lot"] = pivot["Buy_Lot"] + pivot["Sell_Lot"]
+    pivot = pivot.sort_values("Price", ascending=False)
+
+    # 2) Chart data
+    chart_data = pd.DataFrame()
+    if "DateTime" in df.columns:
+        ts = df.dropna(subset=["DateTime"]).copy()
+        ts = ts[ts["Action"].isin(["Buy", "Sell"])]
+        if not ts.empty:
+            ts = ts.set_index("DateTime").sort_index()
+            res = ts.groupby([pd.Grouper(freq="1min"), "Action"], observed=True)["Lot"].sum().unstack(fill_value=0)
+            res.columns = res.columns.astype(str)
+            res["Buy_Cum"] = res.get("Buy", 0).cumsum()
+            res["Sell_Cum"] = res.get("Sell", 0).cumsum()
+            chart_data = res.reset_index()
+
+    return pivot, chart_data
+
+
+def _foreign_side_mask(df: pd.DataFrame, code_col: str, origin_col: str) -> np.ndarray:
+    """Mask 'sisi ini broker asing' per trade: tag [F]/[D] kalau ada, fallback group broker == Asing.
+
+    Group broker lewat ID registry (lookup array), bukan per baris.
+    """
+    is_f = BROKER_REGISTRY["is_foreign"].take(broker_ids(df[code_col]))
+
+    if origin_col in df.columns:
+        origin = df[origin_col]
+        tagged = origin.isin(["F", "D"]).to_numpy()
+        is_f = np.where(tagged, (origin == "F").to_numpy(), is_f)
+    return is_f
+
+
+@traced()
+def compute_foreign_domestic_activity(df: pd.DataFrame):
+    """Override: pakai tag [F]/[D] dari file jika ada (lebih mirip sekuritas).
+    F Buy  : Buyer_Origin == 'F' (fallback: broker group Asing)
+    F Sell : Seller_Origin == 'F' (fallback: broker group Asing)
+
+    Vectorized: tiap trade masuk 1 dari 4 kombinasi (buyer F/D x seller F/D); value/volume/freq
+    dijumlah sekali lewat bincount per kombinasi.
+    """
+    n = len(df)
+    is_f_buy = _foreign_side_mask(df, "Buyer_Code", "Buyer_Origin") if n else np.zeros(0, dtype=bool)
+    is_f_sell = _foreign_side_mask(df, "Seller_Code", "Seller_Origin") if n else np.zeros(0, dtype=bool)
+    value = df["Value"].to_numpy(dtype=float) if "Value" in df.columns else None
+    lot = df["Lot"].to_numpy(dtype=float) if "Lot" in df.columns else None
+    return _foreign_domestic_from_masks(is_f_buy, is_f_sell, value, lot)
+
+
+def _foreign_domestic_from_masks(is_f_buy: np.ndarray, is_f_sell: np.ndarray,
+                                 value: np.ndarray | None, lot: np.ndarray | None) -> dict:
+    """Dict foreign/domestic (format compute_foreign_domestic_activity) dari mask asing per sisi."""
+    combo = is_f_buy.astype(np.int8) * 2 + is_f_sell.astype(np.int8)  # 0=DD 1=DF 2=FD 3=FF
+
+    def _per_combo(w, is_count=False):
+        if is_count:
+            return np.bincount(combo, minlength=4).astype(float)
+        if w is None:
+            return np.zeros(4)
+        return np.bincount(combo, weights=w, minlength=4)
+
+    out = {}
+    for key, w, col in (("value", value, "Value"), ("volume", lot, "Lot"), ("freq", None, None)):
+        c = _per_combo(w, is_count=col is None)
+        m = {"F_Buy": c[2] + c[3], "F_Sell": c[1] + c[3], "D_Buy": c[0] + c[1], "D_Sell": c[0] + c[2]}
+        out[key] = {k: (int(v) if col is None else float(v)) for k, v in m.items()}
+
+    for k in ["value", "volume", "freq"]:
+        total_f = out[k]["F_Buy"] + out[k]["F_Sell"]
+        total_d = out[k]["D_Buy"] + out[k]["D_Sell"]
+        grand = total_f + total_d
+        out[k]["Foreign_Pct"] = (total_f / grand * 100) if grand else 0.0
+        out[k]["Domestic_Pct"] = (total_d / grand * 100) if grand else 0.0
+        out[k]["Net_Foreign"] = out[k]["F_Buy"] - out[k]["F_Sell"]
+    return out
+
+# ---------------------------
+# Aggregate kernel (TradeStats)
+# ---------------------------
+# Total, VWAP, trade pertama/terakhir, split Buy/Sell, jumlah per broker, dan split asing dihitung
+# sekali per dataset dari array kolom cleaned. Semua section / insight membaca objek ini, bukan
+# scan ulang DataFrame (sum per kolom, df.sort_values("DateTime"), filter Action, dst).
+@dataclass(frozen=True, eq=False)
+class TradeStats:
+    rows: int = 0
+    total_value: float = 0.0
+    total_lot: float = 0.0
+    vwap: float = 0.0
+    first_price: float | None = None
+    last_price: float | None = None
+    first_dt: pd.Timestamp | None = None
+    last_dt: pd.Timestamp | None = None
+    last_time: str = ""
+    has_action: bool = False
+    buy_value: float = 0.0
+    sell_value: float = 0.0
+    buy_lot: float = 0.0
+    sell_lot: float = 0.0
+    buy_freq: int = 0
+    sell_freq: int = 0
+    # per broker: Code, Buy_Val, Buy_Lot, Buy_Freq, Sell_Val, Sell_Lot, Sell_Freq (urut kode)
+    brokers: pd.DataFrame = field(default_factory=pd.DataFrame)
+    # format sama dengan compute_foreign_domestic_activity (value / volume / freq)
+    foreign: dict = field(default_factory=dict)
+
+    @property
+    def buy_pct(self) -> float:
+        """Porsi lot Buy dari lot agresif (Buy + Sell), dalam persen."""
+        total = self.buy_lot + self.sell_lot
+        return (self.buy_lot / total * 100) if total else 0.0
+
+    @property
+    def pressure(self) -> float:
+        """(Buy lot - Sell lot) / lot agresif, -1..1 (0 kalau tidak ada trade Buy/Sell)."""
+        if not (self.buy_freq or self.sell_freq):
+            return 0.0
+        return max(-1.0, min(1.0, (self.buy_lot - self.sell_lot) / max(self.buy_lot + self.sell_lot, 1.0)))
+
+
+@traced()
+def compute_trade_stats(df: pd.DataFrame) -> TradeStats:
+    """Kernel agregat 1x jalan atas array kolom cleaned -> TradeStats.
+
+    Trade terakhir = DateTime terbesar; kalau beberapa trade di detik yang sama, diambil baris paling
+    atas (file running trade urut terbaru dulu). Trade pertama kebalikannya.
+    """
+    n = len(df)
+    if df is None or n == 0:
+        return TradeStats(foreign=compute_foreign_domestic_activity(df if df is not None else pd.DataFrame()))
+
+    value = df["Value"].to_numpy(dtype=float) if "Value" in df.columns else np.zeros(n)
+    lot = df["Lot"].to_numpy(dtype=float) if "Lot" in df.columns else np.zeros(n)
+    total_value, total_lot = float(value.sum()), float(lot.sum())
+
+    # trade pertama / terakhir dari int64 ns (NaT = min int64)
+    first_price = last_price = first_dt = last_dt = None
+    last_time = ""
+    if "DateTime" in df.columns:
+        t_ns = pd.to_datetime(df["DateTime"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        valid = t_ns != _NAT_NS
+        if valid.any():
+            t_hi = np.where(valid, t_ns, np.iinfo(np.int64).min)
+            t_lo = np.where(valid, t_ns, np.iinfo(np.int64).max)
+            i_last = int(np.argmax(t_hi))
+            i_first = n - 1 - int(np.argmin(t_lo[::-1]))
+            last_dt, first_dt = pd.Timestamp(t_ns[i_last]), pd.Timestamp(t_ns[i_first])
+            if "Price" in df.columns:
+                price = df["Price"].to_numpy()
+                last_price, first_price = float(price[i_last]), float(price[i_first])
+            if "Time_Sec" in df.columns:
+                last_time = format_time_sec([df["Time_Sec"].iat[i_last]]).iloc[0]
+            elif "Time_Str" in df.columns:
+                last_time = str(df["Time_Str"].iat[i_last])
+
+    # split Buy / Sell (Action agresor)
+    has_action = "Action" in df.columns
+    if has_action:
+        action = df["Action"]
+        is_buy = (action == "Buy").to_numpy()
+        is_sell = (action == "Sell").to_numpy()
+    else:
+        is_buy = is_sell = np.zeros(n, dtype=bool)
+
+    # jumlah per broker (ID kode urut, -1 = kosong)
+    codes, b_idx, s_idx = _broker_code_index(df)
+    k = len(codes)
+    b_ok, s_ok = b_idx >= 0, s_idx >= 0
+
+    def _side(idx, ok, w=None):
+        return np.bincount(idx[ok], weights=None if w is None else w[ok], minlength=k)
+
+    brokers = pd.DataFrame({
+        "Code": [str(c) for c in codes],
+        "Buy_Val": _side(b_idx, b_ok, value),
+        "Buy_Lot": _side(b_idx, b_ok, lot),
+        "Buy_Freq": _side(b_idx, b_ok),
+        "Sell_Val": _side(s_idx, s_ok, value),
+        "Sell_Lot": _side(s_idx, s_ok, lot),
+        "Sell_Freq": _side(s_idx, s_ok),
+    })
+    brokers = brokers[(brokers["Buy_Freq"] > 0) | (brokers["Sell_Freq"] > 0)].reset_index(drop=True)
+
+    foreign = _foreign_domestic_from_masks(
+        _foreign_side_mask(df, "Buyer_Code", "Buyer_Origin"),
+        _foreign_side_mask(df, "Seller_Code", "Seller_Origin"),
+        value if "Value" in df.columns else None,
+        lot if "Lot" in df.columns else None,
+    )
+
+    return TradeStats(
+        rows=n,
+        total_value=total_value,
+        total_lot=total_lot,
+        vwap=(total_value / (total_lot * 100)) if total_lot else 0.0,
+        first_price=first_price,
+        last_price=last_price,
+        first_dt=first_dt,
+        last_dt=last_dt,
+        last_time=last_time,
+        has_action=has_action,
+        buy_value=float(value[is_buy].sum()),
+        sell_value=float(value[is_sell].sum()),
+        buy_lot=float(lot[is_buy].sum()),
+        sell_lot=float(lot[is_sell].sum()),
+        buy_freq=int(is_buy.sum()),
+        sell_freq=int(is_sell.sum()),
+        brokers=brokers,
+        foreign=foreign,
+    )
+
+
+def _broker_code_index(df: pd.DataFrame) -> tuple[pd.Index, np.ndarray, np.ndarray]:
+    """Kode broker -> ID integer (urut kode). Return (codes, buyer_ids, seller_ids); -1 = kode kosong/NaN."""
+    buyer, seller = df["Buyer_Code"], df["Seller_Code"]
+    if (isinstance(buyer.dtype, pd.CategoricalDtype) and isinstance(seller.dtype, pd.CategoricalDtype)
+            and buyer.cat.categories.equals(seller.cat.categories) and buyer.cat.categories.is_monotonic_increasing):
+        # frame compact: kategori kode broker sudah sama + terurut -> pakai codes langsung
+        return (buyer.cat.categories,
+                buyer.cat.codes.to_numpy().astype(np.int64),
+                seller.cat.codes.to_numpy().astype(np.int64))
+    both_idx, codes = pd.factorize(pd.concat([buyer.astype(object), seller.astype(object)], ignore_index=True),
+                                   sort=True)
+    return pd.Index(codes), both_idx[:len(df)], both_idx[len(df):]
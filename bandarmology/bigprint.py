@@ -0,0 +1,145 @@
+"""Big Print detector: trade lot besar (di atas percentile) + label reaksi harga sesudahnya."""
+import numpy as np
+import pandas as pd
+
+from .cleaning import _NS_PER_SEC
+from .instrument import traced
+
+
+# Setting default Big Print (slider dashboard, screener, riwayat skor)
+BIG_PRINT_DEFAULTS = {
+    "bp_q": 0.99,
+    "bp_min_lot": 0,
+    "bp_lookahead_trades": 15,
+    "bp_lookahead_seconds": None,
+}
+
+# Mapping label Big Print (English -> Indonesia)
+BIG_PRINT_LABEL_ID = {
+    "Absorption (Buy, price flat)": "Serap (Beli, harga ditahan)",
+    "Impulse Up (Buy)": "Dorong Naik (Beli)",
+    "Failed Buy / Supply": "Beli Gagal / Ada Supply",
+    "Big Buy": "Big Buy (Beli besar)",
+    "Absorption (Sell absorbed)": "Serap (Jual diserap)",
+    "Distribution (Sell)": "Distribusi (Jual besar)",
+    "Squeeze / Trap Sell": "Squeeze / Trap Sell",
+    "Big Sell": "Big Sell (Jual besar)",
+    "Big Print": "Big Print",
+}
+
+_BIG_PRINT_LABELS_BUY = ("Absorption (Buy, price flat)", "Dorong Naik (Beli agresif)", "Buy Gagal / Supply Kuat", "Big Buy (Beli besar)")
+_BIG_PRINT_LABELS_SELL = ("Serap (Jual diserap)", "Distribusi (Jual besar)", "Squeeze / Trap Sell", "Big Sell (Jual besar)")
+
+
+def _sorted_quantile(a_sorted: np.ndarray, q: float) -> float:
+    """Quantile linear dari array yang sudah terurut, O(1). Hasil identik dengan pd.Series.quantile(q)."""
+    n = len(a_sorted)
+    vi = (n - 1) * ((q * 100) / 100)  # pandas lewat np.percentile(q * 100)
+    if vi >= n - 1:
+        return float(a_sorted[-1])
+    if vi < 0:
+        return float(a_sorted[0])
+    lo = int(np.floor(vi))
+    g = vi - lo
+    a, b = float(a_sorted[lo]), float(a_sorted[lo + 1])
+    return b - (b - a) * (1 - g) if g >= 0.5 else a + (b - a) * g
+
+
+@traced()
+def build_big_print_index(df: pd.DataFrame) -> dict:
+    """Struktur per dataset untuk Big Print: frame urut waktu + lot terurut + forward return per lookahead.
+
+    Dibangun sekali per data (node "bp_index" di ANALYSIS_GRAPH app); query big_print_from_index untuk
+    kombinasi (q, min_lot, lookahead) apa pun cukup quantile O(1) + searchsorted + slice hasilnya.
+    """
+    if df.empty:
+        return {"frame": pd.DataFrame(), "n": 0}
+    dfx = df.dropna(subset=["DateTime"]).sort_values("DateTime").copy()
+    lots = dfx["Lot"].to_numpy(dtype=np.int64)
+    order = np.argsort(lots, kind="stable")
+    action = dfx["Action"].astype(object).to_numpy() if "Action" in dfx.columns else np.full(len(dfx), None)
+    return {
+        "frame": dfx,
+        "n": len(dfx),
+        "lots_sorted": lots[order],
+        "lots_sorted_f": lots[order].astype(float),
+        "order_by_lot": order,
+        "prices": dfx["Price"].to_numpy(dtype=np.int64),
+        "t_ns": dfx["DateTime"].to_numpy(dtype="datetime64[ns]").view("int64"),
+        "is_buy": action == "Buy",
+        "is_sell": action == "Sell",
+        "pct": {},  # (lookahead_trades, lookahead_seconds) -> forward % change semua trade (lazy)
+    }
+
+
+def _big_print_forward_pct(idx: dict, lookahead_trades: int, lookahead_seconds: int | None) -> np.ndarray:
+    key = (None, int(lookahead_seconds)) if lookahead_seconds is not None else (int(lookahead_trades), None)
+    if key not in idx["pct"]:
+        prices = idx["prices"]
+        n = idx["n"]
+        if lookahead_seconds is not None:
+            t_ns = idx["t_ns"]
+            end = np.searchsorted(t_ns, t_ns + int(lookahead_seconds) * _NS_PER_SEC, side="right") - 1
+        else:
+            end = np.minimum(np.arange(n) + int(lookahead_trades), n - 1)
+        future = prices[end]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            idx["pct"][key] = np.where(prices != 0, (future - prices) / np.where(prices != 0, prices, 1) * 100, 0.0)
+    return idx["pct"][key]
+
+
+@traced()
+def big_print_from_index(
+    idx: dict,
+    q: float = 0.99,
+    min_lot: int = 0,
+    lookahead_trades: int = 15,
+    lookahead_seconds: int | None = None,
+) -> pd.DataFrame:
+    """Query Big Print dari build_big_print_index (hasil sama dengan big_print_detector)."""
+    if idx["n"] == 0:
+        return pd.DataFrame()
+    thr = max(int(_sorted_quantile(idx["lots_sorted_f"], q)), int(min_lot))
+    start = int(np.searchsorted(idx["lots_sorted"], thr, side="left"))
+    sel = np.sort(idx["order_by_lot"][start:])  # posisi Big Print, urut waktu
+    bp = idx["frame"].iloc[sel].copy()
+    if bp.empty:
+        return bp
+
+    pct = _big_print_forward_pct(idx, lookahead_trades, lookahead_seconds)[sel]
+    is_buy = idx["is_buy"][sel]
+    is_sell = idx["is_sell"][sel]
+    flat = np.abs(pct) <= 0.10
+    up = pct > 0.25
+    down = pct < -0.25
+    # heuristic label
+    labels = np.select(
+        [
+            is_buy & flat, is_buy & up, is_buy & down, is_buy,
+            is_sell & flat, is_sell & down, is_sell & up, is_sell,
+        ],
+        list(_BIG_PRINT_LABELS_BUY) + list(_BIG_PRINT_LABELS_SELL),
+        default="Big Print",
+    )
+    bp["Label"] = labels.astype(object)
+    # Label -> Bahasa Indonesia
+    bp["Label"] = bp["Label"].map(BIG_PRINT_LABEL_ID).fillna(bp["Label"])
+    bp["Threshold_Lot"] = thr
+    return bp.sort_values("DateTime")
+
+
+def big_print_detector(
+    df: pd.DataFrame,
+    q: float = 0.99,
+    min_lot: int = 0,
+    lookahead_trades: int = 15,
+    lookahead_seconds: int | None = None,
+) -> pd.DataFrame:
+    """Deteksi Big Print (lot >= percentile q / min_lot) + label serap/distribusi dari perubahan harga ke depan.
+
+    Lookahead default = N trade berikutnya; kalau lookahead_seconds diisi, harga pembanding = trade terakhir
+    dalam N detik setelah Big Print. Untuk query berulang di data yang sama (slider), bangun index sekali
+    dengan build_big_print_index lalu pakai big_print_from_index.
+    """
+    return big_print_from_index(build_big_print_index(df), q=q, min_lot=min_lot,
+                                lookahead_trades=lookahead_trades, lookahead_seconds=lookahead_seconds)
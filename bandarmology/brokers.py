@@ -0,0 +1,251 @@
+"""Registry broker: nama sekuritas, kelompok (Asing / BUMN / Lokal), dan warna per kode."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .paths import BROKER_FILE
+
+
+# --- NAMA BROKER (LENGKAP) ---
+BROKER_NAMES = {
+    "CC": "Mandiri Sekuritas",
+    "AK": "UBS Sekuritas Indonesia",
+    "ZP": "Maybank Sekuritas Indonesia",
+    "XL": "Stockbit Sekuritas Digital",
+    "YP": "Mirae Asset Sekuritas Indonesia",
+    "YU": "CGS International Sekuritas Indonesia",
+    "BK": "J.P. Morgan Sekuritas Indonesia",
+    "PD": "Indo Premier Sekuritas",
+    "MG": "Semesta Indovest Sekuritas",
+    "CP": "KB Valbury Sekuritas",
+    "XC": "Ajaib Sekuritas Asia",
+    "LG": "Trimegah Sekuritas Indonesia Tbk.",
+    "SQ": "BCA Sekuritas",
+    "KZ": "CLSA Sekuritas Indonesia",
+    "NI": "BNI Sekuritas",
+    "RX": "Macquarie Sekuritas Indonesia",
+    "DH": "Sinarmas Sekuritas",
+    "AZ": "Sucor Sekuritas",
+    "OD": "BRI Danareksa Sekuritas",
+    "BB": "Verdhana Sekuritas Indonesia",
+    "KK": "Phillip Sekuritas Indonesia",
+    "IF": "Samuel Sekuritas Indonesia",
+    "GR": "Panin Sekuritas Tbk.",
+    "EP": "MNC Sekuritas",
+    "KI": "Ciptadana Sekuritas Asia",
+    "DR": "RHB Sekuritas Indonesia",
+    "TP": "OCBC Sekuritas Indonesia",
+    "BQ": "Korea Investment and Sekuritas Indonesia",
+    "YB": "Yakin Bertumbuh Sekuritas",
+    "XA": "NH Korindo Sekuritas Indonesia",
+    "AP": "Pacific Sekuritas Indonesia",
+    "HP": "Henan Putihrai Sekuritas",
+    "AI": "UOB Kay Hian Sekuritas",
+    "HD": "KGI Sekuritas Indonesia",
+    "DX": "Bahana Sekuritas",
+    "YJ": "Lotus Andalan Sekuritas",
+    "AG": "Kiwoom Sekuritas Indonesia",
+    "SS": "Supra Sekuritas Indonesia",
+    "DP": "DBS Vickers Sekuritas Indonesia",
+    "AO": "Erdikha Elit Sekuritas",
+    "RF": "Buana Capital Sekuritas",
+    "RB": "Ina Sekuritas Indonesia",
+    "BR": "Trust Sekuritas",
+    "AT": "Phintraco Sekuritas",
+    "CD": "Mega Capital Sekuritas",
+    "IN": "Investindo Nusantara Sekuritas",
+    "PO": "Pilarmas Investindo Sekuritas",
+    "FS": "Yuanta Sekuritas Indonesia",
+    "SH": "Artha Sekuritas Indonesia",
+    "IH": "Indo Harvest Sekuritas",
+    "TS": "Dwidana Sakti Sekuritas",
+    "LS": "Reliance Sekuritas Indonesia Tbk.",
+    "MI": "Victoria Sekuritas Indonesia",
+    "FZ": "Waterfront Sekuritas Indonesia",
+    "IU": "Indo Capital Sekuritas",
+    "PC": "FAC Sekuritas Indonesia",
+    "PP": "Aldiracita Sekuritas Indonesia",
+    "MU": "Minna Padi Investama Sekuritas",
+    "II": "Danatama Makmur Sekuritas",
+    "RO": "Pluang Maju Sekuritas",
+    "SA": "Elit Sukses Sekuritas",
+    "ID": "Anugerah Sekuritas Indonesia",
+    "EL": "Evergreen Sekuritas Indonesia",
+    "GA": "BNC Sekuritas Indonesia",
+    "ES": "Ekokapital Sekuritas",
+    "AR": "Binaartha Sekuritas",
+    "PG": "Panca Global Sekuritas",
+    "AN": "Wanteg Sekuritas",
+    "DU": "KAF Sekuritas Indonesia",
+    "AH": "Shinhan Sekuritas Indonesia",
+    "RG": "Profindo Sekuritas Indonesia",
+    "ZR": "Bumiputera Sekuritas",
+    "YO": "Amantara Sekuritas Indonesia",
+    "SF": "Surya Fajar Sekuritas",
+    "RS": "Yulie Sekuritas Indonesia Tbk.",
+    "AF": "Harita Kencana Sekuritas",
+    "PF": "Danasakti Sekuritas Indonesia",
+    "PI": "Magenta Kapital Sekuritas Indonesia",
+    "BS": "Equity Sekuritas Indonesia",
+    "PS": "Paramitra Alfa Sekuritas",
+    "JB": "Bjb Sekuritas",
+    "OK": "Net Sekuritas",
+    "GW": "HSBC Sekuritas Indonesia",
+    "BF": "Inti Fikasa Sekuritas",
+    "TF": "Universal Broker Indonesia Sekuritas",
+    "QA": "Tuntun Sekuritas Indonesia",
+    "GI": "Webull Sekuritas Indonesia",
+    "IT": "Inti Teladan Sekuritas",
+    "AD": "OSO Sekuritas Indonesia",
+    "DD": "Makindo Sekuritas",
+    "IC": "Integrity Capital Sekuritas",
+    "FO": "Forte Global Sekuritas",
+    "IP": "Yugen Bertumbuh Sekuritas",
+    "SC": "IMG Sekuritas",
+    "DM": "Masindo Artha Sekuritas",
+    "CG": "Citigroup Sekuritas Indonesia",
+    "CS": "Credit Suisse Sekuritas Indonesia",
+    "DK": "KAF Sekuritas Indonesia",
+}
+
+# --- KELOMPOK BROKER: Asing / BUMN / Lokal ---
+FOREIGN_BROKERS = {
+    "AG", "AH", "AI", "AK", "BK", "BQ", "CG", "CP", "CS",
+    "DR", "FS", "GI", "GW", "HD", "KI", "KK", "KZ", "RX",
+    "TP", "XA", "YP", "YU", "ZP",
+}
+
+BUMN_BROKERS = {"CC", "DX", "NI", "OD"}
+
+
+def get_broker_group(code: str) -> str:
+    """Kembalikan kelompok broker: Asing / BUMN / Lokal."""
+    c = str(code).upper().strip()
+    if c in BUMN_BROKERS:
+        return "BUMN"
+    if c in FOREIGN_BROKERS:
+        return "Asing"
+    return "Lokal"
+
+
+def get_broker_info(code: str):
+    """Return (code, name, group)."""
+    c = str(code).upper().strip()
+    name = BROKER_NAMES.get(c, "Sekuritas Lain")
+    group = get_broker_group(c)
+    return c, name, group
+
+
+# Warna untuk group broker (dipakai di tabel + sankey + label)
+COLOR_MAP = {
+    "Asing": "#ff4b4b",   # merah
+    "BUMN": "#22c55e",    # hijau
+    "Lokal": "#3b82f6",   # biru
+    "Unknown": "#6b7280",  # abu
+}
+
+
+def style_broker_code(val):
+    """Dipakai untuk mewarnai kolom 'Code' di tabel."""
+    style = _BROKER_STYLE.get(val)
+    if style is not None:
+        return style
+    group = get_broker_group(val)
+    color = COLOR_MAP.get(group, COLOR_MAP["Unknown"])
+    return f"color:{color}; font-weight:700;"
+
+
+# --- REGISTRY BROKER (lookup berbasis array) ---
+# Sumber data: daftar-broker.csv (Code, Sekuritas, Kategori). Broker baru cukup ditambah di file itu;
+# dict di atas dipakai sebagai default kalau file tidak ada / gagal dibaca (dengan RuntimeWarning, dan
+# registry["source"] = None). Path file relatif ke root repo (paths.BROKER_FILE). Tiap kode dapat ID integer
+# kecil yang stabil (ID 0 = kode tidak dikenal -> "Sekuritas Lain" / Lokal), lalu nama / kelompok /
+# warna tersedia sebagai array NumPy supaya 1 kolom kode cukup di-annotate dengan 1x take.
+BROKER_GROUPS = ("Asing", "BUMN", "Lokal")
+
+
+def _norm_broker_code(code) -> str:
+    return str(code).upper().strip()
+
+
+def load_broker_registry(path: str = BROKER_FILE) -> dict:
+    """Bangun registry broker: default dari dict bawaan, lalu ditimpa / ditambah isi file CSV."""
+    rows: dict[str, tuple[str, str]] = {}
+    for code, name in BROKER_NAMES.items():
+        rows[code] = (name, get_broker_group(code))
+    for code in FOREIGN_BROKERS | BUMN_BROKERS:
+        rows.setdefault(code, ("Sekuritas Lain", get_broker_group(code)))
+
+    source = path
+    try:
+        df = pd.read_csv(path, dtype=str).fillna("")
+        for _, r in df.iterrows():
+            code = _norm_broker_code(r.get("Code", ""))
+            if not code:
+                continue
+            group = str(r.get("Kategori", "")).strip().title()
+            group = "BUMN" if group.upper() == "BUMN" else group
+            if group not in BROKER_GROUPS:
+                group = "Lokal"
+            rows[code] = (str(r.get("Sekuritas", "")).strip() or "Sekuritas Lain", group)
+    except Exception as e:
+        source = None
+        warnings.warn(f"Daftar broker {path!r} tidak terbaca ({type(e).__name__}: {e}); "
+                      f"memakai daftar broker bawaan.", RuntimeWarning, stacklevel=2)
+
+    codes = sorted(rows)
+    names = ["Sekuritas Lain"] + [rows[c][0] for c in codes]
+    groups = ["Lokal"] + [rows[c][1] for c in codes]
+    return {
+        "codes": [""] + codes,  # ID 0 = tidak dikenal
+        "id": {c: i + 1 for i, c in enumerate(codes)},
+        "name": np.array(names, dtype=object),
+        "group": np.array(groups, dtype=object),
+        "color": np.array([COLOR_MAP.get(g, COLOR_MAP["Unknown"]) for g in groups], dtype=object),
+        "is_foreign": np.array([g == "Asing" for g in groups], dtype=bool),
+        "source": source,  # path file; None = file gagal dibaca (isi = dict bawaan saja)
+    }
+
+
+def broker_ids(codes) -> np.ndarray:
+    """Kode broker (Series / array / list) -> ID registry (int16), dihitung sekali per kode unik."""
+    s = codes if isinstance(codes, pd.Series) else pd.Series(codes, dtype=object)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        idx, uniques = s.cat.codes.to_numpy(), s.cat.categories
+    else:
+        idx, uniques = pd.factorize(s, use_na_sentinel=True)
+    lut = np.array([BROKER_REGISTRY["id"].get(_norm_broker_code(c), 0) for c in uniques] + [0], dtype=np.int16)
+    return lut[idx]
+
+
+def broker_names(codes) -> np.ndarray:
+    return BROKER_REGISTRY["name"].take(broker_ids(codes))
+
+
+def broker_groups(codes) -> np.ndarray:
+    return BROKER_REGISTRY["group"].take(broker_ids(codes))
+
+
+def broker_colors(codes) -> np.ndarray:
+    return BROKER_REGISTRY["color"].take(broker_ids(codes))
+
+
+def _apply_broker_registry(reg: dict):
+    """Sinkronkan dict lama (BROKER_NAMES / FOREIGN_BROKERS / BUMN_BROKERS) dengan registry."""
+    global BROKER_REGISTRY, _BROKER_STYLE
+    BROKER_REGISTRY = reg
+    known = reg["codes"][1:]
+    BROKER_NAMES.clear()
+    BROKER_NAMES.update({c: reg["name"][reg["id"][c]] for c in known})
+    FOREIGN_BROKERS.clear()
+    FOREIGN_BROKERS.update(c for c in known if reg["group"][reg["id"][c]] == "Asing")
+    BUMN_BROKERS.clear()
+    BUMN_BROKERS.update(c for c in known if reg["group"][reg["id"][c]] == "BUMN")
+    _BROKER_STYLE = {c: f"color:{reg['color'][reg['id'][c]]}; font-weight:700;" for c in known}
+
+
+BROKER_REGISTRY: dict = {}
+_BROKER_STYLE: dict[str, str] = {}
+_apply_broker_registry(load_broker_registry())
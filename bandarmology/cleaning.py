@@ -0,0 +1,531 @@
+"""Cleaning running trade: normalisasi kolom, parsing jam / harga / lot / broker, skema compact."""
+import datetime
+import re
+
+import numpy as np
+import pandas as pd
+
+from .instrument import traced
+
+
+_RT_RENAME_MAP = {
+    "time": "Time", "waktu": "Time", "jam": "Time", "timestamp": "Time", "datetime": "Time",
+    "price": "Price", "harga": "Price", "last": "Price",
+    "lot": "Lot", "vol": "Lot", "volume": "Lot", "qty": "Lot", "quantity": "Lot",
+    "buyer": "Buyer", "b": "Buyer", "buyer broker": "Buyer", "broker beli": "Buyer",
+    "seller": "Seller", "s": "Seller", "seller broker": "Seller", "broker jual": "Seller",
+    "action": "Action", "type": "Action", "side": "Action", "bs": "Action",
+    "market": "Market",
+    "tradedate": "TradeDate", "date": "TradeDate", "__tradedate": "TradeDate",
+}
+
+_RE_BROKER_CODE = re.compile(r"\b([A-Z]{2})\b")
+_RE_ORIGIN_TAG = re.compile(r"\[\s*([FD])\s*\]")
+_RE_FIRST_NUMBER = re.compile(r"([0-9][0-9,\.]+)")
+_RE_TIME_TOKEN = re.compile(r"(\d{1,2}:\d{2}(?:[:\.]\d{2})?)")
+_DUMMY_DATES = (datetime.date(1900, 1, 1), datetime.date(1970, 1, 1))
+
+
+def _rt_normalize_columns(df_input: pd.DataFrame) -> pd.DataFrame:
+    """Copy + rename kolom running trade ke nama standar, lalu cek kolom wajib."""
+    df = df_input.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    col_lut = {str(c).strip().lower(): str(c).strip() for c in df.columns}
+    for low, old in col_lut.items():
+        if low in _RT_RENAME_MAP:
+            df.rename(columns={old: _RT_RENAME_MAP[low]}, inplace=True)
+
+    required = {"Price", "Lot", "Buyer", "Seller"}
+    if not required.issubset(set(df.columns)):
+        raise ValueError("Kolom wajib tidak lengkap. Minimal harus ada: Price, Lot, Buyer, Seller.")
+    return df
+
+
+def _rt_clean_code(x) -> str:
+    s = str(x).upper().strip()
+    m = _RE_BROKER_CODE.search(s)
+    return m.group(1) if m else (s.split()[0] if s else "")
+
+
+def _rt_extract_origin(x) -> str | None:
+    # sumber file kamu punya tag [F] / [D]
+    m = _RE_ORIGIN_TAG.search(str(x).upper())
+    return m.group(1) if m else None
+
+
+def _rt_parse_first_number(x) -> float:
+    if pd.isna(x):
+        return float("nan")
+    t = str(x)
+    m = _RE_FIRST_NUMBER.search(t)
+    if not m:
+        return float("nan")
+    num = m.group(1)
+    if "," in num and "." in num:
+        num = num.replace(".", "").replace(",", "")
+    elif "," in num:
+        num = num.replace(",", "")
+    else:
+        parts = num.split(".")
+        if len(parts) > 1 and len(parts[-1]) == 3:
+            num = "".join(parts)
+    try:
+        return float(num)
+    except Exception:
+        return float("nan")
+
+
+def _rt_norm_action(x) -> str:
+    s = str(x).strip().lower()
+    if "buy" in s or s.startswith("b"):
+        return "Buy"
+    if "sell" in s or s.startswith("s"):
+        return "Sell"
+    return "Unknown"
+
+
+def _rt_parse_time_value(val):
+    """Parse 1 nilai kolom Time yang sering variatif: '08:58', '8:58.00', '08:58:00', '08:58:00.123', dst.
+
+    Return datetime.time (jam intraday, tanggal ikut TradeDate), pd.Timestamp (datetime absolut
+    dengan tanggal asli), atau None kalau gagal.
+    """
+    if pd.isna(val):
+        return None
+
+    # Sudah timestamp/datetime
+    if isinstance(val, (pd.Timestamp, datetime.datetime)):
+        ts = pd.Timestamp(val)
+        # kalau tanggal dummy, pakai jam-nya saja
+        if ts.date() in _DUMMY_DATES:
+            return ts.time()
+        return ts
+
+    if isinstance(val, datetime.time):
+        return val
+
+    s = str(val).strip()
+    if not s:
+        return None
+
+    # Ambil token waktu pertama saja (menghindari '1,190 (+2.15%)' dsb bila salah kolom)
+    m = _RE_TIME_TOKEN.search(s)
+    if m:
+        s = m.group(1)
+
+    # 8:58.00 -> 8:58:00
+    if re.match(r"^\d{1,2}:\d{2}\.\d{2}$", s):
+        s = s.replace(".", ":")
+
+    # 8:58 -> 8:58:00
+    if re.match(r"^\d{1,2}:\d{2}$", s):
+        s = s + ":00"
+
+    t = pd.to_datetime(s, errors="coerce")
+    if pd.isna(t):
+        return None
+    return t.time()
+
+
+def _rt_parse_time_to_dt(val, base_date: datetime.date) -> pd.Timestamp:
+    """Versi per-baris: Timestamp dengan tanggal = base_date (kecuali datetime absolut)."""
+    r = _rt_parse_time_value(val)
+    if r is None:
+        return pd.NaT
+    if isinstance(r, pd.Timestamp):
+        return r
+    return pd.Timestamp(datetime.datetime.combine(base_date, r))
+
+
+def _map_unique(s: pd.Series, fn) -> pd.Series:
+    """Seperti s.apply(fn), tapi fn cuma dipanggil sekali per nilai unik.
+
+    Kolom running trade (broker, harga, action, jam) kardinalitasnya kecil dibanding jumlah baris,
+    jadi regex cukup jalan di ratusan nilai unik lalu hasilnya di-take balik ke semua baris.
+    """
+    codes, uniques = pd.factorize(s)
+    mapped = np.empty(len(uniques), dtype=object)
+    for i, u in enumerate(np.asarray(uniques, dtype=object)):
+        mapped[i] = fn(u)
+    out = mapped[codes] if len(uniques) else np.empty(len(s), dtype=object)
+
+    # factorize menyatukan None/NaN/NaT jadi 1 sentinel, padahal str(None) != str(NaN)
+    na_pos = np.flatnonzero(codes == -1)
+    if len(na_pos):
+        na_vals = s.to_numpy(dtype=object)[na_pos]
+        by_type = {}
+        for j, v in zip(na_pos, na_vals):
+            k = type(v)
+            if k not in by_type:
+                by_type[k] = fn(v)
+            out[j] = by_type[k]
+    return pd.Series(out, index=s.index, dtype=object).infer_objects()
+
+
+# ---------------------------
+# Engine timestamp intraday (batch + inferensi format)
+# ---------------------------
+_NAT_NS = np.iinfo(np.int64).min
+_NS_PER_SEC = 1_000_000_000
+_NS_PER_DAY = 86_400 * _NS_PER_SEC
+
+# format string jam yang umum di file running trade; grup (jam, menit, detik)
+_TIME_FORMAT_PATTERNS = {
+    "HH:MM:SS": r"^\s*(\d{1,2}):(\d{2}):(\d{2})\s*$",
+    "H:MM.SS": r"^\s*(\d{1,2}):(\d{2})\.(\d{2})\s*$",
+    "HH:MM": r"^\s*(\d{1,2}):(\d{2})()\s*$",
+}
+
+
+def infer_time_format(values, sample_size: int = 500) -> str:
+    """Tebak format dominan kolom Time dari sampel nilai unik.
+
+    Return key _TIME_FORMAT_PATTERNS, "datetime64" (kolom sudah bertipe datetime),
+    "time" (object datetime.time, umumnya dari Excel), atau "tolerant" (tidak ada pola dominan).
+    """
+    s = pd.Series(values)
+    if pd.api.types.is_datetime64_dtype(s):
+        return "datetime64"
+    sample = s.dropna().drop_duplicates().head(sample_size)
+    if sample.empty:
+        return "tolerant"
+
+    best, best_n = "tolerant", 0
+    n_time = sum(isinstance(v, datetime.time) for v in sample)
+    if n_time > best_n:
+        best, best_n = "time", n_time
+    strs = sample[[isinstance(v, str) for v in sample]].astype(object)
+    for fmt, pat in _TIME_FORMAT_PATTERNS.items():
+        n = int(strs.str.match(pat).sum()) if len(strs) else 0
+        if n > best_n:
+            best, best_n = fmt, n
+    return best
+
+
+def parse_time_of_day(values, fmt: str | None = None) -> tuple[np.ndarray, np.ndarray, str]:
+    """Parse 1 kolom Time sekaligus.
+
+    Return (tod_ns, abs_ns, fmt):
+      - tod_ns: jam intraday dalam nanodetik sejak 00:00 (int64), _NAT_NS kalau bukan jam intraday
+      - abs_ns: timestamp absolut untuk datetime bertanggal asli (int64 epoch ns), selain itu _NAT_NS
+      - fmt: format dominan yang dipakai (lihat infer_time_format)
+
+    Format dominan diparse langsung (regex sekali per nilai unik + aritmetika int); hanya nilai yang
+    tidak cocok yang lewat parser toleran _rt_parse_time_value. Hasil identik dengan parser per baris.
+    """
+    s = pd.Series(values)
+    fmt = fmt or infer_time_format(s)
+
+    if fmt == "datetime64":
+        ns = s.to_numpy(dtype="datetime64[ns]").view("int64")
+        valid = ns != _NAT_NS
+        day = np.floor_divide(ns, _NS_PER_DAY) * _NS_PER_DAY
+        is_dummy = np.isin(day, [pd.Timestamp(d).value for d in _DUMMY_DATES])
+        # .time() pada Timestamp cuma sampai mikrodetik
+        tod = np.where(valid & is_dummy, (ns - day) // 1_000 * 1_000, _NAT_NS)
+        abs_ = np.where(valid & ~is_dummy, ns, _NAT_NS)
+        return tod, abs_, fmt
+
+    codes, uniques = pd.factorize(s)
+    uniq = np.asarray(uniques, dtype=object)
+    # slot ekstra di akhir = NaT, supaya kode -1 (nilai kosong) otomatis jadi NaT
+    tod_ns = np.full(len(uniq) + 1, _NAT_NS, dtype=np.int64)
+    abs_ns = np.full(len(uniq) + 1, _NAT_NS, dtype=np.int64)
+    done = np.zeros(len(uniq), dtype=bool)
+
+    if fmt in _TIME_FORMAT_PATTERNS:
+        str_pos = np.flatnonzero([isinstance(u, str) for u in uniq])
+        if len(str_pos):
+            parts = pd.Series(uniq[str_pos], dtype=object).str.extract(_TIME_FORMAT_PATTERNS[fmt])
+            h, m, sec = (pd.to_numeric(parts[k], errors="coerce").fillna(-1).to_numpy(dtype=np.int64) for k in range(3))
+            sec = np.where(parts[0].notna().to_numpy() & (parts[2].fillna("") == "").to_numpy(), 0, sec)
+            ok = parts[0].notna().to_numpy() & (h < 24) & (m < 60) & (sec >= 0) & (sec < 60)
+            tod_ns[str_pos[ok]] = ((h[ok] * 60 + m[ok]) * 60 + sec[ok]) * _NS_PER_SEC
+            done[str_pos[ok]] = True
+    elif fmt == "time":
+        t_pos = np.flatnonzero([isinstance(u, datetime.time) for u in uniq])
+        tod_ns[t_pos] = [
+            ((t.hour * 60 + t.minute) * 60 + t.second) * _NS_PER_SEC + t.microsecond * 1_000 for t in uniq[t_pos]
+        ]
+        done[t_pos] = True
+
+    # jalur lambat: cuma nilai yang tidak cocok format dominan
+    for i in np.flatnonzero(~done):
+        r = _rt_parse_time_value(uniq[i])
+        if r is None:
+            continue
+        if isinstance(r, pd.Timestamp):
+            abs_ns[i] = r.value
+        else:
+            tod_ns[i] = ((r.hour * 60 + r.minute) * 60 + r.second) * _NS_PER_SEC + r.microsecond * 1_000
+
+    return tod_ns[codes], abs_ns[codes], fmt
+
+
+def _rt_build_datetime(time_col: pd.Series, trade_dates: pd.Series, source: pd.Series | None = None) -> pd.Series:
+    """DateTime per baris = TradeDate + jam intraday, tanpa apply per baris.
+
+    Kalau ada kolom sumber (__source_file), format jam ditebak per file (file beda sekuritas bisa beda format).
+    """
+    n = len(time_col)
+    tod = np.full(n, _NAT_NS, dtype=np.int64)
+    abs_ = np.full(n, _NAT_NS, dtype=np.int64)
+    if source is None:
+        groups = [np.arange(n)]
+    else:
+        src_codes, src_uniques = pd.factorize(source)
+        groups = [np.flatnonzero(src_codes == g) for g in range(-1, len(src_uniques))]
+    for idx in groups:
+        if not len(idx):
+            continue
+        t, a, _ = parse_time_of_day(time_col.iloc[idx])
+        tod[idx] = t
+        abs_[idx] = a
+
+    base = pd.to_datetime(trade_dates, errors="coerce").to_numpy(dtype="datetime64[ns]").view("int64")
+    out = np.where(abs_ != _NAT_NS, abs_,
+                   np.where((tod != _NAT_NS) & (base != _NAT_NS), base + tod, _NAT_NS))
+    return pd.Series(out.view("datetime64[ns]"), index=time_col.index)
+
+
+def _clean_running_trade_rowwise(df_input: pd.DataFrame, trade_date: datetime.date | None = None, volume_mode: str = "LOT"):
+    """Versi lama (apply per baris) dari clean_running_trade.
+
+    Disimpan sebagai referensi: benchmark membandingkan output & kecepatan versi vectorized terhadap ini.
+    """
+    if df_input is None or df_input.empty:
+        return pd.DataFrame()
+
+    df = _rt_normalize_columns(df_input)
+
+    # Price
+    df["Price"] = df["Price"].apply(_rt_parse_first_number)
+    df["Price"] = pd.to_numeric(df["Price"], errors="coerce").fillna(0).astype(int)
+
+    # Lot
+    df["Lot"] = pd.to_numeric(df["Lot"].astype(str).str.replace(r"[^0-9\.]", "", regex=True), errors="coerce").fillna(0)
+    df["Lot"] = df["Lot"].round(0).astype("int64")
+    df["Shares"] = (df["Lot"] * 100).astype("int64")
+
+    # Broker code + origin
+    df["Buyer_Code"] = df["Buyer"].apply(_rt_clean_code)
+    df["Seller_Code"] = df["Seller"].apply(_rt_clean_code)
+    df["Buyer_Origin"] = df["Buyer"].apply(_rt_extract_origin)
+    df["Seller_Origin"] = df["Seller"].apply(_rt_extract_origin)
+
+    # Action
+    if "Action" in df.columns:
+        df["Action"] = df["Action"].apply(_rt_norm_action)
+    else:
+        df["Action"] = "Unknown"
+
+    # TradeDate
+    if "TradeDate" in df.columns:
+        df["TradeDate"] = pd.to_datetime(df["TradeDate"], errors="coerce").dt.date
+    else:
+        base_date = trade_date or datetime.date.today()
+        df["TradeDate"] = base_date
+
+    # DateTime per row
+    df["Time_Str"] = df["Time"].astype(str).str.strip()
+    df["DateTime"] = df.apply(lambda r: _rt_parse_time_to_dt(r["Time"], r["TradeDate"]), axis=1)
+    df["Time_Obj"] = pd.to_datetime(df["DateTime"], errors="coerce").dt.time
+
+    # Value
+    df["Value"] = df["Shares"] * df["Price"]
+
+    # basic validity
+    df = df[(df["Price"] > 0) & (df["Lot"] > 0)].copy()
+    return df
+
+
+@traced()
+def clean_running_trade(
+    df_input: pd.DataFrame,
+    trade_date: datetime.date | None = None,
+    volume_mode: str = "LOT",
+    compact: bool = True,
+):
+    """Override:
+    - Price ambil angka pertama (fix '1,190 (+2.15%)')
+    - Lot selalu dianggap LOT (1 lot = 100 saham)
+    - Kalau ada kolom TradeDate per baris, DateTime dibentuk per baris (multi-day)
+
+    Versi vectorized: tanpa apply per baris. Helper regex dipanggil per nilai unik (lihat _map_unique),
+    DateTime dibentuk dengan aritmetika int64 (TradeDate + jam).
+    compact=True (default): output mengikuti CLEAN_SCHEMA. compact=False: frame lengkap lama
+    (kolom mentah + Time_Str/Time_Obj), identik dengan _clean_running_trade_rowwise.
+    """
+    if df_input is None or df_input.empty:
+        return pd.DataFrame()
+
+    df = _rt_normalize_columns(df_input)
+
+    # Price
+    df["Price"] = _map_unique(df["Price"], _rt_parse_first_number)
+    df["Price"] = pd.to_numeric(df["Price"], errors="coerce").fillna(0).astype(int)
+
+    # Lot
+    df["Lot"] = pd.to_numeric(df["Lot"].astype(str).str.replace(r"[^0-9\.]", "", regex=True), errors="coerce").fillna(0)
+    df["Lot"] = df["Lot"].round(0).astype("int64")
+    df["Shares"] = (df["Lot"] * 100).astype("int64")
+
+    # Broker code + origin
+    df["Buyer_Code"] = _map_unique(df["Buyer"], _rt_clean_code)
+    df["Seller_Code"] = _map_unique(df["Seller"], _rt_clean_code)
+    df["Buyer_Origin"] = _map_unique(df["Buyer"], _rt_extract_origin)
+    df["Seller_Origin"] = _map_unique(df["Seller"], _rt_extract_origin)
+
+    # Action
+    if "Action" in df.columns:
+        df["Action"] = _map_unique(df["Action"], _rt_norm_action)
+    else:
+        df["Action"] = "Unknown"
+
+    # TradeDate
+    if "TradeDate" in df.columns:
+        df["TradeDate"] = pd.to_datetime(df["TradeDate"], errors="coerce").dt.date
+    else:
+        base_date = trade_date or datetime.date.today()
+        df["TradeDate"] = base_date
+
+    # DateTime per row
+    if not compact:
+        df["Time_Str"] = df["Time"].astype(str).str.strip()
+    df["DateTime"] = _rt_build_datetime(df["Time"], df["TradeDate"], source=df.get("__source_file"))
+    if not compact:
+        df["Time_Obj"] = pd.to_datetime(df["DateTime"], errors="coerce").dt.time
+
+    # Value
+    df["Value"] = df["Shares"] * df["Price"]
+
+    # basic validity
+    df = df[(df["Price"] > 0) & (df["Lot"] > 0)].copy()
+    return compact_trade_frame(df) if compact else df
+
+
+# ---------------------------
+# Skema compact data cleaned (yang disimpan di session_state / cache)
+# ---------------------------
+# Kolom string mentah (Buyer, Seller, Time, Time_Str, Time_Obj) dan kolom lain di luar skema dibuang
+# setelah parsing. Jam cukup disimpan sebagai detik sejak 00:00; tampilan HH:MM:SS dibentuk saat render.
+CLEAN_SCHEMA = {
+    "DateTime": "datetime64[ns]",   # TradeDate + jam transaksi (NaT kalau jam tidak terbaca)
+    "TradeDate": "datetime64[ns]",  # tanggal bursa (jam 00:00)
+    "Time_Sec": "int32",            # detik sejak 00:00, -1 kalau jam tidak terbaca
+    "Price": "int32",
+    "Lot": "int32",
+    "Shares": "int64",              # Lot * 100
+    "Value": "int64",               # Shares * Price (bisa > 2^31)
+    "Action": "category",           # Buy / Sell / Unknown
+    "Buyer_Code": "category",       # kode broker; kategori sama dengan Seller_Code
+    "Seller_Code": "category",
+    "Buyer_Origin": "category",     # F / D, NaN kalau tidak ada tag [F]/[D]
+    "Seller_Origin": "category",
+    "Market": "category",           # RG / NG / TN ...
+    "Code": "category",             # kode saham
+    "__source_file": "category",
+}
+_ACTION_CATEGORIES = ["Buy", "Sell", "Unknown"]
+_ORIGIN_CATEGORIES = ["D", "F"]
+_BROKER_CODE_COLS = ("Buyer_Code", "Seller_Code")
+_FIXED_CATEGORIES = {
+    "Action": _ACTION_CATEGORIES,
+    "Buyer_Origin": _ORIGIN_CATEGORIES,
+    "Seller_Origin": _ORIGIN_CATEGORIES,
+}
+
+
+def _category_values(s: pd.Series) -> set:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return set(s.cat.categories)
+    return set(pd.unique(s.dropna()))
+
+
+def _downcast_int(s: pd.Series, dtype: str) -> pd.Series:
+    """Downcast integer; tetap int64 kalau ada nilai di luar range dtype tujuan."""
+    info = np.iinfo(dtype)
+    if len(s) and (s.min() < info.min or s.max() > info.max):
+        return s.astype("int64")
+    return s.astype(dtype)
+
+
+def compact_trade_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Ubah hasil clean_running_trade ke CLEAN_SCHEMA (idempotent; index dipertahankan)."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    out: dict[str, pd.Series | np.ndarray] = {}
+    if "DateTime" in df.columns:
+        dt = pd.to_datetime(df["DateTime"], errors="coerce")
+        out["DateTime"] = dt
+    if "TradeDate" in df.columns:
+        out["TradeDate"] = pd.to_datetime(df["TradeDate"], errors="coerce")
+    if "Time_Sec" in df.columns:
+        out["Time_Sec"] = df["Time_Sec"].astype("int32")
+    elif "DateTime" in out:
+        ns = out["DateTime"].to_numpy(dtype="datetime64[ns]").view("int64")
+        sec = np.where(ns == _NAT_NS, -1, (ns % _NS_PER_DAY) // _NS_PER_SEC)
+        out["Time_Sec"] = pd.Series(sec.astype("int32"), index=df.index)
+
+    for col in ("Price", "Lot"):
+        if col in df.columns:
+            out[col] = _downcast_int(df[col], "int32")
+    for col in ("Shares", "Value"):
+        if col in df.columns:
+            out[col] = df[col].astype("int64")
+
+    code_cols = [c for c in _BROKER_CODE_COLS if c in df.columns]
+    if code_cols:
+        cats = sorted(set().union(*[_category_values(df[c]) for c in code_cols]))
+        for c in code_cols:
+            out[c] = pd.Categorical(df[c], categories=cats)
+    for col, cats in _FIXED_CATEGORIES.items():
+        if col in df.columns:
+            out[col] = pd.Categorical(df[col], categories=cats)
+    for col in ("Market", "Code", "__source_file"):
+        if col in df.columns:
+            out[col] = df[col].astype("category")
+
+    res = pd.DataFrame(out, index=df.index)
+    return res[[c for c in CLEAN_SCHEMA if c in res.columns]]
+
+
+def concat_trade_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concat beberapa frame compact tanpa jatuh ke object (kategori tiap kolom disatukan dulu)."""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    cat_cols = [c for c in CLEAN_SCHEMA if CLEAN_SCHEMA[c] == "category" and c not in _FIXED_CATEGORIES]
+    unions: dict[str, list] = {}
+    for col in cat_cols:
+        key = "__code" if col in _BROKER_CODE_COLS else col
+        vals = set().union(*[_category_values(f[col]) for f in frames if col in f.columns])
+        unions[key] = sorted(set(unions.get(key, [])) | vals)
+    fixed = []
+    for f in frames:
+        upd = {}
+        for col in cat_cols:
+            if col in f.columns:
+                key = "__code" if col in _BROKER_CODE_COLS else col
+                upd[col] = pd.Categorical(f[col], categories=unions[key])
+        fixed.append(f.assign(**upd))
+    return pd.concat(fixed, ignore_index=True)
+
+
+def format_time_sec(sec) -> pd.Series:
+    """Time_Sec -> string 'HH:MM:SS' ('' kalau -1), untuk tampilan."""
+    def _fmt(x):
+        x = int(x)
+        return "" if x < 0 else f"{x // 3600:02d}:{x // 60 % 60:02d}:{x % 60:02d}"
+    return _map_unique(pd.Series(sec), _fmt)
+
+
+def time_sec_to_time(x: int) -> datetime.time | None:
+    x = int(x)
+    if x < 0:
+        return None
+    return datetime.time(x // 3600 % 24, x // 60 % 60, x % 60)
@@ -0,0 +1,213 @@
+"""CLI batch: laporan bandarmology per saham ke file JSON / Parquet, tanpa Streamlit.
+
+Contoh:
+    python -m bandarmology report --stock MAPI --from 2025-12-01 --to 2025-12-12
+    python -m bandarmology report --stock MAPI BUMI --from 2025-12-01 --to 2025-12-12 --format parquet
+    python -m bandarmology report --all --from 2025-12-01 --to 2025-12-12 --workers 4 --history
+
+Output per saham di <out>/<SAHAM>/: summary.json (skor, komponen, red flags, kesimpulan, total) + tabel
+broker_summary, consistency, big_print, flow_links, daily_rollup (dan score_history kalau --history).
+Ringkasan semua saham ditulis ke <out>/index.json.
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+import time
+
+from .analytics import compute_trade_stats, get_detailed_broker_summary
+from .bigprint import BIG_PRINT_DEFAULTS, big_print_from_index, build_big_print_index
+from .consistency import broker_consistency
+from .flow import build_flow_matrix, flow_top_links
+from .loader import _HAS_PYARROW, DB_ROOT, catalog_files_in_range, get_database_catalog
+from .rollup import load_range_for_analysis
+from .score import BANDAR_SCORE_COMPONENTS, bandar_score_history, compute_bandar_score, overall_conclusion
+from .screener import SCREENER_WORKERS, map_stock_jobs
+
+REPORT_FLOW_TOP_N = 50
+_RE_TAG = re.compile(r"<[^>]+>")
+
+
+def _plain(text: str) -> str:
+    """Teks insight tanpa tag HTML (<b> dst) untuk output file."""
+    return _RE_TAG.sub("", str(text))
+
+
+def build_stock_report(stock: str, filepaths: list[str], start_date: datetime.date, end_date: datetime.date,
+                       cat_index: dict | None = None) -> tuple[dict, dict]:
+    """Semua analisis 1 saham di rentang tanggal. Return (summary dict, tabel {nama: DataFrame}).
+
+    cat_index (katalog database) hanya dipakai untuk riwayat skor harian; None = tanpa riwayat.
+    """
+    df, rollup, intraday_from = load_range_for_analysis(stock, filepaths, start_date, end_date, workers=1)
+    if df.empty:
+        raise ValueError("Data kosong setelah dibersihkan")
+    stats = compute_trade_stats(df)
+    summ = get_detailed_broker_summary(df, stats=stats)
+    try:
+        cons = broker_consistency(rollup)
+    except Exception:
+        cons = None
+    try:
+        bp = big_print_from_index(
+            build_big_print_index(df), q=BIG_PRINT_DEFAULTS["bp_q"], min_lot=BIG_PRINT_DEFAULTS["bp_min_lot"],
+            lookahead_trades=BIG_PRINT_DEFAULTS["bp_lookahead_trades"],
+        )
+    except Exception:
+        bp = None
+    fd = stats.foreign
+    score, bias, components, red_flags, reasons = compute_bandar_score(fd, summ, cons, bp, df, stats=stats)
+    bullets, conclusion, tone = overall_conclusion(fd, summ, cons, bp, df, stats=stats)
+
+    summary = {
+        "stock": stock,
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "intraday_from": intraday_from.isoformat() if intraday_from else None,
+        "days": int(rollup["TradeDate"].nunique()) if not rollup.empty else 0,
+        "score": score,
+        "bias": bias,
+        "components": {k: {"label": c[0], "points": int(c[1]), "max": BANDAR_SCORE_COMPONENTS[k][1], "note": _plain(c[2])}
+                       for k, c in zip(BANDAR_SCORE_COMPONENTS, components)},
+        "red_flags": [_plain(x) for x in red_flags],
+        "reasons": [_plain(x) for x in reasons],
+        "conclusion": {"text": _plain(conclusion), "tone": tone, "bullets": [_plain(x) for x in bullets]},
+        "totals": {
+            "rows": stats.rows, "value": stats.total_value, "lot": stats.total_lot, "vwap": stats.vwap,
+            "first_price": stats.first_price, "last_price": stats.last_price,
+            "buy_pct": stats.buy_pct, "pressure": stats.pressure,
+        },
+        "foreign": fd,
+        "top_accumulation": summ[summ["Net_Val"] > 0].head(5)[["Code", "Net_Val"]].to_dict("records"),
+        "top_distribution": summ[summ["Net_Val"] < 0].sort_values("Net_Val").head(5)[["Code", "Net_Val"]].to_dict("records"),
+    }
+    tables = {
+        "broker_summary": summ,
+        "consistency": cons,
+        "big_print": bp,
+        "flow_links": flow_top_links(build_flow_matrix(df), top_n=REPORT_FLOW_TOP_N),
+        "daily_rollup": rollup,
+    }
+    if cat_index is not None:
+        tables["score_history"] = bandar_score_history(stock, cat_index, start_date, end_date)
+    return summary, tables
+
+
+def write_stock_report(out_dir: str, summary: dict, tables: dict, fmt: str = "json") -> list[str]:
+    """Tulis summary.json + tabel (json records / parquet) ke out_dir; return daftar file yang ditulis."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    path = os.path.join(out_dir, "summary.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+    written.append(path)
+    for name, tbl in tables.items():
+        if tbl is None or tbl.empty:
+            continue
+        tbl = tbl.reset_index(drop=True)
+        if fmt == "parquet":
+            path = os.path.join(out_dir, name + ".parquet")
+            tbl.to_parquet(path, index=False)
+        else:
+            path = os.path.join(out_dir, name + ".json")
+            tbl.to_json(path, orient="records", date_format="iso", force_ascii=False, default_handler=str)
+        written.append(path)
+    return written
+
+
+def report_job(job: tuple) -> dict:
+    """Worker: job (stock, filepaths, start, end, out_root, fmt, cat_index|None) -> 1 baris ringkasan. Error masuk kolom Error."""
+    stock, filepaths, start_date, end_date, out_root, fmt, cat_index = job
+    t0 = time.perf_counter()
+    row = {"Saham": stock, "Error": None}
+    try:
+        summary, tables = build_stock_report(stock, filepaths, start_date, end_date, cat_index=cat_index)
+        files = write_stock_report(os.path.join(out_root, stock), summary, tables, fmt)
+        row.update({"Skor": summary["score"], "Bias": summary["bias"], "Red_Flags": len(summary["red_flags"]),
+                    "Net_Foreign": float(summary["foreign"]["value"]["Net_Foreign"]),
+                    "Total_Value": summary["totals"]["value"], "Hari": summary["days"], "Files": len(files)})
+    except Exception as e:
+        row["Error"] = str(e)
+    row["Detik"] = round(time.perf_counter() - t0, 2)
+    return row
+
+
+def _parse_date(s: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tanggal harus YYYY-MM-DD: {s!r}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m bandarmology", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command", required=True)
+    rp = sub.add_parser("report", help="laporan bandarmology per saham (JSON / Parquet)")
+    who = rp.add_mutually_exclusive_group(required=True)
+    who.add_argument("--stock", nargs="+", metavar="KODE", help="kode saham (boleh lebih dari 1)")
+    who.add_argument("--all", action="store_true", help="semua saham yang punya data di rentang tanggal")
+    rp.add_argument("--from", dest="start", type=_parse_date, required=True, metavar="YYYY-MM-DD")
+    rp.add_argument("--to", dest="end", type=_parse_date, required=True, metavar="YYYY-MM-DD")
+    rp.add_argument("--db", default=DB_ROOT, help=f"folder database running trade (default: {DB_ROOT})")
+    rp.add_argument("--out", default="reports", help="folder output (default: reports)")
+    rp.add_argument("--format", dest="fmt", choices=("json", "parquet"), default="json")
+    rp.add_argument("--workers", type=int, default=SCREENER_WORKERS, help="jumlah saham yang diproses paralel")
+    rp.add_argument("--history", action="store_true", help="sertakan riwayat skor harian (score_history)")
+    return ap
+
+
+def cmd_report(args) -> int:
+    if args.end < args.start:
+        print("Tanggal akhir harus >= tanggal awal.", file=sys.stderr)
+        return 2
+    if args.fmt == "parquet" and not _HAS_PYARROW:
+        print("--format parquet butuh pyarrow (pip install pyarrow).", file=sys.stderr)
+        return 2
+    _, index = get_database_catalog(args.db)
+    stocks = sorted(index) if args.all else [s.upper().strip() for s in args.stock]
+
+    jobs, missing = [], []
+    for stock in stocks:
+        fps = catalog_files_in_range(index, stock, args.start, args.end)
+        if not fps:
+            missing.append(stock)
+            continue
+        cat = {stock: index[stock]} if args.history else None
+        jobs.append((stock, fps, args.start, args.end, args.out, args.fmt, cat))
+    for stock in missing:
+        print(f"{stock}: tidak ada file di {args.start} s/d {args.end}", file=sys.stderr)
+    if not jobs:
+        return 1
+
+    def _progress(done, total):
+        print(f"\r{done}/{total} saham", end="", file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    rows = map_stock_jobs(report_job, jobs, max(1, int(args.workers)), _progress)
+    print(file=sys.stderr)
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(sorted(rows, key=lambda r: r["Saham"]), f, ensure_ascii=False, indent=2, default=str)
+
+    failed = [r for r in rows if r["Error"]]
+    for r in sorted(rows, key=lambda r: r["Saham"]):
+        if r["Error"]:
+            print(f"{r['Saham']:<6} ERROR {r['Error']}")
+        else:
+            print(f"{r['Saham']:<6} skor {r['Skor']:>3}  {r['Bias']:<24} red flags {r['Red_Flags']}  ({r['Detik']:.1f}s)")
+    print(f"{len(rows) - len(failed)}/{len(rows)} saham -> {os.path.abspath(args.out)} ({time.perf_counter() - t0:.1f}s)")
+    return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "report":
+        return cmd_report(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
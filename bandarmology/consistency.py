@@ -0,0 +1,154 @@
+"""Broker consistency multi-hari (skor konsistensi net buy / net sell per broker, juga rolling)."""
+import numpy as np
+import pandas as pd
+
+from .brokers import BROKER_REGISTRY, broker_ids
+from .instrument import traced
+from .rollup import build_daily_rollup, is_rollup_frame
+
+
+CONSISTENCY_WINDOWS = (5, 10, 20)
+
+
+def _broker_daily_matrix(df: pd.DataFrame) -> dict:
+    """Matriks (tanggal x broker) Buy/Sell Lot & Value dari rollup harian (build_daily_rollup).
+
+    df boleh trade cleaned (diringkas dulu jadi rollup) atau langsung rollup dari store.
+    Return dict: dates (urut), codes (urut), buy_lot, buy_val, sell_lot, sell_val, active (bool).
+    Baris tanpa TradeDate / kode broker diabaikan (sama seperti groupby default).
+    """
+    roll = df if is_rollup_frame(df) else build_daily_rollup(df)
+    d_idx, d_uni = pd.factorize(pd.to_datetime(roll["TradeDate"]), sort=True)
+    d_uni = [ts.date() for ts in d_uni]
+    c_idx, codes = pd.factorize(roll["Code"].astype(str), sort=True)
+
+    n_d, n_b = len(d_uni), len(codes)
+    flat = d_idx * n_b + c_idx
+
+    def _mat(col):
+        return np.bincount(flat, weights=roll[col].to_numpy(dtype=float), minlength=n_d * n_b).reshape(n_d, n_b)
+
+    return {
+        "dates": list(d_uni),
+        "codes": list(codes),
+        "buy_lot": _mat("Buy_Lot"),
+        "buy_val": _mat("Buy_Val"),
+        "sell_lot": _mat("Sell_Lot"),
+        "sell_val": _mat("Sell_Val"),
+        "active": (_mat("Buy_Freq") + _mat("Sell_Freq")) > 0,
+    }
+
+
+def _consistency_score(net_buy_days: np.ndarray, net_sell_days: np.ndarray, days_active: np.ndarray) -> np.ndarray:
+    # dominan net-buy vs net-sell sepanjang hari aktif (0-100)
+    da = np.where(days_active > 0, days_active, 1)
+    return np.trunc(50 + 50 * ((net_buy_days - net_sell_days) / da)).astype(np.int64)
+
+
+def _rolling_consistency(m: dict, windows: tuple) -> dict:
+    """Statistik rolling w hari bursa untuk semua (tanggal, broker) dari 1 set cumsum di matriks harian.
+
+    Return {w: {"act", "pos", "neg", "net"}}; tiap array (tanggal x broker), baris t = window yang berakhir di t.
+    """
+    net = m["buy_lot"] - m["sell_lot"]
+    zero = np.zeros((1, net.shape[1]))
+    cs = {
+        "act": np.vstack([zero, np.cumsum(m["active"], axis=0)]),
+        "pos": np.vstack([zero, np.cumsum(net > 0, axis=0)]),
+        "neg": np.vstack([zero, np.cumsum(net < 0, axis=0)]),
+        "net": np.vstack([zero, np.cumsum(net, axis=0)]),
+    }
+    end = np.arange(1, net.shape[0] + 1)
+    out = {}
+    for w in windows:
+        start = np.maximum(end - int(w), 0)
+        out[int(w)] = {k: c[end] - c[start] for k, c in cs.items()}
+    return out
+
+
+@traced()
+def broker_consistency_rolling(df: pd.DataFrame, windows: tuple = CONSISTENCY_WINDOWS) -> pd.DataFrame:
+    """Consistency score + net lot rolling (5/10/20 hari bursa) per (tanggal, broker), long format.
+
+    Semua window dihitung dari cumsum yang sama (tanpa loop per broker / menjalankan ulang per window).
+    Kolom: Date, Code, Window, Days_Active, Net_Buy_Days, Net_Sell_Days, Net_Lot, Score.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    m = _broker_daily_matrix(df)
+    if not m["dates"] or not m["codes"]:
+        return pd.DataFrame()
+    n_d, n_b = len(m["dates"]), len(m["codes"])
+    frames = []
+    for w, r in _rolling_consistency(m, windows).items():
+        frames.append(pd.DataFrame({
+            "Date": np.repeat(np.array(m["dates"], dtype=object), n_b),
+            "Code": np.tile(np.array(m["codes"], dtype=object), n_d),
+            "Window": w,
+            "Days_Active": r["act"].ravel().astype(np.int64),
+            "Net_Buy_Days": r["pos"].ravel().astype(np.int64),
+            "Net_Sell_Days": r["neg"].ravel().astype(np.int64),
+            "Net_Lot": r["net"].ravel(),
+            "Score": _consistency_score(r["pos"], r["neg"], r["act"]).ravel(),
+        }))
+    out = pd.concat(frames, ignore_index=True)
+    return out[out["Days_Active"] > 0].reset_index(drop=True)
+
+
+@traced()
+def broker_consistency(df: pd.DataFrame, windows: tuple = CONSISTENCY_WINDOWS) -> pd.DataFrame:
+    """Konsistensi broker multi-hari (vectorized di matriks tanggal x broker).
+
+    Kolom window (mis. Score_5D / Net_Lot_5D) = nilai untuk N hari bursa terakhir di data,
+    untuk melihat akumulasi yang makin cepat atau mulai memudar dibanding keseluruhan periode.
+    """
+    if df.empty:
+        return pd.DataFrame()
+    m = _broker_daily_matrix(df)
+    if not m["dates"] or not m["codes"]:
+        return pd.DataFrame()
+
+    active = m["active"]
+    net_lot_d = m["buy_lot"] - m["sell_lot"]
+    net_val_d = m["buy_val"] - m["sell_val"]
+    keep = active.any(axis=0)
+
+    days_active = active.sum(axis=0)
+    net_buy_days = (net_lot_d > 0).sum(axis=0)
+    net_sell_days = (net_lot_d < 0).sum(axis=0)
+    agg = pd.DataFrame({
+        "Code": m["codes"],
+        "Days_Active": days_active.astype(np.int64),
+        "Net_Buy_Days": net_buy_days.astype(np.int64),
+        "Net_Sell_Days": net_sell_days.astype(np.int64),
+        "Net_Lot": net_lot_d.sum(axis=0),
+        "Net_Val": net_val_d.sum(axis=0),
+        "Buy_Lot": m["buy_lot"].sum(axis=0),
+        "Sell_Lot": m["sell_lot"].sum(axis=0),
+        "Buy_Val": m["buy_val"].sum(axis=0),
+        "Sell_Val": m["sell_val"].sum(axis=0),
+    })[keep].reset_index(drop=True)
+
+    # avg prices
+    with np.errstate(divide="ignore", invalid="ignore"):
+        buy_avg = np.round(agg["Buy_Val"].to_numpy() / (agg["Buy_Lot"].to_numpy() * 100))
+        sell_avg = np.round(agg["Sell_Val"].to_numpy() / (agg["Sell_Lot"].to_numpy() * 100))
+    agg["Buy_Avg"] = np.where(agg["Buy_Lot"] > 0, buy_avg, 0).astype(np.int64)
+    agg["Sell_Avg"] = np.where(agg["Sell_Lot"] > 0, sell_avg, 0).astype(np.int64)
+
+    agg["Consistency_Score"] = _consistency_score(
+        agg["Net_Buy_Days"].to_numpy(), agg["Net_Sell_Days"].to_numpy(), agg["Days_Active"].to_numpy()
+    )
+
+    ids = broker_ids(agg["Code"])
+    agg["Name"] = BROKER_REGISTRY["name"].take(ids)
+    agg["Group"] = BROKER_REGISTRY["group"].take(ids)
+
+    # window N hari bursa terakhir (baris terakhir dari rolling cumsum)
+    for w, r in _rolling_consistency(m, windows).items():
+        agg[f"Score_{w}D"] = _consistency_score(r["pos"][-1], r["neg"][-1], r["act"][-1])[keep]
+        agg[f"Net_Lot_{w}D"] = r["net"][-1][keep]
+
+    # urut: net val besar + skor konsisten
+    agg = agg.sort_values(["Net_Val","Consistency_Score"], ascending=[False, False])
+    return agg
@@ -0,0 +1,123 @@
+"""Flow broker x broker: matriks aliran lot / value, top link, total per broker, data Sankey."""
+import numpy as np
+import pandas as pd
+
+from .analytics import _broker_code_index
+from .brokers import BROKER_REGISTRY, COLOR_MAP, broker_groups, broker_ids
+from .instrument import traced
+
+
+# ---------------------------
+# Flow engine broker x broker (Sankey + analitik aliran)
+# ---------------------------
+FLOW_GROUPS = ["Asing", "BUMN", "Lokal"]
+
+
+def _hex_to_rgba(hex_color: str, alpha: float) -> str:
+    c_hex = hex_color.lstrip("#")
+    try:
+        rgb = tuple(int(c_hex[i: i + 2], 16) for i in (0, 2, 4))
+        return f"rgba({rgb[0]},{rgb[1]},{rgb[2]},{alpha})"
+    except Exception:
+        return f"rgba(100,100,100,{alpha})"
+
+
+# warna link per group dihitung sekali (bukan parse hex per link)
+_GROUP_LINK_RGBA = {g: _hex_to_rgba(c, 0.4) for g, c in COLOR_MAP.items()}
+
+
+@traced()
+def build_flow_matrix(df: pd.DataFrame) -> dict:
+    """Matriks aliran buyer x seller (dense) untuk Value, Lot, dan frekuensi, dibangun 1x per dataset.
+
+    Return dict: codes, groups (group per broker), value / lot / freq (array n x n, baris = buyer,
+    kolom = seller). Broker yang tidak pernah muncul tidak ikut. Top-N link, aliran antar group, dan
+    total per broker tinggal slice / reduksi dari matriks ini.
+    """
+    if df.empty:
+        codes, b_idx, s_idx = pd.Index([]), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    else:
+        codes, b_idx, s_idx = _broker_code_index(df)
+    ok = (b_idx >= 0) & (s_idx >= 0)
+    n = len(codes)
+    flat = b_idx[ok] * n + s_idx[ok]
+
+    def _mat(col):
+        if col is None:
+            return np.bincount(flat, minlength=n * n).reshape(n, n).astype(np.int64)
+        w = df[col].to_numpy(dtype=float)[ok]
+        return np.rint(np.bincount(flat, weights=w, minlength=n * n)).astype(np.int64).reshape(n, n)
+
+    freq = _mat(None)
+    value = _mat("Value") if n else freq
+    lot = _mat("Lot") if n else freq
+
+    used = (freq.sum(axis=0) + freq.sum(axis=1)) > 0
+    codes = [str(c) for c in np.asarray(codes, dtype=object)[used]]
+    sub = np.ix_(used, used)
+    return {
+        "codes": codes,
+        "groups": broker_groups(codes),
+        "value": value[sub],
+        "lot": lot[sub],
+        "freq": freq[sub],
+    }
+
+
+def _flow_metric(flow: dict, metric: str) -> np.ndarray:
+    return flow["lot"] if metric == "Lot" else (flow["freq"] if metric == "Freq" else flow["value"])
+
+
+def flow_top_links(flow: dict, top_n: int = 15, metric: str = "Value") -> pd.DataFrame:
+    """Top-N pasangan (buyer, seller) dari matriks: argpartition lalu urut (besar -> kecil)."""
+    m = _flow_metric(flow, metric).ravel()
+    cand = np.flatnonzero(flow["freq"].ravel() > 0)
+    k = min(int(top_n), len(cand))
+    if k <= 0:
+        return pd.DataFrame(columns=["Buyer_Code", "Seller_Code", metric])
+    if len(cand) > k:
+        cand = cand[np.argpartition(-m[cand], k - 1)[:k]]
+    cand = cand[np.lexsort((cand, -m[cand]))]
+    n = len(flow["codes"])
+    codes = np.array(flow["codes"], dtype=object)
+    return pd.DataFrame({"Buyer_Code": codes[cand // n], "Seller_Code": codes[cand % n], metric: m[cand]})
+
+
+def flow_broker_totals(flow: dict, metric: str = "Value") -> pd.DataFrame:
+    """Total per broker dari matriks: Buy = jumlah baris, Sell = jumlah kolom, Net = Buy - Sell."""
+    m = _flow_metric(flow, metric)
+    buy, sell = m.sum(axis=1), m.sum(axis=0)
+    return pd.DataFrame({"Buy": buy, "Sell": sell, "Net": buy - sell, "Group": flow["groups"]},
+                        index=pd.Index(flow["codes"], name="Code"))
+
+
+def flow_group_matrix(flow: dict, metric: str = "Value") -> pd.DataFrame:
+    """Aliran antar group (Asing/BUMN/Lokal): baris = group buyer, kolom = group seller."""
+    m = _flow_metric(flow, metric)
+    onehot = (flow["groups"][:, None] == np.array(FLOW_GROUPS, dtype=object)[None, :]).astype(m.dtype)
+    g = onehot.T @ m @ onehot
+    return pd.DataFrame(g, index=pd.Index(FLOW_GROUPS, name="Buyer"), columns=pd.Index(FLOW_GROUPS, name="Seller"))
+
+
+def sankey_from_flow(flow: dict, top_n: int = 15, metric: str = "Value"):
+    """Data Sankey (labels, colors, src, tgt, vals, link_colors) dari matriks aliran (cukup top-k)."""
+    links = flow_top_links(flow, top_n=top_n, metric=metric)
+    sources = [f"{c} (Buyer)" for c in links["Buyer_Code"]]
+    targets = [f"{c} (Seller)" for c in links["Seller_Code"]]
+
+    labels = list(dict.fromkeys(sources + targets))
+    node_map = {k: v for v, k in enumerate(labels)}
+    node_ids = broker_ids([node.split()[0] for node in labels])
+    node_groups = BROKER_REGISTRY["group"].take(node_ids)
+    colors = BROKER_REGISTRY["color"].take(node_ids).tolist()
+
+    src = [node_map[x] for x in sources]
+    tgt = [node_map[x] for x in targets]
+    vals = links[metric].tolist()
+    link_colors = [_GROUP_LINK_RGBA.get(node_groups[s], "rgba(100,100,100,0.4)") for s in src]
+    return labels, colors, src, tgt, vals, link_colors
+
+
+def build_sankey(df, top_n=15, metric="Value"):
+    """Data Sankey top_n aliran buyer -> seller dari trade (lewat build_flow_matrix + sankey_from_flow)."""
+    return sankey_from_flow(build_flow_matrix(df), top_n=top_n, metric=metric)
@@ -0,0 +1,65 @@
+"""Format angka untuk label chart, tabel, dan kalimat insight (gaya Indonesia)."""
+import pandas as pd
+
+
+def format_number_label(value):
+    """Format angka untuk IDR: K/M/B/T (K=ribu, M=juta, B=miliar, T=triliun)."""
+    try:
+        value = float(value)
+    except Exception:
+        return str(value)
+    if pd.isna(value):
+        return "0"
+    abs_val = abs(value)
+    if abs_val >= 1e12:
+        return f"{value/1e12:.2f}T"
+    if abs_val >= 1e9:
+        return f"{value/1e9:.2f}B"
+    if abs_val >= 1e6:
+        return f"{value/1e6:.2f}M"
+    if abs_val >= 1e3:
+        return f"{value/1e3:.2f}K"
+    return f"{value:,.0f}"
+
+
+def format_lot_label(value):
+    try:
+        value = float(value)
+    except Exception:
+        return str(value)
+    abs_val = abs(value)
+    if abs_val >= 1e6:
+        return f"{value/1e6:.2f}M"
+    if abs_val >= 1e3:
+        return f"{value/1e3:.2f}K"
+    return f"{value:,.0f}"
+
+def format_freq_label(value):
+    try:
+        value = float(value)
+    except Exception:
+        return str(value)
+    abs_val = abs(value)
+    if abs_val >= 1e6:
+        return f"{value/1e6:.2f}M"
+    if abs_val >= 1e3:
+        return f"{value/1e3:.2f}K"
+    return f"{value:,.0f}"
+    abs_val = abs(value)
+    if abs_val >= 1e12:
+        return f"{value/1e12:.2f}T"
+    if abs_val >= 1e9:
+        return f"{value/1e9:.2f}B"
+    if abs_val >= 1e6:
+        return f"{value/1e6:.2f}M"
+    if abs_val >= 1e3:
+        return f"{value/1e3:.2f}K"
+    return f"{value:,.0f}"
+
+
+def _fmt_id(x) -> str:
+    """Format angka Indonesia untuk tampilan ringkas."""
+    try:
+        return f"{int(round(float(x))):,}".replace(",", ".")
+    except Exception:
+        return str(x)
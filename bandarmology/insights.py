@@ -0,0 +1,134 @@
+"""Insight engine gaya bandar: bullet + kesimpulan + tone untuk tiap section dashboard."""
+import pandas as pd
+
+from .analytics import compute_trade_stats
+from .flow import flow_broker_totals
+from .formatting import _fmt_id, format_number_label
+
+
+def make_fd_insight(fd_stats: dict, mode_key: str = "value") -> tuple[list[str], str, str]:
+    m = fd_stats.get(mode_key, {}) if fd_stats else {}
+    net = float(m.get("Net_Foreign", 0))
+    fp = float(m.get("Foreign_Pct", 0))
+    label = "Asing Akumulasi" if net > 0 else ("Asing Distribusi" if net < 0 else "Asing Netral")
+    tone = "good" if net > 0 else ("bad" if net < 0 else "neutral")
+
+    bullets = [
+        f"Dominasi asing (2 sisi): <b>{fp:.2f}%</b> | domestik: <b>{float(m.get('Domestic_Pct',0)):.2f}%</b>.",
+        f"Net asing: <b>{format_number_label(net) if mode_key=='value' else _fmt_id(net)}</b> ({label}).",
+        "Kalau asing net buy saat harga tidak liar (naik bertahap), biasanya itu ciri akumulasi yang rapi.",
+        "Kalau asing net sell saat harga naik (ritel FOMO), seringnya itu distribusi."
+    ]
+    conclusion = f"{label} → fokus validasi dengan struktur harga (HH/HL) + volume."
+    return bullets, conclusion, tone
+
+def make_broker_summary_insight(summ: pd.DataFrame, net_mode: bool = True) -> tuple[list[str], str, str]:
+    if summ is None or summ.empty:
+        return [], "Data broker summary kosong.", "neutral"
+    # Top net buy/sell
+    top_acc = summ.sort_values("Net_Val", ascending=False).head(3)
+    top_dist = summ.sort_values("Net_Val", ascending=True).head(3)
+    acc_txt = ", ".join([f"<b>{r['Code']}</b> (Net Rp {format_number_label(r['Net_Val'])})" for _, r in top_acc.iterrows()])
+    dist_txt = ", ".join([f"<b>{r['Code']}</b> (Net Rp {format_number_label(r['Net_Val'])})" for _, r in top_dist.iterrows()])
+
+    # Konsentrasi top 5
+    top5 = summ.reindex(summ["Net_Val"].abs().sort_values(ascending=False).index).head(5)
+    conc = (top5["Net_Val"].abs().sum() / summ["Net_Val"].abs().sum() * 100) if summ["Net_Val"].abs().sum() else 0
+
+    bullets = [
+        f"Top akumulasi (net buy): {acc_txt}.",
+        f"Top distribusi (net sell): {dist_txt}.",
+        f"Konsentrasi 5 broker paling dominan: <b>{conc:.1f}%</b> (semakin tinggi = pergerakan lebih 'dikunci' tangan besar).",
+        "Baca cepat: net buy besar + muncul berulang beberapa hari = kandidat bandar akumulasi.",
+    ]
+    net_total = float(summ["Net_Val"].sum())
+    tone = "good" if net_total > 0 else ("bad" if net_total < 0 else "neutral")
+    conclusion = "Akumulasi lebih kuat" if net_total > 0 else ("Distribusi lebih kuat" if net_total < 0 else "Kekuatan seimbang")
+    return bullets, conclusion, tone
+
+def make_consistency_insight(cons: pd.DataFrame) -> tuple[list[str], str, str]:
+    if cons is None or cons.empty:
+        return [], "Belum cukup data multi-day.", "neutral"
+    # Score: Net_Val + Consistency_Score
+    work = cons.copy()
+    # Top akumulasi konsisten
+    topA = work[work["Net_Lot"] > 0].head(5)
+    topD = work[work["Net_Lot"] < 0].sort_values("Net_Lot").head(5)
+
+    def _fmt_row(r):
+        return f"<b>{r['Code']}</b> (days {int(r['Days_Active'])}, net lot {_fmt_id(r['Net_Lot'])}, score {int(r['Consistency_Score'])})"
+
+    bullets = [
+        "<b>Cara baca tabel:</b> cari kombinasi <b>Days_Active tinggi</b> + <b>Net_Lot besar</b> + <b>Consistency_Score tinggi</b> → broker kerja multi-hari (akumulasi).",
+        "Days_Active = seberapa sering broker aktif di periode; Consistency_Score mendekati 100 = lebih sering net buy, mendekati 0 = lebih sering net sell.",
+        "Top akumulasi konsisten: " + (", ".join([_fmt_row(r) for _, r in topA.iterrows()]) if not topA.empty else "—"),
+        "Top distribusi konsisten: " + (", ".join([_fmt_row(r) for _, r in topD.iterrows()]) if not topD.empty else "—"),
+    ]
+    tone = "good" if not topA.empty and (topA["Net_Lot"].sum() > abs(topD["Net_Lot"].sum()) if not topD.empty else True) else "neutral"
+    conclusion = "Ada indikasi akumulasi multi-hari" if tone == "good" else "Belum ada dominasi akumulasi multi-hari yang jelas"
+    return bullets, conclusion, tone
+
+def make_bigprint_insight(bp: pd.DataFrame) -> tuple[list[str], str, str]:
+    if bp is None or bp.empty:
+        return ["Turunkan percentile atau kurangi minimal lot agar Big Print muncul."], "Tidak ada big print terdeteksi.", "neutral"
+    total_lot = float(bp["Lot"].sum()) if "Lot" in bp.columns else 0
+    thr = int(bp["Threshold_Lot"].iloc[0]) if "Threshold_Lot" in bp.columns and len(bp) else 0
+    counts = bp["Label"].value_counts() if "Label" in bp.columns else pd.Series(dtype=int)
+
+    # dominasi serap vs distribusi
+    serap = counts[counts.index.astype(str).str.lower().str.contains("serap")].sum() if not counts.empty else 0
+    dist = counts[counts.index.astype(str).str.lower().str.contains("distribusi")].sum() if not counts.empty else 0
+    tone = "good" if serap > dist else ("bad" if dist > serap else "neutral")
+    concl = "Serap/akumulasi lebih dominan" if serap > dist else ("Distribusi lebih dominan" if dist > serap else "Sinyal campur / netral")
+
+    bullets = [
+        f"Threshold Big Print (filter): sekitar <b>{_fmt_id(thr)}</b> lot (atau minimal lot).",
+        f"Total lot Big Print terdeteksi: <b>{_fmt_id(total_lot)}</b> lot.",
+        "Dominasi label: " + (", ".join([f"<b>{k}</b> ({int(v)})" for k, v in counts.head(5).items()]) if not counts.empty else "—"),
+        "Baca cepat: <b>Serap</b> = transaksi besar tapi harga tidak jatuh (ada yang nampung). <b>Distribusi</b> = transaksi besar diikuti pelemahan (barang dilepas)."
+    ]
+    return bullets, concl, tone
+
+def make_tradebook_insight(df: pd.DataFrame, stats=None) -> tuple[list[str], str, str]:
+    if df is None or df.empty:
+        return [], "Trade book kosong.", "neutral"
+    if stats is None:
+        stats = compute_trade_stats(df)
+    buy_lot, sell_lot, buy_pct = stats.buy_lot, stats.sell_lot, stats.buy_pct
+    tone = "good" if buy_lot > sell_lot else ("bad" if sell_lot > buy_lot else "neutral")
+    concl = "Tekanan beli lebih dominan" if buy_lot > sell_lot else ("Tekanan jual lebih dominan" if sell_lot > buy_lot else "Seimbang")
+    bullets = [
+        f"Total lot agresif: Buy <b>{_fmt_id(buy_lot)}</b> vs Sell <b>{_fmt_id(sell_lot)}</b> (Buy {buy_pct:.1f}%).",
+        "Kalau Buy dominan tapi harga tidak naik → bisa jadi ada supply besar (ditahan). Kalau Buy dominan dan harga naik bertahap → akumulasi rapi.",
+        "Kalau Sell dominan saat harga naik → rawan distribusi (ritel FOMO).",
+    ]
+    return bullets, concl, tone
+
+def make_sankey_distribution_insight(df: pd.DataFrame, metric_col: str = "Value", flow: dict | None = None) -> tuple[list[str], str, str]:
+    if df is None or df.empty:
+        return [], "Data broker distribution kosong.", "neutral"
+    # Net per broker (gunakan summari kasar dari buyer/seller)
+    if flow is not None:
+        net = flow_broker_totals(flow, metric_col)["Net"].astype(float).sort_values(ascending=False)
+    else:
+        buy = df.groupby("Buyer_Code", observed=True)[metric_col].sum()
+        sell = df.groupby("Seller_Code", observed=True)[metric_col].sum()
+        buy.index = buy.index.astype(str)
+        sell.index = sell.index.astype(str)
+        net = buy.subtract(sell, fill_value=0).sort_values(ascending=False)
+
+    top_acc = net.head(5)
+    top_dist = net.tail(5).sort_values()
+
+    bullets = [
+        "Top akumulasi (net buy): " + ", ".join([f"<b>{k}</b> ({format_number_label(v) if metric_col=='Value' else _fmt_id(v)})" for k,v in top_acc.items()]),
+        "Top distribusi (net sell): " + ", ".join([f"<b>{k}</b> ({format_number_label(v) if metric_col=='Value' else _fmt_id(v)})" for k,v in top_dist.items()]),
+    ]
+    # konsentrasi
+    abs_total = float(net.abs().sum())
+    conc = float(top_acc.abs().sum() / abs_total * 100) if abs_total else 0
+    bullets.append(f"Konsentrasi 5 netteratas: <b>{conc:.1f}%</b> (tinggi = lebih 'dikunci' bandar).")
+
+    tone = "good" if top_acc.sum() > abs(top_dist.sum()) else ("bad" if abs(top_dist.sum()) > top_acc.sum() else "neutral")
+    concl = "Net buy lebih dominan" if tone=="good" else ("Net sell lebih dominan" if tone=="bad" else "Netral / campur")
+    return bullets, concl, tone
@@ -0,0 +1,163 @@
+"""Instrumentasi opsional per tahap: waktu, baris in/out, dan delta memori (RSS) ke daftar record.
+
+Mati secara default. Selama start_trace() belum dipanggil di konteks yang sama, stage() hanya mengembalikan
+objek no-op bersama dan @traced langsung memanggil fungsi aslinya (1x ContextVar.get per panggilan), jadi
+fungsi analitik bisa tetap di-dekorasi permanen.
+"""
+import datetime
+import functools
+import json
+import os
+import time
+from contextvars import ContextVar
+
+import pandas as pd
+
+try:
+    import psutil
+    _PROC = psutil.Process()
+except Exception:
+    _PROC = None
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+# record tahap untuk run yang sedang diinstrumentasi (None = mati); per thread / session Streamlit
+_TRACE: ContextVar[list | None] = ContextVar("bandar_trace", default=None)
+_DEPTH: ContextVar[int] = ContextVar("bandar_trace_depth", default=0)
+
+
+def _rss_bytes() -> int | None:
+    """RSS proses saat ini (psutil, fallback /proc/self/statm); None kalau tidak tersedia."""
+    if _PROC is not None:
+        try:
+            return int(_PROC.memory_info().rss)
+        except Exception:
+            pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except Exception:
+        return None
+
+
+def count_rows(obj) -> int | None:
+    """Jumlah baris objek hasil / input tahap (DataFrame, TradeStats, dict rollup, tuple berisi frame)."""
+    if obj is None:
+        return None
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    rows = getattr(obj, "rows", None)
+    if isinstance(rows, int):
+        return rows
+    if isinstance(obj, tuple):
+        for x in obj:
+            if isinstance(x, pd.DataFrame):
+                return len(x)
+    if isinstance(obj, dict) and isinstance(obj.get("df"), pd.DataFrame):
+        return len(obj["df"])
+    return None
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def out(self, obj):
+        return obj
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ("rec", "t0", "m0", "token")
+
+    def __init__(self, records: list, name: str, rows_in):
+        self.rec = {"stage": name, "depth": _DEPTH.get(), "rows_in": rows_in}
+        records.append(self.rec)  # urutan = urutan mulai (induk sebelum anak)
+
+    def __enter__(self):
+        self.token = _DEPTH.set(self.rec["depth"] + 1)
+        self.m0 = _rss_bytes()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.rec["seconds"] = time.perf_counter() - self.t0
+        m1 = _rss_bytes()
+        self.rec["mem_delta_mb"] = None if m1 is None or self.m0 is None else (m1 - self.m0) / 2**20
+        self.rec.setdefault("rows_out", None)
+        self.rec["error"] = None if exc_type is None else f"{exc_type.__name__}: {exc}"
+        _DEPTH.reset(self.token)
+        return False
+
+    def out(self, obj):
+        """Catat jumlah baris hasil tahap; return obj apa adanya."""
+        self.rec["rows_out"] = count_rows(obj)
+        return obj
+
+
+def stage(name: str, rows_in=None):
+    """Context manager 1 tahap: `with stage("render: sankey", df) as s: ...; s.out(hasil)`.
+
+    rows_in boleh objek (DataFrame dst) atau angka; dihitung hanya kalau instrumentasi aktif.
+    """
+    records = _TRACE.get()
+    if records is None:
+        return _NOOP
+    return _Stage(records, name, rows_in if rows_in is None or isinstance(rows_in, int) else count_rows(rows_in))
+
+
+def traced(name: str | None = None):
+    """Dekorator: seluruh panggilan fungsi = 1 tahap (rows_in dari argumen pertama, rows_out dari hasil)."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            records = _TRACE.get()
+            if records is None:
+                return fn(*args, **kwargs)
+            with _Stage(records, label, count_rows(args[0]) if args else None) as s:
+                return s.out(fn(*args, **kwargs))
+        return wrapper
+    return deco
+
+
+def start_trace():
+    """Aktifkan instrumentasi di konteks ini; return token untuk stop_trace."""
+    return _TRACE.set([])
+
+
+def stop_trace(token) -> list[dict]:
+    """Matikan instrumentasi; return record tahap (urut mulai) sejak start_trace."""
+    records = _TRACE.get() or []
+    _TRACE.reset(token)
+    return records
+
+
+def trace_frame(records: list[dict]) -> pd.DataFrame:
+    """Record -> tabel (nama tahap diindentasi sesuai kedalaman)."""
+    df = pd.DataFrame(records).reindex(
+        columns=["stage", "depth", "seconds", "rows_in", "rows_out", "mem_delta_mb", "error"]
+    )
+    if not df.empty:
+        df["stage"] = ["  " * int(d) + s for s, d in zip(df["stage"], df["depth"])]
+    return df
+
+
+def write_trace_jsonl(path: str, records: list[dict], **meta) -> None:
+    """Append 1 baris JSON per tahap (+ meta yang sama di tiap baris, mis. run id / saham) ke path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    ts = datetime.datetime.now().isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps({"ts": ts, **meta, **r}, default=str, ensure_ascii=False) + "\n")
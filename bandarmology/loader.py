@@ -0,0 +1,686 @@
+"""Akses database/: resolver tanggal -> file, katalog inkremental, baca + clean file, cache harian."""
+import bisect
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .cleaning import _NAT_NS, _NS_PER_SEC, _RT_RENAME_MAP, clean_running_trade, concat_trade_frames, parse_time_of_day
+from .instrument import traced
+from .paths import CACHE_ROOT, DB_ROOT  # noqa: F401  (di-import modul lain lewat loader)
+
+
+# ---------------------------
+# Resolver tanggal -> path file
+# ---------------------------
+MONTH_ID = {
+    1: 'Januari', 2: 'Februari', 3: 'Maret', 4: 'April', 5: 'Mei', 6: 'Juni',
+    7: 'Juli', 8: 'Agustus', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'Desember',
+}
+
+def _norm_token(s: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '', str(s).lower())
+
+def _resolve_year_folder(p_stock: str, year: int) -> str | None:
+    if not os.path.exists(p_stock):
+        return None
+    target = str(year)
+    p = os.path.join(p_stock, target)
+    if os.path.isdir(p):
+        return target
+    # fallback: cari folder yg cocok (case-insensitive / ada tambahan)
+    for d in os.listdir(p_stock):
+        if os.path.isdir(os.path.join(p_stock, d)) and _norm_token(d) == _norm_token(target):
+            return d
+    return None
+
+def _resolve_month_folder(p_year: str, month: int) -> str | None:
+    if not os.path.exists(p_year):
+        return None
+    id_name = MONTH_ID.get(month, str(month))
+    # kandidat umum
+    candidates = [
+        id_name, id_name.lower(), id_name.upper(),
+        id_name[:3], id_name[:3].lower(),
+        str(month), f'{month:02d}',
+        f'{month}-{id_name}', f'{month:02d}-{id_name}',
+        f'{id_name}-{month}', f'{id_name}-{month:02d}',
+    ]
+    dirs = [d for d in os.listdir(p_year) if os.path.isdir(os.path.join(p_year, d))]
+    norm_map = { _norm_token(d): d for d in dirs }
+    for c in candidates:
+        nc = _norm_token(c)
+        if nc in norm_map:
+            return norm_map[nc]
+    # fallback: coba match mengandung nama bulan / angka bulan
+    for d in dirs:
+        nd = _norm_token(d)
+        if _norm_token(id_name) in nd or _norm_token(f'{month:02d}') in nd:
+            return d
+    return None
+
+
+def _resolve_daily_files(p_month: str, dt_date) -> list[str]:
+    """Cari *semua* file harian yang match (bukan hanya 1 file).
+
+    Perbaikan penting:
+    - Hindari fallback 'dd in filename' yang terlalu longgar (bisa kebaca SEMUA file dalam 1 bulan, terutama kalau dd==mm seperti 12/12).
+    - Match hanya jika:
+        (1) nama file (tanpa ekstensi) diawali day (09.csv / 9_part1.csv / 09-xxx.csv), atau
+        (2) nama file mengandung tanggal lengkap (YYYY-MM-DD / DD-MM-YYYY / YYYYMMDD / DDMMYYYY) dengan separator apa pun.
+
+    Ini mencegah nilai transaksi membengkak (mis. jadi triliunan) karena salah load banyak hari sekaligus.
+    """
+    if not os.path.exists(p_month):
+        return []
+
+    day = int(dt_date.day)
+    month = int(dt_date.month)
+    year = int(dt_date.year)
+
+    files = [f for f in os.listdir(p_month) if f.lower().endswith(('.csv', '.xlsx'))]
+    if not files:
+        return []
+
+    dd, mm, yyyy = f"{day:02d}", f"{month:02d}", str(year)
+
+    def stem_lower(fn: str) -> str:
+        return os.path.splitext(fn)[0].strip().lower()
+
+    # (1) kandidat utama: diawali hari
+    start_day = re.compile(rf"^0?{day}([^0-9]|$)")
+    cand = [f for f in files if start_day.search(stem_lower(f))]
+
+    # (2) kandidat tanggal lengkap (lebih aman)
+    if not cand:
+        s_ddmm = f"{dd}{mm}"
+        s_mmdd = f"{mm}{dd}"
+        s_yyyymmdd = f"{yyyy}{mm}{dd}"
+        s_ddmmyyyy = f"{dd}{mm}{yyyy}"
+
+        # allow separators: -, _, ., space
+        sep = r"[-_\.\s]"
+        full_patterns = [
+            re.compile(rf"{yyyy}{sep}{mm}{sep}{dd}"),
+            re.compile(rf"{dd}{sep}{mm}{sep}{yyyy}"),
+            re.compile(rf"{yyyy}{sep}{dd}{sep}{mm}"),  # jarang, tapi biarin
+            re.compile(rf"{dd}{sep}{yyyy}{sep}{mm}"),  # jarang, tapi biarin
+            re.compile(rf"{s_yyyymmdd}"),
+            re.compile(rf"{s_ddmmyyyy}"),
+        ]
+
+        for f in files:
+            s = f.lower()
+            if any(p.search(s) for p in full_patterns):
+                cand.append(f)
+
+    # de-dup (tetap jaga urutan)
+    seen = set()
+    cand = [x for x in cand if not (x.lower() in seen or seen.add(x.lower()))]
+
+    # urutan: prefer .csv dulu, lalu alfabet (stabil)
+    cand_sorted = sorted(cand, key=lambda x: (0 if x.lower().endswith('.csv') else 1, x.lower()))
+    return [os.path.join(p_month, fn) for fn in cand_sorted]
+
+def _resolve_daily_file(p_month: str, dt_date) -> str | None:
+    """Backward-compat: ambil file pertama yang match."""
+    files = _resolve_daily_files(p_month, dt_date)
+    return files[0] if files else None
+
+def resolve_database_file(db_root: str, stock: str, dt_date) -> str | None:
+    """Resolve path file database berdasarkan (stock, tanggal)."""
+    p_stock = os.path.join(db_root, stock)
+    year_folder = _resolve_year_folder(p_stock, int(dt_date.year))
+    if not year_folder:
+        return None
+    p_year = os.path.join(p_stock, year_folder)
+    month_folder = _resolve_month_folder(p_year, int(dt_date.month))
+    if not month_folder:
+        return None
+    p_month = os.path.join(p_year, month_folder)
+    return _resolve_daily_file(p_month, dt_date)
+
+
+def resolve_database_files(db_root: str, stock: str, dt_date) -> list[str]:
+    """Resolve *semua* file database berdasarkan (stock, tanggal)."""
+    p_stock = os.path.join(db_root, stock)
+    year_folder = _resolve_year_folder(p_stock, int(dt_date.year))
+    if not year_folder:
+        return []
+    p_year = os.path.join(p_stock, year_folder)
+    month_folder = _resolve_month_folder(p_year, int(dt_date.month))
+    if not month_folder:
+        return []
+    p_month = os.path.join(p_year, month_folder)
+    return _resolve_daily_files(p_month, dt_date)
+
+MONTH_NAME_TO_NUM = {
+    "januari": 1, "jan": 1, "january": 1,
+    "februari": 2, "feb": 2, "february": 2,
+    "maret": 3, "mar": 3, "march": 3,
+    "april": 4, "apr": 4,
+    "mei": 5, "may": 5,
+    "juni": 6, "jun": 6, "june": 6,
+    "juli": 7, "jul": 7, "july": 7,
+    "agustus": 8, "agu": 8, "aug": 8, "august": 8,
+    "september": 9, "sep": 9,
+    "oktober": 10, "okt": 10, "oct": 10, "october": 10,
+    "november": 11, "nov": 11,
+    "desember": 12, "des": 12, "dec": 12, "december": 12,
+}
+
+def _extract_trade_date_from_filepath(fp: str) -> datetime.date | None:
+    """Ambil tanggal dari path database/{SAHAM}/{YYYY}/{BULAN}/{DD}.csv atau DD_*.csv"""
+    try:
+        p = Path(fp)
+        parts = [x for x in p.parts]
+        # cari tahun 4 digit
+        year = None
+        for x in parts:
+            if re.fullmatch(r"\d{4}", x):
+                year = int(x); break
+        if year is None:
+            return None
+        # cari nama bulan (folder setelah tahun biasanya bulan)
+        month = None
+        if str(year) in parts:
+            idx = parts.index(str(year))
+            if idx+1 < len(parts):
+                mname = parts[idx+1].strip().lower()
+                month = MONTH_NAME_TO_NUM.get(mname)
+        if month is None:
+            # fallback: cari token bulan di path
+            for x in parts:
+                m = MONTH_NAME_TO_NUM.get(str(x).strip().lower())
+                if m:
+                    month = m; break
+        if month is None:
+            return None
+        # ambil day dari nama file (leading number)
+        stem = p.stem
+        mday = re.match(r"^\s*(\d{1,2})", stem)
+        if not mday:
+            return None
+        day = int(mday.group(1))
+        return datetime.date(year, month, day)
+    except Exception:
+        return None
+
+def resolve_database_files_range(db_root: str, stock: str, start_date: datetime.date, end_date: datetime.date) -> list[str]:
+    """Kumpulkan semua file yang tersedia untuk rentang tanggal (inklusif).
+
+    Pakai katalog database (lookup bisect); kalau katalog gagal dibangun, fallback ke resolver per hari.
+    """
+    try:
+        _, index = get_database_catalog(db_root, max_age=0)
+        return catalog_files_in_range(index, stock, start_date, end_date)
+    except Exception:
+        pass
+
+    fps: list[str] = []
+    d = start_date
+    while d <= end_date:
+        fps.extend(resolve_database_files(db_root, stock, d))
+        d += datetime.timedelta(days=1)
+    # de-dup
+    seen = set()
+    out = []
+    for fp in fps:
+        k = str(fp)
+        if k not in seen:
+            out.append(fp); seen.add(k)
+    return out
+
+LOAD_WORKERS = int(os.environ.get("BANDAR_LOAD_WORKERS", min(8, os.cpu_count() or 2)))
+
+
+def _read_source_file(fp: str) -> pd.DataFrame:
+    """Baca 1 file (.csv/.xlsx) + tag __source_file & TradeDate dari path."""
+    if fp.lower().endswith(".csv"):
+        dfp = pd.read_csv(fp)
+    else:
+        dfp = pd.read_excel(fp)
+    dfp["__source_file"] = os.path.basename(fp)
+    td = _extract_trade_date_from_filepath(fp)
+    if td is not None:
+        dfp["TradeDate"] = td
+    return dfp
+
+
+def _timed_read_source_file(fp: str) -> tuple[pd.DataFrame | None, dict]:
+    """Top-level (bisa dipickle ke process pool): baca 1 file + catat durasi / error-nya."""
+    t0 = time.perf_counter()
+    try:
+        dfp = _read_source_file(fp)
+        return dfp, {"file": fp, "ok": True, "rows": int(len(dfp)), "seconds": time.perf_counter() - t0, "error": None}
+    except Exception as e:
+        return None, {"file": fp, "ok": False, "rows": 0, "seconds": time.perf_counter() - t0,
+                      "error": f"{type(e).__name__}: {e}"}
+
+
+def read_database_files(filepaths: list[str], workers: int | None = None) -> tuple[list[pd.DataFrame | None], list[dict]]:
+    """Baca banyak file paralel. Return (frames, report) dengan urutan = urutan filepaths.
+
+    CSV dibaca di thread pool (I/O + parser C pandas); XLSX di process pool karena openpyxl murni Python.
+    Kalau process pool tidak bisa dipakai (mis. fungsi tidak bisa dipickle di environment tertentu),
+    XLSX otomatis dibaca di thread pool. File gagal tidak di-skip diam-diam: ada di report (ok=False).
+    """
+    workers = LOAD_WORKERS if workers is None else max(1, int(workers))
+    results: list[tuple[pd.DataFrame | None, dict] | None] = [None] * len(filepaths)
+
+    if workers <= 1 or len(filepaths) <= 1:
+        for i, fp in enumerate(filepaths):
+            results[i] = _timed_read_source_file(fp)
+    else:
+        xlsx_idx = [i for i, fp in enumerate(filepaths) if not fp.lower().endswith(".csv")]
+        xlsx_set = set(xlsx_idx)
+        thread_idx = [i for i in range(len(filepaths)) if i not in xlsx_set]
+        if len(xlsx_idx) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, len(xlsx_idx))) as pool:
+                    for i, res in zip(xlsx_idx, pool.map(_timed_read_source_file, [filepaths[i] for i in xlsx_idx])):
+                        results[i] = res
+            except Exception:
+                thread_idx = sorted(thread_idx + [i for i in xlsx_idx if results[i] is None])
+        else:
+            thread_idx = sorted(thread_idx + xlsx_idx)
+        if thread_idx:
+            with ThreadPoolExecutor(max_workers=min(workers, len(thread_idx))) as pool:
+                for i, res in zip(thread_idx, pool.map(_timed_read_source_file, [filepaths[i] for i in thread_idx])):
+                    results[i] = res
+
+    frames = [r[0] for r in results]
+    report = [r[1] for r in results]
+    return frames, report
+
+
+@traced()
+def load_database_files(filepaths: list[str], workers: int | None = None, report: list | None = None) -> pd.DataFrame:
+    """Override: load multi file (paralel) + inject TradeDate dari path untuk multi-day analysis.
+
+    report (opsional) diisi durasi, jumlah baris, dan error per file.
+    """
+    frames, rep = read_database_files(filepaths, workers=workers)
+    if report is not None:
+        report.extend(rep)
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------------
+# Cache harian (cleaned running trade per saham + tanggal)
+# ---------------------------
+CLEAN_CACHE_VERSION = 2
+
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+
+def _file_signature(fp: str) -> list:
+    """Signature file sumber: path + mtime + size. Berubah => cache hari itu di-rebuild."""
+    info = os.stat(fp)
+    return [os.path.abspath(fp), int(info.st_mtime_ns), int(info.st_size)]
+
+
+def _clean_cache_paths(stock: str, trade_date: datetime.date, kind: str = "clean") -> tuple[str, str]:
+    """Path (data, manifest) cache cleaned (atau rollup, kind="rollup") untuk 1 saham + 1 tanggal."""
+    base = os.path.join(CACHE_ROOT, kind, str(stock).upper().strip() or "UNKNOWN", trade_date.isoformat())
+    ext = ".parquet" if _HAS_PYARROW else ".pkl"
+    return base + ext, base + ".json"
+
+
+def _read_frame_cache(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _tmp_path(path: str) -> str:
+    """Nama file tmp unik per proses + thread (penulis paralel tidak saling menimpa file tmp)."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _write_frame_cache(df: pd.DataFrame, path: str):
+    """Tulis atomik (tmp -> replace) supaya cache tidak pernah setengah jadi."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = _tmp_path(path)
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+
+def _write_json_atomic(path: str, obj):
+    """JSON (manifest / meta) ditulis atomik seperti _write_frame_cache."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = _tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
+
+
+def _clean_cache_signature(filepaths: list[str]) -> dict:
+    return {"version": CLEAN_CACHE_VERSION, "files": [_file_signature(fp) for fp in filepaths]}
+
+
+def _load_clean_cache(stock: str, trade_date: datetime.date, sig: dict, kind: str = "clean") -> pd.DataFrame | None:
+    """Ambil data cleaned dari cache kalau manifest-nya masih cocok dengan file sumber; None kalau miss."""
+    data_path, meta_path = _clean_cache_paths(stock, trade_date, kind)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        empty = meta.pop("empty", False)
+        if meta == sig:
+            if empty:
+                return pd.DataFrame()
+            if os.path.exists(data_path):
+                return _read_frame_cache(data_path)
+    except Exception:
+        pass
+    return None
+
+
+def _store_clean_cache(stock: str, trade_date: datetime.date, sig: dict, df: pd.DataFrame, kind: str = "clean") -> None:
+    """Simpan 1 hari ke cache. Hari tanpa baris (libur, file cuma header) disimpan sebagai manifest
+    ber-flag "empty" tanpa file data, supaya file mentahnya tidak di-parse ulang di setiap load."""
+    if df is None:
+        return
+    data_path, meta_path = _clean_cache_paths(stock, trade_date, kind)
+    try:
+        if df.empty:
+            if os.path.exists(data_path):
+                os.remove(data_path)
+            _write_json_atomic(meta_path, {**sig, "empty": True})
+            return
+        _write_frame_cache(df.reset_index(drop=True), data_path)
+        _write_json_atomic(meta_path, sig)
+    except Exception:
+        pass
+
+
+def _group_files_by_day(filepaths: list[str]) -> tuple[dict[datetime.date, list[str]], list[str]]:
+    """File -> {tanggal: [file]} (urut kemunculan) + daftar file yang tanggalnya tidak terbaca dari path."""
+    by_day: dict[datetime.date, list[str]] = {}
+    undated: list[str] = []
+    for fp in filepaths:
+        td = _extract_trade_date_from_filepath(fp)
+        if td is None:
+            undated.append(fp)
+        else:
+            by_day.setdefault(td, []).append(fp)
+    return by_day, undated
+
+
+@traced()
+def load_cleaned_database_files(
+    stock: str,
+    filepaths: list[str],
+    trade_date: datetime.date | None = None,
+    workers: int | None = None,
+    report: list | None = None,
+    store: bool = True,
+) -> pd.DataFrame:
+    """Load + clean banyak file sekaligus, per (saham, tanggal) lewat cache.
+
+    Rentang multi-minggu jadi sekadar concat cache harian (tanpa parse CSV + cleaning ulang).
+    Semua file dari hari yang cache-nya miss dibaca paralel dalam 1 batch, lalu di-clean per hari.
+    Hari yang salah satu filenya gagal dibaca tidak disimpan ke cache (supaya dicoba lagi nanti).
+    File yang tanggalnya tidak terbaca dari path tetap di-clean langsung (tanpa cache).
+    report (opsional) diisi status per file; hari dari cache dicatat 1 baris dengan cached=True.
+    store=False: cache cleaned tetap dibaca tapi hari yang miss tidak ditulis (ingest rollup / OHLCV / skor
+    untuk riwayat panjang, supaya .cache/clean tidak tumbuh seukuran seluruh histori).
+    """
+    by_day, undated = _group_files_by_day(filepaths)
+
+    day_frames: dict[datetime.date, pd.DataFrame] = {}
+    misses: dict[datetime.date, dict] = {}
+    for td, fps in by_day.items():
+        sig = _clean_cache_signature(fps)
+        t0 = time.perf_counter()
+        cached = _load_clean_cache(stock, td, sig)
+        if cached is None:
+            misses[td] = sig
+            continue
+        day_frames[td] = cached
+        if report is not None:
+            report.append({"file": f"{stock} {td.isoformat()} ({len(fps)} file)", "ok": True, "rows": int(len(cached)),
+                           "seconds": time.perf_counter() - t0, "error": None, "cached": True})
+
+    to_read = [fp for td in misses for fp in by_day[td]] + undated
+    frames, rep = read_database_files(to_read, workers=workers) if to_read else ([], [])
+    if report is not None:
+        report.extend(rep)
+
+    pos = 0
+    for td, sig in misses.items():
+        n = len(by_day[td])
+        parts = [f for f in frames[pos:pos + n] if f is not None]
+        ok = all(r["ok"] for r in rep[pos:pos + n])
+        pos += n
+        raw = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        df_day = clean_running_trade(raw, trade_date=td, volume_mode="LOT")
+        if ok and store:
+            _store_clean_cache(stock, td, sig, df_day)
+        day_frames[td] = df_day
+
+    out = [day_frames[td] for td in by_day]
+    if undated:
+        parts = [f for f in frames[pos:] if f is not None]
+        raw = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        out.append(clean_running_trade(raw, trade_date=trade_date, volume_mode="LOT"))
+    return concat_trade_frames(out)
+
+
+# ---------------------------
+# Katalog database (saham -> tanggal -> file) dengan refresh inkremental
+# ---------------------------
+CATALOG_VERSION = 1
+# umur maksimum katalog in-memory (detik) sebelum di-refresh lagi dari disk (rerun Streamlit tidak scan ulang)
+CATALOG_TTL = float(os.environ.get("BANDAR_CATALOG_TTL", 30))
+_TIME_COLUMN_ALIASES = {k for k, v in _RT_RENAME_MAP.items() if v == "Time"}
+_CATALOG_MEM: dict[str, tuple[dict, dict, float]] = {}
+_CATALOG_LOCK = threading.Lock()
+
+
+def _catalog_path(db_root: str) -> str:
+    key = hashlib.sha1(os.path.abspath(db_root).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_ROOT, "catalog", f"{key}.json")
+
+
+def _month_from_folder(name: str) -> int | None:
+    """'Desember' / 'des' / '12' / '12-Desember' -> 12."""
+    n = str(name).strip().lower()
+    if n in MONTH_NAME_TO_NUM:
+        return MONTH_NAME_TO_NUM[n]
+    nums = re.findall(r"\d+", n)
+    if nums and 1 <= int(nums[0]) <= 12:
+        return int(nums[0])
+    nt = _norm_token(n)
+    for key in sorted(MONTH_NAME_TO_NUM, key=len, reverse=True):
+        if len(key) > 3 and key in nt:
+            return MONTH_NAME_TO_NUM[key]
+    return None
+
+
+def _date_from_filename(fn: str, year: int, month: int) -> datetime.date | None:
+    """Tanggal file harian, aturan sama dengan _resolve_daily_files (diawali hari / tanggal lengkap)."""
+    stem = os.path.splitext(fn)[0].strip().lower()
+    cands = []
+    m = re.match(r"^0?(\d{1,2})(?:[^0-9]|$)", stem)
+    if m:
+        cands.append((year, month, int(m.group(1))))
+    else:
+        sep = r"[-_\.\s]?"
+        for m in re.finditer(rf"(\d{{4}}){sep}(\d{{2}}){sep}(\d{{2}})", stem):
+            cands.append((int(m.group(1)), int(m.group(2)), int(m.group(3))))
+        for m in re.finditer(rf"(\d{{2}}){sep}(\d{{2}}){sep}(\d{{4}})", stem):
+            cands.append((int(m.group(3)), int(m.group(2)), int(m.group(1))))
+    for y, mo, d in cands:
+        if y != year or mo != month:
+            continue
+        try:
+            return datetime.date(y, mo, d)
+        except ValueError:
+            continue
+    return None
+
+
+def _scan_file_stats(fp: str) -> dict:
+    """Jumlah baris + jam min/max 1 file (cuma kolom Time yang dibaca untuk CSV)."""
+    try:
+        if fp.lower().endswith(".csv"):
+            dfp = pd.read_csv(fp, usecols=lambda c: str(c).strip().lower() in _TIME_COLUMN_ALIASES)
+            if dfp.shape[1] == 0:
+                dfp = pd.read_csv(fp, usecols=[0])
+        else:
+            dfp = pd.read_excel(fp)
+        time_cols = [c for c in dfp.columns if str(c).strip().lower() in _TIME_COLUMN_ALIASES]
+        out = {"rows": int(len(dfp)), "time_min": None, "time_max": None}
+        if time_cols and len(dfp):
+            tod, _, _ = parse_time_of_day(dfp[time_cols[0]])
+            tod = tod[tod != _NAT_NS]
+            if len(tod):
+                for k, v in (("time_min", tod.min()), ("time_max", tod.max())):
+                    sec = int(v // _NS_PER_SEC)
+                    out[k] = f"{sec // 3600:02d}:{sec // 60 % 60:02d}:{sec % 60:02d}"
+        return out
+    except Exception:
+        return {"rows": None, "time_min": None, "time_max": None}
+
+
+def _cached_listdir(cat: dict, path: str) -> list[list]:
+    """listdir hanya kalau mtime folder berubah; kalau tidak, pakai isi katalog."""
+    mtime = os.stat(path).st_mtime_ns
+    ent = cat["dirs"].get(path)
+    if ent and ent["mtime"] == mtime:
+        return ent["children"]
+    children = sorted([name, os.path.isdir(os.path.join(path, name))] for name in os.listdir(path))
+    cat["dirs"][path] = {"mtime": mtime, "children": children}
+    cat["_dirty"] = True
+    return children
+
+
+def _refresh_catalog(cat: dict, db_root: str):
+    """Jalan dari root; folder yang mtime-nya sama tidak di-listdir ulang.
+
+    File harian selalu di-stat (murah): file yang ditimpa dengan nama sama tidak mengubah mtime folder,
+    jadi statistik file hanya dihitung ulang kalau mtime / size file itu sendiri berubah.
+    """
+    seen_files = set()
+    for stock, is_dir in _cached_listdir(cat, db_root):
+        if not is_dir:
+            continue
+        p_stock = os.path.join(db_root, stock)
+        for ydir, y_is_dir in _cached_listdir(cat, p_stock):
+            if not y_is_dir or not re.fullmatch(r"\d{4}", _norm_token(ydir)):
+                continue
+            year = int(_norm_token(ydir))
+            p_year = os.path.join(p_stock, ydir)
+            for mdir, m_is_dir in _cached_listdir(cat, p_year):
+                month = _month_from_folder(mdir) if m_is_dir else None
+                if month is None:
+                    continue
+                p_month = os.path.join(p_year, mdir)
+                for fn, f_is_dir in _cached_listdir(cat, p_month):
+                    if f_is_dir or not fn.lower().endswith((".csv", ".xlsx")):
+                        continue
+                    td = _date_from_filename(fn, year, month)
+                    if td is None:
+                        continue
+                    fp = os.path.join(p_month, fn)
+                    seen_files.add(fp)
+                    ent = cat["files"].get(fp)
+                    info = os.stat(fp)
+                    sig = (int(info.st_mtime_ns), int(info.st_size))
+                    if ent is not None and (ent["mtime"], ent["size"]) == sig:
+                        continue
+                    cat["files"][fp] = {"stock": stock, "date": td.isoformat(), "mtime": sig[0], "size": sig[1],
+                                        **_scan_file_stats(fp)}
+                    cat["_dirty"] = True
+
+    for fp in [fp for fp in cat["files"] if fp not in seen_files]:
+        del cat["files"][fp]
+        cat["_dirty"] = True
+    for d in [d for d in cat["dirs"] if not os.path.isdir(d)]:
+        del cat["dirs"][d]
+        cat["_dirty"] = True
+
+
+def _build_catalog_index(cat: dict) -> dict:
+    """saham -> {"dates": [iso terurut], "files": {iso: [path]}} (urutan file sama dengan resolver lama)."""
+    index: dict[str, dict] = {}
+    for fp, ent in cat["files"].items():
+        idx = index.setdefault(ent["stock"], {"dates": [], "files": {}})
+        idx["files"].setdefault(ent["date"], []).append(fp)
+    for idx in index.values():
+        idx["dates"] = sorted(idx["files"])
+        for iso, fps in idx["files"].items():
+            fps.sort(key=lambda x: (0 if x.lower().endswith(".csv") else 1, os.path.basename(x).lower()))
+    return index
+
+
+def get_database_catalog(db_root: str, max_age: float | None = None) -> tuple[dict, dict]:
+    """Katalog database/ (dibangun sekali, di-refresh inkremental dari mtime folder / file) + index pencarian.
+
+    Katalog disimpan di .cache/catalog/ supaya restart server tidak perlu scan ulang semua file. Katalog
+    in-memory yang umurnya < max_age detik (default CATALOG_TTL) dipakai apa adanya; max_age=0 = selalu refresh.
+    """
+    max_age = CATALOG_TTL if max_age is None else max_age
+    with _CATALOG_LOCK:
+        cat, index, refreshed = _CATALOG_MEM.get(db_root, (None, None, 0.0))
+        if cat is not None and time.monotonic() - refreshed < max_age:
+            return cat, index
+        path = _catalog_path(db_root)
+        if cat is None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cat = json.load(f)
+                if cat.get("version") != CATALOG_VERSION or cat.get("root") != os.path.abspath(db_root):
+                    cat = None
+            except Exception:
+                cat = None
+        if cat is None:
+            cat = {"version": CATALOG_VERSION, "root": os.path.abspath(db_root), "dirs": {}, "files": {}, "_dirty": True}
+
+        _refresh_catalog(cat, db_root)
+        if index is None or cat.get("_dirty"):
+            index = _build_catalog_index(cat)
+        if cat.pop("_dirty", False):
+            try:
+                _write_json_atomic(path, cat)
+            except Exception:
+                pass
+        _CATALOG_MEM[db_root] = (cat, index, time.monotonic())
+        return cat, index
+
+
+def catalog_files_in_range(index: dict, stock: str, start_date: datetime.date, end_date: datetime.date) -> list[str]:
+    """Semua file saham di rentang tanggal (inklusif) lewat bisect di daftar tanggal terurut."""
+    idx = index.get(stock)
+    if not idx:
+        return []
+    dates = idx["dates"]
+    lo = bisect.bisect_left(dates, start_date.isoformat())
+    hi = bisect.bisect_right(dates, end_date.isoformat())
+    return [fp for iso in dates[lo:hi] for fp in idx["files"][iso]]
+
+
+def catalog_latest_date(index: dict, stock: str) -> datetime.date | None:
+    """Tanggal terakhir yang benar-benar ada datanya (untuk default date picker)."""
+    idx = index.get(stock)
+    if not idx or not idx["dates"]:
+        return None
+    return datetime.date.fromisoformat(idx["dates"][-1])
@@ -0,0 +1,326 @@
+"""Data pasar Yahoo Finance (quote + OHLC) lewat refresher background, cache in-process, dan circuit breaker.
+
+Render halaman tidak pernah menunggu HTTP: market_data() langsung mengembalikan nilai terakhir yang diketahui
+(+ umur / error terakhir), dan thread refresher mengambil data yang sudah lewat TTL di belakang. Kalau Yahoo
+gagal berulang kali (offline / rate limit), breaker terbuka dan semua request dihentikan sementara.
+OHLC harian disimpan per simbol di disk dan hanya bar yang belum ada yang diambil; timeframe = slice lokal.
+"""
+import datetime
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import requests
+
+from .loader import CACHE_ROOT, _HAS_PYARROW, _read_frame_cache, _write_frame_cache, _write_json_atomic
+
+YAHOO_BASE = os.environ.get("BANDAR_YAHOO_BASE", "https://query1.finance.yahoo.com").rstrip("/")
+
+# TTL per jenis data (detik): umur di atas TTL -> dijadwalkan refresh; di atas 3x TTL -> ditandai basi
+MARKET_TTL = {"quotes": 60, "ohlc": 3600}
+# key yang tidak diminta halaman mana pun selama ini tidak di-refresh lagi
+MARKET_IDLE_SECONDS = 15 * 60
+# breaker: sekian kegagalan beruntun -> jeda (dobel tiap kali terbuka lagi, maks BREAKER_MAX_COOLDOWN)
+BREAKER_FAILS = 3
+BREAKER_COOLDOWN = 120
+BREAKER_MAX_COOLDOWN = 15 * 60
+
+_YAHOO_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json,text/plain,*/*",
+    "Accept-Language": "en-US,en;q=0.9,id;q=0.8",
+    "Connection": "keep-alive",
+}
+
+_YAHOO_SESSION = requests.Session()
+_YAHOO_SESSION.headers.update(_YAHOO_HEADERS)
+
+
+def _yahoo_get(url: str, timeout: int = 15, retries: int = 3) -> requests.Response:
+    """HTTP GET ke Yahoo dengan retry ringan (untuk 429/5xx)."""
+    last_exc = None
+    for i in range(retries):
+        try:
+            r = _YAHOO_SESSION.get(url, timeout=timeout)
+            # rate limit / transient
+            if r.status_code in (429, 500, 502, 503, 504):
+                last_exc = RuntimeError(f"HTTP {r.status_code}")
+                time.sleep(0.6 * (i + 1))
+                continue
+            r.raise_for_status()
+            return r
+        except Exception as e:
+            last_exc = e
+            time.sleep(0.6 * (i + 1))
+    # lempar exception terakhir biar kelihatan di debug kalau perlu
+    raise last_exc if last_exc else RuntimeError("Yahoo request failed")
+
+
+# ---------------------------
+# Fetcher (sinkron; error dilempar supaya breaker bisa menghitung kegagalan)
+# ---------------------------
+def fetch_yahoo_quotes(symbols: tuple[str, ...]) -> dict:
+    """Batch quote: 1 request untuk banyak simbol -> {symbol: quote dict}."""
+    if not symbols:
+        return {}
+    url = f"{YAHOO_BASE}/v7/finance/quote?symbols={','.join(symbols)}"
+    j = _yahoo_get(url, timeout=12, retries=2).json()
+    res = (j.get("quoteResponse", {}) or {}).get("result", []) or []
+    return {item.get("symbol"): item for item in res if item.get("symbol")}
+
+
+def parse_yahoo_chart(j: dict) -> pd.DataFrame:
+    """JSON chart API Yahoo -> DataFrame Date/Open/High/Low/Close/Volume (kosong kalau tidak ada data)."""
+    result = (j.get("chart", {}) or {}).get("result", []) or []
+    if not result:
+        return pd.DataFrame()
+
+    res = result[0]
+    ts = res.get("timestamp", []) or []
+    ind = (res.get("indicators", {}) or {}).get("quote", []) or []
+    if not ts or not ind:
+        return pd.DataFrame()
+
+    q = ind[0]
+    return pd.DataFrame({
+        "Date": pd.to_datetime(ts, unit="s"),
+        "Open": q.get("open", []),
+        "High": q.get("high", []),
+        "Low": q.get("low", []),
+        "Close": q.get("close", []),
+        "Volume": q.get("volume", []),
+    }).dropna(subset=["Open", "High", "Low", "Close"])
+
+
+def fetch_yahoo_ohlc(symbol: str, rng: str = "3mo", interval: str = "1d",
+                     start: datetime.date | None = None) -> pd.DataFrame:
+    """OHLC dari Yahoo chart API: timeframe rng, atau (start diisi) hanya bar sejak tanggal start s/d sekarang."""
+    if start is None:
+        span = f"range={rng}"
+    else:
+        p1 = int(datetime.datetime.combine(start, datetime.time(), datetime.timezone.utc).timestamp())
+        span = f"period1={p1}&period2={int(time.time())}"
+    url = f"{YAHOO_BASE}/v8/finance/chart/{symbol}?{span}&interval={interval}"
+    return parse_yahoo_chart(_yahoo_get(url, timeout=15, retries=2).json())
+
+
+# ---------------------------
+# Store OHLC harian di disk (per simbol, update inkremental)
+# ---------------------------
+# .cache/ohlc/<SIMBOL>_<interval>.parquet + .json (waktu fetch terakhir, jumlah bar). Keduanya ditulis atomik
+# (data dulu, lalu meta); meta yang rusak / tidak cocok dengan data = store kosong. Download pertama mengambil
+# OHLC_STORE_FULL_RANGE; update berikutnya hanya bar sejak tanggal terakhir di store (bar terakhir diambil
+# ulang karena bisa masih bar hari berjalan). Timeframe apa pun (1mo..5y) = slice lokal dari store.
+OHLC_STORE_ROOT = os.path.join(CACHE_ROOT, "ohlc")
+OHLC_STORE_VERSION = 1
+OHLC_STORE_FULL_RANGE = "5y"
+OHLC_RANGE_OFFSETS = {
+    "1mo": pd.DateOffset(months=1), "3mo": pd.DateOffset(months=3), "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2), "5y": pd.DateOffset(years=5),
+}
+
+
+def _ohlc_store_paths(symbol: str, interval: str) -> tuple[str, str]:
+    base = os.path.join(OHLC_STORE_ROOT, f"{symbol.upper().strip()}_{interval}")
+    return base + (".parquet" if _HAS_PYARROW else ".pkl"), base + ".json"
+
+
+def load_ohlc_store(symbol: str, interval: str = "1d") -> tuple[pd.DataFrame | None, float | None]:
+    """(OHLC tersimpan, waktu fetch terakhir epoch) — (None, None) kalau belum ada / rusak / versi lama /
+    meta tidak cocok dengan isi data (mis. crash di antara tulis data dan meta)."""
+    data_path, meta_path = _ohlc_store_paths(symbol, interval)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") == OHLC_STORE_VERSION and os.path.exists(data_path):
+            df = _read_frame_cache(data_path)
+            if len(df) == meta["rows"] and str(df["Date"].iloc[-1]) == meta["last"]:
+                return df, float(meta["fetched_at"])
+    except Exception:
+        pass
+    return None, None
+
+
+def merge_ohlc(old: pd.DataFrame | None, new: pd.DataFrame) -> pd.DataFrame:
+    """Gabung bar lama + baru: 1 bar per tanggal (bar baru menang), urut tanggal."""
+    if old is None or old.empty:
+        merged = new
+    elif new.empty:
+        return old
+    else:
+        merged = pd.concat([old, new], ignore_index=True)
+    day = merged["Date"].dt.normalize()
+    keep = ~day.duplicated(keep="last")
+    return merged[keep.values].sort_values("Date").reset_index(drop=True)
+
+
+def update_ohlc_store(symbol: str, interval: str = "1d") -> pd.DataFrame:
+    """Ambil bar yang belum ada di store (semua OHLC_STORE_FULL_RANGE kalau store kosong), simpan, return store penuh."""
+    old, _ = load_ohlc_store(symbol, interval)
+    if old is None or old.empty:
+        fresh = fetch_yahoo_ohlc(symbol, rng=OHLC_STORE_FULL_RANGE, interval=interval)
+    else:
+        fresh = fetch_yahoo_ohlc(symbol, interval=interval, start=old["Date"].iloc[-1].date())
+    merged = merge_ohlc(old, fresh)
+    data_path, meta_path = _ohlc_store_paths(symbol, interval)
+    if not merged.empty:
+        _write_frame_cache(merged, data_path)
+        _write_json_atomic(meta_path, {
+            "version": OHLC_STORE_VERSION, "symbol": symbol, "interval": interval,
+            "fetched_at": time.time(), "rows": len(merged), "fetched_rows": len(fresh),
+            "first": str(merged["Date"].iloc[0]), "last": str(merged["Date"].iloc[-1]),
+        })
+    return merged
+
+
+def slice_ohlc(df: pd.DataFrame | None, rng: str) -> pd.DataFrame:
+    """Bar untuk timeframe rng ("1mo".."5y") dari store, dihitung mundur dari bar terakhir."""
+    if df is None or df.empty:
+        return pd.DataFrame() if df is None else df
+    off = OHLC_RANGE_OFFSETS.get(rng)
+    if off is None:
+        return df
+    cutoff = df["Date"].iloc[-1].normalize() - off
+    return df[df["Date"] >= cutoff].reset_index(drop=True)
+
+
+# fetch per jenis data (dipanggil refresher) + seed dari disk saat key pertama kali diminta
+_FETCHERS = {"quotes": fetch_yahoo_quotes, "ohlc": update_ohlc_store}
+_SEEDERS = {"ohlc": load_ohlc_store}
+
+# ---------------------------
+# Cache in-process + refresher background
+# ---------------------------
+# 1 entry per (jenis, argumen...): value terakhir yang berhasil, waktu berhasil, error terakhir, kapan
+# terakhir diminta halaman. Dipakai bersama oleh semua session Streamlit di proses yang sama.
+_MARKET_CACHE: dict[tuple, dict] = {}
+_MARKET_LOCK = threading.Lock()
+_MARKET_WAKE = threading.Event()
+_BREAKER = {"fails": 0, "trips": 0, "open_until": 0.0, "last_error": None}
+_REFRESHER: threading.Thread | None = None
+
+
+def breaker_state() -> dict:
+    """Salinan status circuit breaker (open, sisa detik jeda, kegagalan beruntun, error terakhir)."""
+    with _MARKET_LOCK:
+        b = dict(_BREAKER)
+    b["open"] = b["open_until"] > time.time()
+    b["retry_in"] = max(0.0, b["open_until"] - time.time())
+    return b
+
+
+def _record_result(ok: bool, error: str | None = None):
+    """Update breaker setelah 1 fetch (dipanggil dengan _MARKET_LOCK dipegang)."""
+    if ok:
+        _BREAKER.update(fails=0, trips=0, last_error=None)
+        return
+    _BREAKER["fails"] += 1
+    _BREAKER["last_error"] = error
+    if _BREAKER["fails"] >= BREAKER_FAILS:
+        cooldown = min(BREAKER_COOLDOWN * 2 ** _BREAKER["trips"], BREAKER_MAX_COOLDOWN)
+        _BREAKER["trips"] += 1
+        _BREAKER["fails"] = BREAKER_FAILS - 1  # setelah jeda: 1 percobaan (half-open); gagal lagi -> buka lagi
+        _BREAKER["open_until"] = time.time() + cooldown
+
+
+def _due_keys(now: float) -> list[tuple]:
+    """Key yang perlu di-refresh: belum pernah berhasil / lewat TTL, dan masih diminta halaman."""
+    with _MARKET_LOCK:
+        return [
+            k for k, e in _MARKET_CACHE.items()
+            if now - e["requested"] <= MARKET_IDLE_SECONDS
+            and (e["updated"] is None or now - e["updated"] >= MARKET_TTL[k[0]])
+            and now >= e["retry_after"]
+        ]
+
+
+def _refresh_loop():
+    while True:
+        now = time.time()
+        b = breaker_state()
+        if b["open"]:
+            _MARKET_WAKE.wait(b["retry_in"])
+            _MARKET_WAKE.clear()
+            continue
+        for key in _due_keys(now):
+            if breaker_state()["open"]:
+                break
+            try:
+                value = _FETCHERS[key[0]](*key[1:])
+                with _MARKET_LOCK:
+                    _MARKET_CACHE[key].update(value=value, updated=time.time(), error=None, retry_after=0.0)
+                    _record_result(True)
+            except Exception as e:
+                err = f"{type(e).__name__}: {e}"[:160]
+                with _MARKET_LOCK:
+                    # key yang gagal tidak dicoba lagi di putaran berikutnya langsung (beri jeda 15 detik)
+                    _MARKET_CACHE[key].update(error=err, retry_after=time.time() + 15)
+                    _record_result(False, err)
+        _MARKET_WAKE.wait(5)
+        _MARKET_WAKE.clear()
+
+
+def _ensure_refresher():
+    global _REFRESHER
+    with _MARKET_LOCK:
+        if _REFRESHER is None or not _REFRESHER.is_alive():
+            _REFRESHER = threading.Thread(target=_refresh_loop, name="bandar-market-refresher", daemon=True)
+            _REFRESHER.start()
+
+
+def market_data(kind: str, *args) -> dict:
+    """Snapshot data pasar tanpa menunggu jaringan: value terakhir (None kalau belum pernah berhasil) + status.
+
+    kind "quotes" -> args (tuple simbol,); "ohlc" -> args (symbol, interval), value = store OHLC penuh
+    (timeframe di-slice lokal dengan slice_ohlc). Key yang belum ada didaftarkan (OHLC langsung diisi dari
+    store di disk) lalu refresher dibangunkan kalau lewat TTL. Return dict: value, updated (epoch), age
+    (detik), error, stale (umur > 3x TTL atau refresh terakhir gagal), breaker (status breaker_state()).
+    """
+    key = (kind, *args)
+    now = time.time()
+    with _MARKET_LOCK:
+        e = _MARKET_CACHE.get(key)
+    if e is None:
+        seed = _SEEDERS[kind](*args) if kind in _SEEDERS else (None, None)
+        with _MARKET_LOCK:
+            e = _MARKET_CACHE.setdefault(key, {"value": seed[0], "updated": seed[1], "error": None,
+                                                "requested": now, "retry_after": 0.0})
+    with _MARKET_LOCK:
+        e["requested"] = now
+        wake = e["updated"] is None or now - e["updated"] >= MARKET_TTL[kind]
+        snap = {"value": e["value"], "updated": e["updated"], "error": e["error"]}
+    _ensure_refresher()
+    if wake:
+        _MARKET_WAKE.set()
+    age = None if snap["updated"] is None else now - snap["updated"]
+    snap["age"] = age
+    snap["stale"] = snap["error"] is not None or (age is not None and age > 3 * MARKET_TTL[kind])
+    snap["breaker"] = breaker_state()
+    return snap
+
+
+def _short_error(err: str | None) -> str | None:
+    return None if err is None else err.split(":", 1)[0]
+
+
+def market_status_text(snap: dict) -> str:
+    """Keterangan singkat umur data / error / breaker untuk ditampilkan di bawah widget."""
+    b = snap["breaker"]
+    if snap["age"] is None:
+        if b["open"]:
+            return f"Yahoo dijeda {b['retry_in'] / 60:.0f} menit (gagal berulang: {_short_error(b['last_error'])})."
+        return "Mengambil data Yahoo di background..." + (f" (gagal: {_short_error(snap['error'])})" if snap["error"] else "")
+    age = snap["age"]
+    when = f"{age:.0f} detik" if age < 90 else (f"{age / 60:.0f} menit" if age < 5400 else f"{age / 3600:.1f} jam")
+    text = f"Yahoo: diperbarui {when} lalu"
+    if b["open"]:
+        text += f" · dijeda {b['retry_in'] / 60:.0f} menit (gagal berulang)"
+    elif snap["error"]:
+        text += f" · refresh terakhir gagal ({_short_error(snap['error'])})"
+    return text
@@ -0,0 +1,164 @@
+"""Bar OHLCV (harian + intraday 1m/5m/15m) dari running trade, dengan store per saham + tanggal."""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import _NAT_NS
+from .instrument import traced
+from .loader import (CLEAN_CACHE_VERSION, LOAD_WORKERS, _file_signature, _group_files_by_day, _load_clean_cache,
+                     _store_clean_cache, load_cleaned_database_files)
+
+
+# ---------------------------
+# OHLCV dari trade cleaned
+# ---------------------------
+# Urutan kronologis = DateTime naik; trade di detik yang sama diurutkan per file sumber (urutan file di
+# frame), lalu dari baris paling bawah file itu (file running trade urut terbaru dulu), sama dengan
+# first/last trade di compute_trade_stats. Volume dalam lot,
+# Buy/Sell_Volume = lot per Action agresor (sisanya Unknown), Value dalam rupiah, Freq = jumlah trade.
+# Trade tanpa jam (DateTime NaT) tidak masuk bar.
+OHLCV_VERSION = 2  # v2: tie di detik yang sama diurutkan per file sumber
+OHLCV_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume", "Buy_Volume", "Sell_Volume", "Value", "Freq"]
+OHLCV_INTERVALS = {"1m": 60, "5m": 300, "15m": 900, "1d": 86_400}
+# interval yang disimpan per hari; interval lain = resample_ohlcv dari bar ini
+OHLCV_BASE_INTERVAL = "1m"
+
+
+def _empty_ohlcv() -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "Date" else "int64") for c in OHLCV_COLUMNS})
+
+
+def _source_segments(df: pd.DataFrame) -> np.ndarray:
+    """ID segmen file sumber per baris (run __source_file yang berurutan; 0 semua kalau kolomnya tidak ada)."""
+    if "__source_file" not in df.columns or len(df) == 0:
+        return np.zeros(len(df), dtype=np.int64)
+    src = df["__source_file"]
+    codes = src.cat.codes.to_numpy() if isinstance(src.dtype, pd.CategoricalDtype) else pd.factorize(src)[0]
+    return np.r_[0, np.cumsum(codes[1:] != codes[:-1])]
+
+
+def _bars_from_sorted(bucket: np.ndarray, step_ns: int, open_, high, low, close, sums: dict) -> pd.DataFrame:
+    """Agregasi array yang sudah urut kronologis per bucket (bucket naik) -> frame OHLCV."""
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+    out = pd.DataFrame({
+        "Date": pd.to_datetime(bucket[starts] * step_ns),
+        "Open": open_[starts],
+        "High": np.maximum.reduceat(high, starts),
+        "Low": np.minimum.reduceat(low, starts),
+        "Close": close[ends],
+        **{k: np.add.reduceat(v, starts) for k, v in sums.items()},
+    })
+    return out[OHLCV_COLUMNS]
+
+
+@traced()
+def build_ohlcv(df: pd.DataFrame, interval: str = OHLCV_BASE_INTERVAL) -> pd.DataFrame:
+    """Trade cleaned -> bar OHLCV per interval ("1m", "5m", "15m", "1d"), urut waktu."""
+    if df is None or df.empty or "DateTime" not in df.columns:
+        return _empty_ohlcv()
+    step_ns = OHLCV_INTERVALS[interval] * 1_000_000_000
+    t_ns = pd.to_datetime(df["DateTime"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    pos = np.flatnonzero(t_ns != _NAT_NS)
+    if not len(pos):
+        return _empty_ohlcv()
+    order = pos[np.lexsort((-pos, _source_segments(df)[pos], t_ns[pos]))]
+
+    price = df["Price"].to_numpy(dtype=np.int64)[order]
+    lot = df["Lot"].to_numpy(dtype=np.int64)[order]
+    if "Action" in df.columns:
+        action = df["Action"].to_numpy()[order]
+        buy_vol, sell_vol = np.where(action == "Buy", lot, 0), np.where(action == "Sell", lot, 0)
+    else:
+        buy_vol = sell_vol = np.zeros(len(order), dtype=np.int64)
+    value = (df["Value"].to_numpy(dtype=np.int64)[order] if "Value" in df.columns else price * lot * 100)
+    return _bars_from_sorted(t_ns[order] // step_ns, step_ns, price, price, price, price, {
+        "Volume": lot,
+        "Buy_Volume": buy_vol,
+        "Sell_Volume": sell_vol,
+        "Value": value,
+        "Freq": np.ones(len(order), dtype=np.int64),
+    })
+
+
+def resample_ohlcv(bars: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Bar OHLCV (urut waktu, interval lebih kecil) -> interval yang lebih besar."""
+    if bars is None or bars.empty:
+        return _empty_ohlcv()
+    step_ns = OHLCV_INTERVALS[interval] * 1_000_000_000
+    t_ns = bars["Date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return _bars_from_sorted(
+        t_ns // step_ns, step_ns, bars["Open"].to_numpy(), bars["High"].to_numpy(), bars["Low"].to_numpy(),
+        bars["Close"].to_numpy(), {k: bars[k].to_numpy() for k in OHLCV_COLUMNS[5:]},
+    )
+
+
+# ---------------------------
+# Store bar 1m per hari (.cache/ohlcv/<SAHAM>/<tanggal>)
+# ---------------------------
+# Manifest = signature file sumber, sama seperti cache cleaned / rollup. Chart candlestick lokal cukup
+# membaca bar 1m yang tersimpan (ratusan baris per hari) lalu resample; trade mentah hanya dibaca untuk
+# hari yang belum punya bar.
+def _ohlcv_signature(filepaths: list[str]) -> dict:
+    return {"version": OHLCV_VERSION, "clean_version": CLEAN_CACHE_VERSION,
+            "files": [_file_signature(fp) for fp in filepaths]}
+
+
+def _concat_bars(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    parts = [f for f in frames if f is not None and not f.empty]
+    if not parts:
+        return _empty_ohlcv()
+    return pd.concat(parts, ignore_index=True).sort_values("Date", kind="stable").reset_index(drop=True)
+
+
+@traced()
+def load_ohlcv_bars(
+    stock: str,
+    filepaths: list[str],
+    interval: str = "1d",
+    workers: int | None = None,
+    report: list | None = None,
+) -> pd.DataFrame:
+    """Bar OHLCV untuk semua file (per saham + tanggal) lewat store .cache/ohlcv, di-resample ke interval.
+
+    Hari yang belum punya bar (atau file sumbernya berubah) di-ingest per batch beberapa hari: load cleaned,
+    bangun bar 1m, simpan. Hari dengan file gagal dibaca tidak disimpan; file tanpa tanggal di path
+    dihitung langsung tanpa store.
+    """
+    by_day, undated = _group_files_by_day(filepaths)
+    frames: list[pd.DataFrame] = []
+    misses: dict[datetime.date, dict] = {}
+    for td, fps in by_day.items():
+        sig = _ohlcv_signature(fps)
+        cached = _load_clean_cache(stock, td, sig, kind="ohlcv")
+        if cached is None:
+            misses[td] = sig
+        else:
+            frames.append(cached)
+
+    batch = max(1, workers or LOAD_WORKERS)
+    miss_days = list(misses)
+    for i in range(0, len(miss_days), batch):
+        days = miss_days[i:i + batch]
+        rep: list[dict] = []
+        df = load_cleaned_database_files(stock, [fp for td in days for fp in by_day[td]], workers=workers, report=rep,
+                                         store=False)
+        if report is not None:
+            report.extend(rep)
+        failed = {r["file"] for r in rep if not r["ok"]}
+        bars = build_ohlcv(df)
+        del df
+        bar_days = bars["Date"].dt.date
+        for td in days:
+            if not any(fp in failed for fp in by_day[td]):
+                _store_clean_cache(stock, td, misses[td], bars[(bar_days == td).to_numpy()], kind="ohlcv")
+        frames.append(bars)
+
+    if undated:
+        rep = []
+        frames.append(build_ohlcv(load_cleaned_database_files(stock, undated, workers=workers, report=rep)))
+        if report is not None:
+            report.extend(rep)
+    bars = _concat_bars(frames)
+    return bars if interval == OHLCV_BASE_INTERVAL else resample_ohlcv(bars, interval)
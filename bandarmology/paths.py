@@ -0,0 +1,8 @@
+"""Path default package, relatif ke root repo (bukan working directory), supaya CLI / cron dari folder
+mana pun memakai database, cache, dan daftar broker yang sama dengan app."""
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_ROOT = os.environ.get("BANDAR_DB_ROOT") or os.path.join(REPO_ROOT, "database")
+CACHE_ROOT = os.environ.get("BANDAR_CACHE_ROOT") or os.path.join(REPO_ROOT, ".cache")
+BROKER_FILE = os.path.join(REPO_ROOT, "daftar-broker.csv")
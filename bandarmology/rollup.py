@@ -0,0 +1,182 @@
+"""Rollup harian per broker (cache per saham + tanggal) untuk analisis rentang panjang."""
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+from .analytics import _broker_code_index, _foreign_side_mask
+from .instrument import traced
+from .loader import (CLEAN_CACHE_VERSION, LOAD_WORKERS, _extract_trade_date_from_filepath, _file_signature,
+                     _group_files_by_day, _load_clean_cache, _store_clean_cache, load_cleaned_database_files)
+
+
+# ---------------------------
+# Rollup harian per broker (untuk analisis rentang panjang)
+# ---------------------------
+# 1 baris per (tanggal, broker): Buy/Sell lot, value, frekuensi, avg price, dan porsi sisi asing.
+# Disimpan di .cache/rollup/<SAHAM>/<tanggal> (manifest = signature file sumber, sama seperti cache
+# cleaned). View multi-hari (konsistensi, Top Accumulation/Distribution) cukup baca rollup; trade
+# mentah hanya dibutuhkan section intraday.
+ROLLUP_VERSION = 1
+ROLLUP_COLUMNS = [
+    "TradeDate", "Code",
+    "Buy_Lot", "Buy_Val", "Buy_Freq", "Sell_Lot", "Sell_Val", "Sell_Freq", "Buy_Avg", "Sell_Avg",
+    "F_Buy_Lot", "F_Buy_Val", "F_Sell_Lot", "F_Sell_Val",
+]
+# rentang > N hari: section intraday hanya memakai N hari terakhir (multi-hari tetap seluruh rentang lewat rollup)
+INTRADAY_MAX_DAYS = int(os.environ.get("BANDAR_INTRADAY_MAX_DAYS", 31))
+
+
+def is_rollup_frame(df: pd.DataFrame) -> bool:
+    return "Buy_Lot" in df.columns and "Buyer_Code" not in df.columns
+
+
+@traced()
+def build_daily_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Trade cleaned -> rollup harian per broker (1 pass bincount di grid tanggal x broker)."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    d_idx, d_uni = pd.factorize(pd.to_datetime(df["TradeDate"]).dt.normalize(), sort=True)
+    codes, b_idx, s_idx = _broker_code_index(df)
+    n_d, n_b = len(d_uni), len(codes)
+    lot = df["Lot"].to_numpy(dtype=float)
+    val = df["Value"].to_numpy(dtype=float)
+    f_buy = _foreign_side_mask(df, "Buyer_Code", "Buyer_Origin")
+    f_sell = _foreign_side_mask(df, "Seller_Code", "Seller_Origin")
+
+    def _sum(side_idx, weights=None, mask=None):
+        ok = (d_idx >= 0) & (side_idx >= 0)
+        if mask is not None:
+            ok &= mask
+        flat = d_idx[ok] * n_b + side_idx[ok]
+        w = None if weights is None else weights[ok]
+        return np.rint(np.bincount(flat, weights=w, minlength=n_d * n_b)).astype(np.int64)
+
+    cols = {
+        "Buy_Lot": _sum(b_idx, lot), "Buy_Val": _sum(b_idx, val), "Buy_Freq": _sum(b_idx),
+        "Sell_Lot": _sum(s_idx, lot), "Sell_Val": _sum(s_idx, val), "Sell_Freq": _sum(s_idx),
+        "F_Buy_Lot": _sum(b_idx, lot, f_buy), "F_Buy_Val": _sum(b_idx, val, f_buy),
+        "F_Sell_Lot": _sum(s_idx, lot, f_sell), "F_Sell_Val": _sum(s_idx, val, f_sell),
+    }
+    active = (cols["Buy_Freq"] + cols["Sell_Freq"]) > 0
+    out = pd.DataFrame({
+        "TradeDate": np.repeat(d_uni.to_numpy(), n_b)[active],
+        "Code": np.tile(np.asarray([str(c) for c in codes], dtype=object), n_d)[active],
+        **{k: v[active] for k, v in cols.items()},
+    })
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for side in ("Buy", "Sell"):
+            avg = np.rint(out[f"{side}_Val"].to_numpy() / (out[f"{side}_Lot"].to_numpy() * 100.0))
+            out[f"{side}_Avg"] = np.where(out[f"{side}_Lot"] > 0, avg, 0).astype(np.int64)
+    out["Buy_Freq"] = out["Buy_Freq"].astype(np.int32)
+    out["Sell_Freq"] = out["Sell_Freq"].astype(np.int32)
+    out["Code"] = out["Code"].astype("category")
+    return out[ROLLUP_COLUMNS]
+
+
+def concat_rollups(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    parts = [f for f in frames if f is not None and not f.empty]
+    if not parts:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    out = pd.concat([f.astype({"Code": object}) for f in parts], ignore_index=True)
+    out["Code"] = out["Code"].astype("category")
+    return out.sort_values(["TradeDate", "Code"], kind="stable").reset_index(drop=True)
+
+
+def _rollup_signature(filepaths: list[str]) -> dict:
+    return {"version": ROLLUP_VERSION, "clean_version": CLEAN_CACHE_VERSION,
+            "files": [_file_signature(fp) for fp in filepaths]}
+
+
+@traced()
+def load_daily_rollups(
+    stock: str,
+    filepaths: list[str],
+    trade_date: datetime.date | None = None,
+    workers: int | None = None,
+    report: list | None = None,
+) -> pd.DataFrame:
+    """Rollup harian untuk semua file (per saham + tanggal) lewat store .cache/rollup.
+
+    Hari yang belum punya rollup (atau file sumbernya berubah) di-ingest: load cleaned (cache cleaned
+    kalau ada, kalau tidak baca + clean tanpa menulis cache cleaned), di-rollup, lalu disimpan. Ingest
+    jalan per batch beberapa hari supaya rentang berbulan-bulan tidak pernah memuat semua trade mentah
+    sekaligus. Hari dengan file gagal dibaca tidak disimpan. File tanpa tanggal di path di-rollup langsung (tanpa store).
+    """
+    by_day, undated = _group_files_by_day(filepaths)
+    frames: list[pd.DataFrame] = []
+    misses: dict[datetime.date, dict] = {}
+    for td, fps in by_day.items():
+        sig = _rollup_signature(fps)
+        cached = _load_clean_cache(stock, td, sig, kind="rollup")
+        if cached is None:
+            misses[td] = sig
+        else:
+            frames.append(cached)
+
+    batch = max(1, workers or LOAD_WORKERS)
+    miss_days = list(misses)
+    for i in range(0, len(miss_days), batch):
+        days = miss_days[i:i + batch]
+        rep: list[dict] = []
+        df = load_cleaned_database_files(stock, [fp for td in days for fp in by_day[td]], workers=workers, report=rep,
+                                         store=False)
+        if report is not None:
+            report.extend(rep)
+        failed = {r["file"] for r in rep if not r["ok"]}
+        roll = build_daily_rollup(df)
+        del df
+        roll_days = roll["TradeDate"].dt.date if not roll.empty else pd.Series(dtype=object)
+        for td in days:
+            if not any(fp in failed for fp in by_day[td]):
+                _store_clean_cache(stock, td, misses[td], roll[(roll_days == td).to_numpy()], kind="rollup")
+        frames.append(roll)
+
+    if undated:
+        rep = []
+        frames.append(build_daily_rollup(
+            load_cleaned_database_files(stock, undated, trade_date=trade_date, workers=workers, report=rep)))
+        if report is not None:
+            report.extend(rep)
+    return concat_rollups(frames)
+
+
+def split_intraday_files(filepaths: list[str], start_date: datetime.date, end_date: datetime.date,
+                         max_days: int | None = None) -> tuple[list[str], list[str], datetime.date | None]:
+    """Bagi file rentang jadi (file intraday, file cukup-rollup, tanggal awal intraday / None kalau tidak dipotong).
+
+    Rentang > max_days: trade mentah hanya max_days hari terakhir; kalau hari-hari itu kosong (libur),
+    dipakai hari terakhir yang ada datanya.
+    """
+    max_days = INTRADAY_MAX_DAYS if max_days is None else max_days
+    if (end_date - start_date).days + 1 <= max_days:
+        return list(filepaths), [], None
+    intraday_from = end_date - datetime.timedelta(days=max_days - 1)
+    dated = [(fp, _extract_trade_date_from_filepath(fp)) for fp in filepaths]
+    fps_rollup = [fp for fp, td in dated if td is not None and td < intraday_from]
+    fps_intraday = [fp for fp, td in dated if td is None or td >= intraday_from]
+    if not fps_intraday and fps_rollup:
+        intraday_from = max(td for fp, td in dated if fp in fps_rollup)
+        fps_intraday = [fp for fp, td in dated if td == intraday_from]
+        fps_rollup = [fp for fp in fps_rollup if fp not in fps_intraday]
+    return fps_intraday, fps_rollup, intraday_from
+
+
+@traced()
+def load_range_for_analysis(
+    stock: str,
+    filepaths: list[str],
+    start_date: datetime.date,
+    end_date: datetime.date,
+    workers: int | None = None,
+    report: list | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, datetime.date | None]:
+    """Load 1 saham untuk analisis: (trade cleaned untuk section intraday, rollup harian seluruh rentang, intraday_from)."""
+    fps_intraday, fps_rollup, intraday_from = split_intraday_files(filepaths, start_date, end_date)
+    df = load_cleaned_database_files(stock, fps_intraday, trade_date=start_date, workers=workers, report=report)
+    rollup = concat_rollups([
+        load_daily_rollups(stock, fps_rollup, workers=workers, report=report),
+        build_daily_rollup(df),
+    ])
+    return df, rollup, intraday_from
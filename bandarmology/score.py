@@ -0,0 +1,328 @@
+"""Skor bandar 0-100 (komponen + red flags), kesimpulan akhir, dan riwayat skor harian tersimpan."""
+import bisect
+import datetime
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .analytics import TradeStats, compute_trade_stats, get_detailed_broker_summary
+from .bigprint import BIG_PRINT_DEFAULTS, big_print_from_index, build_big_print_index
+from .consistency import CONSISTENCY_WINDOWS, broker_consistency
+from .formatting import _fmt_id, format_number_label
+from .instrument import traced
+from .loader import CACHE_ROOT, _file_signature, _write_json_atomic, load_cleaned_database_files
+from .rollup import build_daily_rollup, concat_rollups, load_daily_rollups
+
+
+# key komponen skor (urutan = urutan `components` di compute_bandar_score) + poin maksimum
+BANDAR_SCORE_COMPONENTS = {
+    "foreign": ("Asing", 30),
+    "broker": ("Broker Net", 25),
+    "consistency": ("Konsistensi", 25),
+    "big_print": ("Big Print", 15),
+    "trade_book": ("Trade Book", 5),
+}
+
+
+@traced()
+def compute_bandar_score(fd_stats: dict, summ: pd.DataFrame, cons: pd.DataFrame | None, bp: pd.DataFrame | None, df: pd.DataFrame,
+                         stats=None):
+    """
+    Skor 0-100 (heuristik) untuk memudahkan ritel memahami 'bias bandar' intraday.
+    Ini BUKAN rekomendasi investasi.
+    Total / VWAP / harga terakhir / tekanan Buy-Sell diambil dari TradeStats (stats).
+    Return:
+      score (int), bias_label (str), components(list[tuple[name, pts, note]]), red_flags(list[str]), reasons(list[str])
+    """
+    if stats is None:
+        stats = compute_trade_stats(df) if df is not None else TradeStats()
+    # --- 1) Foreign component (0-30) ---
+    netf = float(fd_stats.get("value", {}).get("Net_Foreign", 0)) if fd_stats else 0.0
+    f_buy = float(fd_stats.get("value", {}).get("F_Buy", 0)) if fd_stats else 0.0
+    f_sell = float(fd_stats.get("value", {}).get("F_Sell", 0)) if fd_stats else 0.0
+    f_turn = max(f_buy + f_sell, 1.0)
+    f_ratio = max(-1.0, min(1.0, netf / f_turn))
+    score_foreign = int(round(15 * (f_ratio + 1)))  # 0..30
+
+    # --- 2) Broker net component (0-25) ---
+    score_broker = 12
+    broker_ratio = 0.0
+    net_total = 0.0
+    if summ is not None and not summ.empty:
+        net_total = float(summ.get("Net_Val", pd.Series([0])).sum())
+        turn = float(summ.get("Buy_Val", pd.Series([0])).sum() + summ.get("Sell_Val", pd.Series([0])).sum())
+        turn = max(turn, 1.0)
+        broker_ratio = max(-1.0, min(1.0, net_total / turn))
+        score_broker = int(round(12.5 * (broker_ratio + 1)))  # 0..25
+
+    # --- 3) Multi-day consistency component (0-25) ---
+    score_cons = 12
+    cons_bias = 0.0
+    if cons is not None and not cons.empty and "Net_Lot" in cons.columns:
+        top = cons.copy()
+        # fokus 10 broker paling aktif (abs net lot besar)
+        top = top.reindex(top["Net_Lot"].abs().sort_values(ascending=False).head(10).index)
+        denom = float(top["Net_Lot"].abs().sum()) or 1.0
+        cons_bias = float(top["Net_Lot"].sum()) / denom  # -1..1
+        cons_bias = max(-1.0, min(1.0, cons_bias))
+        # reliability factor dari Days_Active (biar nggak overreact 1 hari)
+        if "Days_Active" in top.columns and top["Days_Active"].notna().any():
+            rel = float(top["Days_Active"].mean())
+            rel_factor = max(0.4, min(1.0, rel / 3.0))
+        else:
+            rel_factor = 0.7
+        score_cons = int(round(12.5 * (cons_bias + 1) * rel_factor))  # 0..25 (aproks)
+
+    # --- 4) Big Print component (0-15) ---
+    score_bp = 7
+    bp_bias = 0.0
+    if bp is not None and not bp.empty and "Label" in bp.columns:
+        counts = bp["Label"].astype(str).str.lower().value_counts()
+        serap = int(counts[counts.index.str.contains("serap")].sum()) if not counts.empty else 0
+        dist = int(counts[counts.index.str.contains("distribusi")].sum()) if not counts.empty else 0
+        denom = max(serap + dist, 1)
+        bp_bias = (serap - dist) / denom  # -1..1
+        bp_bias = max(-1.0, min(1.0, bp_bias))
+        score_bp = int(round(7.5 * (bp_bias + 1)))  # 0..15
+
+    # --- 5) Trade book pressure component (0-5) ---
+    score_tb = 2
+    tb_bias = 0.0
+    if stats.buy_freq or stats.sell_freq:
+        tb_bias = stats.pressure
+        score_tb = int(round(2.5 * (tb_bias + 1)))  # 0..5
+
+    # Total score
+    score = int(np.clip(score_foreign + score_broker + score_cons + score_bp + score_tb, 0, 100))
+
+    # Bias label
+    if score >= 65:
+        bias = "AKUMULASI (bullish bandar)"
+    elif score <= 35:
+        bias = "DISTRIBUSI (waspada bandar)"
+    else:
+        bias = "NETRAL / CAMPUR"
+
+    # Transparansi komponen
+    components = [
+        ("Asing (Net)", score_foreign, f"Net/turnover asing ≈ {f_ratio:+.2f}"),
+        ("Broker Summary (Net)", score_broker, f"Net/turnover broker ≈ {broker_ratio:+.2f}"),
+        ("Konsistensi Multi-day", score_cons, f"Bias net lot ≈ {cons_bias:+.2f}"),
+        ("Big Print (Serap vs Distribusi)", score_bp, f"Bias label ≈ {bp_bias:+.2f}"),
+        ("Trade Book (Buy vs Sell)", score_tb, f"Tekanan lot ≈ {tb_bias:+.2f}"),
+    ]
+
+    # Red Flags (aturan sederhana)
+    red_flags = []
+    # VWAP & last price untuk konteks
+    vwap = stats.vwap
+    last_price = stats.last_price
+
+    # 1) Asing jual tapi harga di atas VWAP (rawan distribusi)
+    if netf < 0 and vwap > 0 and last_price is not None and last_price > vwap:
+        red_flags.append("Asing **net sell** tapi harga di atas **VWAP** → rawan distribusi di atas (harga 'diangkat' saat barang dilepas).")
+
+    # 2) Big print distribusi dominan tapi trade book buy dominan (rawan trap)
+    if bp_bias < -0.25 and tb_bias > 0.20:
+        red_flags.append("Big Print dominan **distribusi** tapi tekanan **buy** tinggi → potensi **trap / FOMO** (ritel nyerap barang bandar).")
+
+    # 3) Broker net distribusi saat skor total masih tinggi (sinyal campur)
+    if net_total < 0 and score >= 65:
+        red_flags.append("Skor tinggi tapi broker total net **distribusi** → sinyal campur, butuh konfirmasi struktur harga.")
+
+    # 4) Konsistensi lemah: net besar tapi skor konsistensi rendah
+    if cons is not None and not cons.empty and "Consistency_Score" in cons.columns and "Net_Val" in cons.columns:
+        leader = cons.iloc[0]
+        if float(leader.get("Net_Val", 0)) > 0 and float(leader.get("Consistency_Score", 50)) < 55:
+            red_flags.append("Broker leader net buy tapi **tidak konsisten** (Consistency < 55) → bisa one-off / bukan kerja multi-hari.")
+
+    # Reasons (highlight)
+    reasons = []
+    if netf > 0:
+        reasons.append("Asing cenderung **akumulasi** (net buy).")
+    elif netf < 0:
+        reasons.append("Asing cenderung **distribusi** (net sell).")
+
+    if net_total > 0:
+        reasons.append("Agregat broker menunjukkan **akumulasi** (net buy).")
+    elif net_total < 0:
+        reasons.append("Agregat broker menunjukkan **distribusi** (net sell).")
+
+    if bp_bias > 0.25:
+        reasons.append("Big Print lebih banyak **serap/akumulasi**.")
+    elif bp_bias < -0.25:
+        reasons.append("Big Print lebih banyak **distribusi**.")
+
+    if cons_bias > 0.20:
+        reasons.append("Broker yang konsisten condong **net buy multi-day**.")
+    elif cons_bias < -0.20:
+        reasons.append("Broker konsisten condong **net sell multi-day**.")
+
+    return score, bias, components, red_flags, reasons
+
+
+def overall_conclusion(fd_stats: dict, summ: pd.DataFrame, cons: pd.DataFrame | None, bp: pd.DataFrame | None, df: pd.DataFrame,
+                       stats=None) -> tuple[list[str], str, str]:
+    if stats is None:
+        stats = compute_trade_stats(df) if df is not None else TradeStats()
+    bullets = []
+    tone = "neutral"
+    # Foreign net
+    netf = float(fd_stats.get("value", {}).get("Net_Foreign", 0)) if fd_stats else 0
+    bullets.append(f"Asing: <b>{'Net Buy' if netf>0 else ('Net Sell' if netf<0 else 'Netral')}</b> (Rp {format_number_label(netf)}).")
+
+    # Broker net
+    net_total = float(summ["Net_Val"].sum()) if summ is not None and not summ.empty else 0
+    bullets.append(f"Broker summary (total net): <b>{'Akumulasi' if net_total>0 else ('Distribusi' if net_total<0 else 'Seimbang')}</b>.")
+
+    # Consistency
+    if cons is not None and not cons.empty:
+        topA = cons[cons["Net_Lot"]>0].head(3)
+        bullets.append("Multi-day top akumulasi: " + (", ".join([f"<b>{r['Code']}</b>" for _, r in topA.iterrows()]) if not topA.empty else "—"))
+
+    # Big print
+    if bp is not None and not bp.empty and "Label" in bp.columns:
+        counts = bp["Label"].value_counts()
+        serap = counts[counts.index.astype(str).str.lower().str.contains("serap")].sum()
+        dist = counts[counts.index.astype(str).str.lower().str.contains("distribusi")].sum()
+        bullets.append(f"Big Print: Serap {int(serap)} vs Distribusi {int(dist)}.")
+    else:
+        bullets.append("Big Print: belum cukup sinyal (atau filter terlalu ketat).")
+
+    # Trade book
+    if stats.rows and stats.has_action:
+        bullets.append(f"Trade Book: Buy lot {_fmt_id(stats.buy_lot)} vs Sell lot {_fmt_id(stats.sell_lot)}.")
+
+    # Tone + conclusion
+    score = (1 if netf>0 else (-1 if netf<0 else 0)) + (1 if net_total>0 else (-1 if net_total<0 else 0))
+    tone = "good" if score >= 2 else ("bad" if score <= -2 else "neutral")
+    concl = "Bias naik (akumulasi) lebih kuat" if tone=="good" else ("Waspada distribusi / koreksi" if tone=="bad" else "Tunggu konfirmasi (campur/sideways)")
+    return bullets, concl, tone
+
+# ---------------------------
+# Riwayat skor bandar harian (per saham, tersimpan + inkremental)
+# ---------------------------
+# 1 entry per (saham, tanggal): skor, bias, 5 komponen, jumlah red flag, harga terakhir, VWAP, net asing.
+# Disimpan di .cache/score/<SAHAM>.json; entry hanya dihitung ulang kalau file sumber hari itu (atau hari di
+# window konsistensi) berubah. Komponen konsistensi hari D = konsistensi SCORE_CONS_DAYS hari bursa terakhir
+# s/d D (dari rollup harian). Big Print pakai setting default (BIG_PRINT_DEFAULTS).
+SCORE_HISTORY_VERSION = 2  # v2: hari error / file gagal tidak lagi disimpan
+SCORE_CONS_DAYS = CONSISTENCY_WINDOWS[0]
+
+
+def _score_history_path(stock: str) -> str:
+    return os.path.join(CACHE_ROOT, "score", f"{str(stock).upper().strip() or 'UNKNOWN'}.json")
+
+
+def _load_score_store(stock: str) -> dict:
+    try:
+        with open(_score_history_path(stock), "r", encoding="utf-8") as f:
+            store = json.load(f)
+        if store.get("version") == SCORE_HISTORY_VERSION:
+            return store
+    except Exception:
+        pass
+    return {"version": SCORE_HISTORY_VERSION, "days": {}}
+
+
+def _save_score_store(stock: str, store: dict):
+    try:
+        _write_json_atomic(_score_history_path(stock), store)
+    except Exception:
+        pass
+
+
+def compute_day_score(stock: str, day_files: list[str], window_files: list[str]) -> dict:
+    """Skor bandar 1 hari bursa: trade hari itu + rollup window konsistensi (window_files = hari-hari sebelumnya).
+
+    Kalau ada file (hari itu / window) yang gagal dibaca, hasil diberi "failed_files" (jumlah file gagal).
+    """
+    rep: list[dict] = []
+    df = load_cleaned_database_files(stock, day_files, workers=1, report=rep, store=False)
+    failed = sum(not r["ok"] for r in rep)
+    if df.empty:
+        return {"error": "Data kosong setelah dibersihkan", **({"failed_files": failed} if failed else {})}
+    stats = compute_trade_stats(df)
+    summ = get_detailed_broker_summary(df, stats=stats)
+    try:
+        rep = []
+        cons = broker_consistency(concat_rollups([load_daily_rollups(stock, window_files, workers=1, report=rep),
+                                                  build_daily_rollup(df)]))
+        failed += sum(not r["ok"] for r in rep)
+    except Exception:
+        cons = None
+    try:
+        bp = big_print_from_index(build_big_print_index(df), q=BIG_PRINT_DEFAULTS["bp_q"],
+                                  min_lot=BIG_PRINT_DEFAULTS["bp_min_lot"],
+                                  lookahead_trades=BIG_PRINT_DEFAULTS["bp_lookahead_trades"])
+    except Exception:
+        bp = None
+    score, bias, components, red_flags, _ = compute_bandar_score(stats.foreign, summ, cons, bp, df, stats=stats)
+    out = {"score": score, "bias": bias, "red_flags": len(red_flags)}
+    out.update({k: int(c[1]) for k, c in zip(BANDAR_SCORE_COMPONENTS, components)})
+    out.update({
+        "last_price": stats.last_price,
+        "vwap": stats.vwap,
+        "net_foreign": float(stats.foreign["value"]["Net_Foreign"]),
+        "value": stats.total_value,
+    })
+    if failed:
+        out["failed_files"] = failed
+    return out
+
+
+@traced()
+def bandar_score_history(stock: str, cat_index: dict, start_date: datetime.date, end_date: datetime.date,
+                         progress=None, compute_missing: bool = True, pending: list | None = None) -> pd.DataFrame:
+    """Riwayat skor harian saham di rentang tanggal (hari bursa dari katalog).
+
+    Hari yang sudah ada di store dengan signature file yang sama tidak dihitung ulang; hanya hari baru /
+    berubah yang dihitung lalu ditambahkan ke store. Hari yang error atau ada file gagal dibaca tetap
+    dikembalikan tapi tidak disimpan, jadi dihitung ulang di panggilan berikutnya (error baca bisa sementara).
+    progress(selesai, total) dipanggil per hari yang dihitung. compute_missing=False: hanya baca store (murah),
+    hari yang belum / perlu dihitung ulang dilewati dan tanggal ISO-nya dimasukkan ke pending (opsional).
+    """
+    idx = cat_index.get(stock) or {"dates": [], "files": {}}
+    all_days = idx["dates"]
+    lo = bisect.bisect_left(all_days, start_date.isoformat())
+    hi = bisect.bisect_right(all_days, end_date.isoformat())
+
+    store = _load_score_store(stock)
+    todo = []
+    for i in range(lo, hi):
+        iso = all_days[i]
+        window = all_days[max(0, i - SCORE_CONS_DAYS + 1):i]
+        sig = [[_file_signature(fp) for fp in idx["files"][d]] for d in window + [iso]]
+        ent = store["days"].get(iso)
+        if ent is None or ent.get("sig") != sig:
+            todo.append((iso, window, sig))
+    if pending is not None:
+        pending.extend(t[0] for t in todo)
+    if not compute_missing:
+        skip = {t[0] for t in todo}
+        todo = []
+
+    unsaved: dict[str, dict] = {}
+    for n, (iso, window, sig) in enumerate(todo, 1):
+        try:
+            row = compute_day_score(stock, idx["files"][iso], [fp for d in window for fp in idx["files"][d]])
+        except Exception as e:
+            row = {"error": str(e)}
+        if "error" in row or row.get("failed_files"):
+            unsaved[iso] = row
+        else:
+            store["days"][iso] = {**row, "sig": sig}
+        if progress is not None:
+            progress(n, len(todo))
+    if len(todo) > len(unsaved):
+        _save_score_store(stock, store)
+
+    rows = [{"Date": datetime.date.fromisoformat(iso),
+             **{k: v for k, v in (unsaved.get(iso) or store["days"][iso]).items() if k != "sig"}}
+            for iso in all_days[lo:hi] if compute_missing or iso not in skip]
+    out = pd.DataFrame(rows)
+    if not out.empty and "score" in out.columns:
+        out = out[out["score"].notna()].reset_index(drop=True)
+    return out
@@ -0,0 +1,111 @@
+"""Screener bandarmology: skor + ringkasan per saham untuk banyak saham sekaligus (paralel)."""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from .analytics import compute_trade_stats, get_detailed_broker_summary
+from .bigprint import BIG_PRINT_DEFAULTS, big_print_from_index, build_big_print_index
+from .consistency import broker_consistency
+from .loader import LOAD_WORKERS
+from .rollup import load_range_for_analysis
+from .score import compute_bandar_score
+
+
+# Skor bandar, net asing, top akumulator, dan jumlah red flag untuk semua saham di database/ sekaligus.
+# Tiap saham dihitung di worker process (fallback thread pool); data harian diambil dari cache cleaned +
+# rollup, jadi screening ulang rentang yang sama hanya membayar agregasi.
+SCREENER_WORKERS = int(os.environ.get("BANDAR_SCREENER_WORKERS", LOAD_WORKERS))
+# worker process tidak di-fork: proses Streamlit punya thread (refresher market, ScriptRunner) dan fork
+# dari proses multi-thread bisa deadlock (lock yang sedang dipegang thread lain ikut tersalin)
+SCREENER_MP_START = os.environ.get("BANDAR_SCREENER_MP_START", "spawn")
+SCREENER_COLUMNS = [
+    "Saham", "Skor", "Bias", "Red_Flags", "Net_Foreign", "Foreign_Pct", "Top_Akumulasi", "Top_Akum_Net",
+    "Total_Value", "Frequency", "Hari", "Detik", "Error",
+]
+
+
+def screen_stock(job: tuple) -> dict:
+    """Hitung 1 baris screener untuk job (stock, filepaths, start_date, end_date). Error tidak dilempar: masuk kolom Error."""
+    stock, filepaths, start_date, end_date = job
+    t0 = time.perf_counter()
+    row = {"Saham": stock, "Error": None}
+    try:
+        df, rollup, _ = load_range_for_analysis(stock, filepaths, start_date, end_date, workers=1)
+        if df.empty:
+            row["Error"] = "Data kosong setelah dibersihkan"
+        else:
+            stats = compute_trade_stats(df)
+            summ = get_detailed_broker_summary(df, stats=stats)
+            try:
+                cons = broker_consistency(rollup)
+            except Exception:
+                cons = None
+            try:
+                bp = big_print_from_index(
+                    build_big_print_index(df), q=BIG_PRINT_DEFAULTS["bp_q"], min_lot=BIG_PRINT_DEFAULTS["bp_min_lot"],
+                    lookahead_trades=BIG_PRINT_DEFAULTS["bp_lookahead_trades"],
+                )
+            except Exception:
+                bp = None
+            score, bias, _, red_flags, _ = compute_bandar_score(stats.foreign, summ, cons, bp, df, stats=stats)
+            # akumulator = broker net buy; saham yang semua brokernya net sell / flat tidak punya top akumulasi
+            buyers = summ[summ["Net_Val"] > 0]
+            top = buyers.iloc[0] if not buyers.empty else None
+            row.update({
+                "Skor": score,
+                "Bias": bias,
+                "Red_Flags": len(red_flags),
+                "Net_Foreign": float(stats.foreign["value"]["Net_Foreign"]),
+                "Foreign_Pct": float(stats.foreign["value"]["Foreign_Pct"]),
+                "Top_Akumulasi": None if top is None else str(top["Code"]),
+                "Top_Akum_Net": 0.0 if top is None else float(top["Net_Val"]),
+                "Total_Value": stats.total_value,
+                "Frequency": stats.rows,
+                "Hari": int(rollup["TradeDate"].nunique()) if not rollup.empty else 0,
+            })
+    except Exception as e:
+        row["Error"] = str(e)
+    row["Detik"] = round(time.perf_counter() - t0, 2)
+    return row
+
+
+def map_stock_jobs(fn, jobs: list[tuple], workers: int, progress=None) -> list:
+    """fn(job) untuk semua job (job[0] = kode saham) di process pool; return hasil sesuai urutan selesai.
+
+    Worker process dimulai dengan metode SCREENER_MP_START (default spawn, aman dari proses app yang
+    multi-thread). Kalau process pool tidak bisa dipakai, sisa job dijalankan di thread pool. progress(selesai, total)
+    dipanggil setiap 1 saham selesai. Hasil fn harus dict dengan key "Saham".
+    """
+    rows: list = []
+
+    def _collect(results):
+        for row in results:
+            rows.append(row)
+            if progress is not None:
+                progress(len(rows), len(jobs))
+
+    if workers <= 1 or len(jobs) <= 1:
+        _collect(map(fn, jobs))
+    else:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                     mp_context=multiprocessing.get_context(SCREENER_MP_START)) as pool:
+                _collect(pool.map(fn, jobs))
+        except Exception:
+            done = {r["Saham"] for r in rows}
+            pending = [j for j in jobs if j[0] not in done]
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                    _collect(pool.map(fn, pending))
+    return rows
+
+
+def run_screener(jobs: list[tuple], workers: int | None = None, progress=None) -> pd.DataFrame:
+    """Jalankan screen_stock untuk semua job (lihat map_stock_jobs); return tabel ranking (Skor tertinggi dulu)."""
+    workers = SCREENER_WORKERS if workers is None else max(1, int(workers))
+    rows = map_stock_jobs(screen_stock, jobs, workers, progress)
+    out = pd.DataFrame(rows).reindex(columns=SCREENER_COLUMNS)
+    return out.sort_values(["Skor", "Total_Value"], ascending=[False, False], na_position="last").reset_index(drop=True)
@@ -0,0 +1,155 @@
+"""Benchmark suite analitik di data running trade sintetis (benchmarks/synthetic.py), hasil JSON per commit.
+
+Tiap ukuran ditulis sebagai database sintetis (default 5 hari bursa, di .cache/synthetic/), lalu diukur:
+load_database_files, clean_running_trade, get_detailed_broker_summary, compute_foreign_domestic_activity,
+big_print_detector, broker_consistency, prepare_trade_book_data, build_sankey, build_ohlcv. Waktu = min /
+median dari --repeat kali jalan (load + clean dihitung 1x per ulangan, analitik lain memakai hasil clean yang sama).
+
+Contoh:
+    python benchmarks/bench_analytics.py --sizes 10000 100000 --out bench_results.json
+    python benchmarks/bench_analytics.py --sizes 10000 100000 --compare bench_results_sebelum.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import synthetic  # noqa: E402
+from bandarmology import (  # noqa: E402
+    big_print_detector,
+    broker_consistency,
+    build_ohlcv,
+    build_sankey,
+    clean_running_trade,
+    compute_foreign_domestic_activity,
+    get_detailed_broker_summary,
+    prepare_trade_book_data,
+)
+from bandarmology.loader import load_database_files  # noqa: E402
+
+RESULT_VERSION = 1
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# (nama, fungsi(df_clean)) — urutan = urutan di tabel / JSON
+ANALYTICS = [
+    ("get_detailed_broker_summary", get_detailed_broker_summary),
+    ("compute_foreign_domestic_activity", compute_foreign_domestic_activity),
+    ("big_print_detector", big_print_detector),
+    ("broker_consistency", broker_consistency),
+    ("prepare_trade_book_data", prepare_trade_book_data),
+    ("build_sankey", build_sankey),
+    ("build_ohlcv", build_ohlcv),
+]
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def _entry(size: int, name: str, times: list[float], rows_out: int | None) -> dict:
+    return {
+        "size": size,
+        "func": name,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "repeat": len(times),
+        "rows_per_s": size / min(times) if min(times) > 0 else None,
+        "rows_out": rows_out,
+    }
+
+
+def bench_size(size: int, days: int, repeat: int, data_root: str, seed: int = 0) -> list[dict]:
+    """Semua fungsi untuk 1 ukuran data; return list entry hasil."""
+    fps = synthetic.write_database(data_root, size, days=days, seed=seed)
+    times: dict[str, list[float]] = {"load_database_files": [], "clean_running_trade": []}
+    rows_out: dict[str, int | None] = {}
+    for _ in range(repeat):
+        df = None  # lepas hasil ulangan sebelumnya dulu (puncak memori di 10M baris)
+        raw, t = _timed(load_database_files, fps, workers=1)
+        times["load_database_files"].append(t)
+        df, t = _timed(clean_running_trade, raw)
+        times["clean_running_trade"].append(t)
+        rows_out["load_database_files"], rows_out["clean_running_trade"] = len(raw), len(df)
+        del raw
+
+    for name, fn in ANALYTICS:
+        times[name] = []
+        for _ in range(repeat):
+            out, t = _timed(fn, df)
+            times[name].append(t)
+        rows_out[name] = len(out) if isinstance(out, pd.DataFrame) else None
+    return [_entry(size, name, ts, rows_out.get(name)) for name, ts in times.items()]
+
+
+def _load_compare(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    return {(r["size"], r["func"]): r for r in old.get("results", [])}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="total baris per dataset")
+    ap.add_argument("--days", type=int, default=5, help="jumlah hari bursa per dataset (untuk consistency)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--data-root", default=os.path.join(ROOT, ".cache", "synthetic"))
+    ap.add_argument("--out", default="bench_results.json", help="file JSON hasil")
+    ap.add_argument("--compare", default=None, help="JSON hasil sebelumnya: tampilkan rasio waktu (lama / baru)")
+    args = ap.parse_args()
+
+    old = _load_compare(args.compare) if args.compare else {}
+    results = []
+    print(f"{'rows':>11} {'func':<34} {'min (s)':>9} {'median (s)':>11} {'rows/s':>12}" + (f" {'vs lama':>8}" if old else ""))
+    for size in args.sizes:
+        for r in bench_size(size, args.days, max(1, args.repeat), os.path.join(args.data_root, str(size))):
+            results.append(r)
+            line = f"{size:>11,} {r['func']:<34} {r['min_s']:>9.4f} {r['median_s']:>11.4f} {r['rows_per_s'] or 0:>12,.0f}"
+            prev = old.get((size, r["func"]))
+            if prev:
+                line += f" {prev['min_s'] / r['min_s']:>7.2f}x"
+            print(line, flush=True)
+
+    doc = {
+        "version": RESULT_VERSION,
+        "commit": _git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "env": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "params": {"days": args.days, "repeat": args.repeat, "generator": "benchmarks/synthetic.py"},
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    print(f"-> {os.path.abspath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark clean_running_trade: versi vectorized vs versi lama (apply per baris).
+
+Data sintetis dibentuk dari file MAPI bawaan (database/MAPI/...), lalu jam, lot, dan broker diacak
+supaya kardinalitasnya mirip data 1 hari saham likuid. Versi vectorized dijalankan dengan compact=False
+supaya output-nya bisa dibandingkan langsung dengan versi lama.
+
+Contoh:
+    python benchmarks/bench_clean_running_trade.py
+    python benchmarks/bench_clean_running_trade.py --sizes 10000 100000 --skip-rowwise-above 100000
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from bandarmology import brokers, cleaning  # noqa: E402
+
+
+def make_running_trade(n: int, seed: int = 0) -> pd.DataFrame:
+    """Running trade sintetis n baris dengan format kolom seperti file database."""
+    rng = np.random.default_rng(seed)
+    sample = pd.read_csv(os.path.join("database", "MAPI", "2025", "Desember", "11.csv"))
+    df = sample.iloc[rng.integers(0, len(sample), n)].reset_index(drop=True)
+
+    # jam sesi 09:00:00 - 16:14:59
+    secs = rng.integers(9 * 3600, 16 * 3600 + 15 * 60, n)
+    df["Time"] = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in secs]
+    df["Lot"] = [f"{x:,}" for x in rng.integers(1, 5000, n)]
+
+    codes = np.array(sorted(brokers.BROKER_NAMES))
+    tags = np.where(np.isin(codes, sorted(brokers.FOREIGN_BROKERS)), "[F]", "[D]")
+    labels = np.char.add(np.char.add(codes, " "), tags)
+    df["Buyer"] = labels[rng.integers(0, len(labels), n)]
+    df["Seller"] = labels[rng.integers(0, len(labels), n)]
+    df["TradeDate"] = datetime.date(2025, 12, 11)
+    return df
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--skip-rowwise-above", type=int, default=None,
+                    help="lewati versi lama untuk ukuran di atas N baris (lama sekali di 1M)")
+    args = ap.parse_args()
+
+    print(f"{'rows':>10} {'rowwise (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for n in args.sizes:
+        df_raw = make_running_trade(n)
+        vec, t_vec = _timed(cleaning.clean_running_trade, df_raw, compact=False)
+
+        if args.skip_rowwise_above is not None and n > args.skip_rowwise_above:
+            print(f"{n:>10,} {'-':>12} {t_vec:>15.3f} {'-':>9}")
+            continue
+
+        ref, t_ref = _timed(cleaning._clean_running_trade_rowwise, df_raw)
+        pd.testing.assert_frame_equal(ref, vec)
+        print(f"{n:>10,} {t_ref:>12.3f} {t_vec:>15.3f} {t_ref / t_vec:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark + cek korektnes store OHLC inkremental (bandarmology.market) terhadap Yahoo stub lokal (offline).
+
+Skenario per simbol (semua timeframe 1mo..5y ditampilkan 1x):
+    legacy        download penuh per timeframe (perilaku cache lama saat restart / ganti timeframe)
+    store_cold    store kosong: 1 download OHLC_STORE_FULL_RANGE, timeframe = slice lokal
+    store_restart store sudah ada, tidak ada bar baru: baca disk + slice, tanpa request
+    store_update  hari stub dimajukan --advance hari bursa: hanya bar baru yang di-download lalu di-merge
+Setelah update, isi store dicek sama persis dengan bar stub di rentang yang sama.
+
+Contoh:
+    python benchmarks/bench_ohlc_store.py --symbols 20 --latency-ms 80 --out bench_results_ohlc.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import yahoo_stub  # noqa: E402
+from bandarmology import market  # noqa: E402
+from bench_analytics import _git_commit  # noqa: E402
+
+RESULT_VERSION = 1
+
+
+def _stub_delta(srv, before: dict) -> dict:
+    return {k: srv.stats[k] - before[k] for k in ("requests", "bars")}
+
+
+def run_scenario(name: str, srv, symbols: list[str], fn) -> dict:
+    before = dict(srv.stats)
+    t0 = time.perf_counter()
+    for sym in symbols:
+        for rng in market.OHLC_RANGE_OFFSETS:
+            fn(sym, rng)
+    sec = time.perf_counter() - t0
+    return {"scenario": name, "seconds": sec, "per_symbol_ms": sec / len(symbols) * 1000, **_stub_delta(srv, before)}
+
+
+def check_store(srv, symbols: list[str]) -> int:
+    """Jumlah simbol yang isi store-nya beda dengan bar stub (0 = benar)."""
+    bad = 0
+    for sym in symbols:
+        df, _ = market.load_ohlc_store(sym)
+        ts, v = srv.bars(sym, int(df["Date"].iloc[0].timestamp()), 2**40)
+        want = pd.DataFrame(v, columns=["Open", "High", "Low", "Close", "Volume"])
+        ok = (len(df) == len(ts)
+              and (df["Date"].astype("datetime64[s]").astype(np.int64).to_numpy() == ts).all()
+              and np.allclose(df[want.columns].to_numpy(float), want.to_numpy(float)))
+        bad += not ok
+    return bad
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--symbols", type=int, default=20)
+    ap.add_argument("--latency-ms", type=float, default=50.0, help="jeda per request stub (simulasi jaringan)")
+    ap.add_argument("--advance", type=int, default=5, help="hari bursa baru sebelum skenario store_update")
+    ap.add_argument("--out", default=None, help="file JSON hasil (opsional)")
+    args = ap.parse_args()
+
+    today = datetime.date.today()
+    start_day = (np.datetime64(today) - np.timedelta64(30, "D")).astype(object)
+    srv = yahoo_stub.start_stub(latency=args.latency_ms / 1000, today=start_day)
+    market.YAHOO_BASE = srv.base_url
+    store_root = tempfile.mkdtemp(prefix="bandar_ohlc_")
+    market.OHLC_STORE_ROOT = store_root
+    symbols = [f"S{i:03d}.JK" for i in range(args.symbols)]
+    store: dict[str, pd.DataFrame] = {}
+
+    def legacy(sym, rng):
+        market.fetch_yahoo_ohlc(sym, rng=rng)
+
+    def from_store(update: bool):
+        def fn(sym, rng):
+            if sym not in store:
+                store[sym] = market.update_ohlc_store(sym) if update else market.load_ohlc_store(sym)[0]
+            market.slice_ohlc(store[sym], rng)
+        return fn
+
+    try:
+        results = [run_scenario("legacy", srv, symbols, legacy),
+                   run_scenario("store_cold", srv, symbols, from_store(True))]
+        store.clear()
+        results.append(run_scenario("store_restart", srv, symbols, from_store(False)))
+        store.clear()
+        srv.today = np.busday_offset(np.datetime64(start_day), args.advance, roll="forward").astype(object)
+        results.append(run_scenario("store_update", srv, symbols, from_store(True)))
+        mismatched = check_store(srv, symbols)
+    finally:
+        shutil.rmtree(store_root, ignore_errors=True)
+        srv.shutdown()
+
+    print(f"{'scenario':<14} {'total (s)':>10} {'ms/simbol':>10} {'requests':>9} {'bars':>9}")
+    for r in results:
+        print(f"{r['scenario']:<14} {r['seconds']:>10.3f} {r['per_symbol_ms']:>10.1f} {r['requests']:>9,} {r['bars']:>9,}")
+    print(f"store vs stub: {'OK' if not mismatched else f'{mismatched} simbol BEDA'}")
+
+    if args.out:
+        doc = {
+            "version": RESULT_VERSION,
+            "commit": _git_commit(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "env": {"python": platform.python_version(), "pandas": pd.__version__, "platform": platform.platform()},
+            "params": {"symbols": args.symbols, "latency_ms": args.latency_ms, "advance": args.advance,
+                       "timeframes": list(market.OHLC_RANGE_OFFSETS), "server": "benchmarks/yahoo_stub.py"},
+            "results": results,
+            "mismatched_symbols": mismatched,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"-> {os.path.abspath(args.out)}")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Laporan memori frame cleaned: frame lengkap lama (compact=False) vs skema compact (CLEAN_SCHEMA).
+
+Memakai file database bawaan (default MAPI dan BUMI), diukur dengan memory_usage(deep=True).
+
+Contoh:
+    python benchmarks/memory_clean_frame.py
+    python benchmarks/memory_clean_frame.py --stocks MAPI --per-column
+"""
+import argparse
+import glob
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pandas as pd  # noqa: E402
+
+from bandarmology import cleaning, loader  # noqa: E402
+
+
+def _mem(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--stocks", nargs="+", default=["MAPI", "BUMI"])
+    ap.add_argument("--per-column", action="store_true", help="tampilkan byte per kolom")
+    args = ap.parse_args()
+
+    print(f"{'stock':<6} {'rows':>8} {'full (KB)':>10} {'compact (KB)':>13} {'B/row full':>11} {'B/row compact':>14} {'ratio':>7}")
+    for stock in args.stocks:
+        fps = sorted(
+            p for p in glob.glob(os.path.join("database", stock, "**", "*.*"), recursive=True)
+            if p.lower().endswith((".csv", ".xlsx"))
+        )
+        if not fps:
+            print(f"{stock:<6} (tidak ada file)")
+            continue
+        raw = loader.load_database_files(fps)
+        full = cleaning.clean_running_trade(raw, volume_mode="LOT", compact=False)
+        comp = cleaning.compact_trade_frame(full)
+        n = max(len(full), 1)
+        m_full, m_comp = _mem(full), _mem(comp)
+        print(f"{stock:<6} {len(full):>8,} {m_full / 1024:>10,.1f} {m_comp / 1024:>13,.1f} "
+              f"{m_full / n:>11,.1f} {m_comp / n:>14,.1f} {m_full / max(m_comp, 1):>6.1f}x")
+
+        if args.per_column:
+            per_col = pd.DataFrame({
+                "full": full.memory_usage(deep=True, index=False),
+                "compact": comp.memory_usage(deep=True, index=False),
+            }).fillna(0).astype(int)
+            per_col["full_dtype"] = full.dtypes.astype(str)
+            per_col["compact_dtype"] = comp.dtypes.astype(str)
+            print(per_col.fillna("-").to_string())
+            print()
+
+
+if __name__ == "__main__":
+    main()
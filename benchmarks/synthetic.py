@@ -0,0 +1,175 @@
+"""Generator running trade sintetis dengan format file database (Time, Code, Price, Action, Lot, Buyer, Seller, Market).
+
+Harga berjalan acak di fraksi harga BEI ("1,165 (-2.10%)" relatif ke close hari sebelumnya), jam mengikuti sesi
+bursa, lot berekor panjang (+ sedikit blok besar untuk Big Print), broker dipilih dari registry dengan
+distribusi Zipf (beberapa broker dominan), tag [F]/[D] mengikuti kelompok broker, Market RG / NG / TN.
+Baris diurutkan dari jam terakhir seperti export running trade.
+
+Contoh:
+    python benchmarks/synthetic.py --rows 1000000 --days 5 --root /tmp/synthdb
+    -> /tmp/synthdb/SYNT/2025/Desember/01.csv ... (bisa dibaca load_database_files / app)
+"""
+import argparse
+import datetime
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from bandarmology import brokers  # noqa: E402
+from bandarmology.loader import MONTH_ID  # noqa: E402
+
+# detik sejak 00:00 untuk sesi 1, sesi 2, dan pre-closing/closing; bobot = porsi trade per sesi
+_SESSIONS = (
+    (9 * 3600, 11 * 3600 + 30 * 60, 0.52),
+    (13 * 3600 + 30 * 60, 15 * 3600 + 50 * 60, 0.44),
+    (16 * 3600, 16 * 3600 + 15 * 60, 0.04),
+)
+_MARKETS = np.array(["RG", "NG", "TN"])
+_MARKET_P = (0.97, 0.02, 0.01)
+_TIME_LABELS = np.array([f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(86_400)], dtype=object)
+
+
+def idx_tick(price: float) -> int:
+    """Fraksi harga BEI untuk level harga."""
+    if price < 200:
+        return 1
+    if price < 500:
+        return 2
+    if price < 2000:
+        return 5
+    if price < 5000:
+        return 10
+    return 25
+
+
+def trading_days(start: datetime.date, days: int) -> list[datetime.date]:
+    """days hari kerja (Senin-Jumat) mulai dari start."""
+    out, d = [], start
+    while len(out) < days:
+        if d.weekday() < 5:
+            out.append(d)
+        d += datetime.timedelta(days=1)
+    return out
+
+
+def _broker_pool(rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Kode broker registry (urutan acak), bobot Zipf, dan flag asing per kode."""
+    codes = np.array(sorted(brokers.BROKER_NAMES))
+    codes = codes[rng.permutation(len(codes))]
+    w = 1.0 / np.arange(1, len(codes) + 1) ** 1.1
+    is_f = np.isin(codes, sorted(brokers.FOREIGN_BROKERS))
+    return codes, w / w.sum(), is_f
+
+
+def _broker_labels(rng, codes, weights, is_f, n: int) -> np.ndarray:
+    """n label broker "XX [F]" / "XX [D]": broker asing 90% [F], broker lokal 5% [F] (nasabah asing)."""
+    pick = rng.choice(len(codes), size=n, p=weights)
+    foreign = np.where(is_f[pick], rng.random(n) < 0.90, rng.random(n) < 0.05)
+    labels_d = np.array([f"{c} [D]" for c in codes], dtype=object)
+    labels_f = np.array([f"{c} [F]" for c in codes], dtype=object)
+    return np.where(foreign, labels_f[pick], labels_d[pick])
+
+
+def make_day(n: int, stock: str = "SYNT", prev_close: float = 1165.0, seed: int = 0) -> tuple[pd.DataFrame, float]:
+    """Running trade 1 hari (n baris) dalam format file database. Return (frame, harga close)."""
+    rng = np.random.default_rng(seed)
+    n = max(int(n), 1)
+
+    # jam: sampel per sesi, urut kronologis
+    sess = rng.choice(len(_SESSIONS), size=n, p=[s[2] for s in _SESSIONS])
+    lo = np.array([s[0] for s in _SESSIONS])[sess]
+    hi = np.array([s[1] for s in _SESSIONS])[sess]
+    secs = np.sort(lo + (rng.random(n) * (hi - lo)).astype(np.int64))
+
+    # harga: random walk dalam tick, range harian ~2% dan dibatasi +-20% dari close kemarin
+    tick = idx_tick(prev_close)
+    target = max(0.02 * prev_close / tick, 1.0)
+    p_move = min(0.4, target ** 2 / n)
+    steps = rng.choice((-1, 0, 1), size=n, p=(p_move / 2, 1 - p_move, p_move / 2))
+    lim = max(int(0.2 * prev_close / tick), 1)
+    ticks = np.clip(np.cumsum(steps), -lim, lim)
+    price = (round(prev_close / tick) + ticks) * tick
+
+    # aksi: uptick cenderung Buy (lifting offer), downtick cenderung Sell
+    p_buy = np.clip(0.5 + 0.35 * steps, 0.05, 0.95)
+    action = np.where(rng.random(n) < p_buy, "Buy", "Sell").astype(object)
+
+    # lot: lognormal berekor panjang + 0.1% blok besar
+    lot = np.ceil(rng.lognormal(mean=2.3, sigma=1.3, size=n)).astype(np.int64)
+    block = rng.random(n) < 0.001
+    lot[block] *= rng.integers(20, 200, int(block.sum()))
+    lot = np.clip(lot, 1, 500_000)
+
+    # urutan dominasi broker sama untuk semua hari 1 dataset (seed hari = seed dataset * 1000 + hari)
+    codes, weights, is_f = _broker_pool(np.random.default_rng(seed // 1000))
+    buyer = _broker_labels(rng, codes, weights, is_f, n)
+    seller = _broker_labels(rng, codes, weights, is_f, n)
+
+    # label harga "1,165 (-2.10%)": unik per level harga, jadi cukup format level yang muncul
+    levels, inv = np.unique(price, return_inverse=True)
+    price_lbl = np.array([f"{int(p):,} ({(p - prev_close) / prev_close * 100:+.2f}%)" for p in levels], dtype=object)[inv]
+
+    order = np.arange(n)[::-1]  # export running trade: jam terakhir di atas
+    df = pd.DataFrame({
+        "Time": _TIME_LABELS[secs[order]],
+        "Code": stock,
+        "Price": price_lbl[order],
+        "Action": action[order],
+        "Lot": lot[order],
+        "Buyer": buyer[order],
+        "Seller": seller[order],
+        "Market": _MARKETS[rng.choice(3, size=n, p=_MARKET_P)],
+    })
+    return df, float(price[-1])
+
+
+def write_database(root: str, rows: int, days: int = 5, stock: str = "SYNT",
+                   start: datetime.date = datetime.date(2025, 12, 1), seed: int = 0) -> list[str]:
+    """Tulis rows baris (dibagi rata ke days hari bursa) sebagai root/<SAHAM>/<YYYY>/<Bulan>/<DD>.csv.
+
+    File yang sudah ada dengan parameter sama dipakai ulang (<file>.meta = parameter + harga close hari itu).
+    """
+    out, close = [], 1165.0
+    per_day = np.full(days, rows // days)
+    per_day[: rows % days] += 1
+    for i, (d, n) in enumerate(zip(trading_days(start, days), per_day)):
+        folder = os.path.join(root, stock, str(d.year), MONTH_ID[d.month])
+        fp = os.path.join(folder, f"{d.day:02d}.csv")
+        meta = f"{rows}|{days}|{seed}|{i}|{n}"
+        try:
+            with open(fp + ".meta", "r", encoding="utf-8") as f:
+                saved, saved_close = f.read().split("\n")
+            if saved == meta:
+                close = float(saved_close)
+                out.append(fp)
+                continue
+        except (OSError, ValueError):
+            pass
+        os.makedirs(folder, exist_ok=True)
+        df, close = make_day(int(n), stock=stock, prev_close=close, seed=seed * 1000 + i)
+        df.to_csv(fp, index=False)
+        with open(fp + ".meta", "w", encoding="utf-8") as f:
+            f.write(f"{meta}\n{close}")
+        out.append(fp)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=100_000, help="total baris (semua hari)")
+    ap.add_argument("--days", type=int, default=5)
+    ap.add_argument("--stock", default="SYNT")
+    ap.add_argument("--root", default=os.path.join(ROOT, ".cache", "synthetic"))
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    for fp in write_database(args.root, args.rows, args.days, args.stock, seed=args.seed):
+        print(fp)
+
+
+if __name__ == "__main__":
+    main()
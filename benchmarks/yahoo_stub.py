@@ -0,0 +1,169 @@
+"""Server HTTP tiruan Yahoo Finance (chart + quote) dengan bar harian sintetis, untuk tes / benchmark offline.
+
+Endpoint yang ditiru (format JSON sama dengan Yahoo, cukup untuk bandarmology.market):
+    /v8/finance/chart/<SIMBOL>?range=3mo&interval=1d        atau ?period1=<epoch>&period2=<epoch>&interval=1d
+    /v7/finance/quote?symbols=BBCA.JK,^JKSE
+
+Bar per simbol deterministik (seed dari nama simbol), hari kerja sejak 2015 s/d "hari ini" server. Hari ini
+bisa dimundurkan / dimajukan (StubServer.today) untuk mensimulasikan bar baru yang muncul antar-update.
+Server mencatat jumlah request dan bar yang dikirim (StubServer.stats).
+
+Contoh:
+    python benchmarks/yahoo_stub.py --port 8765 --latency-ms 80
+    BANDAR_YAHOO_BASE=http://127.0.0.1:8765 streamlit run app.py
+"""
+import argparse
+import datetime
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+HISTORY_START = datetime.date(2015, 1, 1)
+# bar harian IDX dibuka 09:00 WIB = 02:00 UTC
+BAR_HOUR_UTC = 2
+RANGE_DAYS = {"1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731, "5y": 1827, "10y": 3653}
+
+
+def _epoch(d: datetime.date) -> int:
+    return int(datetime.datetime(d.year, d.month, d.day, BAR_HOUR_UTC, tzinfo=datetime.timezone.utc).timestamp())
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, latency: float = 0.0, fail_rate: float = 0.0, today: datetime.date | None = None):
+        super().__init__(addr, _Handler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.today = today or datetime.datetime.now(datetime.timezone.utc).date()
+        self.stats = {"requests": 0, "chart": 0, "quote": 0, "bars": 0, "failed": 0}
+        self._bars: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(0)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def history(self, symbol: str) -> tuple[np.ndarray, np.ndarray]:
+        """(timestamp epoch, OHLCV [n, 5]) semua bar simbol s/d akhir 2030; dipotong ke today saat dikirim."""
+        with self._lock:
+            if symbol not in self._bars:
+                days = np.arange(np.datetime64(HISTORY_START), np.datetime64("2031-01-01"))
+                days = days[np.is_busday(days)]
+                rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+                close = 1000.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.018, len(days))))
+                open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.004, len(days)))
+                high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, len(days))))
+                low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, len(days))))
+                vol = np.ceil(rng.lognormal(15, 0.6, len(days)))
+                ts = days.astype("datetime64[s]").astype(np.int64) + BAR_HOUR_UTC * 3600
+                self._bars[symbol] = (ts, np.column_stack([open_, high, low, close, vol]).round(2))
+            return self._bars[symbol]
+
+    def bars(self, symbol: str, p1: int, p2: int) -> tuple[np.ndarray, np.ndarray]:
+        ts, v = self.history(symbol)
+        p2 = min(p2, _epoch(self.today) + 1)
+        m = (ts >= p1) & (ts < p2)
+        return ts[m], v[m]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, doc: dict):
+        body = json.dumps(doc).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        srv = self.server
+        url = urlparse(self.path)
+        qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with srv._lock:
+            srv.stats["requests"] += 1
+            fail = srv.fail_rate > 0 and srv._rng.random() < srv.fail_rate
+        if srv.latency:
+            time.sleep(srv.latency)
+        if fail:
+            with srv._lock:
+                srv.stats["failed"] += 1
+            return self._send(503, {"error": "stub: simulated failure"})
+        if url.path.startswith("/v8/finance/chart/"):
+            return self._chart(url.path.rsplit("/", 1)[-1], qs)
+        if url.path == "/v7/finance/quote":
+            return self._quote([s for s in qs.get("symbols", "").split(",") if s])
+        return self._send(404, {"error": f"stub: unknown path {url.path}"})
+
+    def _chart(self, symbol: str, qs: dict):
+        srv = self.server
+        if qs.get("interval", "1d") != "1d":
+            return self._send(400, {"chart": {"result": None, "error": {"code": "Bad Request",
+                                                                       "description": "stub: hanya interval=1d"}}})
+        if "period1" in qs:
+            p1, p2 = int(qs["period1"]), int(qs.get("period2", _epoch(srv.today) + 1))
+        else:
+            days = RANGE_DAYS.get(qs.get("range", "1mo"), 31)
+            p1, p2 = _epoch(srv.today - datetime.timedelta(days=days)), _epoch(srv.today) + 1
+        ts, v = srv.bars(symbol, p1, p2)
+        with srv._lock:
+            srv.stats["chart"] += 1
+            srv.stats["bars"] += len(ts)
+        quote = {k: v[:, i].tolist() for i, k in enumerate(("open", "high", "low", "close", "volume"))}
+        self._send(200, {"chart": {"error": None, "result": [{
+            "meta": {"symbol": symbol, "currency": "IDR", "dataGranularity": "1d"},
+            "timestamp": ts.tolist(),
+            "indicators": {"quote": [quote]},
+        }]}})
+
+    def _quote(self, symbols: list[str]):
+        srv = self.server
+        end = _epoch(srv.today) + 1
+        res = []
+        for sym in symbols:
+            _, v = srv.bars(sym, end - 10 * 86_400, end)
+            if len(v) < 2:
+                continue
+            last, prev = v[-1, 3], v[-2, 3]
+            res.append({"symbol": sym, "regularMarketPrice": float(last), "regularMarketPreviousClose": float(prev),
+                        "regularMarketChangePercent": float((last / prev - 1) * 100)})
+        with srv._lock:
+            srv.stats["quote"] += 1
+        self._send(200, {"quoteResponse": {"result": res, "error": None}})
+
+
+def start_stub(port: int = 0, latency: float = 0.0, fail_rate: float = 0.0,
+               today: datetime.date | None = None) -> StubServer:
+    """Jalankan server di thread background (port 0 = port bebas); base URL di server.base_url."""
+    srv = StubServer(("127.0.0.1", port), latency=latency, fail_rate=fail_rate, today=today)
+    threading.Thread(target=srv.serve_forever, name="yahoo-stub", daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="jeda per request (simulasi jaringan)")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="porsi request yang dijawab HTTP 503")
+    args = ap.parse_args()
+    srv = StubServer(("127.0.0.1", args.port), latency=args.latency_ms / 1000, fail_rate=args.fail_rate)
+    print(f"Yahoo stub di {srv.base_url} (BANDAR_YAHOO_BASE={srv.base_url})", flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# cache test tidak boleh menyentuh .cache repo (di-set sebelum bandarmology di-import)
+os.environ.setdefault("BANDAR_CACHE_ROOT", tempfile.mkdtemp(prefix="bandar_test_cache_"))
+
+from bandarmology import loader, market, score  # noqa: E402
+
+SAMPLE_DAYS = [os.path.join(ROOT, "database", "MAPI", "2025", "Desember", f"{d}.csv") for d in ("11", "12")]
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Cache per test (clean / rollup / ohlcv / score / katalog / OHLC Yahoo) di tmp_path."""
+    root = str(tmp_path / "cache")
+    monkeypatch.setattr(loader, "CACHE_ROOT", root)
+    monkeypatch.setattr(score, "CACHE_ROOT", root)
+    monkeypatch.setattr(market, "OHLC_STORE_ROOT", os.path.join(root, "ohlc"))
+    return root
+
+
+@pytest.fixture
+def sample_db(tmp_path):
+    """Database kecil: saham TEST, 2 hari bursa (salinan file MAPI bawaan repo)."""
+    month = tmp_path / "db" / "TEST" / "2025" / "Desember"
+    month.mkdir(parents=True)
+    for fp in SAMPLE_DAYS:
+        shutil.copy(fp, month / os.path.basename(fp))
+    return str(tmp_path / "db")
+
+
+@pytest.fixture
+def messy_raw():
+    """Running trade mentah kecil 2 file / 2 hari: format jam campur, jam kosong / rusak, broker tak dikenal,
+    tag [F]/[D] sebagian, harga & lot berformat, action variatif, baris harga / lot 0."""
+    day1 = pd.DataFrame({
+        "Time": ["16:14:46", "16:14:46", "9:01.05", "08:58", "abc", None, "10:15:30", "09:00:00.250",
+                 "16:14:46", "11:00:01"],
+        "Price": ["1,165 (-2.10%)", "1,165 (-2.10%)", "1.170", 1170, "1,180", "1,160 (+0.5%)", "0", "1,175",
+                  "1,165", "1,150"],
+        "Lot": ["1,000", 5, "12", 40, 3, 7, 9, "250", 2, 0],
+        "Buyer": ["XL [D]", "YU [F]", "zz", "ZZ [F]", "AK", "QQ [D]", "CC", "YP [D]", "KK", "XL [D]"],
+        "Seller": ["KK [D]", "XL [D]", "AK [D]", "qq", "ZZ [F]", "YU", "YP [F]", "CC [D]", "AK", "YU [F]"],
+        "Action": ["Sell", "buy", "S", "x", None, "BUY", "Sell", "b", "sell", "Buy"],
+        "Market": ["RG"] * 10,
+    })
+    day1["TradeDate"] = "2025-12-11"
+    day1["__source_file"] = "11.csv"
+    day2 = pd.DataFrame({
+        "Time": ["15:59:58", "15:59:58", "14:02:03", "9:00:01", "09:00:01"],
+        "Price": ["1,190", "1,185", "1,185 (+1.2%)", "1,170", "1,170"],
+        "Lot": [30, "1,200", 6, 4, 4],
+        "Buyer": ["YU [F]", "ZZ", "XL [D]", "KK [F]", "CC [D]"],
+        "Seller": ["XL [D]", "AK [F]", "YU [F]", "CC [D]", "ZZ"],
+        "Action": ["Buy", "Sell", "Buy", "Sell", "Unknown"],
+        "Market": ["RG", "NG", "RG", "RG", "RG"],
+    })
+    day2["TradeDate"] = "2025-12-12"
+    day2["__source_file"] = "12.csv"
+    return pd.concat([day1, day2], ignore_index=True)
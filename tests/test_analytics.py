@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bandarmology.analytics import compute_foreign_domestic_activity, compute_trade_stats, get_detailed_broker_summary
+from bandarmology.brokers import get_broker_group, get_broker_info
+from bandarmology.cleaning import clean_running_trade
+
+
+def _reference_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """Broker summary lama (groupby buyer / seller + apply nama & group per kode)."""
+    buy = df.groupby("Buyer_Code", observed=True).agg(Buy_Val=("Value", "sum"), Buy_Lot=("Lot", "sum"))
+    sell = df.groupby("Seller_Code", observed=True).agg(Sell_Val=("Value", "sum"), Sell_Lot=("Lot", "sum"))
+    summ = pd.merge(buy, sell, left_index=True, right_index=True, how="outer").fillna(0)
+    summ["Net_Val"] = summ["Buy_Val"] - summ["Sell_Val"]
+    summ["Net_Lot"] = summ["Buy_Lot"] - summ["Sell_Lot"]
+    summ["Total_Val"] = summ["Buy_Val"] + summ["Sell_Val"]
+    summ["Buy_Avg"] = np.where(summ["Buy_Lot"] > 0, summ["Buy_Val"] / (summ["Buy_Lot"] * 100), 0).astype(int)
+    summ["Sell_Avg"] = np.where(summ["Sell_Lot"] > 0, summ["Sell_Val"] / (summ["Sell_Lot"] * 100), 0).astype(int)
+    summ.index = summ.index.astype(str)
+    summ = summ.rename_axis("Code").reset_index()
+    summ["Name"] = summ["Code"].apply(lambda x: get_broker_info(x)[1])
+    summ["Group"] = summ["Code"].apply(lambda x: get_broker_info(x)[2])
+    return summ
+
+
+def _reference_foreign(df: pd.DataFrame) -> dict:
+    """Foreign / domestic lama: tag [F]/[D] per baris, fallback group broker Asing."""
+    def _is_foreign(origin, code):
+        return origin == "F" if origin in ("F", "D") else get_broker_group(code) == "Asing"
+
+    f_buy = pd.Series([_is_foreign(o, c) for o, c in zip(df["Buyer_Origin"], df["Buyer_Code"])], index=df.index)
+    f_sell = pd.Series([_is_foreign(o, c) for o, c in zip(df["Seller_Origin"], df["Seller_Code"])], index=df.index)
+    out = {}
+    for k, col in (("value", "Value"), ("volume", "Lot"), ("freq", None)):
+        def _sum(mask):
+            return int(mask.sum()) if col is None else float(df.loc[mask, col].sum())
+        o = {"F_Buy": _sum(f_buy), "F_Sell": _sum(f_sell), "D_Buy": _sum(~f_buy), "D_Sell": _sum(~f_sell)}
+        total_f, total_d = o["F_Buy"] + o["F_Sell"], o["D_Buy"] + o["D_Sell"]
+        grand = total_f + total_d
+        o["Foreign_Pct"] = (total_f / grand * 100) if grand else 0.0
+        o["Domestic_Pct"] = (total_d / grand * 100) if grand else 0.0
+        o["Net_Foreign"] = o["F_Buy"] - o["F_Sell"]
+        out[k] = o
+    return out
+
+
+@pytest.fixture(params=["compact", "full"])
+def cleaned(request, messy_raw):
+    return clean_running_trade(messy_raw, compact=request.param == "compact")
+
+
+def test_broker_summary_matches_groupby(cleaned):
+    got = get_detailed_broker_summary(cleaned)
+    want = _reference_summary(cleaned)
+    assert got["Net_Val"].is_monotonic_decreasing
+    assert {"ZZ", "QQ"} <= set(got["Code"])  # kode di luar registry tetap ikut
+    cols = list(want.columns)
+    pd.testing.assert_frame_equal(got[cols].sort_values("Code").reset_index(drop=True),
+                                  want.sort_values("Code").reset_index(drop=True), check_dtype=False)
+
+
+def test_foreign_domestic_matches_rowwise(cleaned):
+    want = _reference_foreign(cleaned)
+    for got in (compute_foreign_domestic_activity(cleaned), compute_trade_stats(cleaned).foreign):
+        for k in want:
+            assert got[k] == pytest.approx(want[k])
+
+
+def test_trade_stats_totals_and_first_last(cleaned):
+    stats = compute_trade_stats(cleaned)
+    assert stats.rows == len(cleaned)
+    assert stats.total_value == cleaned["Value"].sum()
+    timed = cleaned.assign(_pos=np.arange(len(cleaned))).dropna(subset=["DateTime"])
+    # detik yang sama: baris paling atas = trade terakhir, baris paling bawah = trade pertama
+    last = timed.sort_values(["DateTime", "_pos"], ascending=[False, True]).iloc[0]
+    first = timed.sort_values(["DateTime", "_pos"], ascending=[True, False]).iloc[0]
+    assert (stats.last_price, stats.last_dt) == (last["Price"], last["DateTime"])
+    assert (stats.first_price, stats.first_dt) == (first["Price"], first["DateTime"])
+
+
+def test_empty_frame():
+    empty = clean_running_trade(pd.DataFrame())
+    stats = compute_trade_stats(empty)
+    assert stats.rows == 0 and stats.total_value == 0
+    assert compute_foreign_domestic_activity(empty)["value"]["Net_Foreign"] == 0
@@ -0,0 +1,71 @@
+import datetime
+import os
+
+import pytest
+
+from conftest import ROOT
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+
+def _ran(at) -> list[str]:
+    return [r["node"] for r in at.session_state["_analysis_log"] if r["status"] == "run"]
+
+
+@pytest.fixture
+def loaded_app(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.session_state["authenticated"] = True
+    at.run()
+    at.selectbox[0].set_value("MAPI").run()
+    at.date_input(key="db_start").set_value(datetime.date(2025, 12, 11))
+    at.date_input(key="db_end").set_value(datetime.date(2025, 12, 12)).run()
+    next(b for b in at.button if b.label == "Load Data").click().run()
+    assert not at.exception
+    return at
+
+
+def test_big_print_param_recomputes_score_and_conclusion_only(loaded_app):
+    at = loaded_app
+    at.run()
+    assert _ran(at) == []
+    applied_before = at.session_state["_bp_params_applied"]
+
+    at.slider(key="bp_la_trades").set_value(30).run()
+    assert not at.exception
+    assert sorted(set(_ran(at))) == ["bp", "conclusion", "score"]
+    assert at.session_state["_bp_params_applied"]["bp_lookahead_trades"] == 30
+    assert applied_before["bp_lookahead_trades"] == 15
+
+
+def _big_print_fragment_script():
+    import streamlit as st
+
+    import app
+
+    calls = []
+    rerun = st.rerun
+    st.rerun = lambda **kw: calls.append(kw.get("scope", "app"))
+    try:
+        app.render_big_print_section(st.session_state["df"])
+    finally:
+        st.rerun = rerun
+    st.session_state["rerun_calls"] = calls
+
+
+@pytest.mark.parametrize("applied_lookahead, reruns", [(15, []), (30, ["app"])])
+def test_big_print_fragment_reruns_app_when_params_change(sample_db, applied_lookahead, reruns):
+    from bandarmology import loader
+
+    _, index = loader.get_database_catalog(sample_db, max_age=0)
+    fps = [fp for day in index["TEST"]["files"].values() for fp in day]
+    at = AppTest.from_function(_big_print_fragment_script, default_timeout=60)
+    at.session_state["df"] = loader.load_cleaned_database_files("TEST", fps)
+    at.session_state["data_fp"] = "test"
+    # panel skor / kesimpulan terakhir dihitung dengan lookahead applied_lookahead; slider masih default 15
+    at.session_state["_bp_params_applied"] = {"bp_q": 0.99, "bp_min_lot": 0, "bp_lookahead_trades": applied_lookahead,
+                                              "bp_lookahead_seconds": None}
+    at.run()
+    assert not at.exception
+    assert at.session_state["rerun_calls"] == reruns
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bandarmology import loader
+from bandarmology.bigprint import BIG_PRINT_LABEL_ID, big_print_detector, big_print_from_index, build_big_print_index
+from bandarmology.cleaning import clean_running_trade
+
+from conftest import SAMPLE_DAYS
+
+
+def _label(action, pct: float) -> str:
+    if action == "Buy":
+        if abs(pct) <= 0.10:
+            return "Absorption (Buy, price flat)"
+        if pct > 0.25:
+            return "Dorong Naik (Beli agresif)"
+        if pct < -0.25:
+            return "Buy Gagal / Supply Kuat"
+        return "Big Buy (Beli besar)"
+    if action == "Sell":
+        if abs(pct) <= 0.10:
+            return "Serap (Jual diserap)"
+        if pct < -0.25:
+            return "Distribusi (Jual besar)"
+        if pct > 0.25:
+            return "Squeeze / Trap Sell"
+        return "Big Sell (Jual besar)"
+    return "Big Print"
+
+
+def _reference_big_print(df, q=0.99, min_lot=0, lookahead_trades=15, lookahead_seconds=None) -> pd.DataFrame:
+    """Big Print lama: loop per Big Print, harga pembanding dicari per baris."""
+    dfx = df.dropna(subset=["DateTime"]).sort_values("DateTime").copy()
+    if dfx.empty:
+        return pd.DataFrame()
+    thr = max(int(dfx["Lot"].quantile(q)), int(min_lot))
+    bp = dfx[dfx["Lot"] >= thr].copy()
+    prices = dfx["Price"].to_numpy()
+    times = dfx["DateTime"].tolist()
+    pos_of = {i: p for p, i in enumerate(dfx.index)}
+    labels = []
+    for i, row in bp.iterrows():
+        pos = pos_of[i]
+        if lookahead_seconds is None:
+            end = min(pos + lookahead_trades, len(dfx) - 1)
+        else:
+            limit = row["DateTime"] + pd.Timedelta(seconds=lookahead_seconds)
+            end = max(p for p, t in enumerate(times) if t <= limit)
+        cur = row["Price"]
+        pct = (prices[end] - cur) / cur * 100 if cur else 0.0
+        labels.append(_label(row["Action"], pct))
+    bp["Label"] = pd.Series(labels, index=bp.index, dtype=object).map(BIG_PRINT_LABEL_ID).fillna(
+        pd.Series(labels, index=bp.index))
+    bp["Threshold_Lot"] = thr
+    return bp.sort_values("DateTime")
+
+
+@pytest.fixture(scope="module")
+def sample_day():
+    raw = pd.concat([loader._read_source_file(fp) for fp in SAMPLE_DAYS], ignore_index=True)
+    return clean_running_trade(raw)
+
+
+@pytest.mark.parametrize("params", [
+    {"q": 0.99}, {"q": 0.9, "lookahead_trades": 3}, {"q": 0.95, "min_lot": 500},
+    {"q": 0.97, "lookahead_seconds": 60}, {"q": 0.99, "lookahead_seconds": 1},
+])
+def test_matches_reference_on_sample_days(sample_day, params):
+    got = big_print_detector(sample_day, **params)
+    want = _reference_big_print(sample_day, **params)
+    assert len(got) > 0
+    pd.testing.assert_frame_equal(got, want, check_dtype=False)
+
+
+def test_messy_frame_and_index_reuse(messy_raw):
+    df = clean_running_trade(messy_raw, compact=False)  # ada DateTime NaT, action Unknown, broker tak dikenal
+    idx = build_big_print_index(df)
+    for params in ({"q": 0.5}, {"q": 0.5, "lookahead_trades": 1}, {"q": 0.3, "lookahead_seconds": 3600}):
+        want = _reference_big_print(df, **params)
+        pd.testing.assert_frame_equal(big_print_from_index(idx, **params), want, check_dtype=False)
+        pd.testing.assert_frame_equal(big_print_detector(df, **params), want, check_dtype=False)
+
+
+def test_empty_and_all_nat_frames(messy_raw):
+    assert big_print_detector(pd.DataFrame()).empty
+    df = clean_running_trade(messy_raw).assign(DateTime=pd.NaT)
+    assert big_print_detector(df).empty
+    assert np.array_equal(build_big_print_index(df)["lots_sorted"], [])
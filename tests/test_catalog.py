@@ -0,0 +1,119 @@
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+from bandarmology import loader
+
+LAYOUT = {
+    ("AAA", "2025", "Desember"): ["01.csv", "3_pagi.csv", "3_sore.xlsx", "2025-12-05.csv", "catatan.txt"],
+    ("AAA", "2025", "11-November"): ["28.csv"],
+    ("BBB", "2026", "Jan"): ["02.csv", "15.csv"],
+}
+
+
+def _write_day(fp: str, rows: int = 3):
+    df = pd.DataFrame({"Time": [f"09:00:{i:02d}" for i in range(rows)], "Price": 100, "Lot": 1,
+                       "Buyer": "XL", "Seller": "YU"})
+    if fp.endswith(".xlsx"):
+        df.to_excel(fp, index=False)
+    elif fp.endswith(".csv"):
+        df.to_csv(fp, index=False)
+    else:
+        with open(fp, "w") as f:
+            f.write("bukan data\n")
+
+
+@pytest.fixture
+def db(tmp_path):
+    root = tmp_path / "db"
+    for parts, files in LAYOUT.items():
+        d = root.joinpath(*parts)
+        d.mkdir(parents=True)
+        for fn in files:
+            _write_day(str(d / fn))
+    return str(root)
+
+
+def _old_range(db_root, stock, start, end) -> list[str]:
+    """Resolver lama: listdir per hari di rentang."""
+    out, d = [], start
+    while d <= end:
+        out.extend(fp for fp in loader.resolve_database_files(db_root, stock, d) if fp not in out)
+        d += datetime.timedelta(days=1)
+    return out
+
+
+def _old_latest(db_root, stock, start, end) -> datetime.date | None:
+    d = end
+    while d >= start:
+        if loader.resolve_database_files(db_root, stock, d):
+            return d
+        d -= datetime.timedelta(days=1)
+    return None
+
+
+@pytest.mark.parametrize("stock, start, end", [
+    ("AAA", datetime.date(2025, 11, 1), datetime.date(2025, 12, 31)),
+    ("AAA", datetime.date(2025, 12, 2), datetime.date(2025, 12, 4)),
+    ("AAA", datetime.date(2025, 12, 6), datetime.date(2025, 12, 31)),
+    ("BBB", datetime.date(2025, 12, 1), datetime.date(2026, 1, 31)),
+    ("CCC", datetime.date(2025, 12, 1), datetime.date(2025, 12, 31)),
+])
+def test_catalog_matches_day_by_day_resolver(db, stock, start, end):
+    _, index = loader.get_database_catalog(db, max_age=0)
+    assert loader.catalog_files_in_range(index, stock, start, end) == _old_range(db, stock, start, end)
+    latest = loader.catalog_latest_date(index, stock)
+    assert latest == _old_latest(db, stock, datetime.date(2025, 1, 1), datetime.date(2026, 12, 31))
+    assert loader.resolve_database_files_range(db, stock, start, end) == _old_range(db, stock, start, end)
+
+
+def test_new_day_file_appears(db):
+    _, index = loader.get_database_catalog(db, max_age=0)
+    assert loader.catalog_latest_date(index, "AAA") == datetime.date(2025, 12, 5)
+    new = os.path.join(os.path.join(db, "AAA", "2025", "Desember"), "08.csv")
+    _write_day(new)
+    # dalam TTL katalog in-memory dipakai apa adanya; max_age=0 = refresh
+    _, index = loader.get_database_catalog(db, max_age=3600)
+    assert loader.catalog_latest_date(index, "AAA") == datetime.date(2025, 12, 5)
+    _, index = loader.get_database_catalog(db, max_age=0)
+    assert loader.catalog_latest_date(index, "AAA") == datetime.date(2025, 12, 8)
+    assert index["AAA"]["files"]["2025-12-08"] == [new]
+
+
+def test_overwritten_file_is_rescanned(db):
+    month = os.path.join(db, "AAA", "2025", "Desember")
+    fp = os.path.join(month, "01.csv")
+    cat, _ = loader.get_database_catalog(db, max_age=0)
+    assert cat["files"][fp]["rows"] == 3
+    dir_mtime = os.stat(month).st_mtime_ns
+
+    _write_day(fp, rows=7)
+    st = os.stat(fp)
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    os.utime(month, ns=(dir_mtime, dir_mtime))  # folder tidak berubah: hanya stat file yang menangkap ini
+    cat, _ = loader.get_database_catalog(db, max_age=0)
+    assert cat["files"][fp]["rows"] == 7
+    assert cat["files"][fp]["time_max"] == "09:00:06"
+
+
+def test_deleted_file_is_dropped(db):
+    month = os.path.join(db, "BBB", "2026", "Jan")
+    _, index = loader.get_database_catalog(db, max_age=0)
+    assert index["BBB"]["dates"] == ["2026-01-02", "2026-01-15"]
+    os.remove(os.path.join(month, "15.csv"))
+    cat, index = loader.get_database_catalog(db, max_age=0)
+    assert index["BBB"]["dates"] == ["2026-01-02"]
+    assert loader.catalog_latest_date(index, "BBB") == datetime.date(2026, 1, 2)
+    assert not any(fp.endswith("15.csv") for fp in cat["files"])
+
+
+def test_catalog_survives_restart(db, monkeypatch):
+    loader.get_database_catalog(db, max_age=0)
+    monkeypatch.setattr(loader, "_CATALOG_MEM", {})
+    scans = []
+    monkeypatch.setattr(loader, "_scan_file_stats", lambda fp: scans.append(fp) or {"rows": 0})
+    _, index = loader.get_database_catalog(db)
+    assert scans == []  # katalog di disk dipakai, file tidak di-scan ulang
+    assert loader.catalog_latest_date(index, "AAA") == datetime.date(2025, 12, 5)
@@ -0,0 +1,57 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bandarmology.cleaning import (CLEAN_SCHEMA, _clean_running_trade_rowwise, _rt_parse_time_to_dt,
+                                   clean_running_trade, compact_trade_frame, parse_time_of_day)
+
+
+def test_full_frame_matches_rowwise(messy_raw):
+    got = clean_running_trade(messy_raw, compact=False)
+    want = _clean_running_trade_rowwise(messy_raw)
+    pd.testing.assert_frame_equal(got, want)
+    assert got["DateTime"].isna().sum() == 2  # "abc" dan jam kosong
+
+
+def test_compact_frame_matches_rowwise(messy_raw):
+    got = clean_running_trade(messy_raw)
+    want = compact_trade_frame(_clean_running_trade_rowwise(messy_raw))
+    pd.testing.assert_frame_equal(got, want)
+    assert {c: str(got[c].dtype) for c in got.columns} == {c: CLEAN_SCHEMA[c] for c in got.columns}
+    sec = got["Time_Sec"].to_numpy()
+    tod = (got["DateTime"] - got["DateTime"].dt.normalize()).dt.total_seconds()
+    assert np.array_equal(sec[sec >= 0], tod[sec >= 0].astype(int))
+    assert got["DateTime"].isna().to_numpy().tolist() == (sec < 0).tolist()
+
+
+def test_without_trade_date_column_uses_argument(messy_raw):
+    raw = messy_raw.drop(columns=["TradeDate"])
+    day = datetime.date(2025, 12, 11)
+    pd.testing.assert_frame_equal(clean_running_trade(raw, trade_date=day, compact=False),
+                                  _clean_running_trade_rowwise(raw, trade_date=day))
+
+
+@pytest.mark.parametrize("values", [
+    ["09:00:01", "9:01.05", "08:58", "09:00:00.250", "abc", None, "", " 10:15:30 "],
+    [datetime.time(9, 0, 1), datetime.time(9, 0, 1, 500_000), "09:02:00", None],
+    pd.to_datetime(["1900-01-01 09:00:01", "2025-12-11 14:02:03", None]),
+    [pd.Timestamp("1970-01-01 10:00:00"), "10:00", float("nan")],
+])
+def test_time_parser_matches_rowwise(values):
+    base = datetime.date(2025, 12, 11)
+    tod, abs_, _ = parse_time_of_day(values)
+    base_ns = pd.Timestamp(base).value
+    got = np.where(abs_ != np.iinfo(np.int64).min, abs_,
+                   np.where(tod != np.iinfo(np.int64).min, base_ns + tod, np.iinfo(np.int64).min))
+    want = pd.Series([_rt_parse_time_to_dt(v, base) for v in values], dtype="datetime64[ns]")
+    assert got.tolist() == want.to_numpy().view(np.int64).tolist()
+
+
+def test_empty_frames():
+    assert clean_running_trade(pd.DataFrame()).empty
+    assert clean_running_trade(None).empty
+    raw = pd.DataFrame({"Time": ["09:00:00"], "Price": ["0"], "Lot": [5], "Buyer": ["XL"], "Seller": ["YU"]})
+    out = clean_running_trade(raw, trade_date=datetime.date(2025, 12, 11))
+    assert out.empty
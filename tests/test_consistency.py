@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bandarmology.brokers import get_broker_info
+from bandarmology.cleaning import clean_running_trade
+from bandarmology.consistency import broker_consistency, broker_consistency_rolling
+from bandarmology.rollup import build_daily_rollup
+
+WINDOWS = (3, 5)
+
+
+def _reference_daily(df: pd.DataFrame) -> pd.DataFrame:
+    d = df.assign(Date=pd.to_datetime(df["TradeDate"]).dt.date)
+    buy = d.groupby(["Date", "Buyer_Code"], observed=True).agg(Buy_Lot=("Lot", "sum"), Buy_Val=("Value", "sum"))
+    sell = d.groupby(["Date", "Seller_Code"], observed=True).agg(Sell_Lot=("Lot", "sum"), Sell_Val=("Value", "sum"))
+    buy.index.names = sell.index.names = ["Date", "Code"]
+    daily = buy.join(sell, how="outer").fillna(0)
+    daily["Net_Lot_D"] = daily["Buy_Lot"] - daily["Sell_Lot"]
+    daily["Net_Val_D"] = daily["Buy_Val"] - daily["Sell_Val"]
+    daily = daily.reset_index()
+    daily["Code"] = daily["Code"].astype(str)
+    return daily
+
+
+def _score(buy_days: int, sell_days: int, active: int) -> int:
+    return int(50 + 50 * ((buy_days - sell_days) / (active or 1)))
+
+
+def _reference_consistency(df: pd.DataFrame, windows=WINDOWS) -> pd.DataFrame:
+    """Konsistensi lama (groupby + apply per broker) + window N hari bursa terakhir lewat loop per broker."""
+    daily = _reference_daily(df)
+    agg = daily.groupby("Code").agg(
+        Days_Active=("Date", "nunique"),
+        Net_Buy_Days=("Net_Lot_D", lambda x: int((x > 0).sum())),
+        Net_Sell_Days=("Net_Lot_D", lambda x: int((x < 0).sum())),
+        Net_Lot=("Net_Lot_D", "sum"), Net_Val=("Net_Val_D", "sum"),
+        Buy_Lot=("Buy_Lot", "sum"), Sell_Lot=("Sell_Lot", "sum"),
+        Buy_Val=("Buy_Val", "sum"), Sell_Val=("Sell_Val", "sum"),
+    ).reset_index()
+    agg["Buy_Avg"] = [round(v / (lot * 100)) if lot > 0 else 0 for v, lot in zip(agg["Buy_Val"], agg["Buy_Lot"])]
+    agg["Sell_Avg"] = [round(v / (lot * 100)) if lot > 0 else 0 for v, lot in zip(agg["Sell_Val"], agg["Sell_Lot"])]
+    agg["Consistency_Score"] = agg.apply(
+        lambda r: _score(r["Net_Buy_Days"], r["Net_Sell_Days"], r["Days_Active"]), axis=1)
+    agg["Name"] = agg["Code"].apply(lambda x: get_broker_info(x)[1])
+    agg["Group"] = agg["Code"].apply(lambda x: get_broker_info(x)[2])
+    dates = sorted(daily["Date"].unique())
+    for w in windows:
+        last = daily[daily["Date"].isin(dates[-w:])]
+        scores, nets = [], []
+        for code in agg["Code"]:
+            x = last.loc[last["Code"] == code, "Net_Lot_D"]
+            scores.append(_score(int((x > 0).sum()), int((x < 0).sum()), len(x)))
+            nets.append(x.sum())
+        agg[f"Score_{w}D"] = scores
+        agg[f"Net_Lot_{w}D"] = nets
+    return agg.sort_values(["Net_Val", "Consistency_Score"], ascending=[False, False])
+
+
+def _reference_rolling(df: pd.DataFrame, windows=WINDOWS) -> pd.DataFrame:
+    daily = _reference_daily(df)
+    dates = sorted(daily["Date"].unique())
+    rows = []
+    for w in windows:
+        for i, day in enumerate(dates):
+            win = daily[daily["Date"].isin(dates[max(0, i - w + 1):i + 1])]
+            for code, x in win.groupby("Code")["Net_Lot_D"]:
+                pos, neg = int((x > 0).sum()), int((x < 0).sum())
+                rows.append({"Date": day, "Code": code, "Window": w, "Days_Active": len(x), "Net_Buy_Days": pos,
+                             "Net_Sell_Days": neg, "Net_Lot": x.sum(), "Score": _score(pos, neg, len(x))})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def multi_day_clean(messy_raw):
+    # 8 hari bursa dari fixture mentah yang sama, lot diacak per hari supaya net buy / sell berganti-ganti
+    rng = np.random.default_rng(7)
+    days = pd.bdate_range("2025-12-01", periods=8)
+    frames = []
+    for i, day in enumerate(days):
+        d = messy_raw.copy()
+        d["TradeDate"] = day.strftime("%Y-%m-%d")
+        d["Lot"] = rng.integers(1, 60, len(d))
+        frames.append(d if i % 3 else d.iloc[: len(d) // 2])  # sebagian broker tidak aktif di hari tertentu
+    return clean_running_trade(pd.concat(frames, ignore_index=True))
+
+
+def test_consistency_matches_reference(multi_day_clean):
+    want = _reference_consistency(multi_day_clean)
+    for src in (multi_day_clean, build_daily_rollup(multi_day_clean)):
+        got = broker_consistency(src, windows=WINDOWS)
+        pd.testing.assert_frame_equal(got.reset_index(drop=True), want.reset_index(drop=True), check_dtype=False)
+
+
+def test_rolling_matches_reference(multi_day_clean):
+    got = broker_consistency_rolling(multi_day_clean, windows=WINDOWS)
+    want = _reference_rolling(multi_day_clean)
+    key = ["Window", "Date", "Code"]
+    pd.testing.assert_frame_equal(got.sort_values(key).reset_index(drop=True),
+                                  want[got.columns].sort_values(key).reset_index(drop=True), check_dtype=False)
+
+
+def test_empty_frame():
+    empty = clean_running_trade(pd.DataFrame())
+    assert broker_consistency(empty).empty
+    assert broker_consistency_rolling(empty).empty
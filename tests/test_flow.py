@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from bandarmology.brokers import get_broker_group
+from bandarmology.cleaning import clean_running_trade
+from bandarmology.flow import FLOW_GROUPS, build_flow_matrix, flow_broker_totals, flow_group_matrix, flow_top_links
+
+
+def _reference_pairs(df: pd.DataFrame) -> pd.DataFrame:
+    """Aliran per pasangan (buyer, seller) lewat groupby biasa."""
+    d = df.assign(Buyer_Code=df["Buyer_Code"].astype(str), Seller_Code=df["Seller_Code"].astype(str))
+    return d.groupby(["Buyer_Code", "Seller_Code"]).agg(Value=("Value", "sum"), Lot=("Lot", "sum"),
+                                                        Freq=("Lot", "size"))
+
+
+def _matrix_pairs(flow: dict) -> pd.DataFrame:
+    codes = np.array(flow["codes"], dtype=object)
+    b, s = np.nonzero(flow["freq"])
+    return pd.DataFrame({"Buyer_Code": codes[b], "Seller_Code": codes[s], "Value": flow["value"][b, s],
+                         "Lot": flow["lot"][b, s], "Freq": flow["freq"][b, s]}).set_index(["Buyer_Code", "Seller_Code"])
+
+
+def test_flow_matrix_matches_groupby(messy_raw):
+    for compact in (True, False):
+        df = clean_running_trade(messy_raw, compact=compact)
+        flow = build_flow_matrix(df)
+        want = _reference_pairs(df)
+        pd.testing.assert_frame_equal(_matrix_pairs(flow).sort_index(), want.sort_index(), check_dtype=False)
+        assert list(flow["groups"]) == [get_broker_group(c) for c in flow["codes"]]
+
+
+def test_top_links_totals_and_groups(messy_raw):
+    df = clean_running_trade(messy_raw)
+    flow = build_flow_matrix(df)
+    want = _reference_pairs(df).reset_index()
+
+    top = flow_top_links(flow, top_n=5, metric="Lot")
+    ref = want.sort_values(["Lot", "Buyer_Code"], ascending=[False, True])
+    assert top["Lot"].tolist() == ref["Lot"].head(5).tolist()
+
+    totals = flow_broker_totals(flow, metric="Value")
+    buy = want.groupby("Buyer_Code")["Value"].sum()
+    sell = want.groupby("Seller_Code")["Value"].sum()
+    net = buy.reindex(totals.index, fill_value=0) - sell.reindex(totals.index, fill_value=0)
+    assert totals["Net"].tolist() == net.tolist()
+
+    g = flow_group_matrix(flow, metric="Value")
+    want["BG"] = want["Buyer_Code"].map(get_broker_group)
+    want["SG"] = want["Seller_Code"].map(get_broker_group)
+    ref_g = want.pivot_table(index="BG", columns="SG", values="Value", aggfunc="sum", fill_value=0)
+    ref_g = ref_g.reindex(index=FLOW_GROUPS, columns=FLOW_GROUPS, fill_value=0)
+    assert np.array_equal(g.to_numpy(), ref_g.to_numpy())
+
+
+def test_empty_frame():
+    flow = build_flow_matrix(clean_running_trade(pd.DataFrame()))
+    assert flow["codes"] == [] and flow["value"].shape == (0, 0)
+    assert flow_top_links(flow).empty
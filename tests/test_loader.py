@@ -0,0 +1,56 @@
+import datetime
+import os
+
+import pandas as pd
+
+from bandarmology import loader
+
+from conftest import SAMPLE_DAYS
+
+
+def _mixed_files(tmp_path) -> list[str]:
+    """2 CSV + 2 XLSX (hari berbeda) + 1 XLSX rusak, urutan sengaja tidak urut tanggal / jenis file."""
+    month = tmp_path / "db" / "TEST" / "2025" / "Desember"
+    month.mkdir(parents=True)
+    src = [pd.read_csv(fp) for fp in SAMPLE_DAYS]
+    paths = {}
+    for day, frame in (("11", src[0]), ("12", src[1])):
+        paths[f"{day}.csv"] = str(month / f"{day}.csv")
+        frame.to_csv(paths[f"{day}.csv"], index=False)
+    for day, frame in (("15", src[0].head(300)), ("16", src[1].tail(200))):
+        paths[f"{day}.xlsx"] = str(month / f"{day}.xlsx")
+        frame.to_excel(paths[f"{day}.xlsx"], index=False)
+    paths["17.xlsx"] = str(month / "17.xlsx")
+    with open(paths["17.xlsx"], "wb") as f:
+        f.write(b"bukan file excel")
+    return [paths[k] for k in ("16.xlsx", "11.csv", "17.xlsx", "15.xlsx", "12.csv")]
+
+
+def test_parallel_read_is_deterministic_and_reports_failures(tmp_path):
+    fps = _mixed_files(tmp_path)
+    rep1: list[dict] = []
+    rep4: list[dict] = []
+    serial = loader.load_database_files(fps, workers=1, report=rep1)
+    parallel = loader.load_database_files(fps, workers=4, report=rep4)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+    # urutan baris = urutan file, tiap blok di-tag nama file + tanggal dari path
+    ok = [r for r in rep1 if r["ok"]]
+    assert serial["__source_file"].tolist() == [os.path.basename(r["file"]) for r in ok for _ in range(r["rows"])]
+    days = {os.path.basename(r["file"]): datetime.date(2025, 12, int(os.path.basename(r["file"])[:2])) for r in ok}
+    assert (serial["TradeDate"] == serial["__source_file"].map(days)).all()
+
+    for rep in (rep1, rep4):
+        assert [r["file"] for r in rep] == fps
+        bad = [r for r in rep if not r["ok"]]
+        assert [r["file"] for r in bad] == [fps[2]]
+        assert bad[0]["rows"] == 0 and bad[0]["error"]
+        assert all(r["error"] is None and r["rows"] > 0 for r in rep if r["ok"])
+
+
+def test_read_database_files_keeps_slots_for_failed_files(tmp_path):
+    fps = _mixed_files(tmp_path)
+    frames, rep = loader.read_database_files(fps, workers=4)
+    assert len(frames) == len(rep) == len(fps)
+    assert frames[2] is None and not rep[2]["ok"]
+    assert all(f is not None for i, f in enumerate(frames) if i != 2)
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from bandarmology import market
+
+
+@pytest.fixture
+def fresh_market(monkeypatch):
+    """Cache + breaker kosong untuk test ini (refresher background membaca global modul saat jalan)."""
+    monkeypatch.setattr(market, "_MARKET_CACHE", {})
+    monkeypatch.setattr(market, "_BREAKER", {"fails": 0, "trips": 0, "open_until": 0.0, "last_error": None})
+    return market
+
+
+def _fail(n: int = 1):
+    with market._MARKET_LOCK:
+        for _ in range(n):
+            market._record_result(False, "RuntimeError: HTTP 503")
+
+
+def test_breaker_opens_after_consecutive_failures(fresh_market):
+    _fail(market.BREAKER_FAILS - 1)
+    assert not market.breaker_state()["open"]
+    _fail()
+    b = market.breaker_state()
+    assert b["open"] and b["trips"] == 1
+    assert b["retry_in"] == pytest.approx(market.BREAKER_COOLDOWN, abs=2)
+    assert b["last_error"] == "RuntimeError: HTTP 503"
+
+
+def test_half_open_failure_doubles_cooldown_up_to_cap(fresh_market):
+    _fail(market.BREAKER_FAILS)
+    cooldowns = []
+    for _ in range(6):
+        # setelah jeda: 1 percobaan (half-open); gagal -> langsung terbuka lagi dengan jeda dobel
+        _fail()
+        cooldowns.append(round(market.breaker_state()["retry_in"]))
+    c = market.BREAKER_COOLDOWN
+    assert cooldowns == [min(c * 2 ** i, market.BREAKER_MAX_COOLDOWN) for i in range(1, 7)]
+    assert cooldowns[-1] == market.BREAKER_MAX_COOLDOWN
+
+
+def test_one_success_resets_breaker(fresh_market):
+    _fail(market.BREAKER_FAILS + 2)
+    with market._MARKET_LOCK:
+        market._record_result(True)
+    b = market.breaker_state()
+    assert (b["fails"], b["trips"], b["last_error"]) == (0, 0, None)
+    # jeda yang sedang berjalan dibiarkan habis; kegagalan berikutnya mulai hitung dari awal
+    market._BREAKER["open_until"] = 0.0
+    _fail(market.BREAKER_FAILS - 1)
+    assert not market.breaker_state()["open"]
+    _fail()
+    assert market.breaker_state()["retry_in"] == pytest.approx(market.BREAKER_COOLDOWN, abs=2)
+
+
+def _wait(cond, timeout: float = 10.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_market_data_never_waits_for_fetch(fresh_market, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_failing(symbols):
+        calls.append(symbols)
+        release.wait(5)
+        raise RuntimeError("HTTP 503")
+
+    monkeypatch.setattr(market, "_FETCHERS", {**market._FETCHERS, "quotes": slow_failing})
+    t0 = time.perf_counter()
+    snap = market.market_data("quotes", ("AAAA.JK",))
+    assert time.perf_counter() - t0 < 0.5
+    assert snap["value"] is None and snap["age"] is None and not snap["stale"]
+    assert market.market_status_text(snap) == "Mengambil data Yahoo di background..."
+
+    # fetch sedang tergantung di refresher: render berikutnya tetap langsung kembali
+    assert _wait(lambda: calls)
+    t0 = time.perf_counter()
+    market.market_data("quotes", ("AAAA.JK",))
+    assert time.perf_counter() - t0 < 0.5
+
+    release.set()
+    assert _wait(lambda: market._MARKET_CACHE[("quotes", ("AAAA.JK",))]["error"] is not None)
+    snap = market.market_data("quotes", ("AAAA.JK",))
+    assert snap["value"] is None and snap["stale"]
+    assert market.market_status_text(snap) == "Mengambil data Yahoo di background... (gagal: RuntimeError)"
+
+
+def test_refresher_failures_open_breaker(fresh_market, monkeypatch):
+    calls = []
+
+    def failing(symbols):
+        calls.append(symbols)
+        raise RuntimeError("HTTP 503")
+
+    monkeypatch.setattr(market, "_FETCHERS", {**market._FETCHERS, "quotes": failing})
+    keys = [(f"S{i}.JK",) for i in range(market.BREAKER_FAILS + 2)]
+    for k in keys:
+        market.market_data("quotes", k)
+    assert _wait(lambda: market.breaker_state()["open"])
+    # breaker terbuka: sisa key di putaran itu tidak di-fetch
+    assert len(calls) == market.BREAKER_FAILS
+
+    snap = market.market_data("quotes", keys[-1])
+    assert snap["value"] is None and snap["breaker"]["open"]
+    assert market.market_status_text(snap) == (
+        f"Yahoo dijeda {market.BREAKER_COOLDOWN / 60:.0f} menit (gagal berulang: RuntimeError)."
+    )
@@ -0,0 +1,97 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bandarmology import market
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import yahoo_stub  # noqa: E402
+
+TODAY = datetime.date(2025, 6, 11)
+SYMBOL = "TEST.JK"
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    srv = yahoo_stub.start_stub(today=TODAY)
+    monkeypatch.setattr(market, "YAHOO_BASE", srv.base_url)
+    yield srv
+    srv.shutdown()
+
+
+def _stub_frame(srv, p1: int = 0) -> pd.DataFrame:
+    ts, v = srv.bars(SYMBOL, p1, 2**40)
+    return pd.DataFrame({"Date": pd.to_datetime(ts, unit="s"),
+                         **{k: v[:, i] for i, k in enumerate(("Open", "High", "Low", "Close", "Volume"))}})
+
+
+def _advance(srv, days: int):
+    srv.today = np.busday_offset(np.datetime64(srv.today), days, roll="forward").astype(object)
+
+
+def test_first_download_is_full_range(stub):
+    df = market.update_ohlc_store(SYMBOL)
+    assert stub.stats["chart"] == 1
+    p1 = yahoo_stub._epoch(TODAY - datetime.timedelta(days=yahoo_stub.RANGE_DAYS[market.OHLC_STORE_FULL_RANGE]))
+    pd.testing.assert_frame_equal(df, _stub_frame(stub, p1), check_dtype=False)
+
+    stored, fetched_at = market.load_ohlc_store(SYMBOL)
+    pd.testing.assert_frame_equal(stored, df)
+    assert fetched_at is not None
+
+
+def test_incremental_update_refetches_last_bar_and_replaces_it(stub):
+    first = market.update_ohlc_store(SYMBOL)
+    last_day = first["Date"].iloc[-1]
+    # bar hari berjalan berubah setelah download pertama (harga penutupan belum final)
+    ts, v = stub.history(SYMBOL)
+    v[np.flatnonzero(ts == int(last_day.timestamp()))[0], 3] += 7.0
+    _advance(stub, 3)
+
+    before = dict(stub.stats)
+    merged = market.update_ohlc_store(SYMBOL)
+    # hanya bar sejak tanggal terakhir di store: bar terakhir lama + 3 bar baru
+    assert stub.stats["chart"] - before["chart"] == 1
+    assert stub.stats["bars"] - before["bars"] == 4
+    assert len(merged) == len(first) + 3
+    assert merged["Date"].dt.normalize().is_unique and merged["Date"].is_monotonic_increasing
+    assert merged.loc[merged["Date"] == last_day, "Close"].item() == first["Close"].iloc[-1] + 7.0
+    pd.testing.assert_frame_equal(merged, _stub_frame(stub, int(first["Date"].iloc[0].timestamp())),
+                                  check_dtype=False)
+
+
+@pytest.mark.parametrize("rng", ["1mo", "5y"])
+def test_slice_is_local(stub, rng):
+    df = market.update_ohlc_store(SYMBOL)
+    requests = stub.stats["requests"]
+    out = market.slice_ohlc(df, rng)
+    cutoff = df["Date"].iloc[-1].normalize() - market.OHLC_RANGE_OFFSETS[rng]
+    pd.testing.assert_frame_equal(out, df[df["Date"] >= cutoff].reset_index(drop=True))
+    assert out["Date"].iloc[-1] == df["Date"].iloc[-1]
+    assert stub.stats["requests"] == requests
+    if rng == "1mo":
+        assert 18 <= len(out) <= 24
+
+
+def test_meta_data_mismatch_is_an_empty_store(stub):
+    df = market.update_ohlc_store(SYMBOL)
+    data_path, meta_path = market._ohlc_store_paths(SYMBOL, "1d")
+    # crash setelah data baru ditulis tapi sebelum meta-nya: meta lama tidak cocok dengan isi data
+    market._write_frame_cache(pd.concat([df, df.tail(1).assign(Date=df["Date"].iloc[-1] + pd.Timedelta(days=1))],
+                                        ignore_index=True), data_path)
+    assert market.load_ohlc_store(SYMBOL) == (None, None)
+
+    before = dict(stub.stats)
+    again = market.update_ohlc_store(SYMBOL)
+    assert stub.stats["bars"] - before["bars"] == len(df)  # download penuh lagi, bukan inkremental
+    pd.testing.assert_frame_equal(again, df)
+    assert market.load_ohlc_store(SYMBOL)[0] is not None
+
+    os.remove(data_path)
+    assert market.load_ohlc_store(SYMBOL) == (None, None)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bandarmology import loader
+from bandarmology.cleaning import clean_running_trade
+from bandarmology.ohlcv import OHLCV_COLUMNS, build_ohlcv
+
+from conftest import SAMPLE_DAYS
+
+
+def _reference_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """groupby per bucket: urut DateTime, file sumber (urutan muncul), lalu baris bawah file dulu."""
+    step = {"1m": "1min", "5m": "5min", "15m": "15min", "1d": "1D"}[interval]
+    d = df.copy()
+    d["_pos"] = np.arange(len(d))
+    src = d["__source_file"].astype(str) if "__source_file" in d.columns else pd.Series("", index=d.index)
+    d["_seg"] = (src != src.shift()).cumsum()
+    d = d[d["DateTime"].notna()].sort_values(["DateTime", "_seg", "_pos"], ascending=[True, True, False])
+    if "Action" not in d.columns:
+        d["Action"] = "Unknown"
+    if "Value" not in d.columns:
+        d["Value"] = d["Price"] * d["Lot"] * 100
+    d["Buy_Volume"] = d["Lot"].where(d["Action"] == "Buy", 0)
+    d["Sell_Volume"] = d["Lot"].where(d["Action"] == "Sell", 0)
+    g = d.groupby(d["DateTime"].dt.floor(step), sort=True)
+    out = pd.DataFrame({
+        "Open": g["Price"].first(), "High": g["Price"].max(), "Low": g["Price"].min(), "Close": g["Price"].last(),
+        "Volume": g["Lot"].sum(), "Buy_Volume": g["Buy_Volume"].sum(), "Sell_Volume": g["Sell_Volume"].sum(),
+        "Value": g["Value"].sum(), "Freq": g.size(),
+    }).rename_axis("Date").reset_index()
+    return out[OHLCV_COLUMNS].astype({c: "int64" for c in OHLCV_COLUMNS[1:]})
+
+
+def _assert_same(got: pd.DataFrame, want: pd.DataFrame):
+    got = got.astype({c: "int64" for c in OHLCV_COLUMNS[1:]})
+    got["Date"] = got["Date"].astype("datetime64[ns]")
+    want["Date"] = want["Date"].astype("datetime64[ns]")
+    pd.testing.assert_frame_equal(got.reset_index(drop=True), want.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("interval", ["1m", "5m", "1d"])
+def test_matches_groupby_on_sample_days(interval):
+    raw = pd.concat([loader._read_source_file(fp) for fp in SAMPLE_DAYS], ignore_index=True)
+    df = clean_running_trade(raw, volume_mode="LOT")
+    _assert_same(build_ohlcv(df, interval), _reference_ohlcv(df, interval))
+
+
+def _ties_frame() -> pd.DataFrame:
+    # 2 file untuk hari yang sama, urut terbaru dulu; detik 09:00:05 ada di kedua file, ada jam kosong
+    t = pd.to_datetime(["2025-12-11 09:00:07", "2025-12-11 09:00:05", "2025-12-11 09:00:05", None,
+                        "2025-12-11 09:00:05", "2025-12-11 09:00:01", "2025-12-11 09:00:05"])
+    return pd.DataFrame({
+        "DateTime": t,
+        "Price": [105, 104, 103, 999, 102, 101, 100],
+        "Lot": [1, 2, 3, 4, 5, 6, 7],
+        "Action": ["Buy", "Sell", "Buy", "Buy", "Unknown", "Sell", "Buy"],
+        "__source_file": ["b.csv", "b.csv", "b.csv", "b.csv", "a.csv", "a.csv", "a.csv"],
+    })
+
+
+def test_same_second_ties_follow_file_then_bottom_row_first():
+    df = _ties_frame()
+    bars = build_ohlcv(df, "1m")
+    assert (bars["Open"].iloc[0], bars["Close"].iloc[0]) == (101, 105)
+    _assert_same(bars, _reference_ohlcv(df, "1m"))
+    # detik 09:00:05: file b dulu (urutan di frame), baris bawah dulu -> 103, 104; lalu file a -> 100, 102
+    sec = build_ohlcv(df[df["DateTime"] == df["DateTime"].iloc[1]], "1m")
+    assert (sec["Open"].iloc[0], sec["Close"].iloc[0]) == (103, 102)
+
+
+def test_without_action_has_zero_buy_sell():
+    df = _ties_frame().drop(columns=["Action"])
+    bars = build_ohlcv(df, "1m")
+    assert bars["Buy_Volume"].dtype == np.int64
+    assert bars["Buy_Volume"].sum() == 0 and bars["Sell_Volume"].sum() == 0
+    _assert_same(bars, _reference_ohlcv(df, "1m"))
+
+
+def test_empty_and_all_nat_frames():
+    assert build_ohlcv(pd.DataFrame()).empty
+    df = _ties_frame().assign(DateTime=pd.NaT)
+    assert list(build_ohlcv(df).columns) == OHLCV_COLUMNS and build_ohlcv(df).empty
@@ -0,0 +1,78 @@
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bandarmology import loader, rollup
+from bandarmology.consistency import broker_consistency
+
+from conftest import SAMPLE_DAYS
+
+DAYS = [datetime.date(2025, 12, d) for d in (1, 2, 3, 4, 5, 8, 9)]
+
+
+@pytest.fixture
+def week_db(tmp_path) -> list[str]:
+    """7 hari bursa saham TEST: sampel acak baris file MAPI (net buy / sell broker berganti-ganti)."""
+    month = tmp_path / "db" / "TEST" / "2025" / "Desember"
+    month.mkdir(parents=True)
+    src = [pd.read_csv(fp) for fp in SAMPLE_DAYS]
+    fps = []
+    for i, day in enumerate(DAYS):
+        fp = str(month / f"{day.day:02d}.csv")
+        src[i % 2].sample(frac=0.6, random_state=i).to_csv(fp, index=False)
+        fps.append(fp)
+    return fps
+
+
+def _sorted(roll: pd.DataFrame) -> pd.DataFrame:
+    out = roll.astype({"Code": str}).sort_values(["TradeDate", "Code"]).reset_index(drop=True)
+    return out.astype({c: np.int64 for c in rollup.ROLLUP_COLUMNS[2:]})
+
+
+def _cache_files(kind: str) -> list[str]:
+    root = os.path.join(loader.CACHE_ROOT, kind)
+    return [os.path.join(d, f) for d, _, files in os.walk(root) for f in files]
+
+
+def test_consistency_from_rollups_equals_cleaned_days(week_db):
+    cleaned = loader.load_cleaned_database_files("TEST", week_db)
+    want = broker_consistency(cleaned)
+
+    for _ in range(2):  # ingest, lalu dari store
+        per_day = [rollup.load_daily_rollups("TEST", [fp]) for fp in week_db]
+        got = broker_consistency(rollup.concat_rollups(per_day))
+        pd.testing.assert_frame_equal(got.reset_index(drop=True), want.reset_index(drop=True), check_dtype=False)
+        pd.testing.assert_frame_equal(_sorted(rollup.concat_rollups(per_day)), _sorted(rollup.build_daily_rollup(cleaned)))
+    assert len(_cache_files("rollup")) == 2 * len(DAYS)
+
+
+def test_range_for_analysis_splits_intraday_and_keeps_full_rollup(week_db, monkeypatch):
+    monkeypatch.setattr(rollup, "INTRADAY_MAX_DAYS", 3)
+    df, roll, intraday_from = rollup.load_range_for_analysis("TEST", week_db, DAYS[0], DAYS[-1])
+    assert intraday_from == DAYS[-1] - datetime.timedelta(days=2)
+    assert sorted(df["TradeDate"].dt.date.unique()) == [d for d in DAYS if d >= intraday_from]
+
+    cleaned = loader.load_cleaned_database_files("TEST", week_db)
+    pd.testing.assert_frame_equal(_sorted(roll), _sorted(rollup.build_daily_rollup(cleaned)))
+    pd.testing.assert_frame_equal(broker_consistency(roll).reset_index(drop=True),
+                                  broker_consistency(cleaned).reset_index(drop=True), check_dtype=False)
+
+
+def test_ingest_does_not_write_clean_cache(week_db):
+    rollup.load_daily_rollups("TEST", week_db)
+    assert _cache_files("clean") == []
+    assert len(_cache_files("rollup")) == 2 * len(DAYS)
+
+    loader.load_cleaned_database_files("TEST", week_db[:2], store=False)
+    assert _cache_files("clean") == []
+    loader.load_cleaned_database_files("TEST", week_db[:2])
+    assert len(_cache_files("clean")) == 2 * 2
+
+
+def test_empty_inputs():
+    assert rollup.build_daily_rollup(pd.DataFrame()).empty
+    assert list(rollup.concat_rollups([]).columns) == rollup.ROLLUP_COLUMNS
+    assert rollup.load_daily_rollups("TEST", []).empty
@@ -0,0 +1,65 @@
+import datetime
+
+from bandarmology import loader, score
+
+START, END = datetime.date(2025, 12, 1), datetime.date(2025, 12, 31)
+
+
+def test_failed_day_is_not_stored_and_recomputed(sample_db, monkeypatch):
+    _, index = loader.get_database_catalog(sample_db, max_age=0)
+    bad_day = index["TEST"]["files"]["2025-12-12"][0]
+    read = loader._read_source_file
+
+    def flaky_read(fp):
+        if fp == bad_day:
+            raise OSError("file sedang ditulis")
+        return read(fp)
+
+    monkeypatch.setattr(loader, "_read_source_file", flaky_read)
+    hist = score.bandar_score_history("TEST", index, START, END)
+    assert list(hist["Date"]) == [datetime.date(2025, 12, 11)]
+    assert "2025-12-12" not in score._load_score_store("TEST")["days"]
+
+    # file yang sama (signature tidak berubah) terbaca normal -> hari itu dihitung ulang, bukan error dari store
+    monkeypatch.setattr(loader, "_read_source_file", read)
+    calls = []
+    compute = score.compute_day_score
+    monkeypatch.setattr(score, "compute_day_score", lambda *a: calls.append(a) or compute(*a))
+    hist = score.bandar_score_history("TEST", index, START, END)
+    assert list(hist["Date"]) == [datetime.date(2025, 12, 11), datetime.date(2025, 12, 12)]
+    assert len(calls) == 1
+    assert "error" not in score._load_score_store("TEST")["days"]["2025-12-12"]
+
+
+def test_failed_window_file_marks_day_unsaved(sample_db, monkeypatch):
+    _, index = loader.get_database_catalog(sample_db, max_age=0)
+    window_day = index["TEST"]["files"]["2025-12-11"][0]
+    read = loader._read_source_file
+
+    def flaky_read(fp):
+        if fp == window_day:
+            raise OSError("file sedang ditulis")
+        return read(fp)
+
+    monkeypatch.setattr(loader, "_read_source_file", flaky_read)
+    row = score.compute_day_score("TEST", index["TEST"]["files"]["2025-12-12"], [window_day])
+    assert row["failed_files"] == 1
+    score.bandar_score_history("TEST", index, datetime.date(2025, 12, 12), END)
+    assert "2025-12-12" not in score._load_score_store("TEST")["days"]
+
+
+def test_unchanged_days_come_from_store(sample_db, monkeypatch):
+    _, index = loader.get_database_catalog(sample_db, max_age=0)
+    first = score.bandar_score_history("TEST", index, START, END)
+    monkeypatch.setattr(score, "compute_day_score", lambda *a: (_ for _ in ()).throw(AssertionError("dihitung ulang")))
+    again = score.bandar_score_history("TEST", index, START, END)
+    assert first.equals(again)
+
+
+def test_cached_only_mode_reports_pending(sample_db, monkeypatch):
+    _, index = loader.get_database_catalog(sample_db, max_age=0)
+    monkeypatch.setattr(score, "compute_day_score", lambda *a: (_ for _ in ()).throw(AssertionError("dihitung")))
+    pending: list[str] = []
+    hist = score.bandar_score_history("TEST", index, START, END, compute_missing=False, pending=pending)
+    assert hist.empty
+    assert pending == ["2025-12-11", "2025-12-12"]
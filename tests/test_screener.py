@@ -0,0 +1,42 @@
+import datetime
+
+import pandas as pd
+
+from bandarmology import loader, screener
+
+START, END = datetime.date(2025, 12, 1), datetime.date(2025, 12, 31)
+
+
+def _jobs(db: str, stocks: tuple[str, ...] = ("TEST",)) -> list[tuple]:
+    _, index = loader.get_database_catalog(db, max_age=0)
+    fps = [fp for day in index["TEST"]["files"].values() for fp in day]
+    return [(s, fps, START, END) for s in stocks]
+
+
+def test_top_accumulator_is_a_net_buyer(sample_db):
+    row = screener.screen_stock(_jobs(sample_db)[0])
+    assert row["Error"] is None
+    assert row["Top_Akum_Net"] > 0
+
+
+def test_no_net_buyer_has_no_top_accumulator(sample_db, monkeypatch):
+    summary = screener.get_detailed_broker_summary
+
+    def all_selling(df, stats=None):
+        summ = summary(df, stats=stats)
+        return summ.assign(Net_Val=-summ["Net_Val"].abs() - 1).sort_values("Net_Val", ascending=False)
+
+    monkeypatch.setattr(screener, "get_detailed_broker_summary", all_selling)
+    row = screener.screen_stock(_jobs(sample_db)[0])
+    assert row["Error"] is None
+    assert row["Top_Akumulasi"] is None
+    assert row["Top_Akum_Net"] == 0.0
+
+
+def test_process_pool_matches_serial(sample_db):
+    jobs = _jobs(sample_db, ("TEST", "TEST2"))
+    serial = pd.DataFrame(screener.map_stock_jobs(screener.screen_stock, jobs, 1))
+    pooled = pd.DataFrame(screener.map_stock_jobs(screener.screen_stock, jobs, 2))
+    cols = ["Saham", "Skor", "Top_Akumulasi", "Top_Akum_Net", "Total_Value", "Error"]
+    pd.testing.assert_frame_equal(serial.sort_values("Saham")[cols].reset_index(drop=True),
+                                  pooled.sort_values("Saham")[cols].reset_index(drop=True))